@@ -0,0 +1,451 @@
+"""
+Reproducible benchmarks for the indicators, strategies and the runner loop.
+
+Every case runs on deterministic synthetic OHLCV data (a seeded random-walk FX
+series) at several sizes, 10k to 5M bars by default:
+
+- ta.*        every TechnicalAnalysis / AdvancedTechnicalAnalysis method of the
+              backtest executor (indicator cache switched off)
+- ata.*       the standalone AdvancedTechnicalAnalysis module, including
+              SupportResistanceDetection and PriceActionPatterns
+- strategy.*  each bundled strategy through execute_strategy (quiet, profiled)
+- mtf.*       multi-timeframe resampling, a higher-timeframe indicator and a
+              one-bar incremental update
+- simulator.* the NumPy trade simulator
+- runner.*    one live signal cycle of runner.py against a mocked OANDA client
+
+Results are written as JSON; pass --baseline with an earlier result file to get
+per-case ratios and a non-zero exit code when something got slower than the
+threshold. Cases whose runtime, extrapolated from the previous size, would
+exceed --budget seconds are recorded as skipped instead of being run.
+
+    python benchmarks.py --sizes 10000,100000 --output bench.json
+    python benchmarks.py --only ta.,strategy. --baseline bench.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import inspect
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from embedded_python import load_executor_namespace
+from trade_simulator import simulate_trades
+
+STRATEGIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'strategies')
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+
+# Value for window arguments without a default (wma, ema, tema, hull_ma)
+_DEFAULT_PERIOD = 20
+
+
+def synthetic_ohlcv(n_bars, seed=42, start_price=1.1, volatility=0.0004, granularity_seconds=60,
+                    start='2024-01-01'):
+    """
+    Deterministic random-walk FX bars: DataFrame with Open/High/Low/Close/Volume and a UTC
+    DatetimeIndex. The same seed always gives the same series.
+    """
+    rng = np.random.default_rng(seed)
+    close = start_price + np.cumsum(rng.normal(0.0, volatility, n_bars))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    wicks = np.abs(rng.normal(0.0, volatility / 2, (2, n_bars)))
+    high = np.maximum(open_, close) + wicks[0]
+    low = np.minimum(open_, close) - wicks[1]
+    volume = rng.integers(10, 1000, n_bars).astype(np.float64)
+    index = pd.date_range(start, periods=n_bars, freq=f'{granularity_seconds}s', tz='UTC')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
+
+
+class BenchmarkCase:
+    """
+    A named timing target; setup(df) prepares inputs outside the timed call run(inputs).
+    Cases that do not scale with the series length (per_size=False) run once, on the smallest size.
+    """
+
+    def __init__(self, name, run, setup=None, per_size=True):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda df: df)
+        self.per_size = per_size
+
+
+def _method_arguments(func, lists):
+    """Call arguments for an indicator method, chosen from its parameter names."""
+    column_names = {
+        'data': 'Close', 'close': 'Close', 'high': 'High', 'low': 'Low',
+        'open_prices': 'Open', 'open': 'Open', 'volume': 'Volume'
+    }
+    kwargs = {}
+    for name, param in inspect.signature(func).parameters.items():
+        if name in column_names:
+            column = lists[column_names[name]]
+            # Pivot point style methods take the scalar of one bar
+            kwargs[name] = column[-1] if param.annotation is float else column
+        elif name in ('high_price', 'low_price'):
+            kwargs[name] = max(lists['High']) if name == 'high_price' else min(lists['Low'])
+        elif name == 'level':
+            kwargs[name] = float(np.median(lists['Close']))
+        elif param.default is inspect.Parameter.empty:
+            kwargs[name] = _DEFAULT_PERIOD
+    return kwargs
+
+
+def _as_lists(df):
+    return {column: df[column].tolist() for column in df.columns}
+
+
+def _class_cases(prefix, cls):
+    cases = []
+    for name, member in inspect.getmembers(cls, inspect.isfunction):
+        if name.startswith('_'):
+            continue
+
+        def setup(df, func=member):
+            return func, _method_arguments(func, _as_lists(df))
+
+        cases.append(BenchmarkCase(f'{prefix}.{cls.__name__}.{name}', lambda inputs: inputs[0](**inputs[1]), setup))
+    return cases
+
+
+def indicator_cases():
+    """Cases for the executor indicators and the standalone advanced analysis module."""
+    executor = load_executor_namespace()
+    advanced = load_executor_namespace('ADVANCED_TECHNICAL_ANALYSIS_PYTHON_CODE', 'advanced_technical_analysis')
+    cases = []
+    for cls in (executor.TechnicalAnalysis, executor.AdvancedTechnicalAnalysis):
+        cases.extend(_class_cases('ta', cls))
+    for cls in (advanced.AdvancedTechnicalAnalysis, advanced.TechnicalAnalysis,
+                advanced.SupportResistanceDetection, advanced.PriceActionPatterns):
+        cases.extend(_class_cases('ata', cls))
+    return cases
+
+
+def strategy_cases():
+    """One case per bundled strategy, run through execute_strategy like the browser does."""
+    executor = load_executor_namespace()
+    cases = []
+    for filename in sorted(os.listdir(STRATEGIES_DIR)):
+        if not filename.endswith('.py'):
+            continue
+        with open(os.path.join(STRATEGIES_DIR, filename), encoding='utf-8') as f:
+            code = f.read()
+
+        def setup(df):
+            market_data = {column.lower(): df[column].to_numpy() for column in df.columns}
+            market_data.update(verbose=False, profile=True)
+            return market_data
+
+        def run(market_data, code=code):
+            result = executor.execute_strategy(dict(market_data), code)
+            if result.get('error'):
+                raise RuntimeError(result['error'].splitlines()[0])
+            return {'stages': {name: timing['wall_seconds'] for name, timing in result['perf']['stages'].items()}}
+
+        cases.append(BenchmarkCase(f'strategy.{filename[:-3]}', run, setup))
+    return cases
+
+
+def timeframe_cases():
+    """Resampling to M5..D, a higher-timeframe indicator and a one-bar incremental update."""
+    executor = load_executor_namespace()
+    timeframes = ('M5', 'M15', 'H1', 'H4', 'D')
+
+    def resample(df):
+        mtf = executor.MultiTimeframe(df)
+        return {'bars': {timeframe: len(mtf.bars(timeframe)['close']) for timeframe in timeframes}}
+
+    def indicator(df):
+        executor.MultiTimeframe(df).indicator('H1', 'ema', 200)
+
+    def setup_update(df):
+        mtf = executor.MultiTimeframe(df)
+        for timeframe in timeframes:
+            mtf.bars(timeframe)
+        return mtf
+
+    def update(mtf):
+        last = float(mtf.bars('M5')['close'][-1])
+        mtf.update(mtf.times[-1] + mtf.base_seconds, last, last, last, last, 1.0)
+        mtf.indicator('H1', 'ema', 200)
+
+    return [BenchmarkCase('mtf.resample', resample), BenchmarkCase('mtf.indicator_h1_ema', indicator),
+            BenchmarkCase('mtf.update', update, setup_update)]
+
+
+def simulator_cases():
+    def setup(df):
+        rng = np.random.default_rng(7)
+        n = len(df)
+        return (df['Open'].to_numpy(), df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(),
+                rng.random(n) < 0.02, np.where(rng.random(n) < 0.5, 1, -1), rng.random(n) < 0.01)
+
+    def run(inputs):
+        simulation = simulate_trades(*inputs, stop_loss_pips=20, take_profit_pips=30, spread_pips=1.0, units=1000)
+        return {'trades': len(simulation.trades)}
+
+    return [BenchmarkCase('simulator.simulate_trades', run, setup)]
+
+
+class MockOandaClient:
+    """
+    Stand-in for oandapyV20.API serving InstrumentsCandles from synthetic bars.
+
+    advance() closes the next bar; the newest bar is always returned as incomplete,
+    like OANDA does. latency_ms adds a fixed delay per request.
+    """
+
+    def __init__(self, instruments, n_bars, seed=42, latency_ms=0.0):
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self._bars = {}
+        self._times = {}
+        for offset, instrument in enumerate(instruments):
+            df = synthetic_ohlcv(n_bars, seed=seed + offset)
+            self._bars[instrument] = df[['Open', 'High', 'Low', 'Close']].to_numpy()
+            self._times[instrument] = [t.strftime('%Y-%m-%dT%H:%M:%S.000000000Z') for t in df.index]
+        self.now = 0
+
+    def advance(self, bars=1):
+        self.now += bars
+
+    def _candle(self, instrument, i):
+        o, h, l, c = self._bars[instrument][i]
+        return {'time': self._times[instrument][i], 'complete': i < self.now, 'volume': 10,
+                'mid': {'o': f'{o:.5f}', 'h': f'{h:.5f}', 'l': f'{l:.5f}', 'c': f'{c:.5f}'}}
+
+    def request(self, endpoint):
+        self.requests += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        # InstrumentsCandles endpoints are 'v3/instruments/<instrument>/candles'
+        instrument = str(endpoint).split('/')[2]
+        params = endpoint.params
+        times = self._times[instrument]
+        if 'from' in params:
+            start = np.searchsorted(times, params['from'], side='right')
+        else:
+            start = max(0, self.now + 1 - int(params['count']))
+        endpoint.response = {'instrument': instrument, 'candles': [
+            self._candle(instrument, i) for i in range(start, self.now + 1)]}
+        return endpoint.response
+
+
+def runner_cases(instruments=8, cycles=50, latency_ms=0.0):
+    """The runner's signal cycle (SignalEngine + evaluate_signal) over a mocked client."""
+
+    def setup(df):
+        # runner.py configures logging and reads .env on import; keep its per-candle logging out of the timings
+        import runner
+        from signal_engine import SignalEngine
+        names = [f'BENCH_{i}' for i in range(instruments)]
+        client = MockOandaClient(names, n_bars=cycles + 200, latency_ms=latency_ms)
+        client.advance(100)
+        strategies = [runner.MovingAverageCrossover(instrument=name) for name in names]
+        engine = SignalEngine(client, strategies, runner.evaluate_signal, max_workers=instruments)
+        with _logging_disabled():
+            engine.run_cycle()  # seed the indicators from history
+        return client, engine
+
+    def run(inputs):
+        client, engine = inputs
+        cycle_ms = []
+        with _logging_disabled():
+            for _ in range(cycles):
+                client.advance()
+                engine.run_cycle()
+                cycle_ms.append(engine.last_cycle_ms)
+        return {'instruments': instruments, 'cycles': cycles, 'cycle_ms_p50': statistics.median(cycle_ms),
+                'cycle_ms_max': max(cycle_ms)}
+
+    return [BenchmarkCase('runner.signal_cycle', run, setup, per_size=False)]
+
+
+@contextlib.contextmanager
+def _logging_disabled():
+    logging.disable(logging.INFO)
+    try:
+        yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def time_case(case, df, repeat):
+    """Run one case `repeat` times on df; returns a result row."""
+    bars = len(df) if case.per_size else None
+    row = {'case': case.name, 'bars': bars, 'repeat': repeat}
+    try:
+        inputs = case.setup(df)
+        timings = []
+        extra = None
+        for _ in range(repeat):
+            # Strategy / executor code narrates; keep stdout clean for the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                extra = case.run(inputs)
+                timings.append(time.perf_counter() - started)
+    except Exception as e:
+        row.update(status='error', error=f'{type(e).__name__}: {e}')
+        return row
+    row.update(status='ok', min_seconds=min(timings), median_seconds=statistics.median(timings),
+               bars_per_second=bars / min(timings) if bars and min(timings) > 0 else None)
+    if isinstance(extra, dict):
+        row['extra'] = extra
+    return row
+
+
+def run_benchmarks(cases, sizes=DEFAULT_SIZES, repeat=3, budget=20.0, seed=42, on_result=None):
+    """
+    Time every case at every size (ascending). A case is skipped at the larger sizes once its
+    previous timing, scaled linearly by bars, would exceed `budget` seconds per run.
+    """
+    sizes = sorted(sizes)
+    executor = load_executor_namespace()
+    previous_cache_state = executor.INDICATOR_CACHE.enabled
+    # Repeats must recompute, not hit the indicator cache
+    executor.configure_indicator_cache(enabled=False)
+    results = []
+    try:
+        frames = {}
+        for case in cases:
+            last = None
+            for size in (sizes if case.per_size else sizes[:1]):
+                if last is not None and last['status'] != 'ok':
+                    row = {'case': case.name, 'bars': size, 'status': 'skipped', 'reason': 'failed at a smaller size'}
+                elif last is not None and last['min_seconds'] * size / last['bars'] > budget:
+                    estimate = last['min_seconds'] * size / last['bars']
+                    row = {'case': case.name, 'bars': size, 'status': 'skipped',
+                           'reason': f'estimated {estimate:.0f}s exceeds the {budget:.0f}s budget'}
+                else:
+                    if size not in frames:
+                        frames[size] = synthetic_ohlcv(size, seed=seed)
+                    row = time_case(case, frames[size], repeat)
+                    last = row
+                if not case.per_size:
+                    row['bars'] = None
+                results.append(row)
+                if on_result is not None:
+                    on_result(row)
+    finally:
+        executor.configure_indicator_cache(enabled=previous_cache_state)
+    return results
+
+
+def compare_results(current, baseline, threshold=0.10):
+    """
+    Per (case, bars) ratio current / baseline of min_seconds. 'regression' when slower by more
+    than threshold, 'improvement' when faster by more than threshold.
+    """
+    baseline_rows = {(row['case'], row['bars']): row for row in baseline if row.get('status') == 'ok'}
+    comparison = []
+    for row in current:
+        previous = baseline_rows.get((row['case'], row['bars']))
+        if row.get('status') != 'ok' or previous is None or not previous['min_seconds']:
+            continue
+        ratio = row['min_seconds'] / previous['min_seconds']
+        if ratio > 1 + threshold:
+            verdict = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            verdict = 'improvement'
+        else:
+            verdict = 'unchanged'
+        comparison.append({'case': row['case'], 'bars': row['bars'], 'baseline_seconds': previous['min_seconds'],
+                           'seconds': row['min_seconds'], 'ratio': ratio, 'verdict': verdict})
+    return comparison
+
+
+def environment_metadata():
+    """Versions and machine details stored next to the results."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def select_cases(only=None, runner_instruments=8, runner_cycles=50, runner_latency_ms=0.0):
+    cases = (indicator_cases() + strategy_cases() + timeframe_cases() + simulator_cases()
+             + runner_cases(runner_instruments, runner_cycles, runner_latency_ms))
+    if only:
+        cases = [case for case in cases if any(pattern in case.name for pattern in only)]
+    return cases
+
+
+def _bars_label(bars):
+    return f'{bars:,}' if bars else '-'
+
+
+def _print_row(row):
+    if row['status'] == 'ok':
+        rate = f"{row['bars_per_second']:,.0f} bars/s" if row.get('bars_per_second') else ''
+        print(f"{row['case']:<60} {_bars_label(row['bars']):>9} {row['min_seconds'] * 1000:>11.2f} ms  {rate}")
+    else:
+        print(f"{row['case']:<60} {_bars_label(row['bars']):>9} {row['status']}: {row.get('error') or row.get('reason')}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark indicators, strategies and the runner loop')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='comma separated bar counts')
+    parser.add_argument('--only', help='comma separated substrings of case names, e.g. ta.,strategy.')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=20.0, help='max estimated seconds per run before skipping')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--runner-instruments', type=int, default=8)
+    parser.add_argument('--runner-cycles', type=int, default=50)
+    parser.add_argument('--runner-latency-ms', type=float, default=0.0, help='simulated OANDA request latency')
+    parser.add_argument('--output', help='write the JSON report here (default: stdout)')
+    parser.add_argument('--baseline', help='earlier JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative slowdown counted as a regression')
+    args = parser.parse_args(argv)
+
+    only = [pattern for pattern in args.only.split(',') if pattern] if args.only else None
+    cases = select_cases(only, args.runner_instruments, args.runner_cycles, args.runner_latency_ms)
+    sizes = [int(size) for size in args.sizes.split(',')]
+    # Progress goes to stderr so the JSON report can be piped
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_benchmarks(cases, sizes, args.repeat, args.budget, args.seed, on_result=_print_row)
+
+    report = {'meta': environment_metadata(), 'settings': vars(args), 'results': results}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['baseline'] = baseline.get('meta')
+        report['comparison'] = compare_results(results, baseline['results'], args.threshold)
+        regressions = [row for row in report['comparison'] if row['verdict'] == 'regression']
+        for row in report['comparison']:
+            if row['verdict'] != 'unchanged':
+                print(f"{row['verdict']:<12} {row['case']} @ {_bars_label(row['bars'])} bars: {row['ratio']:.2f}x",
+                      file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
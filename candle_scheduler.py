@@ -0,0 +1,129 @@
+"""
+Candle-close aligned scheduling for the live runner.
+
+Instead of sleeping a fixed 60 seconds, the runner wakes a short settle delay
+after each candle close of the granularities it trades, so signals are
+evaluated on the candle that just completed. The candle grid follows OANDA's
+dailyAlignment (17:00 America/New_York unless configured otherwise), so H4
+and D candles close where OANDA closes them, across DST changes. Trade
+throttling uses a
+monotonic-clock cooldown per instrument, which is immune to wall-clock jumps
+and hour/day wraparound.
+"""
+
+import math
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+# OANDA candlestick granularities in seconds
+GRANULARITY_SECONDS = {
+    'S5': 5, 'S10': 10, 'S15': 15, 'S30': 30,
+    'M1': 60, 'M2': 120, 'M4': 240, 'M5': 300, 'M10': 600, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H2': 7200, 'H3': 10800, 'H4': 14400, 'H6': 21600, 'H8': 28800, 'H12': 43200,
+    'D': 86400
+}
+
+
+def granularity_seconds(granularity):
+    try:
+        return GRANULARITY_SECONDS[granularity]
+    except KeyError:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+
+
+def next_candle_close(granularity, now, offset=0):
+    """
+    Epoch time of the first candle close strictly after `now`.
+
+    `offset` shifts the candle grid in seconds; H4/D candles follow OANDA's
+    dailyAlignment (17:00 America/New_York by default) and need one.
+    """
+    period = granularity_seconds(granularity)
+    return (math.floor((now - offset) / period) + 1) * period + offset
+
+
+def daily_alignment_offset(granularity, now, daily_alignment=17, alignment_timezone='America/New_York'):
+    """
+    Candle grid offset (seconds) of `granularity` at `now` under OANDA's dailyAlignment.
+
+    The trading day starts at `daily_alignment` o'clock in `alignment_timezone`;
+    candles of every granularity are laid out from that instant, which only moves
+    granularities longer than an hour (e.g. H4 closes at 21:00 UTC + 4h steps in
+    New York summer time, D at 21:00 UTC, an hour later in winter).
+    """
+    utc_offset = datetime.fromtimestamp(now, timezone.utc).astimezone(ZoneInfo(alignment_timezone)).utcoffset()
+    day_start = daily_alignment * 3600 - int(utc_offset.total_seconds())
+    return day_start % granularity_seconds(granularity)
+
+
+class CandleCloseScheduler:
+    """
+    Sleeps until just after the next candle close of any configured granularity.
+
+    Candle closes follow `daily_alignment` / `alignment_timezone` (the defaults
+    are OANDA's); `offsets` overrides the grid offset of single granularities and
+    daily_alignment=None keeps every grid on UTC midnight.
+    """
+
+    def __init__(self, granularities, settle_delay=1.5, offsets=None, daily_alignment=17,
+                 alignment_timezone='America/New_York', clock=time.time, sleep=time.sleep):
+        self.granularities = sorted(set(granularities), key=granularity_seconds)
+        if not self.granularities:
+            raise ValueError("At least one granularity is required")
+        self.settle_delay = settle_delay
+        self.offsets = offsets or {}
+        self.daily_alignment = daily_alignment
+        self.alignment_timezone = alignment_timezone
+        self.clock = clock
+        self.sleep = sleep
+        self.last_wake_lag = None
+
+    def offset(self, granularity, now):
+        """Grid offset of `granularity` in seconds at `now`."""
+        if granularity in self.offsets:
+            return self.offsets[granularity]
+        if self.daily_alignment is None:
+            return 0
+        return daily_alignment_offset(granularity, now, self.daily_alignment, self.alignment_timezone)
+
+    def next_close(self, now=None):
+        """Return (close_time, due_granularities) for the next candle close after `now`."""
+        now = self.clock() if now is None else now
+        closes = {g: next_candle_close(g, now, self.offset(g, now)) for g in self.granularities}
+        close_time = min(closes.values())
+        due = {g for g, t in closes.items() if t == close_time}
+        return close_time, due
+
+    def wait_for_next_close(self):
+        """Block until `settle_delay` after the next candle close; returns (close_time, due_granularities)."""
+        close_time, due = self.next_close()
+        wake_at = close_time + self.settle_delay
+        while True:
+            remaining = wake_at - self.clock()
+            if remaining <= 0:
+                break
+            self.sleep(remaining)
+        self.last_wake_lag = self.clock() - wake_at
+        return close_time, due
+
+
+class Cooldown:
+    """Per-key cooldown measured on the monotonic clock."""
+
+    def __init__(self, seconds, clock=time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self._last = {}
+
+    def remaining(self, key):
+        last = self._last.get(key)
+        if last is None:
+            return 0.0
+        return max(0.0, self.seconds - (self.clock() - last))
+
+    def ready(self, key):
+        return self.remaining(key) == 0.0
+
+    def mark(self, key):
+        self._last[key] = self.clock()
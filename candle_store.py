@@ -0,0 +1,355 @@
+"""
+Local columnar candle store.
+
+Candles are kept per instrument and granularity as append-only raw column
+files (little-endian int64 times, float64 OHLC, int64 volume) plus a small
+meta.json holding the committed row count and the current column file
+generation. meta.json is the commit point: a merge writes a complete new
+generation of column files before switching to it, so a crash leaves either
+the old or the new columns, never a mix. Reads memory-map the columns, so
+loading years of M1 history is a zero-copy view instead of a network call
+and a JSON parse. Missing ranges (before the first bar, after the last bar
+and gaps inside the history) can be topped up from OANDA incrementally;
+ranges the API has already answered in full are recorded in meta.json, so
+holidays, halts and illiquid hours without bars are not requested again.
+"""
+
+import contextlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+from oandapyV20.endpoints.instruments import InstrumentsCandles
+
+from candle_scheduler import granularity_seconds
+
+COLUMNS = {
+    'time': np.dtype('<i8'),
+    'open': np.dtype('<f8'),
+    'high': np.dtype('<f8'),
+    'low': np.dtype('<f8'),
+    'close': np.dtype('<f8'),
+    'volume': np.dtype('<i8')
+}
+
+# OANDA returns at most 5000 candles per request
+MAX_CANDLES_PER_REQUEST = 5000
+
+
+def parse_oanda_times(times):
+    """RFC3339 OANDA timestamps -> int64 epoch seconds (vectorized)."""
+    return np.array([t[:19] for t in times], dtype='datetime64[s]').astype(np.int64)
+
+
+def format_oanda_time(epoch_seconds):
+    return datetime.fromtimestamp(int(epoch_seconds), tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000000000Z')
+
+
+def candles_to_columns(candles, price='mid'):
+    """Convert complete OANDA candle dicts to column arrays, parsing price strings in bulk."""
+    complete = [c for c in candles if c.get('complete', False)]
+    return {
+        'time': parse_oanda_times([c['time'] for c in complete]),
+        'open': np.array([c[price]['o'] for c in complete], dtype=np.float64),
+        'high': np.array([c[price]['h'] for c in complete], dtype=np.float64),
+        'low': np.array([c[price]['l'] for c in complete], dtype=np.float64),
+        'close': np.array([c[price]['c'] for c in complete], dtype=np.float64),
+        'volume': np.array([c.get('volume', 0) for c in complete], dtype=np.int64)
+    }
+
+
+def merge_ranges(ranges):
+    """Sorted, non-overlapping union of half-open [start, end) ranges (touching ranges are joined)."""
+    merged = []
+    for start, end in sorted((int(a), int(b)) for a, b in ranges if b > a):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_ranges(ranges, covered):
+    """Parts of the [start, end) ranges outside the sorted, non-overlapping covered ranges."""
+    remaining = []
+    for start, end in ranges:
+        for covered_start, covered_end in covered:
+            if covered_end <= start or covered_start >= end:
+                continue
+            if covered_start > start:
+                remaining.append((start, covered_start))
+            start = max(start, covered_end)
+            if start >= end:
+                break
+        if start < end:
+            remaining.append((start, end))
+    return remaining
+
+
+def is_weekend_gap(gap_start, gap_end):
+    """True for the regular FX weekend close (Friday evening to Sunday evening UTC)."""
+    start = datetime.fromtimestamp(int(gap_start), tz=timezone.utc)
+    end = datetime.fromtimestamp(int(gap_end), tz=timezone.utc)
+    return start.weekday() in (4, 5) and end.weekday() in (6, 0) and (gap_end - gap_start) <= 3 * 86400
+
+
+class CandleSeries:
+    """One instrument/granularity column set on disk."""
+
+    def __init__(self, path, instrument, granularity):
+        self.path = path
+        self.instrument = instrument
+        self.granularity = granularity
+        self.step = granularity_seconds(granularity)
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                self._meta = json.load(f)
+        else:
+            self._meta = {'instrument': instrument, 'granularity': granularity, 'count': 0,
+                          'columns': {name: dtype.str for name, dtype in COLUMNS.items()}}
+            self._write_meta()
+        self._check_columns()
+
+    def __len__(self):
+        return self._meta['count']
+
+    @property
+    def generation(self):
+        return self._meta.get('generation', 0)
+
+    def _column_path(self, name, generation=None):
+        generation = self.generation if generation is None else generation
+        filename = f'{name}.bin' if generation == 0 else f'{name}.{generation}.bin'
+        return os.path.join(self.path, filename)
+
+    def _check_columns(self):
+        """Every column file must hold the committed rows (extra bytes from an interrupted append are fine)."""
+        count = len(self)
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size < count * dtype.itemsize:
+                raise ValueError(f"{path} holds {size // dtype.itemsize} rows but meta.json commits {count}")
+
+    @property
+    def checked_ranges(self):
+        """[start, end) ranges already fetched in full: bars missing inside them do not exist."""
+        return [tuple(r) for r in self._meta.get('checked_ranges', [])]
+
+    def mark_checked(self, start, end):
+        """Record that the API has returned everything in [start, end)."""
+        with self._lock:
+            self._meta['checked_ranges'] = [list(r) for r in merge_ranges(self.checked_ranges + [(start, end)])]
+            self._write_meta()
+
+    def _write_meta(self):
+        tmp_path = self._meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _map_column(self, name, count):
+        if count == 0:
+            return np.empty(0, dtype=COLUMNS[name])
+        return np.memmap(self._column_path(name), dtype=COLUMNS[name], mode='r', shape=(count,))
+
+    def read(self, start=None, end=None, columns=None):
+        """
+        Memory-mapped column views for bars with start <= time < end (epoch seconds).
+        No data is copied; slice or np.array() the result to materialize it.
+        """
+        count = len(self)
+        times = self._map_column('time', count)
+        lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        hi = count if end is None else int(np.searchsorted(times, end, side='left'))
+        return {name: self._map_column(name, count)[lo:hi] for name in (columns or COLUMNS)}
+
+    @property
+    def first_time(self):
+        return int(self._map_column('time', len(self))[0]) if len(self) else None
+
+    @property
+    def last_time(self):
+        return int(self._map_column('time', len(self))[-1]) if len(self) else None
+
+    def append(self, columns):
+        """
+        Add bars; rows newer than the last stored bar are appended in place,
+        anything older is merged (which rewrites the column files).
+        Returns the number of new rows stored.
+        """
+        times = np.asarray(columns['time'], dtype=np.int64)
+        if len(times) == 0:
+            return 0
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        keep = np.concatenate(([True], np.diff(times) != 0))
+        rows = {name: np.asarray(columns[name], dtype=dtype)[order][keep] for name, dtype in COLUMNS.items()}
+
+        with self._lock:
+            last_time = self.last_time
+            if last_time is None or rows['time'][0] > last_time:
+                return self._append_tail(rows)
+            return self._merge(rows)
+
+    def append_candles(self, candles, price='mid'):
+        return self.append(candles_to_columns(candles, price))
+
+    def _append_tail(self, rows):
+        count = len(self)
+        for name, dtype in COLUMNS.items():
+            with open(self._column_path(name), 'ab') as f:
+                # Drop bytes from an interrupted earlier append before writing
+                f.truncate(count * dtype.itemsize)
+                f.write(np.ascontiguousarray(rows[name]).tobytes())
+        self._meta['count'] = count + len(rows['time'])
+        self._write_meta()
+        return len(rows['time'])
+
+    def _merge(self, rows):
+        existing = {name: np.array(col) for name, col in self.read().items()}
+        new_mask = ~np.isin(rows['time'], existing['time'])
+        if not new_mask.any():
+            return 0
+        merged_times = np.concatenate((existing['time'], rows['time'][new_mask]))
+        order = np.argsort(merged_times, kind='stable')
+        # Write every merged column as the next generation first; the meta.json
+        # update then switches all columns at once
+        previous = self.generation
+        generation = previous + 1
+        for name, dtype in COLUMNS.items():
+            merged = np.concatenate((existing[name], rows[name][new_mask]))[order].astype(dtype)
+            merged.tofile(self._column_path(name, generation))
+        self._meta['generation'] = generation
+        self._meta['count'] = len(merged_times)
+        self._write_meta()
+        for name in COLUMNS:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._column_path(name, previous))
+        return int(new_mask.sum())
+
+    def gaps(self, start=None, end=None, ignore_weekends=True):
+        """(gap_start, gap_end) pairs where consecutive bars are more than one step apart."""
+        times = self.read(start, end, columns=['time'])['time']
+        if len(times) < 2:
+            return []
+        diffs = np.diff(times)
+        idx = np.flatnonzero(diffs > self.step)
+        gaps = [(int(times[i]) + self.step, int(times[i + 1])) for i in idx]
+        if ignore_weekends:
+            gaps = [g for g in gaps if not is_weekend_gap(*g)]
+        return gaps
+
+    def missing_ranges(self, start, end, ignore_weekends=True):
+        """Half-open [from, to) ranges within [start, end) that are neither stored nor already checked."""
+        if len(self) == 0:
+            return subtract_ranges([(start, end)], self.checked_ranges)
+        ranges = []
+        if start < self.first_time:
+            ranges.append((start, min(end, self.first_time)))
+        ranges.extend((a, b) for a, b in self.gaps(start, end, ignore_weekends) if a < end and b > start)
+        next_bar = self.last_time + self.step
+        if end > next_bar:
+            ranges.append((max(start, next_bar), end))
+        return subtract_ranges(ranges, self.checked_ranges)
+
+
+class CandleStore:
+    """Root directory holding one CandleSeries per instrument and granularity."""
+
+    def __init__(self, root):
+        self.root = root
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def series(self, instrument, granularity):
+        key = (instrument, granularity)
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = CandleSeries(os.path.join(self.root, instrument, granularity), instrument, granularity)
+            return self._series[key]
+
+    def load(self, instrument, granularity, start=None, end=None):
+        return self.series(instrument, granularity).read(start, end)
+
+    def top_up(self, api_client, instrument, granularity, start, end=None, price='M'):
+        """
+        Fetch only the ranges missing between start and end (epoch seconds, end defaults to now)
+        and store them. Returns the number of new bars stored.
+
+        Once the API returns a candle at or after the end of a range, nothing more can
+        appear inside it: the range is marked checked and not requested again, even if it
+        holds no bars (holidays, halts). Ranges still open at the end, such as the one
+        after the newest bar, are requested again on the next call.
+        """
+        series = self.series(instrument, granularity)
+        end = int(datetime.now(tz=timezone.utc).timestamp()) if end is None else end
+        price_key = {'M': 'mid', 'B': 'bid', 'A': 'ask'}[price]
+        stored = 0
+        for range_start, range_end in series.missing_ranges(start, end):
+            cursor = range_start
+            while cursor < range_end:
+                params = {
+                    'granularity': granularity,
+                    'price': price,
+                    'from': format_oanda_time(cursor),
+                    'count': MAX_CANDLES_PER_REQUEST
+                }
+                endpoint = InstrumentsCandles(instrument=instrument, params=params)
+                api_client.request(endpoint)
+                candles = endpoint.response.get('candles', [])
+                if not candles:
+                    break
+                columns = candles_to_columns(candles, price_key)
+                in_range = columns['time'] < range_end
+                stored += series.append({name: col[in_range] for name, col in columns.items()})
+
+                last_time = int(parse_oanda_times([candles[-1]['time']])[0])
+                if last_time >= range_end:
+                    # A later bar (complete or forming) exists: the range is final
+                    series.mark_checked(range_start, range_end)
+                    break
+                if last_time + series.step <= cursor or not candles[-1].get('complete', False):
+                    break
+                cursor = last_time + series.step
+        return stored
+
+
+class RecordedCandleClient:
+    """
+    Stand-in for oandapyV20.API that answers InstrumentsCandles requests from
+    recorded candles (e.g. a saved API response), for offline runs and tests.
+    """
+
+    def __init__(self, candles_by_instrument):
+        self.candles = {
+            instrument: sorted(candles, key=lambda c: c['time'])
+            for instrument, candles in candles_by_instrument.items()
+        }
+        self.requests = []
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def request(self, endpoint):
+        params = dict(endpoint.params or {})
+        self.requests.append(params)
+        instrument = str(endpoint).split('/')[2]
+        candles = self.candles.get(instrument, [])
+        if 'from' in params:
+            from_time = params['from'][:19]
+            candles = [c for c in candles if c['time'][:19] >= from_time]
+            if str(params.get('includeFirst', 'true')).lower() == 'false':
+                candles = [c for c in candles if c['time'][:19] != from_time]
+            candles = candles[:int(params.get('count', 500))]
+        else:
+            candles = candles[-int(params.get('count', 500)):]
+        endpoint.response = {'instrument': instrument, 'granularity': params.get('granularity'), 'candles': candles}
+        return endpoint.response
@@ -0,0 +1,61 @@
+"""
+Load the Python code embedded in src/services/python/*.ts outside the browser.
+
+The backtest executor (TechnicalAnalysis, execute_strategy, ...) ships as
+template-literal strings that Pyodide runs in the browser. Batch tools such
+as the optimizer and the benchmarks reuse exactly the same source by
+resolving those template literals here, so there is a single implementation.
+"""
+
+import os
+import re
+import types
+
+PYTHON_SERVICES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'services', 'python')
+
+_EXPORT_PATTERN = re.compile(r'export const (\w+) = `(.*?)(?<!\\)`;', re.S)
+_INTERPOLATION_PATTERN = re.compile(r'\$\{(\w+)\}')
+
+_namespaces = {}
+
+
+def _unescape_template(raw):
+    """Apply the template-literal escapes used in these files (\\\\, \\`, \\$)."""
+    return re.sub(r'\\([\\`$])', r'\1', raw)
+
+
+def load_python_sources(services_dir=PYTHON_SERVICES_DIR):
+    """Return {CONSTANT_NAME: python_source} for every exported template literal."""
+    raw_sources = {}
+    for filename in sorted(os.listdir(services_dir)):
+        if not filename.endswith('.ts'):
+            continue
+        with open(os.path.join(services_dir, filename), encoding='utf-8') as f:
+            for match in _EXPORT_PATTERN.finditer(f.read()):
+                raw_sources[match.group(1)] = match.group(2)
+
+    resolved = {}
+
+    def resolve(name, stack=()):
+        if name in resolved:
+            return resolved[name]
+        if name in stack:
+            raise ValueError(f"Circular template reference: {' -> '.join(stack + (name,))}")
+        source = _INTERPOLATION_PATTERN.sub(lambda m: resolve(m.group(1), stack + (name,)), raw_sources[name])
+        resolved[name] = source
+        return source
+
+    # Resolve interpolations on the raw text first, then unescape each constant once
+    return {name: _unescape_template(resolve(name)) for name in raw_sources}
+
+
+def load_executor_namespace(name='STRATEGY_EXECUTOR_PYTHON_CODE', module_name='strategy_executor'):
+    """
+    Execute an embedded source once per process and return its namespace as a module
+    (so functions defined there can be referenced from worker processes).
+    """
+    if name not in _namespaces:
+        module = types.ModuleType(module_name)
+        exec(compile(load_python_sources()[name], f'<{name}>', 'exec'), module.__dict__)
+        _namespaces[name] = module
+    return _namespaces[name]
@@ -0,0 +1,311 @@
+"""
+Local mock of the OANDA v20 REST API for exercising the order path offline.
+
+MockOandaServer runs a threaded HTTP/1.1 (keep-alive) server on localhost
+that implements the order endpoints the runner uses:
+
+- POST /v3/accounts/<account>/orders             MARKET orders, clientExtensions.id
+- GET  /v3/accounts/<account>/orders/<id|@client> order state lookup
+- GET  /v3/accounts/<account>/transactions/<id>   fill transaction lookup
+- GET  /v3/accounts/<account>/pricing/stream      PRICE ticks (random walk) and HEARTBEATs
+
+Orders fill immediately (the response carries orderFillTransaction) or, with
+fill_delay > 0, are only created and fill in the background like a delayed
+confirmation. fail_next() injects faults: 'error' answers 503 without
+placing the order, 'drop' places the order and closes the connection without
+a response (the lost-response case idempotent retries have to handle), and
+'reject' answers 400 with an orderRejectTransaction. disconnect_streams()
+cuts every open pricing stream, as a network drop would.
+
+    with MockOandaServer(latency=0.02) as server:
+        api = server.api_client()
+        ...
+"""
+
+import datetime
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from oandapyV20 import API
+from oandapyV20.oandapyV20 import TRADING_ENVIRONMENTS
+
+DEFAULT_ACCOUNT_ID = '101-000-00000000-001'
+
+_ORDERS_PATH = re.compile(r'^/v3/accounts/([^/]+)/orders/?$')
+_ORDER_PATH = re.compile(r'^/v3/accounts/([^/]+)/orders/([^/?]+)$')
+_TRANSACTION_PATH = re.compile(r'^/v3/accounts/([^/]+)/transactions/([^/?]+)$')
+_STREAM_PATH = re.compile(r'^/v3/accounts/([^/]+)/pricing/stream$')
+
+
+def _timestamp():
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f000Z')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.mock.lock:
+            self.server.mock.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _dispatch(self, method):
+        mock = self.server.mock
+        with mock.lock:
+            mock.requests += 1
+        if mock.latency:
+            time.sleep(mock.latency)
+        body = None
+        if method == 'POST':
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+        path = self.path.split('?')[0]
+        status, response, drop = mock.handle(method, path, body)
+        if drop:
+            # Order may have been placed, but the client never hears about it
+            self.close_connection = True
+            return
+        self._send_json(status, response)
+
+    def _stream_prices(self, instruments):
+        mock = self.server.mock
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        with mock.lock:
+            generation = mock.stream_generation
+        next_heartbeat = time.monotonic() + mock.heartbeat_interval
+        try:
+            while mock.running and mock.stream_generation == generation:
+                messages = [mock.price_message(instrument) for instrument in instruments]
+                if time.monotonic() >= next_heartbeat:
+                    messages.append({'type': 'HEARTBEAT', 'time': _timestamp()})
+                    next_heartbeat += mock.heartbeat_interval
+                self.wfile.write(b''.join(json.dumps(m).encode('utf-8') + b'\n' for m in messages))
+                self.wfile.flush()
+                time.sleep(mock.tick_interval)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        match = _STREAM_PATH.match(self.path.split('?')[0])
+        if match:
+            query = self.path.partition('?')[2]
+            params = dict(part.split('=', 1) for part in query.split('&') if '=' in part)
+            instruments = [i for i in params.get('instruments', '').replace('%2C', ',').split(',') if i]
+            with self.server.mock.lock:
+                self.server.mock.requests += 1
+            self._stream_prices(instruments)
+            return
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+
+class MockOandaServer:
+    """Threaded mock OANDA REST server; see the module docstring for the supported endpoints."""
+
+    def __init__(self, account_id=DEFAULT_ACCOUNT_ID, price=1.1, fill_delay=0.0, latency=0.0,
+                 tick_interval=0.1, heartbeat_interval=5.0, host='127.0.0.1', port=0, seed=None):
+        self.account_id = account_id
+        self.price = price
+        self.fill_delay = fill_delay
+        self.latency = latency
+        self.tick_interval = tick_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.running = False
+        self.stream_generation = 0
+        self._prices = {}
+        self._random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.orders = {}
+        self.transactions = {}
+        self.client_ids = {}
+        self.connections = 0
+        self.requests = 0
+        self._faults = []
+        self._ids = itertools.count(1)
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+        self.environment = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='mock-oanda', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self.environment is not None:
+            TRADING_ENVIRONMENTS.pop(self.environment, None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def api_client(self, access_token='mock-token', **kwargs):
+        """oandapyV20.API pointed at this server (registered as its own trading environment)."""
+        if self.environment is None:
+            self.environment = f'mock-{self._httpd.server_address[1]}'
+            TRADING_ENVIRONMENTS[self.environment] = {'api': self.url, 'stream': self.url}
+        return API(access_token=access_token, environment=self.environment, **kwargs)
+
+    def fail_next(self, count=1, mode='error'):
+        """Inject faults into the next `count` order submissions ('error', 'drop' or 'reject')."""
+        if mode not in ('error', 'drop', 'reject'):
+            raise ValueError(f"Unknown fault mode: {mode}")
+        with self.lock:
+            self._faults.extend([mode] * count)
+
+    def disconnect_streams(self):
+        """Drop every open pricing stream (clients see the connection close)."""
+        with self.lock:
+            self.stream_generation += 1
+
+    def price_message(self, instrument):
+        """Next random-walk PRICE message for an instrument."""
+        with self.lock:
+            mid = self._prices.get(instrument, self.price) * (1 + self._random.gauss(0, 0.00005))
+            self._prices[instrument] = mid
+        spread = mid * 0.00005
+        return {'type': 'PRICE', 'instrument': instrument, 'time': _timestamp(), 'tradeable': True,
+                'bids': [{'price': f'{mid - spread / 2:.5f}', 'liquidity': 1000000}],
+                'asks': [{'price': f'{mid + spread / 2:.5f}', 'liquidity': 1000000}],
+                'closeoutBid': f'{mid - spread / 2:.5f}', 'closeoutAsk': f'{mid + spread / 2:.5f}'}
+
+    # --- request handling ---
+
+    def handle(self, method, path, body):
+        """Return (status, response_body, drop_connection)."""
+        match = _ORDERS_PATH.match(path)
+        if match and method == 'POST':
+            return self._create_order(match.group(1), body)
+        match = _ORDER_PATH.match(path)
+        if match and method == 'GET':
+            order = self._find_order(match.group(2))
+            if order is None:
+                return 404, {'errorMessage': 'The Order specified does not exist'}, False
+            return 200, {'order': dict(order), 'lastTransactionID': str(self._last_id())}, False
+        match = _TRANSACTION_PATH.match(path)
+        if match and method == 'GET':
+            transaction = self.transactions.get(match.group(2))
+            if transaction is None:
+                return 404, {'errorMessage': 'The Transaction specified does not exist'}, False
+            return 200, {'transaction': transaction, 'lastTransactionID': str(self._last_id())}, False
+        return 404, {'errorMessage': f'No mock route for {method} {path}'}, False
+
+    def _last_id(self):
+        return max((int(i) for i in self.transactions), default=0)
+
+    def _find_order(self, specifier):
+        with self.lock:
+            if specifier.startswith('@'):
+                specifier = self.client_ids.get(specifier[1:])
+            return self.orders.get(specifier)
+
+    def _create_order(self, account_id, body):
+        if account_id != self.account_id:
+            return 400, {'errorMessage': 'Invalid value specified for accountID'}, False
+        with self.lock:
+            fault = self._faults.pop(0) if self._faults else None
+        if fault == 'error':
+            return 503, {'errorMessage': 'Service unavailable'}, False
+
+        request = (body or {}).get('order', {})
+        client_id = (request.get('clientExtensions') or {}).get('id')
+        with self.lock:
+            if client_id and client_id in self.client_ids:
+                return 400, {'errorCode': 'CLIENT_ORDER_ID_ALREADY_EXISTS',
+                             'errorMessage': 'The client Order ID specified is already assigned'}, False
+            order_id = str(next(self._ids))
+            create = {'id': order_id, 'type': 'MARKET_ORDER', 'time': _timestamp(), 'accountID': account_id,
+                      'instrument': request.get('instrument'), 'units': str(request.get('units')),
+                      'timeInForce': request.get('timeInForce', 'FOK'), 'reason': 'CLIENT_ORDER'}
+            if client_id:
+                create['clientExtensions'] = request['clientExtensions']
+            if fault == 'reject':
+                reject = dict(create, type='MARKET_ORDER_REJECT', rejectReason='INSUFFICIENT_MARGIN')
+                self.transactions[order_id] = reject
+                return 400, {'orderRejectTransaction': reject, 'errorCode': 'INSUFFICIENT_MARGIN',
+                             'errorMessage': 'Insufficient margin'}, False
+            order = {'id': order_id, 'state': 'PENDING', 'instrument': create['instrument'],
+                     'units': create['units'], 'createTime': create['time'], 'type': 'MARKET'}
+            if client_id:
+                order['clientExtensions'] = request['clientExtensions']
+                self.client_ids[client_id] = order_id
+            self.orders[order_id] = order
+            self.transactions[order_id] = create
+
+        response = {'orderCreateTransaction': create, 'relatedTransactionIDs': [order_id]}
+        if self.fill_delay > 0:
+            timer = threading.Timer(self.fill_delay, self._fill, args=(order_id,))
+            timer.daemon = True
+            timer.start()
+        else:
+            fill = self._fill(order_id)
+            response['orderFillTransaction'] = fill
+            response['relatedTransactionIDs'].append(fill['id'])
+        response['lastTransactionID'] = response['relatedTransactionIDs'][-1]
+        return 201, response, fault == 'drop'
+
+    def _fill(self, order_id):
+        with self.lock:
+            order = self.orders[order_id]
+            fill_id = str(next(self._ids))
+            fill = {'id': fill_id, 'type': 'ORDER_FILL', 'orderID': order_id, 'time': _timestamp(),
+                    'accountID': self.account_id, 'instrument': order['instrument'], 'units': order['units'],
+                    'price': f'{self.price:.5f}', 'reason': 'MARKET_ORDER',
+                    'tradeOpened': {'tradeID': fill_id, 'units': order['units']}}
+            self.transactions[fill_id] = fill
+            order.update(state='FILLED', fillingTransactionID=fill_id, filledTime=fill['time'],
+                         tradeOpenedID=fill_id)
+            return fill
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run a local mock OANDA REST server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--fill-delay', type=float, default=0.0, help='seconds until orders fill (0 = immediately)')
+    parser.add_argument('--tick-interval', type=float, default=0.1, help='seconds between streamed price ticks')
+    args = parser.parse_args()
+    with MockOandaServer(port=args.port, latency=args.latency, fill_delay=args.fill_delay,
+                         tick_interval=args.tick_interval) as server:
+        print(f"Mock OANDA server on {server.url} (account {server.account_id}), Ctrl+C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,374 @@
+"""
+Pooled, concurrent order execution for the live runner.
+
+Orders are submitted without blocking the signal loop: submit() returns a
+Future right away and a small thread pool sends the OrderCreate requests over
+the API client's keep-alive session, so several instruments signalling in
+the same minute go out in parallel instead of one after another.
+
+- A token bucket per account keeps every request (submissions, lookups and
+  the confirmation poller) under OANDA's request rate.
+- Every order carries a client order ID (clientExtensions.id). When a
+  request fails without a definite answer (connection drop, timeout, 5xx),
+  the order is looked up by that ID before it is retried, so a retry never
+  places a second order.
+- Orders that are accepted but not filled in the create response are
+  confirmed asynchronously by a background poller.
+- Submit-to-acknowledgement and submit-to-fill latencies are kept in
+  fixed-bucket histograms.
+
+mock_oanda.MockOandaServer serves the same endpoints locally for testing.
+"""
+
+import bisect
+import itertools
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from oandapyV20.contrib.requests import MarketOrderRequest
+from oandapyV20.endpoints import orders, transactions
+from oandapyV20.exceptions import V20Error
+
+from signal_engine import configure_connection_pool
+
+# Final order states reported in OrderResult.status
+ORDER_FILLED = 'FILLED'
+ORDER_CANCELLED = 'CANCELLED'
+ORDER_REJECTED = 'REJECTED'
+ORDER_TIMEOUT = 'TIMEOUT'
+ORDER_ERROR = 'ERROR'
+
+
+class LatencyHistogram:
+    """Thread-safe latency histogram over fixed millisecond buckets."""
+
+    BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, bounds_ms=BOUNDS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = None
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds_ms, latency_ms)] += 1
+            self.count += 1
+            self.total_ms += latency_ms
+            self.max_ms = latency_ms if self.max_ms is None else max(self.max_ms, latency_ms)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (max_ms for the overflow bucket)."""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds_ms[i] if i < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f'<={bound}ms' for bound in self.bounds_ms] + [f'>{self.bounds_ms[-1]}ms']
+            return {
+                'count': self.count,
+                'mean_ms': self.total_ms / self.count if self.count else None,
+                'p50_ms': self.percentile(50),
+                'p95_ms': self.percentile(95),
+                'p99_ms': self.percentile(99),
+                'max_ms': self.max_ms,
+                'buckets': dict(zip(labels, self.counts))
+            }
+
+
+class RateLimiter:
+    """Token bucket: on average `rate` acquisitions per second, bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token (possibly going negative) and return how long the caller has to wait."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+# One limiter per account, shared by every executor trading that account
+_account_limiters = {}
+_account_limiters_lock = threading.Lock()
+
+
+def account_rate_limiter(account_id, rate):
+    with _account_limiters_lock:
+        limiter = _account_limiters.get(account_id)
+        if limiter is None:
+            limiter = _account_limiters[account_id] = RateLimiter(rate)
+        return limiter
+
+
+class OrderResult:
+    """Outcome of one submitted order."""
+
+    def __init__(self, client_order_id, instrument, units):
+        self.client_order_id = client_order_id
+        self.instrument = instrument
+        self.units = units
+        self.status = None
+        self.order_id = None
+        self.trade_id = None
+        self.price = None
+        self.attempts = 0
+        self.ack_ms = None
+        self.fill_ms = None
+        self.error = None
+        self.response = None
+
+    @property
+    def filled(self):
+        return self.status == ORDER_FILLED
+
+    def as_dict(self):
+        return {name: value for name, value in vars(self).items() if name != 'response'}
+
+    def __repr__(self):
+        return f"OrderResult({self.client_order_id}, {self.instrument}, {self.units}, {self.status})"
+
+
+class _PendingOrder:
+    def __init__(self, result, future, submitted, deadline):
+        self.result = result
+        self.future = future
+        self.submitted = submitted
+        self.deadline = deadline
+
+
+class OrderExecutor:
+    """
+    Concurrent market order submission over a shared oandapyV20.API client.
+
+    submit() returns a Future resolving to an OrderResult once the order is filled,
+    cancelled, rejected, timed out or failed for good; callbacks run in a worker thread.
+    """
+
+    def __init__(self, api_client, account_id, max_workers=4, orders_per_second=20, max_retries=2,
+                 retry_delay=0.5, confirm_interval=0.5, confirm_timeout=30.0, client_id_prefix='runner',
+                 clock=time.monotonic):
+        self.api_client = api_client
+        self.account_id = account_id
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.confirm_interval = confirm_interval
+        self.confirm_timeout = confirm_timeout
+        self.client_id_prefix = client_id_prefix
+        self.clock = clock
+        self.rate_limiter = account_rate_limiter(account_id, orders_per_second)
+        self.ack_latency = LatencyHistogram()
+        self.fill_latency = LatencyHistogram()
+        self.counts = {status: 0 for status in (ORDER_FILLED, ORDER_CANCELLED, ORDER_REJECTED, ORDER_TIMEOUT,
+                                                ORDER_ERROR)}
+        self.retries = 0
+        self._sequence = itertools.count(1)
+        self._session_tag = uuid.uuid4().hex[:8]
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._accepting = True
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='order')
+        configure_connection_pool(api_client, max_workers + 1)
+        self._confirmer = threading.Thread(target=self._confirm_loop, name='order-confirm', daemon=True)
+        self._confirmer.start()
+
+    def new_client_order_id(self):
+        # OANDA client IDs are limited to 128 characters
+        return f'{self.client_id_prefix}-{self._session_tag}-{next(self._sequence)}'
+
+    def submit(self, instrument, units, client_order_id=None, callback=None, **order_fields):
+        """
+        Queue a market order and return a Future of its OrderResult.
+        order_fields go to MarketOrderRequest (timeInForce, stopLossOnFill, ...).
+        """
+        if not self._accepting:
+            raise RuntimeError("OrderExecutor is shut down")
+        result = OrderResult(client_order_id or self.new_client_order_id(), instrument, units)
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(lambda done: callback(done.result()))
+        submitted = self.clock()
+        self._pool.submit(self._dispatch, result, future, submitted, order_fields)
+        return future
+
+    def _dispatch(self, result, future, submitted, order_fields):
+        try:
+            response = self._create_with_retries(result, order_fields)
+            result.ack_ms = (self.clock() - submitted) * 1000
+            self.ack_latency.record(result.ack_ms)
+            self._apply_response(result, response)
+        except V20Error as e:
+            result.status = ORDER_REJECTED if 400 <= e.code < 500 else ORDER_ERROR
+            result.error = f"{e.code}: {e.msg}"
+        except Exception as e:
+            result.status = ORDER_ERROR
+            result.error = str(e)
+
+        if result.status is None:
+            # Accepted but not filled yet - the confirmer resolves it
+            with self._lock:
+                self._pending[result.client_order_id] = _PendingOrder(
+                    result, future, submitted, self.clock() + self.confirm_timeout)
+            self._wake.set()
+            return
+        self._finish(result, future, submitted)
+
+    def _create_with_retries(self, result, order_fields):
+        data = MarketOrderRequest(instrument=result.instrument, units=result.units,
+                                  clientExtensions={'id': result.client_order_id}, **order_fields).data
+        while True:
+            result.attempts += 1
+            try:
+                return self._request(orders.OrderCreate(accountID=self.account_id, data=data))
+            except V20Error as e:
+                if 'CLIENT_ORDER_ID_ALREADY_EXISTS' in str(e.msg):
+                    # An earlier attempt went through after all
+                    existing = self._lookup(result.client_order_id)
+                    if existing is not None:
+                        return existing
+                    raise
+                if e.code < 500 and e.code != 429:
+                    raise
+                error = e
+            except requests.RequestException as e:
+                error = e
+
+            # Outcome unknown: never retry blindly, the order may already exist
+            existing = self._lookup(result.client_order_id)
+            if existing is not None:
+                return existing
+            if result.attempts > self.max_retries:
+                raise error
+            logging.warning(f"{result.instrument}: order {result.client_order_id} retry {result.attempts} ({error})")
+            with self._lock:
+                self.retries += 1
+            time.sleep(self.retry_delay * result.attempts)
+
+    def _request(self, endpoint):
+        """Send one request once the account's token bucket allows it."""
+        self.rate_limiter.acquire()
+        return self.api_client.request(endpoint)
+
+    def _lookup(self, client_order_id):
+        """Order known to OANDA under client_order_id as a create-style response, or None."""
+        try:
+            endpoint = orders.OrderDetails(accountID=self.account_id, orderID=f'@{client_order_id}')
+            order = self._request(endpoint)['order']
+        except (V20Error, requests.RequestException):
+            return None
+        response = {'orderCreateTransaction': {'id': order['id']}}
+        if order.get('state') == 'FILLED':
+            response['orderFillTransaction'] = self._fill_transaction(order)
+        elif order.get('state') == 'CANCELLED':
+            response['orderCancelTransaction'] = {'orderID': order['id'],
+                                                  'reason': order.get('cancellingTransactionID')}
+        return response
+
+    def _fill_transaction(self, order):
+        fill_id = order.get('fillingTransactionID')
+        try:
+            endpoint = transactions.TransactionDetails(accountID=self.account_id, transactionID=fill_id)
+            return self._request(endpoint)['transaction']
+        except (V20Error, requests.RequestException):
+            return {'id': fill_id, 'orderID': order['id'], 'tradeOpened': {'tradeID': order.get('tradeOpenedID')}}
+
+    @staticmethod
+    def _apply_response(result, response):
+        """Set status/ids from an OrderCreate (or lookup) response; status stays None while pending."""
+        result.response = response
+        result.order_id = response.get('orderCreateTransaction', {}).get('id', result.order_id)
+        fill = response.get('orderFillTransaction')
+        if fill is not None:
+            result.status = ORDER_FILLED
+            result.price = fill.get('price')
+            trade = fill.get('tradeOpened') or fill.get('tradeReduced') or (fill.get('tradesClosed') or [{}])[0]
+            result.trade_id = trade.get('tradeID')
+        elif 'orderCancelTransaction' in response:
+            result.status = ORDER_CANCELLED
+            result.error = response['orderCancelTransaction'].get('reason')
+
+    def _finish(self, result, future, submitted):
+        if result.status == ORDER_FILLED:
+            result.fill_ms = (self.clock() - submitted) * 1000
+            self.fill_latency.record(result.fill_ms)
+        with self._lock:
+            self.counts[result.status] += 1
+        future.set_result(result)
+
+    def _confirm_loop(self):
+        while not self._closed:
+            # Poll every confirm_interval while orders are outstanding, otherwise sleep until woken
+            self._wake.wait(self.confirm_interval if self.pending_count() else None)
+            self._wake.clear()
+            with self._lock:
+                pending = list(self._pending.values())
+            for item in pending:
+                response = self._lookup(item.result.client_order_id)
+                if response is not None:
+                    self._apply_response(item.result, response)
+                if item.result.status is None and self.clock() >= item.deadline:
+                    item.result.status = ORDER_TIMEOUT
+                    item.result.error = f"Not filled within {self.confirm_timeout}s"
+                if item.result.status is not None:
+                    with self._lock:
+                        self._pending.pop(item.result.client_order_id, None)
+                    self._finish(item.result, item.future, item.submitted)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def metrics(self):
+        with self._lock:
+            counts = dict(self.counts)
+            pending = len(self._pending)
+            retries = self.retries
+        return {
+            'orders': counts,
+            'pending': pending,
+            'retries': retries,
+            'submit_to_ack': self.ack_latency.snapshot(),
+            'submit_to_fill': self.fill_latency.snapshot()
+        }
+
+    def shutdown(self, wait=True):
+        """Stop accepting orders; with wait=True, let queued submissions and confirmations finish."""
+        self._accepting = False
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+        if wait:
+            deadline = self.clock() + self.confirm_timeout
+            while self.pending_count() and self.clock() < deadline:
+                time.sleep(self.confirm_interval / 2)
+        self._closed = True
+        self._wake.set()
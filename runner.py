@@ -1,15 +1,17 @@
 import os
 import time
 import logging
-from datetime import datetime
 from dotenv import load_dotenv
-import pandas as pd
 from oandapyV20.endpoints.instruments import InstrumentsCandles
 # OANDA ki zaroori libraries
 from oandapyV20 import API
-from oandapyV20.contrib.requests import MarketOrderRequest
-from oandapyV20.endpoints import orders  # Yeh line zaroori hai
-from oandapyV20.exceptions import V20Error
+
+from candle_scheduler import GRANULARITY_SECONDS, CandleCloseScheduler, Cooldown, granularity_seconds
+from candle_store import CandleStore, format_oanda_time
+from order_executor import OrderExecutor
+from signal_engine import SignalEngine, format_strategy_key, strategy_key
+from streaming_indicators import SMA, CrossoverDetector
+from tick_stream import BarAggregator, BarFeed, PricingStreamSource, streaming_api_client
 
 # --- Step 1: Setup ---
 
@@ -31,105 +33,204 @@ OANDA_TOKEN = os.getenv("OANDA_ACCESS_TOKEN")
 OANDA_ACCOUNT_ID = os.getenv("OANDA_ACCOUNT_ID")
 OANDA_ENV = "practice"
 
+# Kaunse instruments watch karne hain (comma separated, optional granularity: "EUR_USD:M5,GBP_USD"), aur kitne parallel requests
+RUNNER_GRANULARITY = os.getenv("RUNNER_GRANULARITY", "M1")
+RUNNER_INSTRUMENTS = [
+    (item.split(":")[0].strip(), (item.split(":")[1].strip() if ":" in item else RUNNER_GRANULARITY))
+    for item in os.getenv("RUNNER_INSTRUMENTS", "EUR_USD").split(",") if item.strip()
+]
+RUNNER_MAX_WORKERS = int(os.getenv("RUNNER_MAX_WORKERS", "8"))
+
+# Candle close ke kitne second baad data maange (taaki OANDA candle ko complete mark kar de)
+CANDLE_SETTLE_DELAY = float(os.getenv("CANDLE_SETTLE_DELAY", "1.5"))
+# Candles ka dailyAlignment - OANDA candles request ke default (17, America/New_York) jaisa hi rakho
+OANDA_DAILY_ALIGNMENT = int(os.getenv("OANDA_DAILY_ALIGNMENT", "17"))
+OANDA_ALIGNMENT_TIMEZONE = os.getenv("OANDA_ALIGNMENT_TIMEZONE", "America/New_York")
+# Ek instrument (aur granularity) par do trades ke beech kam se kam itne second
+TRADE_COOLDOWN_SECONDS = float(os.getenv("TRADE_COOLDOWN_SECONDS", "180"))
+# Optional: local candle store ki directory (khali ho to store use nahi hota)
+CANDLE_STORE_DIR = os.getenv("CANDLE_STORE_DIR", "")
+# Kitne orders ek saath bheje ja sakte hain, aur account par max orders per second
+ORDER_MAX_WORKERS = int(os.getenv("ORDER_MAX_WORKERS", "4"))
+ORDER_RATE_LIMIT = float(os.getenv("ORDER_RATE_LIMIT", "20"))
+# "poll" = har candle close par REST se candles, "stream" = pricing stream se ticks aur bars yahin banao
+# (stream mode mein sub-minute granularity bhi chalti hai, jaise "S5" ya "S1")
+RUNNER_MODE = os.getenv("RUNNER_MODE", "poll").lower()
+# Bar close hone ke kitne second baad (local clock) bina agle tick ke bhi close maan lo
+STREAM_CLOSE_GRACE = float(os.getenv("STREAM_CLOSE_GRACE", "0.25"))
+# Signal logic peeche reh jaye to itne closed bars tak queue, uske baad stream padhna ruk jaata hai
+STREAM_MAX_PENDING_BARS = int(os.getenv("STREAM_MAX_PENDING_BARS", "1000"))
+# Optional: stream ke saare messages is file mein record karo (tick_stream.ReplaySource se replay hote hain)
+STREAM_RECORD_FILE = os.getenv("STREAM_RECORD_FILE", "")
+
 # --- Step 2: Functions ---
 
-# Yeh poora function copy-paste karein
+class MovingAverageCrossover:
+    """
+    Moving Average Crossover strategy ka live state.
+    Indicators ek baar history se seed hote hain, phir har naye closed candle par O(1) update.
+    """
 
-def execute_trade(api_client, account_id, instrument, units):
-    """Yeh function OANDA par asli trade daalta hai"""
-    logging.info(f"Trade karne ki koshish: {units} units of {instrument}")
-    
-    order_request_data = MarketOrderRequest(instrument=instrument, units=units).data
-    endpoint = orders.OrderCreate(accountID=account_id, data=order_request_data)
+    def __init__(self, instrument="EUR_USD", short_window=20, long_window=50, granularity="M1", units=100):
+        self.instrument = instrument
+        self.granularity = granularity
+        self.units = units
+        self.long_window = long_window
+        self.short_ma = SMA(short_window)  # Choti Moving Average
+        self.long_ma = SMA(long_window)    # Badi Moving Average
+        self.crossover = CrossoverDetector()
+        self.last_candle_time = None  # Aakhri closed candle ka time (OANDA RFC3339 string)
+        self.candle_series = None  # Optional local CandleStore series - naye candles yahan bhi save hote hain
 
-    try:
-        response = api_client.request(endpoint)
-        logging.info(f"OANDA se response mila: {response}")
-        
-        if 'orderFillTransaction' in response:
-            fill_details = response['orderFillTransaction']
-            
-            # --- YAHAN PAR CODE THEEK KIYA GAYA HAI ---
-            # Problem 1: Emoji hata diya
-            # Problem 2: Trade ID sahi jagah se uthaya
-            trade_id = fill_details.get('tradeOpened', {}).get('tradeID', 'N/A')
-            price = fill_details.get('price', 'N/A')
-            
-            logging.info(f"--- SUCCESS! Trade Filled! ---") # Emoji hata diya
-            logging.info(f"Trade ID: {trade_id}, Price: {price}")
-            return True
-        else:
-            logging.warning(f"Order place ho gaya hai, par shayad fill nahi hua. Response: {response}")
+    def seed_from_store(self, series):
+        """Local candle store se indicators seed karo, taaki startup par history download na karni pade"""
+        self.candle_series = series
+        if len(series) == 0:
             return False
+        closes = series.read(columns=['close'])['close'][-(self.long_window + 1):]
+        for close in closes:
+            self.crossover.update(self.short_ma.update(close), self.long_ma.update(close))
+        self.last_candle_time = format_oanda_time(series.last_time)
+        return True
 
-    except V20Error as e:
-        logging.error(f"OANDA API mein trade karte time Error: {e}")
-        logging.error(f"Error Details: {e.msg}")
-    except Exception as e:
-        logging.error(f"Koi anjaan error aaya: {e}")
-    
-    return False
+    def candle_params(self):
+        """Pehli baar history maango, uske baad sirf last candle ke baad wale naye candles"""
+        if self.last_candle_time is None:
+            # Ek incomplete candle bhi aa sakta hai, isliye thoda extra maango
+            return {"count": self.long_window + 2, "granularity": self.granularity}
+        return {"from": self.last_candle_time, "includeFirst": "false", "granularity": self.granularity}
+
+    def on_candles(self, candles):
+        """Naye closed candles se indicators update karo; latest candle ka signal return karo"""
+        signal = None
+        for candle in candles:
+            if not candle.get('complete', False):
+                continue
+            if self.last_candle_time is not None and candle['time'] <= self.last_candle_time:
+                continue
+
+            short_ma = self.short_ma.update(float(candle['mid']['c']))
+            long_ma = self.long_ma.update(float(candle['mid']['c']))
+            signal = self.crossover.update(short_ma, long_ma)
+            self.last_candle_time = candle['time']
+        return signal
 
-# Yeh poora naya function copy-paste karein
-def check_for_trade_signal(api_client, account_id):
+
+def evaluate_signal(api_client, strategy):
     """
-    Yeh function Moving Average Crossover strategy ke hisaab se signal check karta hai.
+    Ek instrument ke naye closed candles laao aur crossover signal check karo.
+    Errors yahan catch nahi hote - caller (SignalEngine) unhe handle karta hai.
     """
-    instrument = "EUR_USD"
-    short_window = 20  # Choti Moving Average
-    long_window = 50   # Badi Moving Average
-    
-    logging.info(f"Strategy Check: {instrument} ke liye Moving Average Crossover check kar rahe hain...")
+    instrument = strategy.instrument
+
+    # API se sirf naye candles ka request
+    endpoint = InstrumentsCandles(instrument=instrument, params=strategy.candle_params())
+    api_client.request(endpoint)
+    response = endpoint.response
+
+    candles = response.get('candles', [])
+    if strategy.candle_series is not None:
+        strategy.candle_series.append_candles(candles)
+    return signal_from_candles(strategy, candles)
+
+
+def signal_from_candles(strategy, candles):
+    """Closed candles (REST se ya stream se bane hue) strategy mein daalo aur (instrument, units) signal return karo"""
+    instrument = strategy.instrument
+    previous_candle_time = strategy.last_candle_time
+    signal = strategy.on_candles(candles)
 
-    # OANDA se pichhle 100 candles (bars) ka data maango
-    params = {
-        "count": 100,
-        "granularity": "M1"  # M1 = 1 Minute ki candles. Aap isko "H1" (1 Hour) ya "D" (1 Day) bhi kar sakte hain.
-    }
+    if strategy.last_candle_time == previous_candle_time:
+        logging.info(f"{instrument}: Koi naya closed candle nahi aaya. Koi Signal Nahi.")
+        return (None, None)
+
+    logging.info(f"{instrument}: Latest MAs: Short MA = {strategy.short_ma.value:.5f}, Long MA = {strategy.long_ma.value:.5f}")
+
+    # --- Strategy ka Asli Logic ---
     
+    # BUY Signal: Agar pichhli candle mein short MA neeche tha, aur ab upar aa gaya hai
+    if signal == 'BUY':
+        logging.info(f"{instrument}: BUY SIGNAL MILA! Short MA ne Long MA ko upar ki taraf cross kiya.")
+        return (instrument, strategy.units)  # 100 units buy karo
+
+    # SELL Signal: Agar pichhli candle mein short MA upar tha, aur ab neeche aa gaya hai
+    elif signal == 'SELL':
+        logging.info(f"{instrument}: SELL SIGNAL MILA! Short MA ne Long MA ko neeche ki taraf cross kiya.")
+        return (instrument, -strategy.units) # 100 units sell karo (-100)
+
+    logging.info(f"{instrument}: Koi Crossover nahi hua. Koi Signal Nahi.")
+    return (None, None)
+
+
+def on_order_done(result, engine, cooldown, key, close_time):
+    """Order ka final result aane par chalta hai (order worker thread mein): log, latency aur cooldown"""
+    close_to_order_ms = (time.time() - close_time) * 1000
+    engine.metrics[key].record_order_latency(close_to_order_ms)
+
+    if result.filled:
+        cooldown.mark(key)
+        logging.info(f"--- SUCCESS! Trade Filled! --- {result.instrument}: Trade ID: {result.trade_id}, Price: {result.price}")
+        logging.info(
+            f"{result.instrument}: submit se fill {result.fill_ms:.0f} ms, candle close se {close_to_order_ms:.0f} ms "
+            f"({result.attempts} attempt)"
+        )
+    else:
+        logging.warning(f"{result.instrument}: order {result.client_order_id} fill nahi hua ({result.status}): {result.error}")
+
+
+def submit_signal(order_executor, engine, cooldown, strategy, units, close_time):
+    """
+    Cooldown check karke order queue mein daalo - fill ka result on_order_done callback mein aata hai.
+    Cooldown aur metrics (instrument, granularity) par chalte hain - ek instrument do granularity par alag strategies hain.
+    """
+    key = strategy_key(strategy)
+    if not cooldown.ready(key):
+        logging.info(f"{format_strategy_key(key)}: cooldown chal raha hai ({cooldown.remaining(key):.0f}s baaki), trade skip")
+        return
+    logging.info(f"Signal confirm! Instrument: {strategy.instrument} ({strategy.granularity}), Units: {units}")
+    order_executor.submit(
+        strategy.instrument, units,
+        callback=lambda result: on_order_done(result, engine, cooldown, key, close_time)
+    )
+
+
+def run_streaming(api_client, strategies, engine, order_executor, cooldown):
+    """
+    Stream mode: pricing stream ke ticks se bars yahin bante hain aur bar close hote hi signal check hota hai.
+    REST sirf shuru mein history (seed) ke liye use hota hai, har candle ke liye nahi.
+    """
+    # Pehle REST/candle store se indicators seed karo (custom granularity jaise S1 OANDA par nahi hoti, woh stream se warm up hogi)
+    engine.run_cycle([s for s in strategies if s.granularity in GRANULARITY_SECONDS])
+
+    by_bar = {}
+    for strategy in strategies:
+        by_bar.setdefault((strategy.instrument, strategy.granularity), []).append(strategy)
+    aggregator = BarAggregator(list(by_bar))
+    stream_client = streaming_api_client(OANDA_TOKEN, OANDA_ENV)
+    source = PricingStreamSource(stream_client, OANDA_ACCOUNT_ID, aggregator.instruments)
+    feed = BarFeed(source, aggregator, max_pending_bars=STREAM_MAX_PENDING_BARS, clock=time.time,
+                   close_grace=STREAM_CLOSE_GRACE, record_to=STREAM_RECORD_FILE or None)
+    logging.info(f"Stream mode: {', '.join(f'{i} ({g})' for i, g in by_bar)}")
+
     try:
-        # API se data lene ka request
-        endpoint = InstrumentsCandles(instrument=instrument, params=params)
-        api_client.request(endpoint)
-        response = endpoint.response
-
-        # Data ko saaf-suthre format (DataFrame) mein daalo
-        candles = response.get('candles')
-        prices = [float(c['mid']['c']) for c in candles] # Har candle ka closing price
-        df = pd.DataFrame(prices, columns=['close'])
-
-        # Moving Averages calculate karo
-        df['short_ma'] = df['close'].rolling(window=short_window).mean()
-        df['long_ma'] = df['close'].rolling(window=long_window).mean()
-
-        # Sabse aakhri (latest) do candles ka data dekho
-        latest_short_ma = df['short_ma'].iloc[-1]
-        latest_long_ma = df['long_ma'].iloc[-1]
-        
-        previous_short_ma = df['short_ma'].iloc[-2]
-        previous_long_ma = df['long_ma'].iloc[-2]
-
-        logging.info(f"Latest MAs: Short MA = {latest_short_ma:.5f}, Long MA = {latest_long_ma:.5f}")
-
-        # --- Strategy ka Asli Logic ---
-        
-        # BUY Signal: Agar pichhli candle mein short MA neeche tha, aur ab upar aa gaya hai
-        if previous_short_ma <= previous_long_ma and latest_short_ma > latest_long_ma:
-            logging.info(f"BUY SIGNAL MILA! Short MA ne Long MA ko upar ki taraf cross kiya.")
-            return (instrument, 100)  # 100 units buy karo
-
-        # SELL Signal: Agar pichhli candle mein short MA upar tha, aur ab neeche aa gaya hai
-        elif previous_short_ma >= previous_long_ma and latest_short_ma < latest_long_ma:
-            logging.info(f"SELL SIGNAL MILA! Short MA ne Long MA ko neeche ki taraf cross kiya.")
-            return (instrument, -100) # 100 units sell karo (-100)
-
-        else:
-            logging.info("Koi Crossover nahi hua. Koi Signal Nahi.")
-            return (None, None)
-
-    except Exception as e:
-        logging.error(f"Strategy check karte waqt error aaya: {e}")
-        return (None, None)
+        for bar in feed:
+            started = time.perf_counter()
+            for strategy in by_bar[(bar.instrument, bar.granularity)]:
+                # Partial bar (connect/reconnect ke baad pehla) ka close sahi hai, par OHLC adhoora - store mein mat daalo
+                if strategy.candle_series is not None and not bar.partial:
+                    strategy.candle_series.append_candles([bar.candle])
+                instrument, units = signal_from_candles(strategy, [bar.candle])
+                engine.metrics[strategy_key(strategy)].record((time.perf_counter() - started) * 1000)
+                if instrument and units:
+                    submit_signal(order_executor, engine, cooldown, strategy, units, bar.close_time)
+            logging.info(
+                f"{bar.instrument} {bar.granularity} bar close: signal check close se "
+                f"{(time.time() - bar.close_time) * 1000:.0f} ms baad ({bar.candle['volume']} ticks)"
+            )
+    finally:
+        feed.stop()
+        logging.info(f"Stream metrics: {feed.metrics()}")
+
 
 def main():
     """Yeh main loop hai jo hamesha chalta rahega."""
@@ -140,30 +241,69 @@ def main():
         logging.critical("Error: OANDA_ACCESS_TOKEN ya OANDA_ACCOUNT_ID .env file mein nahi mila. Program band ho raha hai.")
         return
 
-    # OANDA API client taiyaar karo
+    # OANDA API client taiyaar karo - saare instruments isi ek session (connection pool) ko share karte hain
     api_client = API(access_token=OANDA_TOKEN, environment=OANDA_ENV)
+    strategies = [
+        MovingAverageCrossover(instrument=instrument, short_window=20, long_window=50, granularity=granularity)
+        for instrument, granularity in RUNNER_INSTRUMENTS
+    ]
+
+    # Local candle store ho to pehle sirf missing candles top-up karo, phir wahin se seed karo
+    if CANDLE_STORE_DIR:
+        store = CandleStore(CANDLE_STORE_DIR)
+        for strategy in strategies:
+            if strategy.granularity not in GRANULARITY_SECONDS:
+                continue  # Custom (stream-only) granularity ki OANDA history nahi hoti
+            step = granularity_seconds(strategy.granularity)
+            warmup_start = int(time.time()) - step * (strategy.long_window + 10)
+            try:
+                added = store.top_up(api_client, strategy.instrument, strategy.granularity, start=warmup_start)
+                strategy.seed_from_store(store.series(strategy.instrument, strategy.granularity))
+                logging.info(f"{strategy.instrument}: candle store se seed kiya ({added} naye candles download hue)")
+            except Exception as e:
+                logging.error(f"{strategy.instrument}: candle store top-up fail hua, OANDA history se seed hoga: {e}")
+
+    engine = SignalEngine(api_client, strategies, evaluate_signal, max_workers=RUNNER_MAX_WORKERS)
+    # Orders background mein jaate hain (same keep-alive session), signal loop unka wait nahi karta
+    order_executor = OrderExecutor(api_client, OANDA_ACCOUNT_ID, max_workers=ORDER_MAX_WORKERS,
+                                   orders_per_second=ORDER_RATE_LIMIT)
+    logging.info(f"{len(strategies)} instruments watch ho rahe hain: {', '.join(f'{s.instrument} ({s.granularity})' for s in strategies)}")
     
-    last_trade_minute = -5 
+    # Poll mode: har granularity ke candle close ke thodi der baad jaago, fixed 60 second sleep nahi
+    scheduler = None
+    if RUNNER_MODE != "stream":
+        # H4/D candles OANDA ke dailyAlignment par band hote hain (default 17:00 New York), UTC midnight par nahi
+        scheduler = CandleCloseScheduler({s.granularity for s in strategies}, settle_delay=CANDLE_SETTLE_DELAY,
+                                         daily_alignment=OANDA_DAILY_ALIGNMENT,
+                                         alignment_timezone=OANDA_ALIGNMENT_TIMEZONE)
+    cooldown = Cooldown(TRADE_COOLDOWN_SECONDS)  # Har (instrument, granularity) ka apna throttle (monotonic clock)
 
     while True:
         try:
-            current_minute = datetime.now().minute
-            
-            if abs(current_minute - last_trade_minute) > 2:
-                instrument, units = check_for_trade_signal(api_client, OANDA_ACCOUNT_ID)
-                if instrument and units:
-                    logging.info(f"Signal confirm! Instrument: {instrument}, Units: {units}")
-                    
-                    # Trade execute karo, is baar sahi details ke saath
-                    trade_success = execute_trade(api_client, OANDA_ACCOUNT_ID, instrument, units)
-                    
-                    if trade_success:
-                        last_trade_minute = current_minute
+            if scheduler is None:
+                # Stream mode mein bars stream se aate hain; stream ruk jaye to dobara seed karke reconnect
+                run_streaming(api_client, strategies, engine, order_executor, cooldown)
+                continue
+
+            close_time, due_granularities = scheduler.wait_for_next_close()
+            due_strategies = [s for s in strategies if s.granularity in due_granularities]
             
-            time.sleep(60)
+            signals = engine.run_cycle(due_strategies)
+            logging.info(
+                f"Candle close {', '.join(sorted(due_granularities))}: signal cycle {engine.last_cycle_ms:.0f} ms "
+                f"({len(signals)} signals, close se {(time.time() - close_time) * 1000:.0f} ms baad)"
+            )
+
+            # Saare signals ke orders parallel jaate hain, fill ka result callback mein
+            for strategy, units in signals:
+                submit_signal(order_executor, engine, cooldown, strategy, units, close_time)
 
         except KeyboardInterrupt:
             logging.info("--- Runner band kiya jaa raha hai ---")
+            logging.info(f"Instrument metrics: {engine.metrics_snapshot()}")
+            engine.shutdown()
+            order_executor.shutdown()
+            logging.info(f"Order metrics: {order_executor.metrics()}")
             break
         except Exception as e:
             logging.error(f"Main loop mein error: {e}")
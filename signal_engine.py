@@ -0,0 +1,160 @@
+"""
+Concurrent multi-instrument signal engine for the live runner.
+
+Each cycle fans one evaluation per strategy out over a bounded thread pool
+that shares a single oandapyV20.API session. Strategies are keyed by
+(instrument, granularity), so one instrument can be watched on several
+granularities. They are isolated from each other: a failing or slow request
+only affects its own strategy, and per-strategy latency/error metrics are kept
+for every cycle.
+"""
+
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from requests.adapters import HTTPAdapter
+
+
+def strategy_key(strategy):
+    """(instrument, granularity) of a strategy."""
+    return (strategy.instrument, getattr(strategy, 'granularity', None))
+
+
+def format_strategy_key(key):
+    """'EUR_USD:M5' (the RUNNER_INSTRUMENTS notation), or just the instrument without a granularity."""
+    instrument, granularity = key
+    return instrument if granularity is None else f"{instrument}:{granularity}"
+
+
+class InstrumentMetrics:
+    """Rolling latency and error counters for one instrument and granularity."""
+
+    def __init__(self, window=100):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.last_error = None
+        self.last_latency_ms = None
+        self._latencies = deque(maxlen=window)
+        self._order_latencies = deque(maxlen=window)
+
+    def record(self, latency_ms, error=None):
+        self.requests += 1
+        self.last_latency_ms = latency_ms
+        self._latencies.append(latency_ms)
+        if error is not None:
+            self.errors += 1
+            self.last_error = str(error)
+
+    def record_order_latency(self, latency_ms):
+        """Latency from candle close to the order response."""
+        self._order_latencies.append(latency_ms)
+
+    def snapshot(self):
+        latencies = sorted(self._latencies)
+        order_latencies = sorted(self._order_latencies)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'skipped': self.skipped,
+            'last_error': self.last_error,
+            'last_ms': self.last_latency_ms,
+            'avg_ms': sum(latencies) / len(latencies) if latencies else None,
+            'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+            'max_ms': latencies[-1] if latencies else None,
+            'close_to_order_p50_ms': order_latencies[len(order_latencies) // 2] if order_latencies else None,
+            'close_to_order_max_ms': order_latencies[-1] if order_latencies else None
+        }
+
+
+def configure_connection_pool(api_client, pool_size):
+    """Let the shared API session keep `pool_size` keep-alive connections open (never shrinks the pool)."""
+    session = getattr(api_client, 'client', None)
+    if session is None:
+        return
+    current = session.adapters.get('https://')
+    if getattr(current, '_pool_maxsize', 0) >= pool_size:
+        return
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+class SignalEngine:
+    """
+    Evaluates many instrument strategies in parallel.
+
+    `evaluate(api_client, strategy)` must return `(instrument, units)` or
+    `(None, None)` and may raise; exceptions are recorded per strategy in
+    `metrics[(instrument, granularity)]`.
+    """
+
+    def __init__(self, api_client, strategies, evaluate, max_workers=8, cycle_timeout=20.0):
+        self.api_client = api_client
+        self.strategies = list(strategies)
+        self.evaluate = evaluate
+        self.cycle_timeout = cycle_timeout
+        self.max_workers = max(1, min(max_workers, len(self.strategies) or 1))
+        self.metrics = {strategy_key(s): InstrumentMetrics() for s in self.strategies}
+        self.last_cycle_ms = None
+        self._in_flight = {}
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='signal')
+        configure_connection_pool(api_client, self.max_workers)
+
+    def _evaluate_one(self, strategy):
+        started = time.perf_counter()
+        error = None
+        try:
+            return self.evaluate(self.api_client, strategy)
+        except Exception as e:
+            error = e
+            logging.error(f"{format_strategy_key(strategy_key(strategy))}: signal check mein error: {e}")
+            return (None, None)
+        finally:
+            self.metrics[strategy_key(strategy)].record((time.perf_counter() - started) * 1000, error)
+
+    def run_cycle(self, strategies=None):
+        """
+        Run one evaluation per strategy and return the list of (strategy, units) signals.
+        `strategies` limits the cycle to a subset, e.g. those whose candle just closed.
+        """
+        cycle_started = time.perf_counter()
+        futures = {}
+        for strategy in (self.strategies if strategies is None else strategies):
+            key = strategy_key(strategy)
+            previous = self._in_flight.get(key)
+            if previous is not None and not previous.done():
+                # Pichhla request abhi bhi chal raha hai - is strategy ko is cycle mein skip karo
+                self.metrics[key].skipped += 1
+                continue
+            future = self._executor.submit(self._evaluate_one, strategy)
+            self._in_flight[key] = future
+            futures[future] = strategy
+
+        done, not_done = wait(futures, timeout=self.cycle_timeout)
+        for future in not_done:
+            key = strategy_key(futures[future])
+            self.metrics[key].timeouts += 1
+            logging.warning(f"{format_strategy_key(key)}: signal check {self.cycle_timeout}s mein complete nahi hua")
+
+        signals = []
+        for future in done:
+            instrument, units = future.result()
+            if instrument and units:
+                signals.append((futures[future], units))
+
+        self.last_cycle_ms = (time.perf_counter() - cycle_started) * 1000
+        return signals
+
+    def metrics_snapshot(self):
+        return {
+            'cycle_ms': self.last_cycle_ms,
+            'instruments': {format_strategy_key(key): m.snapshot() for key, m in self.metrics.items()}
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
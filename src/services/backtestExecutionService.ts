@@ -73,6 +73,7 @@ export class BacktestExecutionService {
       low: marketData.map((d: any) => parseFloat(d.low)),
       close: marketData.map((d: any) => parseFloat(d.close)),
       volume: marketData.map((d: any) => parseFloat(d.volume || 0)),
+      time: marketData.map((d: any) => d.date),
       reverse_signals: strategy.reverseSignals || false
     };
     
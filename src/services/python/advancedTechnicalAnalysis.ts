@@ -7,6 +7,117 @@ import numpy as np
 import math
 from typing import Dict, List, Any
 
+# Sliding-window kernels shared by the indicator classes below. Each one is O(n)
+# in the series length regardless of the window size (except the mean absolute
+# deviation, see below) and works on float64 arrays; the public methods convert
+# their results back to lists.
+
+def _as_float_array(values):
+    """List/Series/ndarray -> float64 array"""
+    return np.asarray(values, dtype=np.float64)
+
+def _sliding_extreme(values, period, func):
+    """Rolling max (func=np.fmax) or min (np.fmin) over period bars, NaN for the first period-1 bars.
+
+    van Herk/Gil-Werman: prefix and suffix running extremes inside fixed blocks of
+    period bars; every window spans at most two blocks, so each output needs one
+    comparison whatever the period.
+
+    NaN handling is that of the builtin max()/min() over each window slice, which
+    the indicators used before: a window whose first bar is NaN is NaN (nothing
+    compares greater than it), NaN bars later in the window are skipped.
+    """
+    values = _as_float_array(values)
+    n = len(values)
+    result = np.full(n, np.nan)
+    if period < 1 or n < period:
+        return result
+    pad = (-n) % period
+    blocks = np.concatenate((values, np.full(pad, np.nan))).reshape(-1, period)
+    prefix = func.accumulate(blocks, axis=1).ravel()
+    suffix = func.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    result[period - 1:] = func(suffix[:n - period + 1], prefix[period - 1:n])
+    result[period - 1:][np.isnan(values[:n - period + 1])] = np.nan
+    return result
+
+def _window_mean(values, period):
+    """Rolling mean over period bars; NaN until a full window without NaN is available"""
+    return pd.Series(_as_float_array(values)).rolling(window=period, min_periods=period).mean().to_numpy()
+
+def _weighted_window_mean(values, period, block=4096):
+    """Rolling linearly weighted mean (weights 1..period, newest heaviest) in O(n).
+
+    Uses cumulative sums of y and k * y per block of outputs; each block is
+    re-centred on its first value so the sums stay small and precise. Windows
+    containing NaN are NaN.
+    """
+    values = _as_float_array(values)
+    n = len(values)
+    result = np.full(n, np.nan)
+    if period < 1 or n < period:
+        return result
+    nan_mask = np.isnan(values)
+    clean = np.where(nan_mask, 0.0, values)
+    weight_sum = period * (period + 1) / 2
+    step = max(block, 4 * period)
+    for start in range(period - 1, n, step):
+        stop = min(n, start + step)
+        segment = clean[start - period + 1:stop]
+        reference = segment[0]
+        centred = segment - reference
+        positions = np.arange(len(centred), dtype=np.float64)
+        sums = np.concatenate(([0.0], np.cumsum(centred)))
+        weighted = np.concatenate(([0.0], np.cumsum(positions * centred)))
+        ends = np.arange(period - 1, len(centred))
+        starts = ends - period + 1
+        window_sums = (weighted[ends + 1] - weighted[starts]) - (starts - 1) * (sums[ends + 1] - sums[starts])
+        result[start:stop] = window_sums / weight_sum + reference
+    nan_windows = np.convolve(nan_mask.astype(np.int64), np.ones(period, dtype=np.int64))[:n] > 0
+    result[nan_windows] = np.nan
+    return result
+
+def _mean_abs_deviation(values, means, period, chunk_size=1 << 22):
+    """mean(|values[j] - means[i]|) over each window ending at i.
+
+    The deviation is taken from each window's own mean, so it cannot be updated
+    incrementally; it is evaluated on strided window views (no per-bar slices),
+    chunked to bound memory.
+    """
+    n = len(values)
+    result = np.full(n, np.nan)
+    if period < 1 or n < period:
+        return result
+    windows = np.lib.stride_tricks.sliding_window_view(values, period)
+    rows = max(1, chunk_size // period)
+    for start in range(0, len(windows), rows):
+        block = windows[start:start + rows]
+        offset = period - 1 + start
+        centre = means[offset:offset + len(block)]
+        result[offset:offset + len(block)] = np.abs(block - centre[:, None]).sum(axis=1) / period
+    return result
+
+def _recursive_ema(values, alpha):
+    """y[0] = x[0], y[i] = alpha * x[i] + (1 - alpha) * y[i-1]; a NaN propagates to every later value"""
+    values = _as_float_array(values)
+    result = np.full(len(values), np.nan)
+    nan_positions = np.flatnonzero(np.isnan(values))
+    valid_length = nan_positions[0] if len(nan_positions) else len(values)
+    if valid_length:
+        result[:valid_length] = pd.Series(values[:valid_length]).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result
+
+def _true_ranges(high, low, close):
+    """True range for bars 1..n-1, same comparison order as max(tr1, tr2, tr3)"""
+    high = _as_float_array(high)
+    low = _as_float_array(low)
+    close = _as_float_array(close)
+    prev_close = close[:-1]
+    tr = high[1:] - low[1:]
+    tr2 = np.abs(high[1:] - prev_close)
+    tr3 = np.abs(low[1:] - prev_close)
+    tr = np.where(tr2 > tr, tr2, tr)
+    return np.where(tr3 > tr, tr3, tr)
+
 # Include Support & Resistance Detection
 ${SUPPORT_RESISTANCE_PYTHON_CODE}
 
@@ -20,66 +131,41 @@ class AdvancedTechnicalAnalysis:
         if len(high) < 2 or len(low) < 2 or len(close) < 2:
             return [float('nan')] * len(close)
         
-        true_ranges = []
-        
-        for i in range(1, len(close)):
-            tr1 = high[i] - low[i]  # Current high - current low
-            tr2 = abs(high[i] - close[i-1])  # Current high - previous close
-            tr3 = abs(low[i] - close[i-1])   # Current low - previous close
-            true_range = max(tr1, tr2, tr3)
-            true_ranges.append(true_range)
+        # True range from the second bar on (current high/low vs previous close)
+        true_ranges = _true_ranges(high, low, close)
         
         # Calculate ATR using simple moving average of true ranges
-        atr_values = [float('nan')]  # First value is always NaN
+        # (first value is always NaN)
+        atr_values = np.concatenate(([np.nan], _window_mean(true_ranges, period)))
         
-        for i in range(len(true_ranges)):
-            if i < period - 1:
-                atr_values.append(float('nan'))
-            else:
-                atr = sum(true_ranges[i-period+1:i+1]) / period
-                atr_values.append(atr)
-        
-        return atr_values
+        return atr_values.tolist()
     
     @staticmethod
     def williams_r(high: List[float], low: List[float], close: List[float], period: int = 14) -> List[float]:
         """Williams %R"""
-        result = []
+        period_high = _sliding_extreme(high, period, np.fmax)
+        period_low = _sliding_extreme(low, period, np.fmin)
+        close = _as_float_array(close)
         
-        for i in range(len(close)):
-            if i < period - 1:
-                result.append(float('nan'))
-            else:
-                period_high = max(high[i-period+1:i+1])
-                period_low = min(low[i-period+1:i+1])
-                
-                if period_high == period_low:
-                    result.append(-50.0)  # Neutral value when no range
-                else:
-                    wr = ((period_high - close[i]) / (period_high - period_low)) * -100
-                    result.append(wr)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wr = ((period_high - close) / (period_high - period_low)) * -100
+        # Neutral value when no range
+        result = np.where(period_high == period_low, -50.0, wr)
         
-        return result
+        return result.tolist()
     
     @staticmethod
     def stochastic_oscillator(high: List[float], low: List[float], close: List[float], 
                             k_period: int = 14, d_period: int = 3, smooth_k: int = 3) -> Dict[str, List[float]]:
         """Stochastic Oscillator with smoothing"""
         # Calculate raw %K
-        raw_k = []
+        period_high = _sliding_extreme(high, k_period, np.fmax)
+        period_low = _sliding_extreme(low, k_period, np.fmin)
+        close = _as_float_array(close)
         
-        for i in range(len(close)):
-            if i < k_period - 1:
-                raw_k.append(float('nan'))
-            else:
-                period_high = max(high[i-k_period+1:i+1])
-                period_low = min(low[i-k_period+1:i+1])
-                
-                if period_high == period_low:
-                    raw_k.append(50.0)
-                else:
-                    k_val = ((close[i] - period_low) / (period_high - period_low)) * 100
-                    raw_k.append(k_val)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k_val = ((close - period_low) / (period_high - period_low)) * 100
+        raw_k = np.where(period_high == period_low, 50.0, k_val)
         
         # Smooth %K
         k_percent = AdvancedTechnicalAnalysis._smooth_values(raw_k, smooth_k)
@@ -95,32 +181,20 @@ class AdvancedTechnicalAnalysis:
     @staticmethod
     def commodity_channel_index(high: List[float], low: List[float], close: List[float], period: int = 20) -> List[float]:
         """Commodity Channel Index"""
-        result = []
-        
         # Calculate typical price
-        typical_prices = []
-        for i in range(len(close)):
-            tp = (high[i] + low[i] + close[i]) / 3
-            typical_prices.append(tp)
+        typical_prices = (_as_float_array(high) + _as_float_array(low) + _as_float_array(close)) / 3
         
-        for i in range(len(typical_prices)):
-            if i < period - 1:
-                result.append(float('nan'))
-            else:
-                # Simple Moving Average of typical price
-                sma_tp = sum(typical_prices[i-period+1:i+1]) / period
-                
-                # Mean Deviation
-                deviations = [abs(tp - sma_tp) for tp in typical_prices[i-period+1:i+1]]
-                mean_deviation = sum(deviations) / period
-                
-                if mean_deviation == 0:
-                    result.append(0)
-                else:
-                    cci = (typical_prices[i] - sma_tp) / (0.015 * mean_deviation)
-                    result.append(cci)
+        # Simple Moving Average of typical price
+        sma_tp = _window_mean(typical_prices, period)
         
-        return result
+        # Mean Deviation
+        mean_deviation = _mean_abs_deviation(typical_prices, sma_tp, period)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cci = (typical_prices - sma_tp) / (0.015 * mean_deviation)
+        result = np.where(mean_deviation == 0, 0.0, cci)
+        
+        return result.tolist()
     
     @staticmethod
     def vwap(high: List[float], low: List[float], close: List[float], volume: List[float]) -> List[float]:
@@ -163,62 +237,43 @@ class AdvancedTechnicalAnalysis:
     @staticmethod
     def adx(high: List[float], low: List[float], close: List[float], period: int = 14) -> Dict[str, List[float]]:
         """Average Directional Index"""
-        atr_values = AdvancedTechnicalAnalysis.atr(high, low, close, period)
+        high = _as_float_array(high)
+        low = _as_float_array(low)
+        atr_values = _as_float_array(AdvancedTechnicalAnalysis.atr(high, low, close, period))[1:]
         
-        plus_di = []
-        minus_di = []
-        adx_values = []
+        # Directional movement from the second bar on
+        up_move = high[1:] - high[:-1]
+        down_move = low[:-1] - low[1:]
         
-        for i in range(1, len(close)):
-            up_move = high[i] - high[i-1] if i > 0 else 0
-            down_move = low[i-1] - low[i] if i > 0 else 0
-            
-            plus_dm = up_move if up_move > down_move and up_move > 0 else 0
-            minus_dm = down_move if down_move > up_move and down_move > 0 else 0
-            
-            if i < period:
-                plus_di.append(float('nan'))
-                minus_di.append(float('nan'))
-                adx_values.append(float('nan'))
-            else:
-                plus_di_val = (plus_dm / atr_values[i]) * 100 if atr_values[i] > 0 else 0
-                minus_di_val = (minus_dm / atr_values[i]) * 100 if atr_values[i] > 0 else 0
-                
-                plus_di.append(plus_di_val)
-                minus_di.append(minus_di_val)
-                
-                dx = abs(plus_di_val - minus_di_val) / (plus_di_val + minus_di_val) * 100 if (plus_di_val + minus_di_val) > 0 else 0
-                adx_values.append(dx)
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+        
+        has_range = atr_values > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            plus_di = np.where(has_range, (plus_dm / atr_values) * 100, 0.0)
+            minus_di = np.where(has_range, (minus_dm / atr_values) * 100, 0.0)
+            di_sum = plus_di + minus_di
+            adx_values = np.where(di_sum > 0, np.abs(plus_di - minus_di) / di_sum * 100, 0.0)
+        
+        warmup = np.arange(1, len(plus_di) + 1) < period
+        for values in (plus_di, minus_di, adx_values):
+            values[warmup] = np.nan
         
         # Pad to match original length
-        plus_di = [float('nan')] + plus_di
-        minus_di = [float('nan')] + minus_di
-        adx_values = [float('nan')] + adx_values
+        plus_di = [float('nan')] + plus_di.tolist()
+        minus_di = [float('nan')] + minus_di.tolist()
+        adx_values = [float('nan')] + adx_values.tolist()
         
         return {'adx': adx_values, 'plus_di': plus_di, 'minus_di': minus_di}
     
     @staticmethod
     def donchian_channels(high: List[float], low: List[float], period: int = 20) -> Dict[str, List[float]]:
         """Donchian Channels"""
-        upper = []
-        lower = []
-        middle = []
-        
-        for i in range(len(high)):
-            if i < period - 1:
-                upper.append(float('nan'))
-                lower.append(float('nan'))
-                middle.append(float('nan'))
-            else:
-                period_high = max(high[i-period+1:i+1])
-                period_low = min(low[i-period+1:i+1])
-                period_middle = (period_high + period_low) / 2
-                
-                upper.append(period_high)
-                lower.append(period_low)
-                middle.append(period_middle)
+        period_high = _sliding_extreme(high, period, np.fmax)
+        period_low = _sliding_extreme(low, period, np.fmin)
+        period_middle = (period_high + period_low) / 2
         
-        return {'upper': upper, 'lower': lower, 'middle': middle}
+        return {'upper': period_high.tolist(), 'lower': period_low.tolist(), 'middle': period_middle.tolist()}
     
     @staticmethod
     def keltner_channels(high: List[float], low: List[float], close: List[float], period: int = 20, multiplier: float = 2.0) -> Dict[str, List[float]]:
@@ -257,26 +312,22 @@ class AdvancedTechnicalAnalysis:
     @staticmethod
     def tema(close: List[float], period: int) -> List[float]:
         """Triple Exponential Moving Average"""
-        ema1 = TechnicalAnalysis.ema(close, period)
-        ema2 = TechnicalAnalysis.ema([x for x in ema1 if not math.isnan(x)], period)
+        alpha = 2 / (period + 1)
+        ema1 = _recursive_ema(close, alpha)
+        ema2 = _recursive_ema(ema1[~np.isnan(ema1)], alpha)
         
         # Pad ema2 to match ema1 length
-        ema2_padded = [float('nan')] * (len(ema1) - len(ema2)) + ema2
+        ema2_padded = np.concatenate((np.full(len(ema1) - len(ema2), np.nan), ema2))
         
-        ema3 = TechnicalAnalysis.ema([x for x in ema2_padded if not math.isnan(x)], period)
+        ema3 = _recursive_ema(ema2_padded[~np.isnan(ema2_padded)], alpha)
         
         # Pad ema3 to match original length
-        ema3_padded = [float('nan')] * (len(ema1) - len(ema3)) + ema3
+        ema3_padded = np.concatenate((np.full(len(ema1) - len(ema3), np.nan), ema3))
         
-        tema_values = []
-        for i in range(len(ema1)):
-            if math.isnan(ema1[i]) or math.isnan(ema2_padded[i]) or math.isnan(ema3_padded[i]):
-                tema_values.append(float('nan'))
-            else:
-                tema = 3 * ema1[i] - 3 * ema2_padded[i] + ema3_padded[i]
-                tema_values.append(tema)
+        # NaN in any component propagates
+        tema_values = 3 * ema1 - 3 * ema2_padded + ema3_padded
         
-        return tema_values
+        return tema_values.tolist()
     
     @staticmethod
     def hull_ma(close: List[float], period: int) -> List[float]:
@@ -284,29 +335,31 @@ class AdvancedTechnicalAnalysis:
         half_period = int(period / 2)
         sqrt_period = int(math.sqrt(period))
         
-        wma_half = TechnicalAnalysis.wma(close, half_period)
-        wma_full = TechnicalAnalysis.wma(close, period)
+        wma_half = _weighted_window_mean(close, half_period)
+        wma_full = _weighted_window_mean(close, period)
         
         # Calculate 2 * WMA(n/2) - WMA(n)
-        raw_hull = []
-        for i in range(len(close)):
-            if math.isnan(wma_half[i]) or math.isnan(wma_full[i]):
-                raw_hull.append(float('nan'))
-            else:
-                raw_hull.append(2 * wma_half[i] - wma_full[i])
+        raw_hull = 2 * wma_half - wma_full
         
         # Apply WMA with sqrt(period) to the result
-        hull_ma = TechnicalAnalysis.wma([x for x in raw_hull if not math.isnan(x)], sqrt_period)
+        hull_ma = _weighted_window_mean(raw_hull[~np.isnan(raw_hull)], sqrt_period)
         
         # Pad to match original length
-        hull_ma_padded = [float('nan')] * (len(raw_hull) - len(hull_ma)) + hull_ma
+        hull_ma_padded = np.concatenate((np.full(len(raw_hull) - len(hull_ma), np.nan), hull_ma))
         
-        return hull_ma_padded
+        return hull_ma_padded.tolist()
     
     @staticmethod
     def supertrend(high: List[float], low: List[float], close: List[float], period: int = 10, multiplier: float = 3.0) -> Dict[str, List[float]]:
         """SuperTrend Indicator"""
-        atr_values = AdvancedTechnicalAnalysis.atr(high, low, close, period)
+        atr_values = _as_float_array(AdvancedTechnicalAnalysis.atr(high, low, close, period))
+        
+        # Basic bands are computed for all bars at once; only the band ratchet is sequential
+        hl2 = (_as_float_array(high) + _as_float_array(low)) / 2
+        basic_upper_values = (hl2 + (multiplier * atr_values)).tolist()
+        basic_lower_values = (hl2 - (multiplier * atr_values)).tolist()
+        atr_missing = np.isnan(atr_values).tolist()
+        close = _as_float_array(close).tolist()
         
         basic_upper = []
         basic_lower = []
@@ -316,7 +369,7 @@ class AdvancedTechnicalAnalysis:
         trend = []
         
         for i in range(len(close)):
-            if math.isnan(atr_values[i]):
+            if atr_missing[i]:
                 basic_upper.append(float('nan'))
                 basic_lower.append(float('nan'))
                 final_upper.append(float('nan'))
@@ -324,10 +377,8 @@ class AdvancedTechnicalAnalysis:
                 supertrend.append(float('nan'))
                 trend.append(1)
             else:
-                hl2 = (high[i] + low[i]) / 2
-                
-                basic_ub = hl2 + (multiplier * atr_values[i])
-                basic_lb = hl2 - (multiplier * atr_values[i])
+                basic_ub = basic_upper_values[i]
+                basic_lb = basic_lower_values[i]
                 
                 basic_upper.append(basic_ub)
                 basic_lower.append(basic_lb)
@@ -373,53 +424,32 @@ class AdvancedTechnicalAnalysis:
     
     @staticmethod
     def _smooth_values(values: List[float], period: int) -> List[float]:
-        """Helper method to smooth values with SMA"""
-        result = []
-        valid_values = []
-        
-        for i, val in enumerate(values):
-            if not math.isnan(val):
-                valid_values.append(val)
-            
-            if i < period - 1 or len(valid_values) < period:
-                result.append(float('nan'))
-            else:
-                smooth_val = sum(valid_values[-period:]) / period
-                result.append(smooth_val)
-        
-        return result
+        """Helper method to smooth values with SMA of the last period non-NaN values"""
+        values = _as_float_array(values)
+        valid = ~np.isnan(values)
+        valid_means = _window_mean(values[valid], period)
+        
+        # Number of valid values seen up to each bar selects the matching window
+        valid_counts = np.cumsum(valid)
+        ready = (np.arange(len(values)) >= period - 1) & (valid_counts >= period)
+        result = np.full(len(values), np.nan)
+        result[ready] = valid_means[valid_counts[ready] - 1]
+        
+        return result.tolist()
 
 # Additional helper for Hull MA
 class TechnicalAnalysis:
     @staticmethod
     def wma(data: List[float], period: int) -> List[float]:
         """Weighted Moving Average"""
-        result = []
-        weights = list(range(1, period + 1))
-        weight_sum = sum(weights)
-        
-        for i in range(len(data)):
-            if i < period - 1:
-                result.append(float('nan'))
-            else:
-                weighted_sum = sum(data[i-period+1+j] * weights[j] for j in range(period))
-                wma_val = weighted_sum / weight_sum
-                result.append(wma_val)
-        
-        return result
+        return _weighted_window_mean(data, period).tolist()
     
     @staticmethod
     def ema(data: List[float], period: int) -> List[float]:
         """Exponential Moving Average"""
-        if not data:
+        if len(data) == 0:
             return []
         
-        result = [data[0]]
         multiplier = 2 / (period + 1)
-        
-        for i in range(1, len(data)):
-            ema_val = (data[i] * multiplier) + (result[i-1] * (1 - multiplier))
-            result.append(ema_val)
-        
-        return result
+        return _recursive_ema(data, multiplier).tolist()
 `;
@@ -0,0 +1,183 @@
+
+export const BATCH_EXECUTION_PYTHON_CODE = `
+# Batch evaluation: several strategies (normal and reversed) over one dataset.
+# The market data is converted once and its read-only columns are shared by every
+# run (each run gets its own DataFrame over them, so columns a strategy adds stay
+# out of the next strategy's data), indicator inputs are
+# fingerprinted once (INDICATOR_CACHE.pinned_inputs) so common indicator calls
+# across strategies are computed once, and a reversed result is derived from the
+# forward run whenever the strategy cannot see reverse_signals.
+
+BATCH_MODES = ('normal', 'reversed')
+
+def reversal_derivable(compiled):
+    """True when reversing cannot change what the strategy computes.
+
+    A strategy_logic without a reverse_signals parameter (or module-level signals)
+    never sees the flag, so its reversed result is the forward result with BUY and
+    SELL swapped. Strategies that take reverse_signals (or are called through the
+    positional fallback) may change their logic and are run again.
+    """
+    return compiled.strategy_func is None or compiled.call_mode == CALL_WITH_DATA_ONLY
+
+def reverse_processed_result(processed):
+    """Reversed copy of a processed (dict format) forward result; indicator lists are shared"""
+    swap = {'BUY': 'SELL', 'SELL': 'BUY'}
+    reversed_result = dict(processed)
+    reversed_result['direction'] = [swap.get(d, d) for d in processed.get('direction', [])]
+    reversed_result['reverse_signals_applied'] = True
+    stats = processed.get('signal_stats')
+    if stats is not None:
+        reversed_result['signal_stats'] = dict(stats, buy_signals=stats.get('sell_signals', 0),
+                                               sell_signals=stats.get('buy_signals', 0))
+    return reversed_result
+
+def _process_batch_result(result, reverse_signals, data_length):
+    if isinstance(result, dict) and result.get('error'):
+        return result
+    return ensure_signal_arrays(process_strategy_signals(result, reverse_signals), data_length)
+
+def run_strategy_modes(strategy_code, columns, modes=BATCH_MODES, strategy_params=None):
+    """Processed results of one strategy for each mode ('normal' / 'reversed').
+
+    columns maps column name -> array; every run gets a fresh DataFrame over them
+    (no copy), so a strategy that adds or replaces columns only changes its own
+    frame. Returns (results, runs): results maps mode -> processed result, runs maps
+    mode -> {'seconds', 'derived', 'indicator_hits', 'indicator_misses'}. When both
+    modes are requested and reversal_derivable() holds, the strategy runs once.
+    """
+    unknown = [mode for mode in modes if mode not in BATCH_MODES]
+    if unknown:
+        raise ValueError(f"Unknown batch modes: {unknown} (expected {BATCH_MODES})")
+    data_length = len(columns['Close'])
+    results = {}
+    runs = {}
+    forward = None
+    for mode in modes:
+        reverse_signals = mode == 'reversed'
+        hits, misses = INDICATOR_CACHE.hits, INDICATOR_CACHE.misses
+        started = time.perf_counter()
+        derived = False
+        try:
+            compiled = STRATEGY_REGISTRY.get(strategy_code)
+            if reverse_signals and forward is not None and reversal_derivable(compiled):
+                derived = True
+                processed = forward if forward.get('error') else reverse_processed_result(forward)
+            else:
+                raw = compiled.run(pd.DataFrame(columns, copy=False), reverse_signals, strategy_params)
+                processed = _process_batch_result(raw, reverse_signals, data_length)
+                if not reverse_signals:
+                    forward = processed
+        except Exception as e:
+            print(f"❌ Strategy execution error: {str(e)}")
+            processed = {'entry': [], 'exit': [], 'direction': [], 'error': f"Strategy execution failed: {str(e)}"}
+        results[mode] = processed
+        runs[mode] = {
+            'seconds': time.perf_counter() - started,
+            'derived': derived,
+            'indicator_hits': INDICATOR_CACHE.hits - hits,
+            'indicator_misses': INDICATOR_CACHE.misses - misses
+        }
+    return results, runs
+
+def batch_strategy_entries(strategies):
+    """Normalize strategies given as {name: code}, [code, ...] or [{'name', 'code', 'params'}, ...]"""
+    if isinstance(strategies, dict):
+        strategies = [{'name': name, 'code': code} for name, code in strategies.items()]
+    entries = []
+    for index, entry in enumerate(strategies):
+        if isinstance(entry, str):
+            entry = {'code': entry}
+        else:
+            entry = dict(entry)
+        entry.setdefault('name', f"strategy_{index + 1}")
+        entry.setdefault('params', None)
+        entries.append(entry)
+    names = [entry['name'] for entry in entries]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Strategy names must be unique: {names}")
+    return entries
+
+def comparison_row(name, mode, processed, run):
+    """One row of the batch comparison table"""
+    stats = processed.get('signal_stats', {}) if isinstance(processed, dict) else {}
+    return {
+        'strategy': name,
+        'mode': mode,
+        'total_entries': stats.get('total_entries', 0),
+        'buy_signals': stats.get('buy_signals', 0),
+        'sell_signals': stats.get('sell_signals', 0),
+        'derived': run['derived'],
+        'seconds': run['seconds'],
+        'indicator_hits': run['indicator_hits'],
+        'indicator_misses': run['indicator_misses'],
+        'error': processed.get('error') if isinstance(processed, dict) else 'Invalid strategy result format'
+    }
+
+def execute_strategy_batch(market_data_dict: Dict[str, List[float]], strategies, modes=BATCH_MODES) -> Dict[str, Any]:
+    """Execute several strategies on one dataset and compare them.
+
+    strategies is {name: code}, a list of sources or a list of {'name', 'code', 'params'}
+    dicts. The reverse_signals flag of market_data_dict is ignored: every strategy is
+    evaluated in each of modes. Returns {'results': {name: {mode: processed}},
+    'comparison': [row, ...], 'bars': n, 'perf': {...}}; results are in the dict
+    format of execute_strategy. verbose is read from market_data_dict as there.
+    """
+    verbose = bool(extract_market_data_option(market_data_dict, 'verbose', True))
+    with output_context(verbose):
+        return _execute_strategy_batch(market_data_dict, strategies, tuple(modes))
+
+def _execute_strategy_batch(market_data_dict, strategies, modes):
+    started = time.perf_counter()
+    entries = batch_strategy_entries(strategies)
+    print(f"🐍 Starting batch execution: {len(entries)} strategies, modes {list(modes)}")
+
+    # Convert once; every strategy sees the same read-only column views
+    data_dict = {name: values.view() for name, values in validate_and_convert_market_data(market_data_dict).items()}
+    bar_times = extract_bar_times(market_data_dict, len(data_dict['Close']))
+    if bar_times is not None:
+        data_dict['Time'] = bar_times
+    for values in data_dict.values():
+        values.flags.writeable = False
+    bars = len(data_dict['Close'])
+    convert_seconds = time.perf_counter() - started
+    print(f"📈 Data converted once: {bars} bars")
+
+    results = {}
+    comparison = []
+    cache_hits, cache_misses = INDICATOR_CACHE.hits, INDICATOR_CACHE.misses
+    strategy_runs = 0
+    with INDICATOR_CACHE.pinned_inputs(data_dict.values()):
+        for entry in entries:
+            if bars == 0:
+                mode_results = {mode: {'entry': [], 'exit': [], 'direction': [], 'error': 'No price data available'}
+                                for mode in modes}
+                mode_runs = {mode: {'seconds': 0.0, 'derived': False, 'indicator_hits': 0, 'indicator_misses': 0}
+                             for mode in modes}
+            else:
+                mode_results, mode_runs = run_strategy_modes(entry['code'], data_dict, modes, entry['params'])
+            results[entry['name']] = mode_results
+            for mode in modes:
+                row = comparison_row(entry['name'], mode, mode_results[mode], mode_runs[mode])
+                comparison.append(row)
+                strategy_runs += 0 if row['derived'] or bars == 0 else 1
+                print(f"📊 {entry['name']} ({mode}{', derived' if row['derived'] else ''}): "
+                      f"Entry={row['total_entries']}, BUY={row['buy_signals']}, SELL={row['sell_signals']}"
+                      + (f" ❌ {row['error']}" if row['error'] else ''))
+
+    wall_seconds = time.perf_counter() - started
+    print(f"✅ Batch completed: {strategy_runs} strategy runs for {len(comparison)} results in {wall_seconds * 1000:.1f} ms")
+    return {
+        'results': results,
+        'comparison': comparison,
+        'bars': bars,
+        'perf': {
+            'wall_seconds': wall_seconds,
+            'convert_seconds': convert_seconds,
+            'strategy_runs': strategy_runs,
+            'derived_results': sum(1 for row in comparison if row['derived']),
+            'indicator_hits': INDICATOR_CACHE.hits - cache_hits,
+            'indicator_misses': INDICATOR_CACHE.misses - cache_misses
+        }
+    }
+`;
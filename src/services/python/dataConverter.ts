@@ -2,17 +2,40 @@
 import type { MarketData } from './types';
 
 export class DataConverter {
+  // Contiguous float64 column; Python reads it as one buffer instead of value by value
+  private static toFloat64Column(values: ArrayLike<number> | undefined): Float64Array {
+    if (values instanceof Float64Array) {
+      return values;
+    }
+    return Float64Array.from(values ?? [], x => Number(x));
+  }
+
+  // Bar times as epoch seconds; date strings without a zone are read as UTC
+  private static toEpochSeconds(values: ArrayLike<number | string>): Float64Array {
+    return Float64Array.from(values as ArrayLike<number | string>, x => {
+      if (typeof x === 'number') {
+        return x > 1e11 ? x / 1000 : x;
+      }
+      const text = String(x).trim().replace(' ', 'T');
+      const zoned = /(Z|[+-]\d{2}:?\d{2})$/.test(text) || !text.includes('T');
+      return Date.parse(zoned ? text : `${text}Z`) / 1000;
+    });
+  }
+
   static convertMarketData(marketData: MarketData): any {
     console.log('📊 Converting market data for Python execution...');
     
-    // Convert market data to plain JavaScript object with proper data conversion
+    // Convert market data to typed array columns (NaN marks missing values)
     const plainMarketData = {
-      open: Array.from(marketData.open).map(x => Number(x)),
-      high: Array.from(marketData.high).map(x => Number(x)),
-      low: Array.from(marketData.low).map(x => Number(x)),
-      close: Array.from(marketData.close).map(x => Number(x)),
-      volume: Array.from(marketData.volume).map(x => Number(x))
-    };
+      open: DataConverter.toFloat64Column(marketData.open),
+      high: DataConverter.toFloat64Column(marketData.high),
+      low: DataConverter.toFloat64Column(marketData.low),
+      close: DataConverter.toFloat64Column(marketData.close),
+      volume: DataConverter.toFloat64Column(marketData.volume)
+    } as Record<string, any>;
+    if (marketData.time && marketData.time.length) {
+      plainMarketData.time = DataConverter.toEpochSeconds(marketData.time);
+    }
     
     console.log('📈 Market data converted:', {
       dataPoints: plainMarketData.close.length,
@@ -28,8 +51,7 @@ export class DataConverter {
       return { isValid: false, error: 'Invalid market data: no close prices available' };
     }
 
-    const closeArray = Array.from(marketData.close);
-    if (closeArray.some(isNaN)) {
+    if (Array.prototype.some.call(marketData.close, (x: number) => isNaN(x))) {
       return { isValid: false, error: 'Invalid market data: NaN values detected in close prices' };
     }
 
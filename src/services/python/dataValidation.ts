@@ -1,7 +1,51 @@
 
 export const DATA_VALIDATION_PYTHON_CODE = `
+def _column_to_float_array(raw_data):
+    """Turn one OHLCV column into a float64 array, copying only when unavoidable.
+
+    - JS typed arrays (JsProxy buffers) are read through a single bulk buffer copy
+      into Python memory and then used in place
+    - NumPy arrays / memoryviews / pandas Series are copied once in a single bulk pass:
+      the caller still holds them, and strategies may write to their DataFrame
+    - plain lists are converted in one vectorized pass (None becomes NaN)
+    """
+    owned = False
+    if hasattr(raw_data, 'to_memoryview'):
+        # JsBuffer (Float64Array, ...) - no per-element conversion
+        raw_data = raw_data.to_memoryview()
+        owned = True
+    elif hasattr(raw_data, 'to_py'):
+        raw_data = raw_data.to_py()
+        owned = True
+    
+    if isinstance(raw_data, pd.Series):
+        raw_data = raw_data.to_numpy()
+    if isinstance(raw_data, (np.ndarray, memoryview)):
+        return np.asarray(raw_data).astype(np.float64, copy=not owned).reshape(-1)
+    
+    if not hasattr(raw_data, '__iter__') or isinstance(raw_data, str):
+        return np.empty(0, dtype=np.float64)
+    if not isinstance(raw_data, (list, tuple)):
+        raw_data = list(raw_data)
+    try:
+        return np.array(raw_data, dtype=np.float64)
+    except (ValueError, TypeError):
+        # Mixed content (e.g. strings) - convert value by value, invalid entries become NaN
+        converted_data = np.empty(len(raw_data), dtype=np.float64)
+        for i, val in enumerate(raw_data):
+            try:
+                converted_data[i] = float('nan') if val is None else float(val)
+            except (ValueError, TypeError):
+                converted_data[i] = np.nan
+        return converted_data
+
 def validate_and_convert_market_data(market_data_dict):
-    """Convert and validate market data from JavaScript to Python with improved JsProxy handling"""
+    """Convert and validate market data from JavaScript to Python with improved JsProxy handling
+
+    Returns {'Open': ..., 'Close': ...} as contiguous float64 NumPy arrays owned by the
+    executor. Typed-array buffers are not copied again after the bulk transfer, so
+    pd.DataFrame(data_dict, copy=False) hands strategies a frame backed by them.
+    """
     data_dict = {}
     
     # Handle different types of JavaScript objects properly
@@ -12,7 +56,9 @@ def validate_and_convert_market_data(market_data_dict):
             # Try multiple access methods for different JS object types
             if hasattr(market_data_dict, 'get'):
                 # Dictionary-like object
-                raw_data = market_data_dict.get(key, [])
+                raw_data = market_data_dict.get(key)
+                if raw_data is None:
+                    raw_data = market_data_dict.get(key.capitalize(), [])
             elif hasattr(market_data_dict, '__getitem__'):
                 # Array-like or object with bracket notation
                 try:
@@ -23,49 +69,78 @@ def validate_and_convert_market_data(market_data_dict):
                 # Try attribute access
                 raw_data = getattr(market_data_dict, key, [])
             
-            # Convert JsProxy to Python
-            if hasattr(raw_data, 'to_py'):
-                raw_data = raw_data.to_py()
-            elif hasattr(raw_data, '__iter__') and not isinstance(raw_data, str):
-                # Convert iterable to list
-                try:
-                    raw_data = list(raw_data)
-                except:
-                    raw_data = []
-            
-            # Ensure all values are properly converted to float
-            converted_data = []
-            for val in raw_data:
-                try:
-                    if val is None or (hasattr(val, '__class__') and 'nan' in str(val.__class__)):
-                        converted_data.append(float('nan'))
-                    else:
-                        converted_data.append(float(val))
-                except (ValueError, TypeError):
-                    converted_data.append(float('nan'))
-            
-            data_dict[key.capitalize()] = converted_data
+            data_dict[key.capitalize()] = _column_to_float_array(raw_data)
             
         except Exception as e:
             print(f"Warning: Error processing {key}: {e}")
-            data_dict[key.capitalize()] = []
+            data_dict[key.capitalize()] = np.empty(0, dtype=np.float64)
     
     # Ensure all data arrays have the same length
-    if data_dict.get('Close'):
-        data_length = len(data_dict['Close'])
+    data_length = len(data_dict.get('Close', []))
+    if data_length:
         for key in data_dict:
             current_length = len(data_dict[key])
-            if current_length != data_length:
-                if current_length < data_length:
-                    # Pad with NaN
-                    data_dict[key].extend([float('nan')] * (data_length - current_length))
-                else:
-                    # Truncate
-                    data_dict[key] = data_dict[key][:data_length]
+            if current_length < data_length:
+                # Pad with NaN
+                data_dict[key] = np.concatenate((data_dict[key], np.full(data_length - current_length, np.nan)))
+            elif current_length > data_length:
+                # Truncate (a view, no copy)
+                data_dict[key] = data_dict[key][:data_length]
+        
+        # Vectorized NaN check per column
+        for key, values in data_dict.items():
+            nan_count = int(np.count_nonzero(np.isnan(values)))
+            if nan_count:
+                print(f"⚠️ {key}: {nan_count} missing/invalid values (NaN)")
     
-    print(f"✅ Converted market data: {len(data_dict.get('Close', []))} data points")
+    print(f"✅ Converted market data: {data_length} data points")
     return data_dict
 
+def extract_market_data_option(market_data_dict, name, default=None):
+    """Read an optional setting (e.g. result_format) passed alongside the market data"""
+    try:
+        if hasattr(market_data_dict, 'get'):
+            value = market_data_dict.get(name, default)
+        elif hasattr(market_data_dict, '__getitem__'):
+            try:
+                value = market_data_dict[name]
+            except (KeyError, TypeError):
+                value = default
+        else:
+            value = getattr(market_data_dict, name, default)
+        
+        if hasattr(value, 'to_py'):
+            value = value.to_py()
+        return default if value is None else value
+    except Exception as e:
+        print(f"Warning: Could not extract {name}: {e}")
+        return default
+
+def extract_bar_times(market_data_dict, data_length):
+    """Optional bar open times passed as 'time' (epoch seconds or milliseconds, or date strings).
+
+    Returns float64 epoch seconds, or None when no times were passed or they do not
+    line up with the bars (other length, missing or not strictly increasing values).
+    """
+    raw_times = extract_market_data_option(market_data_dict, 'time')
+    if raw_times is None or data_length == 0:
+        return None
+    try:
+        if not isinstance(raw_times, (np.ndarray, memoryview)) and len(raw_times) and isinstance(raw_times[0], str):
+            parsed = pd.to_datetime(pd.Series(list(raw_times)), utc=True, format='mixed')
+            times = parsed.dt.tz_convert(None).to_numpy('datetime64[ns]').astype(np.int64) / 1e9
+        else:
+            times = _column_to_float_array(raw_times)
+            if len(times) and np.nanmax(times) > 1e11:
+                times = times / 1000.0  # milliseconds
+    except Exception as e:
+        print(f"Warning: Could not parse bar times: {e}")
+        return None
+    if len(times) != data_length or np.isnan(times).any() or np.any(np.diff(times) <= 0):
+        print(f"Warning: Ignoring bar times ({len(times)} values, {data_length} bars, must be strictly increasing)")
+        return None
+    return times
+
 def extract_reverse_signals_flag(market_data_dict):
     """Extract reverse_signals flag from market data with enhanced error handling"""
     try:
@@ -1,11 +1,16 @@
 
 import { PyodideLoader } from './pyodideLoader';
-import type { PyodideInstance } from './types';
+import type { PyodideInstance, ExecutionOptions, BatchMode, BatchStrategyEntry, StrategyBatchResult } from './types';
 import { DataConverter } from './dataConverter';
 import { ResultProcessor } from './resultProcessor';
 
 export class ExecutionManager {
-  static async executePythonStrategy(pyodide: PyodideInstance, marketData: any, strategyCode: string): Promise<any> {
+  static async executePythonStrategy(
+    pyodide: PyodideInstance,
+    marketData: any,
+    strategyCode: string,
+    options: ExecutionOptions = {}
+  ): Promise<any> {
     try {
       console.log('🚀 Executing Python strategy...');
       
@@ -17,6 +22,21 @@ export class ExecutionManager {
         throw new Error(validation.error);
       }
 
+      // Packed formats return typed buffers instead of per-bar Python lists
+      if (options.resultFormat && options.resultFormat !== 'dict') {
+        plainMarketData.result_format = options.resultFormat;
+        plainMarketData.indicator_dtype = options.indicatorDtype || 'float64';
+      }
+      if (options.verbose !== undefined) {
+        plainMarketData.verbose = options.verbose;
+      }
+      if (options.profile !== undefined) {
+        plainMarketData.profile = options.profile;
+      }
+      if (options.profileMemory !== undefined) {
+        plainMarketData.profile_memory = options.profileMemory;
+      }
+
       // Set the data and code in Python using proper conversion
       console.log('📤 Setting data in Python environment...');
       pyodide.globals.set('js_market_data', plainMarketData);
@@ -24,20 +44,7 @@ export class ExecutionManager {
       console.log('✅ Data set in Python environment');
       
       // Check if execute_strategy function is available and re-initialize if needed
-      const checkResult = pyodide.runPython(`
-try:
-    if 'execute_strategy' in globals():
-        print("✅ execute_strategy function found")
-        result = True
-    else:
-        print("❌ execute_strategy function not found in globals")
-        print(f"Available globals: {list(globals().keys())}")
-        result = False
-    result
-except Exception as e:
-    print(f"❌ Error checking execute_strategy: {e}")
-    False
-      `);
+      const checkResult = PyodideLoader.hasExecuteStrategy(pyodide);
       
       if (!checkResult) {
         console.warn('🔄 execute_strategy function not found, reinitializing Python environment...');
@@ -74,13 +81,16 @@ try:
     else:
         result = raw_result
         print(f"📊 Python: Valid result keys: {list(result.keys())}")
-        if 'entry' in result and result['entry']:
-            entry_count = sum(1 for x in result['entry'] if x) if result['entry'] else 0
-            print(f"📈 Python: Entry signals: {entry_count}")
-        if 'direction' in result and result['direction']:
-            buy_count = sum(1 for d in result['direction'] if d == 'BUY') if result['direction'] else 0
-            sell_count = sum(1 for d in result['direction'] if d == 'SELL') if result['direction'] else 0
-            print(f"📊 Python: BUY signals: {buy_count}, SELL signals: {sell_count}")
+        if result.get('format') == 'packed':
+            print(f"📈 Python: Packed result, signal stats: {result.get('signal_stats')}")
+        else:
+            if 'entry' in result and result['entry']:
+                entry_count = sum(1 for x in result['entry'] if x) if result['entry'] else 0
+                print(f"📈 Python: Entry signals: {entry_count}")
+            if 'direction' in result and result['direction']:
+                buy_count = sum(1 for d in result['direction'] if d == 'BUY') if result['direction'] else 0
+                sell_count = sum(1 for d in result['direction'] if d == 'SELL') if result['direction'] else 0
+                print(f"📊 Python: BUY signals: {buy_count}, SELL signals: {sell_count}")
     
     print(f"📊 Python: Final result type: {type(result)}")
     result
@@ -106,4 +116,54 @@ except Exception as e:
       throw error;
     }
   }
+
+  static async executePythonStrategyBatch(
+    pyodide: PyodideInstance,
+    marketData: any,
+    strategies: BatchStrategyEntry[],
+    modes: BatchMode[] = ['normal', 'reversed'],
+    options: Pick<ExecutionOptions, 'verbose'> = {}
+  ): Promise<StrategyBatchResult> {
+    try {
+      console.log(`🚀 Executing Python strategy batch (${strategies.length} strategies)...`);
+
+      const plainMarketData = DataConverter.convertMarketData(marketData);
+      const validation = DataConverter.validateMarketData(marketData);
+
+      if (!validation.isValid) {
+        throw new Error(validation.error);
+      }
+      if (options.verbose !== undefined) {
+        plainMarketData.verbose = options.verbose;
+      }
+
+      pyodide.globals.set('js_market_data', plainMarketData);
+      pyodide.globals.set('js_batch_strategies', strategies);
+      pyodide.globals.set('js_batch_modes', modes);
+
+      if (!PyodideLoader.hasExecuteStrategy(pyodide)) {
+        PyodideLoader.reset();
+        throw new Error('Python environment not properly initialized: execute_strategy function not found');
+      }
+
+      // The market data is converted once inside the batch and shared by every strategy
+      const pythonResult = pyodide.runPython(`
+execute_strategy_batch(js_market_data, js_batch_strategies.to_py(), tuple(js_batch_modes.to_py()))
+      `);
+
+      const batchResult = typeof pythonResult?.toJs === 'function'
+        ? pythonResult.toJs({ dict_converter: Object.fromEntries })
+        : pythonResult;
+      if (typeof pythonResult?.destroy === 'function') {
+        pythonResult.destroy();
+      }
+
+      console.log('✅ Python batch execution completed');
+      return batchResult as StrategyBatchResult;
+
+    } catch (error) {
+      console.error('❌ Python batch execution failed:', error);
+      throw error;
+    }
+  }
 }
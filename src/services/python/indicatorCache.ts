@@ -0,0 +1,235 @@
+
+export const INDICATOR_CACHE_PYTHON_CODE = `
+import hashlib
+import functools
+import contextlib
+from collections import OrderedDict
+
+class IndicatorCache:
+    """LRU cache for indicator results keyed by dataset fingerprint + indicator + parameters.
+
+    Results are stored as float64 arrays and counted against a byte budget;
+    the least recently used entries are evicted once the budget is exceeded.
+    """
+
+    def __init__(self, max_bytes=128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._entries = OrderedDict()
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pinned = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def fingerprint(values):
+        """Content fingerprint of an array-like input (length + float64 bytes digest)"""
+        array = np.ascontiguousarray(values, dtype=np.float64)
+        digest = hashlib.blake2b(array.tobytes(), digest_size=16).hexdigest()
+        return (len(array), digest)
+
+    @staticmethod
+    def _buffer_key(values):
+        """(address, length, stride) of a float64 array or Series buffer, None for anything else"""
+        if isinstance(values, pd.Series):
+            values = values.to_numpy()
+        if not isinstance(values, np.ndarray) or values.dtype != np.float64 or values.ndim != 1:
+            return None
+        return (values.__array_interface__['data'][0], len(values), values.strides[0])
+
+    def input_fingerprint(self, values):
+        """fingerprint(), served from the pinned inputs when values is a view of one"""
+        if self._pinned:
+            buffer_key = IndicatorCache._buffer_key(values)
+            if buffer_key is not None and buffer_key in self._pinned:
+                return self._pinned[buffer_key][1]
+        return IndicatorCache.fingerprint(values)
+
+    @contextlib.contextmanager
+    def pinned_inputs(self, arrays):
+        """Fingerprint read-only float64 columns once for a block of indicator calls.
+
+        Inside the block, indicator inputs that view the same buffer (same address,
+        length and stride) reuse the pinned fingerprint instead of hashing the column
+        again. The arrays are referenced until the block ends so their memory cannot be
+        reused, and only non-writeable arrays are pinned so the content cannot change.
+        """
+        pinned = {}
+        for array in arrays:
+            if isinstance(array, pd.Series):
+                array = array.to_numpy()
+            buffer_key = IndicatorCache._buffer_key(array)
+            if buffer_key is not None and not array.flags.writeable:
+                pinned[buffer_key] = (array, IndicatorCache.fingerprint(array))
+        previous = self._pinned
+        self._pinned = {**previous, **pinned} if previous else pinned
+        try:
+            yield self
+        finally:
+            self._pinned = previous
+
+    def make_key(self, name, args, kwargs):
+        """Build a cache key; returns None when an argument cannot be keyed"""
+        key_parts = [name]
+        for value in list(args) + [kwargs[k] for k in sorted(kwargs)]:
+            if isinstance(value, (list, tuple, np.ndarray, pd.Series)):
+                key_parts.append(self.input_fingerprint(value))
+            elif isinstance(value, (int, float, str, bool)) or value is None:
+                key_parts.append(value)
+            else:
+                return None
+        key_parts.append(tuple(sorted(kwargs)))
+        return tuple(key_parts)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value):
+        size = IndicatorCache._value_nbytes(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._current_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self._current_bytes += size
+        self.evict_to_budget()
+
+    def evict_to_budget(self):
+        while self._current_bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._current_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._current_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'bytes': self._current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    @staticmethod
+    def _value_nbytes(value):
+        if isinstance(value, tuple):
+            return sum(IndicatorCache._value_nbytes(v) for v in value)
+        if isinstance(value, dict):
+            return sum(IndicatorCache._value_nbytes(v) for v in value.values())
+        return 0 if value is None else value.nbytes
+
+# Keep the cache (and its statistics) alive when the executor code is re-run in the same interpreter
+if 'INDICATOR_CACHE' not in globals():
+    INDICATOR_CACHE = IndicatorCache()
+
+def configure_indicator_cache(max_bytes=None, enabled=None):
+    """Adjust the shared indicator cache budget or switch caching on/off"""
+    if max_bytes is not None:
+        INDICATOR_CACHE.max_bytes = max_bytes
+        INDICATOR_CACHE.evict_to_budget()
+    if enabled is not None:
+        INDICATOR_CACHE.enabled = bool(enabled)
+    return INDICATOR_CACHE.stats()
+
+def cached_indicator(name):
+    """Memoize an indicator function in INDICATOR_CACHE; callers still receive fresh lists.
+
+    Pass as_array=True to get the cached float64 array(s) back directly (read-only,
+    no list conversion) - this is what vectorized strategies should use.
+    Calls are timed into ACTIVE_PROFILER while execute_strategy profiles a run.
+    """
+    def decorator(func):
+        def lookup(args, kwargs, as_array):
+            """(result, cache_hit)"""
+            cache = INDICATOR_CACHE
+            key = cache.make_key(name, args, kwargs) if cache.enabled else None
+            entry = cache.get(key) if key is not None else None
+            
+            if entry is None:
+                result = func(*args, **kwargs)
+                if key is None and not as_array:
+                    return _as_list_result(result), False
+                if isinstance(result, dict):
+                    cached = {k: _frozen_array(v) for k, v in result.items()}
+                    int_positions = {k: _int_positions(v) for k, v in result.items()}
+                else:
+                    cached = _frozen_array(result)
+                    int_positions = _int_positions(result)
+                if key is not None:
+                    cache.put(key, (cached, int_positions))
+                if not as_array:
+                    return _as_list_result(result), False
+                return cached, False
+            
+            cached, int_positions = entry
+            if as_array:
+                return cached, True
+            if isinstance(cached, dict):
+                return {k: _restored_list(v, int_positions[k]) for k, v in cached.items()}, True
+            return _restored_list(cached, int_positions), True
+        
+        @functools.wraps(func)
+        def wrapper(*args, as_array=False, **kwargs):
+            profiler = ACTIVE_PROFILER
+            if profiler is None:
+                return lookup(args, kwargs, as_array)[0]
+            started = time.perf_counter()
+            result, cache_hit = lookup(args, kwargs, as_array)
+            profiler.record_indicator(name, time.perf_counter() - started, cache_hit)
+            return result
+        # Marks functions that take as_array (callers such as MultiTimeframe check it)
+        wrapper.cache_name = name
+        return wrapper
+    return decorator
+
+def _frozen_array(values):
+    # Indicator functions return fresh arrays, so those can be frozen without a copy
+    array = values if isinstance(values, np.ndarray) else np.array(values, dtype=np.float64)
+    array = array.astype(np.float64, copy=False)
+    array.flags.writeable = False
+    return array
+
+def _int_positions(values):
+    # Positions of int items in a list result (sentinels such as 50 or -50), so cache
+    # hits hand back the same item types as the call that filled the cache
+    if isinstance(values, np.ndarray):
+        return None
+    positions = [i for i, v in enumerate(values) if isinstance(v, (int, np.integer)) and not isinstance(v, bool)]
+    return np.array(positions, dtype=np.intp) if positions else None
+
+def _restored_list(array, int_positions):
+    values = array.tolist()
+    if int_positions is not None:
+        for i in int_positions.tolist():
+            values[i] = int(values[i])
+    return values
+
+def _as_list_result(result):
+    if isinstance(result, np.ndarray):
+        return result.tolist()
+    if isinstance(result, dict):
+        return {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in result.items()}
+    return result
+`;
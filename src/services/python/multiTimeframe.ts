@@ -0,0 +1,272 @@
+
+export const MULTI_TIMEFRAME_PYTHON_CODE = `
+import numpy as np
+import pandas as pd
+
+# Bar length in seconds by timeframe name (OANDA names and the app's timeframe values)
+TIMEFRAME_SECONDS = {
+    'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H4': 14400, 'D': 86400,
+    '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '4h': 14400, '1d': 86400
+}
+
+BAR_FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+def timeframe_seconds(timeframe):
+    """Bar length in seconds of a timeframe name (or a number of seconds)"""
+    if isinstance(timeframe, (int, float, np.integer, np.floating)):
+        return int(timeframe)
+    seconds = TIMEFRAME_SECONDS.get(timeframe)
+    if seconds is None:
+        raise ValueError(f"Unknown timeframe '{timeframe}' (expected one of {', '.join(TIMEFRAME_SECONDS)})")
+    return seconds
+
+class _ColumnBuffer:
+    """Growable float64/int64 column (amortized O(1) appends, views of the filled part)"""
+
+    def __init__(self, dtype=np.float64):
+        self._values = np.empty(16, dtype=dtype)
+        self.length = 0
+
+    def extend(self, values):
+        needed = self.length + len(values)
+        if needed > len(self._values):
+            grown = np.empty(max(needed, 2 * len(self._values)), dtype=self._values.dtype)
+            grown[:self.length] = self._values[:self.length]
+            self._values = grown
+        self._values[self.length:needed] = values
+        self.length = needed
+
+    def set_last(self, value):
+        self._values[self.length - 1] = value
+
+    def last(self):
+        return self._values[self.length - 1]
+
+    def view(self):
+        return self._values[:self.length]
+
+class TimeframeResampler:
+    """Bars of one higher timeframe built from base bars, updated as base bars arrive.
+
+    Base bars are keyed by their open time (epoch seconds) and belong to the
+    higher-timeframe bar floor((time - origin) / seconds); origin=0 aligns H4 and
+    D bars to UTC midnight. update() only touches the newest higher-timeframe
+    bar and the bars after it, so appending k base bars costs O(k).
+
+    For every base bar i, closed_through[i] is the index of the latest higher-
+    timeframe bar that is complete when bar i closes (-1 if none): the bar's own
+    period when bar i is its last base bar, otherwise the one before it. Values
+    read through closed_through never use prices after bar i.
+    """
+
+    def __init__(self, timeframe, base_seconds, origin=0):
+        self.seconds = timeframe_seconds(timeframe)
+        self.base_seconds = int(base_seconds)
+        if self.seconds < self.base_seconds:
+            raise ValueError(f"Timeframe of {self.seconds}s is shorter than the {self.base_seconds}s base bars")
+        self.origin = origin
+        self._bars = {name: _ColumnBuffer() for name in BAR_FIELDS}
+        self._base_index = _ColumnBuffer(np.int64)
+        self._closed_through = _ColumnBuffer(np.int64)
+        self._last_bucket = None
+        self._last_time = None
+
+    def __len__(self):
+        return self._bars['time'].length
+
+    @property
+    def base_length(self):
+        return self._base_index.length
+
+    def update(self, times, open_prices, high, low, close, volume=None):
+        """Append base bars (strictly increasing open times after the last appended bar; scalars for one bar)"""
+        times = np.atleast_1d(_to_float_array(times))
+        if len(times) == 0:
+            return self
+        open_prices, high, low, close = (np.atleast_1d(_to_float_array(values)) for values in (open_prices, high, low, close))
+        volume = np.zeros(len(times)) if volume is None else np.nan_to_num(np.atleast_1d(_to_float_array(volume)))
+        if np.any(times[1:] <= times[:-1]) or (self._last_time is not None and times[0] <= self._last_time):
+            raise ValueError("Base bars must be appended in strictly increasing time order")
+
+        buckets = np.floor((times - self.origin) / self.seconds).astype(np.int64)
+        starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+        ends = np.concatenate((starts[1:], [len(times)])) - 1
+        group_high = np.fmax.reduceat(high, starts)
+        group_low = np.fmin.reduceat(low, starts)
+        group_volume = np.add.reduceat(volume, starts)
+
+        # The first group may continue the newest (still open) higher-timeframe bar
+        merge = self._last_bucket is not None and buckets[0] == self._last_bucket
+        first_index = len(self) - 1 if merge else len(self)
+        if merge:
+            bars = self._bars
+            bars['high'].set_last(np.fmax(bars['high'].last(), group_high[0]))
+            bars['low'].set_last(np.fmin(bars['low'].last(), group_low[0]))
+            bars['close'].set_last(close[ends[0]])
+            bars['volume'].set_last(bars['volume'].last() + group_volume[0])
+        new = slice(1, None) if merge else slice(None)
+        group_buckets = buckets[starts]
+        self._bars['time'].extend(group_buckets[new] * self.seconds + self.origin)
+        self._bars['open'].extend(open_prices[starts[new]])
+        self._bars['high'].extend(group_high[new])
+        self._bars['low'].extend(group_low[new])
+        self._bars['close'].extend(close[ends[new]])
+        self._bars['volume'].extend(group_volume[new])
+
+        group_index = np.arange(first_index, first_index + len(starts))
+        base_index = np.repeat(group_index, ends - starts + 1)
+        # Only the last base bar of a period can complete it (earlier bars are followed by
+        # another bar of the same period); it does when it closes at or after the period end
+        closed_through = base_index - 1
+        period_end = (group_buckets + 1) * self.seconds + self.origin
+        closed_through[ends] += times[ends] + self.base_seconds >= period_end
+        self._base_index.extend(base_index)
+        self._closed_through.extend(closed_through)
+        self._last_bucket = int(buckets[-1])
+        self._last_time = float(times[-1])
+        return self
+
+    def bars(self):
+        """{'time', 'open', 'high', 'low', 'close', 'volume'} arrays; the newest bar may still be forming"""
+        return {name: column.view() for name, column in self._bars.items()}
+
+    @property
+    def base_index(self):
+        """Higher-timeframe bar containing each base bar"""
+        return self._base_index.view()
+
+    @property
+    def closed_through(self):
+        """Latest higher-timeframe bar complete at the close of each base bar (-1 if none)"""
+        return self._closed_through.view()
+
+    def align(self, values):
+        """Higher-timeframe values (one per bar) at every base bar, from completed bars only (NaN before the first)"""
+        # Position 0 of the padded values is the NaN read by closed_through == -1
+        padded = np.concatenate(([np.nan], _to_float_array(values)))
+        return padded[self.closed_through + 1]
+
+class MultiTimeframe:
+    """Higher-timeframe bars and indicators for a base series, aligned back to base bars.
+
+    data is a DataFrame (or dict) with Open/High/Low/Close(/Volume) columns. Bar
+    open times come from times, a 'Time' column (epoch seconds, set when the
+    market data carries 'time') or a DatetimeIndex; without them the bars are
+    assumed contiguous and base_timeframe is required. The base timeframe is
+    otherwise inferred from the smallest bar spacing.
+
+    Resampled bars are built once per timeframe and kept on the instance;
+    update() appends new base bars to every timeframe incrementally. Indicators
+    run on the (short) higher-timeframe series through TechnicalAnalysis, so they
+    are cached like any other indicator call, and come back aligned to base bars
+    without look-ahead:
+
+        mtf = MultiTimeframe(data)
+        h1_trend = mtf.indicator('H1', 'ema', 50)      # same length as data
+        h4_atr = mtf.indicator('H4', 'atr', 14, inputs=('high', 'low', 'close'))
+    """
+
+    def __init__(self, data, base_timeframe=None, times=None, origin=0):
+        columns = {str(name).lower(): name for name in data.keys()}
+        self._base = {}
+        for name in ('open', 'high', 'low', 'close', 'volume'):
+            if name in columns:
+                self._base[name] = _ColumnBuffer()
+                self._base[name].extend(_to_float_array(data[columns[name]]))
+            elif name != 'volume':
+                raise ValueError(f"Market data is missing the '{name.capitalize()}' column")
+        length = self._base['close'].length
+        if 'volume' not in self._base:
+            self._base['volume'] = _ColumnBuffer()
+            self._base['volume'].extend(np.zeros(length))
+
+        if times is None and 'time' in columns:
+            times = data[columns['time']]
+        if times is None and isinstance(getattr(data, 'index', None), pd.DatetimeIndex):
+            times = data.index
+        if isinstance(times, (pd.DatetimeIndex, pd.Series)) and pd.api.types.is_datetime64_any_dtype(times):
+            times = pd.DatetimeIndex(times)
+            times = (times.tz_convert(None) if times.tz is not None else times).to_numpy('datetime64[ns]').astype(np.int64) / 1e9
+
+        if base_timeframe is not None:
+            self.base_seconds = timeframe_seconds(base_timeframe)
+        elif times is not None and length > 1:
+            # The smallest spacing: gaps only make others longer, and underestimating the bar
+            # length can only delay (never advance) the completion of a higher-timeframe bar
+            self.base_seconds = int(np.min(np.diff(_to_float_array(times))))
+        else:
+            raise ValueError("base_timeframe is required when the data has no bar times")
+        self.contiguous = times is None
+        self._times = _ColumnBuffer()
+        self._times.extend(np.arange(length) * float(self.base_seconds) if times is None else _to_float_array(times))
+        self.origin = origin
+        self._resamplers = {}
+        self._indicators = {}
+
+    def __len__(self):
+        return self._times.length
+
+    @property
+    def times(self):
+        """Open time (epoch seconds) of every base bar"""
+        return self._times.view()
+
+    def resampler(self, timeframe):
+        """TimeframeResampler of a timeframe (built on first use, then kept up to date)"""
+        seconds = timeframe_seconds(timeframe)
+        resampler = self._resamplers.get(seconds)
+        if resampler is None:
+            resampler = TimeframeResampler(seconds, self.base_seconds, self.origin)
+            base = {name: column.view() for name, column in self._base.items()}
+            resampler.update(self.times, base['open'], base['high'], base['low'], base['close'], base['volume'])
+            self._resamplers[seconds] = resampler
+        return resampler
+
+    def bars(self, timeframe):
+        """{'time', 'open', 'high', 'low', 'close', 'volume'} arrays of the timeframe (newest bar may be forming)"""
+        return self.resampler(timeframe).bars()
+
+    def align(self, timeframe, values):
+        """Values computed per timeframe bar, at every base bar from completed bars only"""
+        return self.resampler(timeframe).align(values)
+
+    def indicator(self, timeframe, name, *args, inputs=('close',), **kwargs):
+        """TechnicalAnalysis.<name> on the timeframe's bars, aligned to base bars without look-ahead.
+
+        inputs names the bar fields passed before args (e.g. ('high', 'low', 'close')
+        for atr). Dict results (macd, bollinger_bands, ...) are aligned per key.
+        Cached indicators hand back their arrays (as_array=True); other functions
+        return lists, which align() converts.
+        """
+        key = (timeframe_seconds(timeframe), name, tuple(inputs), args, tuple(sorted(kwargs.items())))
+        aligned = self._indicators.get(key)
+        if aligned is None:
+            indicator = getattr(TechnicalAnalysis, name, None) or getattr(AdvancedTechnicalAnalysis, name)
+            bars = self.bars(timeframe)
+            if getattr(indicator, 'cache_name', None) is not None:
+                kwargs = dict(kwargs, as_array=True)
+            values = indicator(*(bars[field] for field in inputs), *args, **kwargs)
+            if isinstance(values, dict):
+                aligned = {k: self.align(timeframe, v) for k, v in values.items()}
+            else:
+                aligned = self.align(timeframe, values)
+            self._indicators[key] = aligned
+        return aligned
+
+    def update(self, times, open_prices, high, low, close, volume=None):
+        """Append new base bars (arrays, or scalars for one bar); every timeframe already built is updated incrementally"""
+        times = np.atleast_1d(_to_float_array(times))
+        new_columns = {'open': open_prices, 'high': high, 'low': low, 'close': close,
+                       'volume': np.zeros(len(times)) if volume is None else volume}
+        for resampler in self._resamplers.values():
+            resampler.update(times, new_columns['open'], new_columns['high'], new_columns['low'],
+                             new_columns['close'], new_columns['volume'])
+        self._times.extend(times)
+        for name, values in new_columns.items():
+            self._base[name].extend(np.atleast_1d(_to_float_array(values)))
+        # Aligned indicators are recomputed on the next request (the newest bars changed)
+        self._indicators.clear()
+        return self
+`;
@@ -1,255 +1,239 @@
-
 export const PRICE_ACTION_PATTERNS_PYTHON_CODE = `
 import pandas as pd
 import numpy as np
 import math
 from typing import Dict, List, Any, Tuple
 
+# The detectors below evaluate each pattern rule as a boolean mask over all bars.
+# Comparisons that used max()/min() keep the builtins' semantics (first argument
+# unless the second compares greater/smaller), so NaN bars classify exactly as
+# they did bar by bar.
+
+def _python_max(a, b):
+    """Elementwise max(a, b) as the builtin evaluates it"""
+    return np.where(b > a, b, a)
+
+def _python_min(a, b):
+    """Elementwise min(a, b) as the builtin evaluates it"""
+    return np.where(b < a, b, a)
+
+def _truncate(values):
+    """int() of each value; NaN/inf only occur on bars masked out afterwards and become 0"""
+    return np.trunc(np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)).astype(np.int64)
+
+def _python_window_extreme(values, before, after, greater):
+    """max() (greater=True) or min() of values[max(0, i-before):i+after+1] for every i, in builtin order"""
+    n = len(values)
+    positions = np.arange(n)
+    window_start = np.maximum(0, positions - before)
+    extreme = values[window_start]
+    for offset in range(-before + 1, after + 1):
+        candidate_positions = positions + offset
+        valid = (candidate_positions > window_start) & (candidate_positions < n)
+        candidate = values[np.clip(candidate_positions, 0, n - 1)]
+        better = candidate > extreme if greater else candidate < extreme
+        extreme = np.where(valid & better, candidate, extreme)
+    return extreme
+
 class PriceActionPatterns:
+    # Row layouts of the structured arrays returned with as_array=True
+    PATTERN_DTYPE = np.dtype([('type', 'U20'), ('strength', np.int64)])
+    CHART_PATTERN_DTYPE = np.dtype([('first_index', np.int64), ('second_index', np.int64),
+                                    ('first_level', np.float64), ('second_level', np.float64),
+                                    ('current_index', np.int64)])
+
+    @staticmethod
+    def _ohlc(open_prices, high, low, close):
+        n = len(close)
+        return tuple(_as_float_array(values)[:n] for values in (open_prices, high, low, close))
+
     @staticmethod
-    def pin_bar(open_prices: List[float], high: List[float], low: List[float], 
-               close: List[float], min_body_ratio: float = 0.3) -> List[Dict[str, Any]]:
+    def _patterns(n, labelled, as_array):
+        """Per-bar pattern rows from (mask, type, strengths) triples; earlier triples take precedence"""
+        types = np.full(n, 'none', dtype=PriceActionPatterns.PATTERN_DTYPE['type'])
+        strengths = np.zeros(n, dtype=np.int64)
+        taken = np.zeros(n, dtype=bool)
+        for mask, pattern_type, pattern_strengths in labelled:
+            mask = mask & ~taken
+            types[mask] = pattern_type
+            strengths[mask] = pattern_strengths[mask]
+            taken |= mask
+        if as_array:
+            patterns = np.empty(n, dtype=PriceActionPatterns.PATTERN_DTYPE)
+            patterns['type'] = types
+            patterns['strength'] = strengths
+            return patterns
+        return [{'type': t, 'strength': s} for t, s in zip(types.tolist(), strengths.tolist())]
+
+    @staticmethod
+    def _shifted(values, shift):
+        """values[i - shift] at position i; the first shift positions are NaN"""
+        shifted = np.full(len(values), np.nan)
+        shifted[shift:] = values[:len(values) - shift]
+        return shifted
+
+    @staticmethod
+    def pin_bar(open_prices: List[float], high: List[float], low: List[float],
+               close: List[float], min_body_ratio: float = 0.3, as_array: bool = False) -> List[Dict[str, Any]]:
         """Detect Pin Bar (Hammer/Shooting Star) patterns"""
-        patterns = []
-        
-        for i in range(len(close)):
-            body_size = abs(close[i] - open_prices[i])
-            total_range = high[i] - low[i]
-            
-            if total_range == 0:
-                patterns.append({'type': 'none', 'strength': 0})
-                continue
-            
-            upper_shadow = high[i] - max(open_prices[i], close[i])
-            lower_shadow = min(open_prices[i], close[i]) - low[i]
-            
-            body_ratio = body_size / total_range
-            upper_shadow_ratio = upper_shadow / total_range
-            lower_shadow_ratio = lower_shadow / total_range
-            
-            # Bullish Pin Bar (Hammer)
-            if (lower_shadow_ratio > 0.6 and body_ratio < min_body_ratio and 
-                upper_shadow_ratio < 0.1):
-                strength = min(100, int(lower_shadow_ratio * 100))
-                patterns.append({'type': 'bullish_pin', 'strength': strength})
-            
-            # Bearish Pin Bar (Shooting Star)
-            elif (upper_shadow_ratio > 0.6 and body_ratio < min_body_ratio and 
-                  lower_shadow_ratio < 0.1):
-                strength = min(100, int(upper_shadow_ratio * 100))
-                patterns.append({'type': 'bearish_pin', 'strength': strength})
-            
-            else:
-                patterns.append({'type': 'none', 'strength': 0})
-        
-        return patterns
-    
+        o, h, l, c = PriceActionPatterns._ohlc(open_prices, high, low, close)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total_range = h - l
+            body_ratio = np.abs(c - o) / total_range
+            upper_shadow_ratio = (h - _python_max(o, c)) / total_range
+            lower_shadow_ratio = (_python_min(o, c) - l) / total_range
+        has_range = total_range != 0
+
+        # Bullish Pin Bar (Hammer)
+        bullish = has_range & (lower_shadow_ratio > 0.6) & (body_ratio < min_body_ratio) & (upper_shadow_ratio < 0.1)
+        # Bearish Pin Bar (Shooting Star)
+        bearish = has_range & (upper_shadow_ratio > 0.6) & (body_ratio < min_body_ratio) & (lower_shadow_ratio < 0.1)
+
+        return PriceActionPatterns._patterns(len(c), [
+            (bullish, 'bullish_pin', np.minimum(100, _truncate(lower_shadow_ratio * 100))),
+            (bearish, 'bearish_pin', np.minimum(100, _truncate(upper_shadow_ratio * 100)))
+        ], as_array)
+
     @staticmethod
-    def engulfing_pattern(open_prices: List[float], high: List[float], low: List[float], 
-                         close: List[float]) -> List[Dict[str, Any]]:
+    def engulfing_pattern(open_prices: List[float], high: List[float], low: List[float],
+                         close: List[float], as_array: bool = False) -> List[Dict[str, Any]]:
         """Detect Bullish and Bearish Engulfing patterns"""
-        patterns = []
-        
-        for i in range(len(close)):
-            if i == 0:
-                patterns.append({'type': 'none', 'strength': 0})
-                continue
-            
-            # Current candle
-            curr_body_top = max(open_prices[i], close[i])
-            curr_body_bottom = min(open_prices[i], close[i])
-            curr_is_bullish = close[i] > open_prices[i]
-            
-            # Previous candle
-            prev_body_top = max(open_prices[i-1], close[i-1])
-            prev_body_bottom = min(open_prices[i-1], close[i-1])
-            prev_is_bullish = close[i-1] > open_prices[i-1]
-            
-            # Bullish Engulfing
-            if (curr_is_bullish and not prev_is_bullish and
-                curr_body_bottom < prev_body_bottom and curr_body_top > prev_body_top):
-                
-                engulf_ratio = (curr_body_top - curr_body_bottom) / (prev_body_top - prev_body_bottom)
-                strength = min(100, int(engulf_ratio * 50))
-                patterns.append({'type': 'bullish_engulfing', 'strength': strength})
-            
-            # Bearish Engulfing
-            elif (not curr_is_bullish and prev_is_bullish and
-                  curr_body_bottom < prev_body_bottom and curr_body_top > prev_body_top):
-                
-                engulf_ratio = (curr_body_top - curr_body_bottom) / (prev_body_top - prev_body_bottom)
-                strength = min(100, int(engulf_ratio * 50))
-                patterns.append({'type': 'bearish_engulfing', 'strength': strength})
-            
-            else:
-                patterns.append({'type': 'none', 'strength': 0})
-        
-        return patterns
-    
+        o, h, l, c = PriceActionPatterns._ohlc(open_prices, high, low, close)
+        shifted = PriceActionPatterns._shifted
+
+        # Current candle
+        curr_body_top = _python_max(o, c)
+        curr_body_bottom = _python_min(o, c)
+        curr_is_bullish = c > o
+
+        # Previous candle (the first bar has none and never matches)
+        prev_body_top = shifted(curr_body_top, 1)
+        prev_body_bottom = shifted(curr_body_bottom, 1)
+        prev_is_bullish = shifted(curr_is_bullish.astype(np.float64), 1) == 1
+        prev_is_bearish = shifted(curr_is_bullish.astype(np.float64), 1) == 0
+
+        engulfs = (curr_body_bottom < prev_body_bottom) & (curr_body_top > prev_body_top)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            engulf_ratio = (curr_body_top - curr_body_bottom) / (prev_body_top - prev_body_bottom)
+        # A zero-size previous body engulfs infinitely: full strength
+        strength = np.minimum(100, _truncate(np.minimum(engulf_ratio * 50, 100)))
+
+        return PriceActionPatterns._patterns(len(c), [
+            (curr_is_bullish & prev_is_bearish & engulfs, 'bullish_engulfing', strength),
+            (~curr_is_bullish & prev_is_bullish & engulfs, 'bearish_engulfing', strength)
+        ], as_array)
+
     @staticmethod
-    def doji_patterns(open_prices: List[float], high: List[float], low: List[float], 
-                     close: List[float], doji_threshold: float = 0.1) -> List[Dict[str, Any]]:
+    def doji_patterns(open_prices: List[float], high: List[float], low: List[float],
+                     close: List[float], doji_threshold: float = 0.1, as_array: bool = False) -> List[Dict[str, Any]]:
         """Detect Doji, Dragonfly, and Gravestone patterns"""
-        patterns = []
-        
-        for i in range(len(close)):
-            body_size = abs(close[i] - open_prices[i])
-            total_range = high[i] - low[i]
-            
-            if total_range == 0:
-                patterns.append({'type': 'none', 'strength': 0})
-                continue
-            
-            body_ratio = body_size / total_range
-            upper_shadow = high[i] - max(open_prices[i], close[i])
-            lower_shadow = min(open_prices[i], close[i]) - low[i]
-            
-            upper_shadow_ratio = upper_shadow / total_range
-            lower_shadow_ratio = lower_shadow / total_range
-            
-            if body_ratio <= doji_threshold:
-                # Dragonfly Doji
-                if lower_shadow_ratio > 0.6 and upper_shadow_ratio < 0.1:
-                    strength = int(lower_shadow_ratio * 100)
-                    patterns.append({'type': 'dragonfly_doji', 'strength': strength})
-                
-                # Gravestone Doji
-                elif upper_shadow_ratio > 0.6 and lower_shadow_ratio < 0.1:
-                    strength = int(upper_shadow_ratio * 100)
-                    patterns.append({'type': 'gravestone_doji', 'strength': strength})
-                
-                # Regular Doji
-                else:
-                    strength = int((1 - body_ratio) * 50)
-                    patterns.append({'type': 'doji', 'strength': strength})
-            else:
-                patterns.append({'type': 'none', 'strength': 0})
-        
-        return patterns
-    
+        o, h, l, c = PriceActionPatterns._ohlc(open_prices, high, low, close)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total_range = h - l
+            body_ratio = np.abs(c - o) / total_range
+            upper_shadow_ratio = (h - _python_max(o, c)) / total_range
+            lower_shadow_ratio = (_python_min(o, c) - l) / total_range
+        doji = (total_range != 0) & (body_ratio <= doji_threshold)
+
+        return PriceActionPatterns._patterns(len(c), [
+            # Dragonfly Doji
+            (doji & (lower_shadow_ratio > 0.6) & (upper_shadow_ratio < 0.1), 'dragonfly_doji',
+             _truncate(lower_shadow_ratio * 100)),
+            # Gravestone Doji
+            (doji & (upper_shadow_ratio > 0.6) & (lower_shadow_ratio < 0.1), 'gravestone_doji',
+             _truncate(upper_shadow_ratio * 100)),
+            # Regular Doji
+            (doji, 'doji', _truncate((1 - body_ratio) * 50))
+        ], as_array)
+
     @staticmethod
-    def morning_evening_star(open_prices: List[float], high: List[float], low: List[float], 
-                           close: List[float]) -> List[Dict[str, Any]]:
+    def morning_evening_star(open_prices: List[float], high: List[float], low: List[float],
+                           close: List[float], as_array: bool = False) -> List[Dict[str, Any]]:
         """Detect Morning Star and Evening Star patterns"""
-        patterns = []
-        
-        for i in range(len(close)):
-            if i < 2:
-                patterns.append({'type': 'none', 'strength': 0})
-                continue
-            
-            # Three candles: [i-2], [i-1], [i]
-            candles = []
-            for j in range(i-2, i+1):
-                body_size = abs(close[j] - open_prices[j])
-                is_bullish = close[j] > open_prices[j]
-                candles.append({
-                    'body_size': body_size,
-                    'is_bullish': is_bullish,
-                    'high': high[j],
-                    'low': low[j],
-                    'open': open_prices[j],
-                    'close': close[j]
-                })
-            
-            # Morning Star Pattern
-            if (not candles[0]['is_bullish'] and  # First candle bearish
-                candles[1]['body_size'] < candles[0]['body_size'] * 0.5 and  # Small middle candle
-                candles[2]['is_bullish'] and  # Third candle bullish
-                candles[2]['close'] > (candles[0]['open'] + candles[0]['close']) / 2):  # Recovery
-                
-                strength = int(min(100, (candles[2]['body_size'] / candles[0]['body_size']) * 50))
-                patterns.append({'type': 'morning_star', 'strength': strength})
-            
-            # Evening Star Pattern
-            elif (candles[0]['is_bullish'] and  # First candle bullish
-                  candles[1]['body_size'] < candles[0]['body_size'] * 0.5 and  # Small middle candle
-                  not candles[2]['is_bullish'] and  # Third candle bearish
-                  candles[2]['close'] < (candles[0]['open'] + candles[0]['close']) / 2):  # Decline
-                
-                strength = int(min(100, (candles[2]['body_size'] / candles[0]['body_size']) * 50))
-                patterns.append({'type': 'evening_star', 'strength': strength})
-            
-            else:
-                patterns.append({'type': 'none', 'strength': 0})
-        
-        return patterns
-    
+        o, h, l, c = PriceActionPatterns._ohlc(open_prices, high, low, close)
+        shifted = PriceActionPatterns._shifted
+
+        # Three candles: [i-2], [i-1], [i]; the first two bars never match
+        body_size = np.abs(c - o)
+        is_bullish = (c > o).astype(np.float64)
+        first_body = shifted(body_size, 2)
+        first_bullish = shifted(is_bullish, 2)
+        first_midpoint = shifted((o + c) / 2, 2)
+        small_middle = shifted(body_size, 1) < first_body * 0.5  # Small middle candle
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            strength = _truncate(_python_min(100, (body_size / first_body) * 50))
+
+        return PriceActionPatterns._patterns(len(c), [
+            # Morning Star: bearish, small, bullish recovering past the first candle's midpoint
+            ((first_bullish == 0) & small_middle & (is_bullish == 1) & (c > first_midpoint), 'morning_star', strength),
+            # Evening Star: bullish, small, bearish declining past the first candle's midpoint
+            ((first_bullish == 1) & small_middle & (is_bullish == 0) & (c < first_midpoint), 'evening_star', strength)
+        ], as_array)
+
     @staticmethod
-    def inside_outside_bars(open_prices: List[float], high: List[float], low: List[float], 
-                           close: List[float]) -> List[Dict[str, Any]]:
+    def inside_outside_bars(open_prices: List[float], high: List[float], low: List[float],
+                           close: List[float], as_array: bool = False) -> List[Dict[str, Any]]:
         """Detect Inside Bar and Outside Bar patterns"""
-        patterns = []
-        
-        for i in range(len(close)):
-            if i == 0:
-                patterns.append({'type': 'none', 'strength': 0})
-                continue
-            
-            curr_range = high[i] - low[i]
-            prev_range = high[i-1] - low[i-1]
-            
-            # Inside Bar
-            if high[i] <= high[i-1] and low[i] >= low[i-1]:
-                compression_ratio = 1 - (curr_range / prev_range) if prev_range > 0 else 0
-                strength = int(compression_ratio * 100)
-                patterns.append({'type': 'inside_bar', 'strength': strength})
-            
-            # Outside Bar
-            elif high[i] > high[i-1] and low[i] < low[i-1]:
-                expansion_ratio = (curr_range / prev_range) - 1 if prev_range > 0 else 0
-                strength = int(min(100, expansion_ratio * 100))
-                patterns.append({'type': 'outside_bar', 'strength': strength})
-            
-            else:
-                patterns.append({'type': 'none', 'strength': 0})
-        
-        return patterns
-    
+        o, h, l, c = PriceActionPatterns._ohlc(open_prices, high, low, close)
+        shifted = PriceActionPatterns._shifted
+
+        prev_high = shifted(h, 1)
+        prev_low = shifted(l, 1)
+        curr_range = h - l
+        prev_range = prev_high - prev_low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            range_ratio = np.where(prev_range > 0, curr_range / prev_range, np.nan)
+        has_prev_range = prev_range > 0
+
+        # Inside Bar: strength is the compression, Outside Bar: the expansion (capped at 100)
+        compression = np.where(has_prev_range, _truncate((1 - range_ratio) * 100), 0)
+        expansion = np.where(has_prev_range, _truncate(np.minimum(100, (range_ratio - 1) * 100)), 0)
+
+        return PriceActionPatterns._patterns(len(c), [
+            ((h <= prev_high) & (l >= prev_low), 'inside_bar', compression),
+            ((h > prev_high) & (l < prev_low), 'outside_bar', expansion)
+        ], as_array)
+
     @staticmethod
-    def chart_patterns_simple(high: List[float], low: List[float], close: List[float], 
-                             lookback: int = 20) -> Dict[str, List[Any]]:
-        """Simplified chart pattern detection for Double Top/Bottom"""
-        double_tops = []
-        double_bottoms = []
-        
-        for i in range(lookback, len(close) - lookback):
-            # Look for potential double top
-            if i >= lookback * 2:
-                recent_highs = []
-                for j in range(i - lookback * 2, i):
-                    if high[j] == max(high[max(0, j-5):j+6]):  # Local high
-                        recent_highs.append((j, high[j]))
-                
-                if len(recent_highs) >= 2:
-                    # Check if two highs are similar
-                    last_two = sorted(recent_highs, key=lambda x: x[1], reverse=True)[:2]
-                    if abs(last_two[0][1] - last_two[1][1]) / last_two[0][1] < 0.02:  # Within 2%
-                        double_tops.append({
-                            'indices': [last_two[0][0], last_two[1][0]],
-                            'levels': [last_two[0][1], last_two[1][1]],
-                            'current_index': i
-                        })
-            
-            # Look for potential double bottom
-            if i >= lookback * 2:
-                recent_lows = []
-                for j in range(i - lookback * 2, i):
-                    if low[j] == min(low[max(0, j-5):j+6]):  # Local low
-                        recent_lows.append((j, low[j]))
-                
-                if len(recent_lows) >= 2:
-                    # Check if two lows are similar
-                    last_two = sorted(recent_lows, key=lambda x: x[1])[:2]
-                    if abs(last_two[0][1] - last_two[1][1]) / last_two[0][1] < 0.02:  # Within 2%
-                        double_bottoms.append({
-                            'indices': [last_two[0][0], last_two[1][0]],
-                            'levels': [last_two[0][1], last_two[1][1]],
-                            'current_index': i
-                        })
-        
+    def chart_patterns_simple(high: List[float], low: List[float], close: List[float],
+                             lookback: int = 20, as_array: bool = False) -> Dict[str, List[Any]]:
+        """Simplified chart pattern detection for Double Top/Bottom.
+
+        Local highs/lows (extreme of the 5 bars either side) are found for all bars
+        at once; each position then only ranks the few local extremes in its window.
+        """
+        high = _as_float_array(high)
+        low = _as_float_array(low)
+        n = len(close)
+        local_high_idx = np.flatnonzero(high == _python_window_extreme(high, 5, 5, True))
+        local_low_idx = np.flatnonzero(low == _python_window_extreme(low, 5, 5, False))
+        positions = np.arange(max(lookback, lookback * 2), max(0, n - lookback))
+
+        def find_pairs(candidates, values, descending):
+            # Local extremes in [i - lookback * 2, i) for every position i
+            window_start = np.searchsorted(candidates, positions - lookback * 2, side='left')
+            window_end = np.searchsorted(candidates, positions, side='left')
+            pairs = []
+            for i, start, end in zip(positions.tolist(), window_start.tolist(), window_end.tolist()):
+                if end - start < 2:
+                    continue
+                recent = [(j, values[j]) for j in candidates[start:end].tolist()]
+                # Check if the two most extreme levels are similar
+                last_two = sorted(recent, key=lambda x: x[1], reverse=descending)[:2]
+                if abs(last_two[0][1] - last_two[1][1]) / last_two[0][1] < 0.02:  # Within 2%
+                    pairs.append((last_two[0][0], last_two[1][0], last_two[0][1], last_two[1][1], i))
+            if as_array:
+                return np.array(pairs, dtype=PriceActionPatterns.CHART_PATTERN_DTYPE)
+            return [
+                {'indices': [first, second], 'levels': [first_level, second_level], 'current_index': i}
+                for first, second, first_level, second_level, i in pairs
+            ]
+
         return {
-            'double_tops': double_tops,
-            'double_bottoms': double_bottoms
+            'double_tops': find_pairs(local_high_idx, high.tolist(), True),
+            'double_bottoms': find_pairs(local_low_idx, low.tolist(), False)
         }
 `;
@@ -0,0 +1,95 @@
+export const PROFILING_PYTHON_CODE = `
+import time
+import contextlib
+
+class ExecutionProfiler:
+    """Stage and indicator timings for one execute_strategy run.
+
+    Stages record wall (perf_counter) and CPU (process_time) seconds; indicator
+    timings are inclusive (macd includes its ema calls) and split cache hits from
+    computed calls. Peak memory uses tracemalloc when track_memory is set, since
+    tracing every allocation slows large runs down.
+    """
+
+    def __init__(self, track_memory=False):
+        self.stages = {}
+        self.indicators = {}
+        self.track_memory = track_memory
+        self._started_tracing = False
+        self._wall_start = None
+        self._cpu_start = None
+
+    def start(self):
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        if self.track_memory:
+            try:
+                import tracemalloc
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                tracemalloc.reset_peak()
+            except Exception as e:
+                print(f"Warning: Memory tracking unavailable: {e}")
+                self.track_memory = False
+        return self
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            stage['wall_seconds'] += time.perf_counter() - wall_start
+            stage['cpu_seconds'] += time.process_time() - cpu_start
+
+    def record_indicator(self, name, seconds, cache_hit):
+        timing = self.indicators.get(name)
+        if timing is None:
+            timing = self.indicators[name] = {'calls': 0, 'cache_hits': 0, 'seconds': 0.0}
+        timing['calls'] += 1
+        timing['cache_hits'] += int(cache_hit)
+        timing['seconds'] += seconds
+
+    def report(self, bars):
+        """The perf block returned with the result"""
+        wall_seconds = time.perf_counter() - self._wall_start
+        perf = {
+            'bars': bars,
+            'wall_seconds': wall_seconds,
+            'cpu_seconds': time.process_time() - self._cpu_start,
+            'bars_per_second': bars / wall_seconds if wall_seconds > 0 else 0.0,
+            'stages': self.stages,
+            'indicators': self.indicators,
+            'peak_memory_bytes': None
+        }
+        if self.track_memory:
+            import tracemalloc
+            perf['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        return perf
+
+    def stop(self):
+        """Stop tracemalloc if this profiler started it"""
+        if self._started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracing = False
+
+# Profiler of the execute_strategy run in progress (None outside runs or with profiling off)
+ACTIVE_PROFILER = None
+
+class _NullOutput:
+    """stdout sink for quiet runs"""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+def output_context(verbose):
+    """Context that drops print output when verbose is False"""
+    return contextlib.nullcontext() if verbose else contextlib.redirect_stdout(_NullOutput())
+`;
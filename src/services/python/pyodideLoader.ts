@@ -11,10 +11,13 @@ export class PyodideLoader {
   static async initialize(): Promise<PyodideInstance> {
     if (this.pyodideInstance) {
       console.log('🐍 Returning existing Pyodide instance');
-      // Re-run the strategy executor code to ensure execute_strategy is available
+      // Re-run the strategy executor code only if execute_strategy went missing;
+      // re-running it on every call would rebuild all classes for each backtest
       try {
-        this.pyodideInstance.runPython(STRATEGY_EXECUTOR_PYTHON_CODE);
-        console.log('🐍 Re-initialized strategy executor code in existing instance');
+        if (!this.hasExecuteStrategy(this.pyodideInstance)) {
+          this.pyodideInstance.runPython(STRATEGY_EXECUTOR_PYTHON_CODE);
+          console.log('🐍 Re-initialized strategy executor code in existing instance');
+        }
       } catch (error) {
         console.warn('🐍 Failed to re-initialize strategy code, creating new instance:', error);
         this.pyodideInstance = null;
@@ -177,6 +180,18 @@ result
     }
   }
 
+  // Globals lookup from JS, without parsing and running Python code
+  static hasExecuteStrategy(pyodide: PyodideInstance): boolean {
+    const executeStrategy = pyodide.globals.get('execute_strategy');
+    if (!executeStrategy) {
+      return false;
+    }
+    if (typeof executeStrategy.destroy === 'function') {
+      executeStrategy.destroy();
+    }
+    return true;
+  }
+
   static getLastError(): Error | null {
     return this.lastError;
   }
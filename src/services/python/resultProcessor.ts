@@ -1,5 +1,5 @@
 
-import type { StrategyResult, MarketData } from './types';
+import type { StrategyResult, MarketData, PackedStrategyResult } from './types';
 
 export class ResultProcessor {
   static processResult(pythonResult: any, marketData: MarketData): StrategyResult {
@@ -14,8 +14,14 @@ export class ResultProcessor {
     let jsResult;
     
     try {
+      // Case 0: Packed result (typed buffers), copied out without per-bar conversion
+      if (ResultProcessor.isPackedProxy(pythonResult)) {
+        console.log('📦 Reading packed Python result buffers...');
+        jsResult = ResultProcessor.unpackResult(ResultProcessor.readPackedResult(pythonResult));
+        console.log('✅ Packed result read successfully');
+      }
       // Case 1: Result already is a JavaScript object (plain object)
-      if (pythonResult && typeof pythonResult === 'object' && pythonResult.constructor === Object) {
+      else if (pythonResult && typeof pythonResult === 'object' && pythonResult.constructor === Object) {
         console.log('✅ Result is already a plain JavaScript object');
         jsResult = pythonResult;
       }
@@ -51,6 +57,86 @@ export class ResultProcessor {
     return jsResult as StrategyResult;
   }
 
+  private static isPackedProxy(pythonResult: any): boolean {
+    if (!pythonResult || typeof pythonResult !== 'object' || typeof pythonResult.get !== 'function') {
+      return false;
+    }
+    try {
+      return pythonResult.get('format') === 'packed';
+    } catch {
+      return false;
+    }
+  }
+
+  // Copy a NumPy array proxy into a JS typed array and free the Python buffer
+  private static copyBuffer(proxy: any): any {
+    if (!proxy || typeof proxy.getBuffer !== 'function') {
+      return proxy;
+    }
+    const buffer = proxy.getBuffer();
+    try {
+      return buffer.data.slice();
+    } finally {
+      buffer.release();
+      proxy.destroy();
+    }
+  }
+
+  static readPackedResult(pythonResult: any): PackedStrategyResult {
+    const packed: any = {};
+    for (const key of pythonResult.keys()) {
+      const value = pythonResult.get(key);
+      if (key === 'indicators') {
+        packed.indicators = {};
+        for (const name of value.keys()) {
+          packed.indicators[name] = ResultProcessor.copyBuffer(value.get(name));
+        }
+        value.destroy();
+      } else if (value && typeof value === 'object' && typeof value.getBuffer === 'function') {
+        packed[key] = ResultProcessor.copyBuffer(value);
+      } else if (value && typeof value === 'object' && typeof value.toJs === 'function') {
+        packed[key] = value.toJs({ dict_converter: Object.fromEntries });
+        value.destroy();
+      } else {
+        packed[key] = value;
+      }
+    }
+    return packed as PackedStrategyResult;
+  }
+
+  // Expand a packed result into the list-based StrategyResult shape
+  static unpackResult(packed: PackedStrategyResult): StrategyResult {
+    const length = packed.length;
+    const readMask = (mask: Uint8Array): boolean[] => {
+      const values = new Array<boolean>(length);
+      for (let i = 0; i < length; i++) {
+        values[i] = packed.bitpacked ? ((mask[i >> 3] >> (7 - (i & 7))) & 1) === 1 : mask[i] !== 0;
+      }
+      return values;
+    };
+    const direction = new Array<string | null>(length);
+    for (let i = 0; i < length; i++) {
+      const code = packed.direction[i];
+      direction[i] = code > 0 ? 'BUY' : code < 0 ? 'SELL' : null;
+    }
+
+    const result: StrategyResult = {
+      ...packed,
+      entry: readMask(packed.entry),
+      exit: readMask(packed.exit),
+      direction: direction as string[]
+    };
+    delete result.format;
+    delete result.bitpacked;
+    delete result.length;
+    delete result.indicators;
+    for (const [name, values] of Object.entries(packed.indicators || {})) {
+      // The dict format writes 0 for NaN
+      result[name] = Array.from(values, x => (Number.isNaN(x) ? 0 : x));
+    }
+    return result;
+  }
+
   static createFallbackResult(marketData: MarketData, errorMessage: string): StrategyResult {
     const length = marketData?.close?.length || 0;
     return {
@@ -1,5 +1,35 @@
 
 export const SIGNAL_PROCESSING_PYTHON_CODE = `
+DIRECTION_KEYS = ('direction', 'entry_type', 'trade_direction')
+DIRECTION_CODES = {1: 'BUY', -1: 'SELL'}
+
+def normalize_strategy_result(result):
+    """Convert vectorized strategy outputs to the list format used by signal processing.
+
+    Vectorized strategy contract - strategy_logic may return, instead of lists:
+    - 'entry' / 'exit': boolean NumPy arrays or pandas Series (one value per bar)
+    - 'direction' (or 'entry_type' / 'trade_direction'): arrays of 'BUY' / 'SELL' / None,
+      or integer codes (1 = BUY, -1 = SELL, 0 = no trade)
+    - indicator outputs: float arrays or Series (NaN allowed)
+    Plain lists keep working unchanged.
+    """
+    if not isinstance(result, dict):
+        return result
+    
+    normalized = {}
+    for key, value in result.items():
+        if isinstance(value, pd.Series):
+            value = value.to_numpy()
+        if isinstance(value, np.ndarray):
+            if key in DIRECTION_KEYS and value.dtype.kind in 'iub':
+                value = [DIRECTION_CODES.get(int(code)) for code in value]
+            elif key in DIRECTION_KEYS:
+                value = [None if x is None or x == '' else str(x) for x in value.tolist()]
+            else:
+                value = value.tolist()
+        normalized[key] = value
+    return normalized
+
 def validate_strategy_signals(result):
     """Validate that strategy returns proper directional signals"""
     
@@ -133,6 +163,9 @@ def process_strategy_signals(result, reverse_signals):
     if not isinstance(result, dict):
         return {'entry': [], 'exit': [], 'direction': [], 'error': 'Invalid strategy result format'}
     
+    # Accept NumPy/pandas outputs from vectorized strategies
+    result = normalize_strategy_result(result)
+    
     # Enforce directional signals (this will auto-generate if missing)
     result = enforce_directional_signals(result)
     
@@ -195,6 +228,137 @@ def process_strategy_signals(result, reverse_signals):
     
     return processed_result
 
+def _direction_codes(direction):
+    """Direction values -> (int8 codes BUY=1 / SELL=-1 / none=0, set of invalid values).
+
+    Same rules as normalize_strategy_result + validate_strategy_signals: integer and
+    boolean arrays are codes (only 1 and -1 trade, anything else is no trade), all
+    other values must be 'BUY', 'SELL' or None - float arrays and lists of numbers
+    are invalid.
+    """
+    if isinstance(direction, pd.Series):
+        direction = direction.to_numpy()
+    codes = np.zeros(len(direction), dtype=np.int8)
+    if isinstance(direction, np.ndarray) and direction.dtype.kind in 'iub':
+        codes[direction == 1] = 1
+        codes[direction == -1] = -1
+        return codes, set()
+    values = np.empty(len(direction), dtype=object)
+    values[:] = direction.tolist() if isinstance(direction, np.ndarray) else list(direction)
+    is_buy = values == 'BUY'
+    is_sell = values == 'SELL'
+    is_none = np.equal(values, None) | (values == 'None') | (values == 'NONE')
+    if isinstance(direction, np.ndarray):
+        # normalize_strategy_result turns '' array items into None
+        is_none |= values == ''
+    invalid = ~(is_buy | is_sell | is_none)
+    codes[is_buy] = 1
+    codes[is_sell] = -1
+    return codes, set(values[invalid].tolist()) if invalid.any() else set()
+
+def _fit_length(values, data_length, fill=0):
+    """Truncate or pad a 1-D array to data_length"""
+    if len(values) >= data_length:
+        return values[:data_length]
+    return np.concatenate((values, np.full(data_length - len(values), fill, dtype=values.dtype)))
+
+def pack_strategy_signals(result, reverse_signals, data_length, bitpack=False, indicator_dtype='float64'):
+    """Packed counterpart of process_strategy_signals + ensure_signal_arrays.
+
+    Same validation, auto-direction and reversal rules, but the outputs stay NumPy buffers:
+    - 'entry' / 'exit': uint8 masks (np.packbits bytes, MSB first, when bitpack=True)
+    - 'direction': int8 codes (BUY=1, SELL=-1, none=0)
+    - 'indicators': {name: float64/float32 array}; NaN is kept (the dict format writes 0)
+    Non-numeric outputs are passed through as lists / values.
+
+    A valid 'direction' array is coded without building lists. Anything else (no or
+    invalid direction, entry_type only, no signals, mismatched lengths) goes through
+    enforce_directional_signals like the dict format, so both formats trade the same.
+    """
+    if not isinstance(result, dict):
+        return {'entry': [], 'exit': [], 'direction': [], 'error': 'Invalid strategy result format'}
+    
+    def error(message):
+        print(f"❌ Final validation failed: {message}")
+        return {'entry': [], 'exit': [], 'direction': [], 'error': f"Strategy validation failed: {message}"}
+    
+    entry = result.get('entry')
+    exit = result.get('exit')
+    direction = result.get('direction')
+    codes = None
+    if (entry is not None and exit is not None and direction is not None and
+            0 < len(entry) == len(exit) == len(direction)):
+        entry = np.asarray(entry).astype(bool)
+        exit = np.asarray(exit).astype(bool)
+        codes, invalid_directions = _direction_codes(direction)
+        if invalid_directions or not np.any(entry & (codes != 0)):
+            codes = None
+    
+    auto_generated = False
+    if codes is None:
+        # Rare path: the dict format would repair or reject this result, reuse its list-based rules
+        context = normalize_strategy_result({key: result[key] for key in ('entry', 'exit', *DIRECTION_KEYS, 'short_ema', 'long_ema', 'rsi', 'close')
+                                             if key in result})
+        context = enforce_directional_signals(context)
+        is_valid, message = validate_strategy_signals(context)
+        if not is_valid:
+            return error(message)
+        entry = np.asarray(context['entry']).astype(bool)
+        exit = np.asarray(context['exit']).astype(bool)
+        codes, _ = _direction_codes(context.get('direction', context.get('entry_type', context.get('trade_direction', []))))
+        auto_generated = bool(context.get('auto_generated_direction', False))
+    
+    buy_signals = int(np.count_nonzero(entry & (codes == 1)))
+    sell_signals = int(np.count_nonzero(entry & (codes == -1)))
+    validation_message = f"✅ Strategy valid: {buy_signals} BUY signals, {sell_signals} SELL signals"
+    
+    # Apply reverse signals if requested
+    if reverse_signals:
+        print("🔄 Applying reverse signals transformation")
+        codes = -codes
+    
+    # Counted before fitting to data_length, like the dict format's signal_stats
+    signal_stats = {
+        'total_entries': int(np.count_nonzero(entry)),
+        'buy_signals': int(np.count_nonzero(codes == 1)),
+        'sell_signals': int(np.count_nonzero(codes == -1))
+    }
+    entry = _fit_length(entry.astype(np.uint8), data_length)
+    exit = _fit_length(exit.astype(np.uint8), data_length)
+    codes = _fit_length(codes, data_length)
+    
+    packed_result = {
+        'format': 'packed',
+        'length': data_length,
+        'bitpacked': bool(bitpack),
+        'entry': np.packbits(entry) if bitpack else entry,
+        'exit': np.packbits(exit) if bitpack else exit,
+        'direction': codes,
+        'indicators': {},
+        'reverse_signals_applied': reverse_signals,
+        'validation_passed': True,
+        'validation_message': validation_message,
+        'auto_generated_direction': auto_generated,
+        'signal_stats': signal_stats
+    }
+    
+    # Include other indicators if present
+    for key, value in result.items():
+        if key in ('entry', 'exit') or key in DIRECTION_KEYS:
+            continue
+        if isinstance(value, pd.Series):
+            value = value.to_numpy()
+        if isinstance(value, (np.ndarray, list, tuple)):
+            array = np.asarray(value)
+            if array.ndim == 1 and array.dtype.kind in 'fiub':
+                packed_result['indicators'][key] = array.astype(indicator_dtype, copy=False)
+            else:
+                packed_result[key] = array.tolist() if isinstance(value, np.ndarray) else value
+        else:
+            packed_result[key] = value
+    
+    return packed_result
+
 def ensure_signal_arrays(result, data_length):
     """Ensure signal arrays have the correct length"""
     
@@ -1,5 +1,41 @@
 
 export const STRATEGY_EXECUTION_PYTHON_CODE = `
+import inspect
+import types
+
+# Modules strategies may import inside the sandbox (they are already exposed as globals)
+SANDBOX_IMPORTABLE_MODULES = ('math', 'numpy', 'pandas', 'typing')
+
+def _sandbox_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """Restricted __import__ for strategy code: only SANDBOX_IMPORTABLE_MODULES"""
+    if level != 0 or name.split('.')[0] not in SANDBOX_IMPORTABLE_MODULES:
+        raise ImportError(f"Import of '{name}' is not allowed in strategy code")
+    return __import__(name, globals, locals, fromlist, level)
+
+SAFE_BUILTINS = {
+    'len': len,
+    'range': range,
+    'sum': sum,
+    'max': max,
+    'min': min,
+    'abs': abs,
+    'round': round,
+    'float': float,
+    'int': int,
+    'bool': bool,
+    'list': list,
+    'dict': dict,
+    'enumerate': enumerate,
+    'zip': zip,
+    'any': any,
+    'all': all,
+    'None': None,
+    'True': True,
+    'False': False,
+    'print': print,
+    '__import__': _sandbox_import,
+}
+
 def create_safe_execution_environment(df):
     """Create a safe execution environment with all technical analysis classes"""
     return {
@@ -8,69 +44,212 @@ def create_safe_execution_environment(df):
         'data': df,
         'TechnicalAnalysis': TechnicalAnalysis,
         'AdvancedTechnicalAnalysis': AdvancedTechnicalAnalysis,
+        'MultiTimeframe': MultiTimeframe,
         'math': math,
-        '__builtins__': {
-            'len': len,
-            'range': range,
-            'sum': sum,
-            'max': max,
-            'min': min,
-            'abs': abs,
-            'round': round,
-            'float': float,
-            'int': int,
-            'bool': bool,
-            'list': list,
-            'dict': dict,
-            'enumerate': enumerate,
-            'zip': zip,
-            'any': any,
-            'all': all,
-            'None': None,
-            'True': True,
-            'False': False,
-            'print': print,
-        }
+        '__builtins__': dict(SAFE_BUILTINS)
     }
 
-def execute_strategy_code(strategy_code, safe_globals, reverse_signals):
-    """Execute the strategy code and return results with enhanced error handling"""
+# Calling conventions of strategy_logic
+CALL_WITH_REVERSE_KEYWORD = 'reverse_signals_keyword'
+CALL_WITH_DATA_ONLY = 'data_only'
+CALL_WITH_FALLBACK = 'fallback'
+
+def strategy_call_mode(strategy_func):
+    """Resolve how strategy_logic is called (once per compiled strategy)"""
     try:
-        # Execute the strategy code in safe environment
-        exec(strategy_code, safe_globals)
-        
-        # Try to call strategy_logic function
-        if 'strategy_logic' in safe_globals:
-            strategy_func = safe_globals['strategy_logic']
-            
-            # Check function signature to determine parameters
-            import inspect
-            try:
-                sig = inspect.signature(strategy_func)
-                params = list(sig.parameters.keys())
-                
-                # Call with appropriate parameters
-                if 'reverse_signals' in params:
-                    result = strategy_func(safe_globals['data'], reverse_signals=reverse_signals)
-                else:
-                    result = strategy_func(safe_globals['data'])
-                    
-            except Exception as sig_error:
-                print(f"Warning: Signature inspection failed: {sig_error}")
-                # Fallback to simple call
-                try:
-                    result = strategy_func(safe_globals['data'], reverse_signals)
-                except:
-                    result = strategy_func(safe_globals['data'])
+        params = inspect.signature(strategy_func).parameters
+    except (TypeError, ValueError) as sig_error:
+        print(f"Warning: Signature inspection failed: {sig_error}")
+        return CALL_WITH_FALLBACK
+    return CALL_WITH_REVERSE_KEYWORD if 'reverse_signals' in params else CALL_WITH_DATA_ONLY
+
+# Module-level values that runs of a persistent sandbox may share: none can be changed in place
+_IMMUTABLE_GLOBAL_TYPES = (type(None), bool, int, float, complex, str, bytes, range, types.ModuleType)
+
+def _immutable_global(value):
+    if isinstance(value, (tuple, frozenset)):
+        return all(_immutable_global(item) for item in value)
+    # typing names (from typing import Dict, List) are only used in annotations
+    return isinstance(value, _IMMUTABLE_GLOBAL_TYPES) or type(value).__module__ == 'typing'
+
+def reusable_namespace(namespace, sandbox):
+    """True when the globals the strategy source defined cannot carry state from one run to the next.
+
+    Allowed are immutable values and plain functions defined by the source (with
+    immutable defaults and no attributes); those are rebound to a fresh copy of the
+    globals on every run, so even 'global x; x += 1' starts from the loaded value.
+    Classes, containers, decorated functions and other objects can be mutated in
+    place, so such sources are re-executed for every run instead.
+    """
+    for name, value in namespace.items():
+        if name == '__builtins__' or (name in sandbox and value is sandbox[name]):
+            continue
+        if isinstance(value, types.FunctionType):
+            defaults = tuple(value.__defaults__ or ()) + tuple((value.__kwdefaults__ or {}).values())
+            if value.__globals__ is not namespace or value.__dict__ or not _immutable_global(defaults):
+                return False
+        elif not _immutable_global(value):
+            return False
+    return True
+
+class CompiledStrategy:
+    """A strategy source compiled once, with its sandbox namespace and calling convention.
+
+    When the module level of the source does not read 'data' and only defines
+    functions and immutable values (reusable_namespace), the source is executed once;
+    every run then gets a shallow copy of those loaded globals with 'data' rebound and
+    the source's functions bound to the copy, so nothing a run assigns reaches the next
+    one. Other sources (module-level 'data' reads, no strategy_logic, mutable globals)
+    re-run the cached code object in a fresh sandbox on every run.
+    """
+
+    def __init__(self, key, strategy_code):
+        self.key = key
+        self.code = compile(strategy_code, '<strategy>', 'exec')
+        self.toolkit = (TechnicalAnalysis, AdvancedTechnicalAnalysis, MultiTimeframe)
+        self.reads_data_at_module_level = 'data' in self.code.co_names
+        self.namespace = None
+        self.strategy_func = None
+        self.call_mode = None
+        self.runs = 0
+
+    def _load(self, df):
+        sandbox = create_safe_execution_environment(df)
+        namespace = dict(sandbox)
+        exec(self.code, namespace)
+        strategy_func = namespace.get('strategy_logic')
+        if strategy_func is not None and self.call_mode is None:
+            self.call_mode = strategy_call_mode(strategy_func)
+        self.strategy_func = strategy_func
+        if (not self.reads_data_at_module_level and strategy_func is not None
+                and reusable_namespace(namespace, sandbox)):
+            self.namespace = namespace
+        return namespace
+
+    def _run_namespace(self, df):
+        """Copy of the loaded globals for one run, with the source's functions bound to the copy"""
+        namespace = dict(self.namespace)
+        namespace['__builtins__'] = dict(self.namespace['__builtins__'])
+        namespace['data'] = df
+        for name, value in self.namespace.items():
+            if isinstance(value, types.FunctionType) and value.__globals__ is self.namespace:
+                rebound = types.FunctionType(value.__code__, namespace, value.__name__,
+                                             value.__defaults__, value.__closure__)
+                rebound.__kwdefaults__ = value.__kwdefaults__
+                rebound.__qualname__ = value.__qualname__
+                rebound.__doc__ = value.__doc__
+                namespace[name] = rebound
+        return namespace
+
+    def run(self, df, reverse_signals, strategy_params=None):
+        """Run strategy_logic (or collect module-level signals) on df"""
+        strategy_params = strategy_params or {}
+        if self.namespace is None:
+            namespace = self._load(df)
+            if self.namespace is not None:
+                # The loaded globals stay pristine; runs work on copies
+                namespace = self._run_namespace(df)
         else:
-            # If no function found, look for direct variables
-            result = {}
-            for var_name in ['entry', 'exit', 'direction', 'signals']:
-                if var_name in safe_globals:
-                    result[var_name] = safe_globals[var_name]
+            namespace = self._run_namespace(df)
+        self.runs += 1
         
-        return result
+        if self.strategy_func is None:
+            # If no function found, look for direct variables
+            return {var_name: namespace[var_name] for var_name in ['entry', 'exit', 'direction', 'signals']
+                    if var_name in namespace}
         
+        strategy_func = namespace['strategy_logic']
+        if self.call_mode == CALL_WITH_REVERSE_KEYWORD:
+            return strategy_func(df, reverse_signals=reverse_signals, **strategy_params)
+        if self.call_mode == CALL_WITH_DATA_ONLY or strategy_params:
+            return strategy_func(df, **strategy_params)
+        try:
+            return strategy_func(df, reverse_signals)
+        except:
+            return strategy_func(df)
+
+class StrategyRegistry:
+    """LRU registry of CompiledStrategy entries keyed by a content hash of the source.
+
+    Changed source hashes to a new key, so edits never hit a stale entry; entries built
+    against an older TechnicalAnalysis (executor code re-run) are recompiled on lookup.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.enabled = True
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def source_key(strategy_code):
+        return hashlib.blake2b(strategy_code.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, strategy_code):
+        """Compiled entry for strategy_code (compiles on a miss; raises SyntaxError like exec)"""
+        if not self.enabled:
+            return CompiledStrategy(None, strategy_code)
+        key = StrategyRegistry.source_key(strategy_code)
+        entry = self._entries.get(key)
+        if entry is not None and entry.toolkit == (TechnicalAnalysis, AdvancedTechnicalAnalysis, MultiTimeframe):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = CompiledStrategy(key, strategy_code)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self.evict_to_limit()
+        return entry
+
+    def invalidate(self, strategy_code=None):
+        """Drop one strategy (or every strategy when strategy_code is None)"""
+        if strategy_code is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(StrategyRegistry.source_key(strategy_code), None)
+
+    def evict_to_limit(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+# Keep compiled strategies alive when the executor code is re-run in the same interpreter
+if 'STRATEGY_REGISTRY' not in globals():
+    STRATEGY_REGISTRY = StrategyRegistry()
+
+def configure_strategy_registry(max_entries=None, enabled=None):
+    """Adjust the compiled strategy registry size or switch it on/off"""
+    if max_entries is not None:
+        STRATEGY_REGISTRY.max_entries = max_entries
+        STRATEGY_REGISTRY.evict_to_limit()
+    if enabled is not None:
+        STRATEGY_REGISTRY.enabled = bool(enabled)
+        if not enabled:
+            STRATEGY_REGISTRY.invalidate()
+    return STRATEGY_REGISTRY.stats()
+
+def run_registered_strategy(strategy_code, df, reverse_signals, strategy_params=None):
+    """Run strategy_code through STRATEGY_REGISTRY: compile once, reuse the sandbox and call mode"""
+    try:
+        return STRATEGY_REGISTRY.get(strategy_code).run(df, reverse_signals, strategy_params)
     except Exception as e:
         print(f"❌ Strategy execution error: {str(e)}")
         import traceback
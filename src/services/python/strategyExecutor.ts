@@ -1,9 +1,13 @@
 
+import { PROFILING_PYTHON_CODE } from './profiling';
+import { INDICATOR_CACHE_PYTHON_CODE } from './indicatorCache';
 import { TECHNICAL_ANALYSIS_PYTHON_CODE } from './technicalAnalysis';
+import { MULTI_TIMEFRAME_PYTHON_CODE } from './multiTimeframe';
 import { DATA_VALIDATION_PYTHON_CODE } from './dataValidation';
 import { SIGNAL_PROCESSING_PYTHON_CODE } from './signalProcessing';
 import { STRATEGY_EXECUTION_PYTHON_CODE } from './strategyExecution';
 import { ERROR_HANDLING_PYTHON_CODE } from './errorHandling';
+import { BATCH_EXECUTION_PYTHON_CODE } from './batchExecution';
 
 export const STRATEGY_EXECUTOR_PYTHON_CODE = `
 # Import necessary typing modules at the top
@@ -13,15 +17,38 @@ import pandas as pd
 import numpy as np
 import math
 
+${PROFILING_PYTHON_CODE}
+${INDICATOR_CACHE_PYTHON_CODE}
 ${TECHNICAL_ANALYSIS_PYTHON_CODE}
+${MULTI_TIMEFRAME_PYTHON_CODE}
 ${DATA_VALIDATION_PYTHON_CODE}
 ${SIGNAL_PROCESSING_PYTHON_CODE}
 ${STRATEGY_EXECUTION_PYTHON_CODE}
 ${ERROR_HANDLING_PYTHON_CODE}
+${BATCH_EXECUTION_PYTHON_CODE}
 
 def execute_strategy(market_data_dict: Dict[str, List[float]], strategy_code: str) -> Dict[str, Any]:
-    """Execute the user's strategy code safely with complete technical analysis support"""
+    """Execute the user's strategy code safely with complete technical analysis support
+
+    Options read from market_data_dict next to reverse_signals:
+    - verbose (default True): False drops the progress prints
+    - profile (default True): attach a 'perf' block with stage/indicator timings
+    - profile_memory (default False): include tracemalloc peak memory in 'perf'
+    """
+    verbose = bool(extract_market_data_option(market_data_dict, 'verbose', True))
+    with output_context(verbose):
+        return _execute_strategy(market_data_dict, strategy_code)
+
+def _execute_strategy(market_data_dict, strategy_code):
+    global ACTIVE_PROFILER
+    profiler = None
     try:
+        if extract_market_data_option(market_data_dict, 'profile', True):
+            track_memory = bool(extract_market_data_option(market_data_dict, 'profile_memory', False))
+            profiler = ExecutionProfiler(track_memory=track_memory).start()
+        stage = profiler.stage if profiler is not None else (lambda name: contextlib.nullcontext())
+        ACTIVE_PROFILER = profiler
+        
         print("🐍 Starting strategy execution...")
         
         # Debug: Print the type and structure of market_data_dict
@@ -29,9 +56,10 @@ def execute_strategy(market_data_dict: Dict[str, List[float]], strategy_code: st
         
         # Convert JavaScript data to proper Python with enhanced handling
         print("🔄 Converting market data...")
-        data_dict = validate_and_convert_market_data(market_data_dict)
+        with stage('convert'):
+            data_dict = validate_and_convert_market_data(market_data_dict)
         
-        if not data_dict.get('Close'):
+        if len(data_dict.get('Close', [])) == 0:
             return {
                 'entry': [],
                 'exit': [],
@@ -39,41 +67,71 @@ def execute_strategy(market_data_dict: Dict[str, List[float]], strategy_code: st
                 'error': 'No price data available'
             }
         
+        # Optional bar open times: strategies get them as a 'Time' column (epoch seconds)
+        bar_times = extract_bar_times(market_data_dict, len(data_dict['Close']))
+        if bar_times is not None:
+            data_dict['Time'] = bar_times
+        
         # Extract reverse_signals flag
         reverse_signals = extract_reverse_signals_flag(market_data_dict)
         
+        # Optional packed result transport ('dict' keeps the list format)
+        result_format = extract_market_data_option(market_data_dict, 'result_format', 'dict')
+        indicator_dtype = extract_market_data_option(market_data_dict, 'indicator_dtype', 'float64')
+        
         print(f"📈 Data converted successfully: {len(data_dict['Close'])} bars")
         print(f"🔄 Reverse signals: {reverse_signals}")
         
-        # Create DataFrame from validated data
-        df = pd.DataFrame(data_dict)
+        # Create DataFrame backed by the validated column buffers (no copy)
+        with stage('dataframe'):
+            df = pd.DataFrame(data_dict, copy=False)
         print("📋 DataFrame created successfully")
         
-        # Create safe execution environment with all technical analysis tools
-        safe_globals = create_safe_execution_environment(df)
-        print("🛡️ Safe execution environment created")
-        
-        # Execute the strategy code
+        # Execute the strategy code (compiled once per source, sandbox reused)
         print("🚀 Executing strategy code...")
-        result = execute_strategy_code(strategy_code, safe_globals, reverse_signals)
+        with stage('strategy'):
+            result = run_registered_strategy(strategy_code, df, reverse_signals)
         
+        data_length = len(data_dict.get('Close', []))
         if isinstance(result, dict) and result.get('error'):
             print(f"❌ Strategy returned error: {result['error']}")
+            if profiler is not None:
+                result['perf'] = profiler.report(data_length)
             return result
         
         # Process and convert results
         print("⚙️ Processing strategy results...")
-        processed_result = process_strategy_signals(result, reverse_signals)
-        
-        # Ensure minimum required arrays
-        data_length = len(data_dict.get('Close', []))
-        processed_result = ensure_signal_arrays(processed_result, data_length)
+        if result_format in ('packed', 'bitpacked'):
+            with stage('signals'):
+                processed_result = pack_strategy_signals(result, reverse_signals, data_length,
+                                                         bitpack=result_format == 'bitpacked',
+                                                         indicator_dtype=indicator_dtype)
+        else:
+            with stage('signals'):
+                processed_result = process_strategy_signals(result, reverse_signals)
+            
+            # Ensure minimum required arrays
+            with stage('padding'):
+                processed_result = ensure_signal_arrays(processed_result, data_length)
         
         print(f"✅ Strategy execution completed successfully")
-        print(f"📊 Signals generated: Entry={sum(processed_result.get('entry', []))}, "
+        print(f"📊 Signals generated: Entry={processed_result.get('signal_stats', {}).get('total_entries', 0)}, "
               f"BUY={processed_result.get('signal_stats', {}).get('buy_signals', 0)}, "
               f"SELL={processed_result.get('signal_stats', {}).get('sell_signals', 0)}")
         
+        cache_stats = INDICATOR_CACHE.stats()
+        print(f"🗃️ Indicator cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"{cache_stats['entries']} entries ({cache_stats['bytes'] / (1024 * 1024):.1f} MB)")
+        registry_stats = STRATEGY_REGISTRY.stats()
+        print(f"🗂️ Strategy registry: {registry_stats['hits']} hits, {registry_stats['misses']} compiles, "
+              f"{registry_stats['entries']} strategies")
+        
+        if profiler is not None:
+            processed_result['perf'] = profiler.report(data_length)
+            perf = processed_result['perf']
+            print(f"⏱️ {perf['wall_seconds'] * 1000:.1f} ms ({perf['bars_per_second']:,.0f} bars/s): "
+                  + ", ".join(f"{name} {timing['wall_seconds'] * 1000:.1f} ms" for name, timing in perf['stages'].items()))
+        
         return processed_result
         
     except Exception as e:
@@ -83,4 +141,8 @@ def execute_strategy(market_data_dict: Dict[str, List[float]], strategy_code: st
         print(f"📍 Full traceback: {traceback.format_exc()}")
         
         return handle_strategy_error(e, market_data_dict)
+    finally:
+        ACTIVE_PROFILER = None
+        if profiler is not None:
+            profiler.stop()
 `;
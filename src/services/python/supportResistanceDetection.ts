@@ -5,7 +5,53 @@ import numpy as np
 import math
 from typing import Dict, List, Any, Tuple
 
+class PriceRangeIndex:
+    """Bar ranges sorted by low and by high, for counting level touches in bulk.
+
+    A bar touches the zone [zone_low, zone_high] when low <= zone_high and
+    high >= zone_low. For bars with low <= high and a zone with
+    zone_low <= zone_high, every bar with high < zone_low also has
+    low <= zone_high, so touches = #(low <= zone_high) - #(high < zone_low):
+    two binary searches per level instead of a pass over the history.
+    Bars without a proper range (NaN, low > high) are few and checked directly.
+    """
+
+    def __init__(self, high, low):
+        high = _as_float_array(high)
+        low = _as_float_array(low)
+        regular = low <= high
+        self.sorted_lows = np.sort(low[regular])
+        self.sorted_highs = np.sort(high[regular])
+        self._regular_high = high[regular]
+        self._regular_low = low[regular]
+        self._irregular_high = high[~regular]
+        self._irregular_low = low[~regular]
+
+    @staticmethod
+    def _direct_touches(high, low, zone_high, zone_low):
+        return ((low[None, :] <= zone_high[:, None]) & (high[None, :] >= zone_low[:, None])).sum(axis=1)
+
+    def touches(self, levels, tolerance=0.001):
+        """Number of bars touching level * (1 -/+ tolerance), for every level at once"""
+        levels = _as_float_array(levels)
+        zone_high = levels * (1 + tolerance)
+        zone_low = levels * (1 - tolerance)
+        counts = (np.searchsorted(self.sorted_lows, zone_high, side='right') -
+                  np.searchsorted(self.sorted_highs, zone_low, side='left')).astype(np.int64)
+        inverted = zone_low > zone_high  # negative levels
+        if inverted.any():
+            counts[inverted] = self._direct_touches(self._regular_high, self._regular_low,
+                                                    zone_high[inverted], zone_low[inverted])
+        if len(self._irregular_high):
+            counts += self._direct_touches(self._irregular_high, self._irregular_low, zone_high, zone_low)
+        return counts
+
 class SupportResistanceDetection:
+    # Row layouts of the structured arrays returned with as_array=True
+    ZONE_DTYPE = np.dtype([('start_index', np.int64), ('high', np.float64), ('low', np.float64),
+                           ('strength', np.int64), ('type', 'U6')])
+    LEVEL_DTYPE = np.dtype([('price', np.float64), ('volume', np.float64)])
+
     @staticmethod
     def pivot_points_standard(high: float, low: float, close: float) -> Dict[str, float]:
         """Standard Pivot Points calculation"""
@@ -55,165 +101,175 @@ class SupportResistanceDetection:
         }
     
     @staticmethod
-    def fractal_levels(high: List[float], low: List[float], lookback: int = 5) -> Dict[str, List[float]]:
+    def _fractal_masks(high, low, lookback):
+        """Bars strictly above (below) every other bar within lookback on both sides.
+
+        Compared one offset at a time over shifted slices; a NaN neighbour never
+        disqualifies a bar, as in the per-bar loop.
+        """
+        high = _as_float_array(high)
+        low = _as_float_array(low)
+        n = len(high)
+        is_high = np.zeros(n, dtype=bool)
+        is_low = np.zeros(n, dtype=bool)
+        if n <= 2 * lookback:
+            return is_high, is_low
+        centre = slice(lookback, n - lookback)
+        centre_high = high[centre]
+        centre_low = low[centre]
+        high_mask = np.ones(len(centre_high), dtype=bool)
+        low_mask = np.ones(len(centre_low), dtype=bool)
+        for offset in range(1, lookback + 1):
+            for shift in (-offset, offset):
+                neighbour = slice(lookback + shift, n - lookback + shift)
+                high_mask &= ~(high[neighbour] >= centre_high)
+                low_mask &= ~(low[neighbour] <= centre_low)
+        is_high[centre] = high_mask
+        is_low[centre] = low_mask
+        return is_high, is_low
+    
+    @staticmethod
+    def fractal_levels(high: List[float], low: List[float], lookback: int = 5,
+                       as_array: bool = False) -> Dict[str, List[float]]:
         """Detect fractal swing highs and lows"""
-        fractal_highs = []
-        fractal_lows = []
-        
-        for i in range(len(high)):
-            if i < lookback or i >= len(high) - lookback:
-                fractal_highs.append(float('nan'))
-                fractal_lows.append(float('nan'))
-                continue
-            
-            # Check for fractal high
-            is_fractal_high = True
-            for j in range(i - lookback, i + lookback + 1):
-                if j != i and high[j] >= high[i]:
-                    is_fractal_high = False
-                    break
-            
-            # Check for fractal low
-            is_fractal_low = True
-            for j in range(i - lookback, i + lookback + 1):
-                if j != i and low[j] <= low[i]:
-                    is_fractal_low = False
-                    break
-            
-            fractal_highs.append(high[i] if is_fractal_high else float('nan'))
-            fractal_lows.append(low[i] if is_fractal_low else float('nan'))
-        
+        is_high, is_low = SupportResistanceDetection._fractal_masks(high, low, lookback)
+        fractal_highs = np.where(is_high, _as_float_array(high), np.nan)
+        fractal_lows = np.where(is_low, _as_float_array(low), np.nan)
+        if as_array:
+            return {'fractal_highs': fractal_highs, 'fractal_lows': fractal_lows}
         return {
-            'fractal_highs': fractal_highs,
-            'fractal_lows': fractal_lows
+            'fractal_highs': fractal_highs.tolist(),
+            'fractal_lows': fractal_lows.tolist()
         }
     
     @staticmethod
-    def recent_highs_lows(high: List[float], low: List[float], period: int = 20) -> Dict[str, List[float]]:
-        """Mark recent highs and lows"""
-        recent_highs = []
-        recent_lows = []
-        
-        for i in range(len(high)):
-            if i < period - 1:
-                recent_highs.append(float('nan'))
-                recent_lows.append(float('nan'))
-            else:
-                period_high = max(high[i-period+1:i+1])
-                period_low = min(low[i-period+1:i+1])
-                
-                recent_highs.append(period_high)
-                recent_lows.append(period_low)
-        
+    def recent_highs_lows(high: List[float], low: List[float], period: int = 20,
+                          as_array: bool = False) -> Dict[str, List[float]]:
+        """Mark recent highs and lows (rolling max/min over period bars)"""
+        recent_highs = _sliding_extreme(high, period, np.fmax)
+        recent_lows = _sliding_extreme(low, period, np.fmin)
+        if as_array:
+            return {'recent_highs': recent_highs, 'recent_lows': recent_lows}
         return {
-            'recent_highs': recent_highs,
-            'recent_lows': recent_lows
+            'recent_highs': recent_highs.tolist(),
+            'recent_lows': recent_lows.tolist()
         }
     
+    @staticmethod
+    def _zones(indices, zone_high, zone_low, zone_strength, zone_type, as_array):
+        if as_array:
+            zones = np.empty(len(indices), dtype=SupportResistanceDetection.ZONE_DTYPE)
+            zones['start_index'] = indices
+            zones['high'] = zone_high
+            zones['low'] = zone_low
+            zones['strength'] = zone_strength
+            zones['type'] = zone_type
+            return zones
+        return [
+            {'start_index': i, 'high': h, 'low': l, 'strength': zone_strength, 'type': zone_type}
+            for i, h, l in zip(indices.tolist(), zone_high.tolist(), zone_low.tolist())
+        ]
+    
     @staticmethod
     def supply_demand_zones(high: List[float], low: List[float], close: List[float], 
-                           volume: List[float], zone_strength: int = 2) -> Dict[str, List[Any]]:
+                           volume: List[float], zone_strength: int = 2,
+                           as_array: bool = False) -> Dict[str, List[Any]]:
         """Identify supply and demand zones based on price reaction and volume"""
-        supply_zones = []
-        demand_zones = []
+        high = _as_float_array(high)
+        low = _as_float_array(low)
+        volume = _as_float_array(volume)
+        n = len(close)
         
         # Use fractal levels as base for zones
-        fractals = SupportResistanceDetection.fractal_levels(high, low, 3)
+        is_high, is_low = SupportResistanceDetection._fractal_masks(high, low, 3)
+        
+        # Average volume of the bar and up to 10 bars before it. The window sum is
+        # accumulated oldest bar first (zero padding at the start), like sum() over the slice.
+        padded = np.concatenate((np.zeros(10), volume[:n]))
+        window_sums = np.zeros(n)
+        for offset in range(11):
+            window_sums = window_sums + padded[offset:offset + n]
+        vol_avg = window_sums / np.minimum(11, np.arange(1, n + 1))
+        confirmed = volume[:n] > vol_avg * 1.2  # Above average volume
         
-        for i in range(len(close)):
-            if not math.isnan(fractals['fractal_highs'][i]):
-                # Potential supply zone
-                zone_high = fractals['fractal_highs'][i]
-                zone_low = zone_high * 0.995  # 0.5% zone width
-                
-                # Check for volume confirmation
-                vol_avg = sum(volume[max(0, i-10):i+1]) / min(11, i+1)
-                if volume[i] > vol_avg * 1.2:  # Above average volume
-                    supply_zones.append({
-                        'start_index': i,
-                        'high': zone_high,
-                        'low': zone_low,
-                        'strength': zone_strength,
-                        'type': 'supply'
-                    })
-            
-            if not math.isnan(fractals['fractal_lows'][i]):
-                # Potential demand zone
-                zone_low = fractals['fractal_lows'][i]
-                zone_high = zone_low * 1.005  # 0.5% zone width
-                
-                # Check for volume confirmation
-                vol_avg = sum(volume[max(0, i-10):i+1]) / min(11, i+1)
-                if volume[i] > vol_avg * 1.2:  # Above average volume
-                    demand_zones.append({
-                        'start_index': i,
-                        'high': zone_high,
-                        'low': zone_low,
-                        'strength': zone_strength,
-                        'type': 'demand'
-                    })
+        # Potential supply zones: 0.5% below the fractal high
+        supply_idx = np.flatnonzero(is_high[:n] & ~np.isnan(high[:n]) & confirmed)
+        supply_high = high[supply_idx]
+        # Potential demand zones: 0.5% above the fractal low
+        demand_idx = np.flatnonzero(is_low[:n] & ~np.isnan(low[:n]) & confirmed)
+        demand_low = low[demand_idx]
         
         return {
-            'supply_zones': supply_zones,
-            'demand_zones': demand_zones
+            'supply_zones': SupportResistanceDetection._zones(
+                supply_idx, supply_high, supply_high * 0.995, zone_strength, 'supply', as_array),
+            'demand_zones': SupportResistanceDetection._zones(
+                demand_idx, demand_low * 1.005, demand_low, zone_strength, 'demand', as_array)
         }
     
     @staticmethod
-    def volume_profile_levels(close: List[float], volume: List[float], bins: int = 20) -> Dict[str, Any]:
-        """Simplified volume profile - identify high volume price levels"""
-        if not close or not volume:
-            return {'levels': [], 'poc': float('nan')}
+    def volume_profile_levels(close: List[float], volume: List[float], bins: int = 20,
+                              as_array: bool = False) -> Dict[str, Any]:
+        """Simplified volume profile - identify high volume price levels.
+
+        levels is sorted by volume, ties in order of first appearance; with
+        as_array it is a LEVEL_DTYPE array and volume_by_price lists the occupied
+        bins by price. Bars with a NaN close are ignored.
+        """
+        close = _as_float_array(close)
+        volume = _as_float_array(volume)
+        empty = np.empty(0, dtype=SupportResistanceDetection.LEVEL_DTYPE) if as_array else []
+        valid = ~np.isnan(close[:len(volume)])
+        close = close[:len(volume)][valid]
+        volume = volume[:len(valid)][valid]
+        if len(close) == 0:
+            return {'levels': empty, 'poc': float('nan')}
         
-        min_price = min(close)
-        max_price = max(close)
+        min_price = float(close.min())
+        max_price = float(close.max())
         price_range = max_price - min_price
         
         if price_range == 0:
-            return {'levels': [], 'poc': close[0]}
+            return {'levels': empty, 'poc': float(close[0])}
         
         bin_size = price_range / bins
-        volume_by_price = {}
+        # Accumulate volume by price bins (np.bincount adds in bar order)
+        price_bins = np.minimum(((close - min_price) / bin_size).astype(np.int64), bins - 1)
+        volume_by_bin = np.bincount(price_bins, weights=volume, minlength=bins)
+        occupied, first_seen = np.unique(price_bins, return_index=True)
+        bin_prices = min_price + (occupied * bin_size) + (bin_size / 2)
+        bin_volumes = volume_by_bin[occupied]
         
-        # Accumulate volume by price bins
-        for i in range(len(close)):
-            price_bin = int((close[i] - min_price) / bin_size)
-            price_bin = min(price_bin, bins - 1)  # Ensure within bounds
-            
-            bin_price = min_price + (price_bin * bin_size) + (bin_size / 2)
-            
-            if bin_price not in volume_by_price:
-                volume_by_price[bin_price] = 0
-            volume_by_price[bin_price] += volume[i]
+        # Sort levels by volume; the first level is the Point of Control
+        by_appearance = np.argsort(first_seen, kind='stable')
+        order = by_appearance[np.argsort(-bin_volumes[by_appearance], kind='stable')]
+        poc_price = float(bin_prices[order[0]])
         
-        # Find Point of Control (highest volume level)
-        poc_price = max(volume_by_price.keys(), key=lambda k: volume_by_price[k])
-        
-        # Sort levels by volume
-        levels = sorted(volume_by_price.items(), key=lambda x: x[1], reverse=True)
+        if as_array:
+            profile = np.empty(len(occupied), dtype=SupportResistanceDetection.LEVEL_DTYPE)
+            profile['price'] = bin_prices
+            profile['volume'] = bin_volumes
+            return {'levels': profile[order], 'poc': poc_price, 'volume_by_price': profile}
         
         return {
-            'levels': levels,
+            'levels': list(zip(bin_prices[order].tolist(), bin_volumes[order].tolist())),
             'poc': poc_price,
-            'volume_by_price': volume_by_price
+            'volume_by_price': dict(zip(bin_prices[by_appearance].tolist(), bin_volumes[by_appearance].tolist()))
         }
     
     @staticmethod
     def support_resistance_strength(high: List[float], low: List[float], close: List[float], 
                                   level: float, tolerance: float = 0.001) -> int:
-        """Calculate strength of a support/resistance level based on touches"""
-        touches = 0
+        """Calculate strength of a support/resistance level based on touches.
+
+        level may also be a list/array of levels: the bars are then indexed once
+        (PriceRangeIndex) and an int64 array of touch counts is returned.
+        """
+        if np.ndim(level):
+            return PriceRangeIndex(high, low).touches(level, tolerance)
         
-        for i in range(len(close)):
-            # Check if price touched the level within tolerance
-            price_high = high[i]
-            price_low = low[i]
-            
-            level_high = level * (1 + tolerance)
-            level_low = level * (1 - tolerance)
-            
-            # Count as touch if price range intersects with level zone
-            if price_low <= level_high and price_high >= level_low:
-                touches += 1
+        level_high = level * (1 + tolerance)
+        level_low = level * (1 - tolerance)
         
-        return touches
+        # Count as touch if price range intersects with level zone
+        return int(np.count_nonzero((_as_float_array(low) <= level_high) & (_as_float_array(high) >= level_low)))
 `;
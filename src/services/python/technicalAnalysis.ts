@@ -4,102 +4,109 @@ import math
 import pandas as pd
 import numpy as np
 
+def _to_float_array(data):
+    """Convert list/Series/ndarray input to a contiguous float64 array"""
+    return np.asarray(data, dtype=np.float64)
+
+def _seeded_recursive_average(values, period, alpha):
+    """Recursive average y[i] = alpha * x[i] + (1 - alpha) * y[i-1] seeded with SMA(period).
+
+    Matches the list-based loop: NaN for the first period-1 values, and a NaN
+    anywhere in the input propagates to every later value.
+    """
+    result = np.full(len(values), np.nan)
+    seed = values[:period].sum() / period
+    result[period - 1] = seed
+    tail = values[period:]
+    nan_positions = np.flatnonzero(np.isnan(tail))
+    valid_length = nan_positions[0] if len(nan_positions) else len(tail)
+    if math.isnan(seed) or valid_length == 0:
+        if math.isnan(seed):
+            result[period - 1:] = np.nan
+        return result
+    seeded = np.concatenate(([seed], tail[:valid_length]))
+    smoothed = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    result[period:period + valid_length] = smoothed[1:]
+    return result
+
+def _rolling_mean(values, period):
+    """O(n) rolling mean; NaN until a full window without NaN is available"""
+    return pd.Series(values).rolling(window=period, min_periods=period).mean().to_numpy()
+
+def _true_range(high, low, close):
+    """True range with the same comparison order as max(tr1, tr2, tr3)"""
+    tr = high - low
+    if len(tr) > 1:
+        prev_close = close[:-1]
+        tr2 = np.abs(high[1:] - prev_close)
+        tr3 = np.abs(low[1:] - prev_close)
+        rest = tr[1:]
+        rest = np.where(tr2 > rest, tr2, rest)
+        rest = np.where(tr3 > rest, tr3, rest)
+        tr[1:] = rest
+    return tr
+
 class TechnicalAnalysis:
-    """Technical Analysis class with static methods for indicators"""
+    """Technical Analysis class with static methods for indicators.
+
+    ema, sma, rsi and atr are computed with NumPy/pandas; cached_indicator
+    hands callers plain lists, so strategies indexing the results keep working
+    unchanged. Every cached indicator also accepts as_array=True to return
+    read-only float64 arrays instead of lists.
+    """
     
     @staticmethod
+    @cached_indicator('TechnicalAnalysis.ema')
     def ema(data, period):
         """Calculate Exponential Moving Average"""
-        if len(data) < period:
-            return [float('nan')] * len(data)
+        values = _to_float_array(data)
+        if len(values) < period:
+            return np.full(len(values), np.nan)
         
-        result = []
         multiplier = 2 / (period + 1)
-        
-        # Initialize with SMA for the first value
-        sma = sum(data[:period]) / period
-        result.extend([float('nan')] * (period - 1))
-        result.append(sma)
-        
-        # Calculate EMA for remaining values
-        for i in range(period, len(data)):
-            ema = (data[i] * multiplier) + (result[i-1] * (1 - multiplier))
-            result.append(ema)
-        
-        return result
+        return _seeded_recursive_average(values, period, multiplier)
     
     @staticmethod
+    @cached_indicator('TechnicalAnalysis.sma')
     def sma(data, period):
         """Calculate Simple Moving Average"""
-        result = []
-        for i in range(len(data)):
-            if i < period - 1:
-                result.append(float('nan'))
-            else:
-                avg = sum(data[i-period+1:i+1]) / period
-                result.append(avg)
-        return result
+        return _rolling_mean(_to_float_array(data), period)
     
     @staticmethod
+    @cached_indicator('TechnicalAnalysis.rsi')
     def rsi(data, period=14):
-        """Calculate Relative Strength Index"""
-        if len(data) < period + 1:
-            return [float('nan')] * len(data)
-        
-        deltas = [data[i] - data[i-1] for i in range(1, len(data))]
-        gains = [delta if delta > 0 else 0 for delta in deltas]
-        losses = [-delta if delta < 0 else 0 for delta in deltas]
+        """Calculate Relative Strength Index (Wilder smoothing)"""
+        values = _to_float_array(data)
+        if len(values) < period + 1:
+            return np.full(len(values), np.nan)
         
-        # Calculate initial average gain and loss
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
+        deltas = np.diff(values)
+        gains = np.where(deltas > 0, deltas, 0.0)
+        losses = np.where(deltas < 0, -deltas, 0.0)
         
-        result = [float('nan')] * (period)
+        avg_gain = _seeded_recursive_average(gains, period, 1 / period)[period - 1:]
+        avg_loss = _seeded_recursive_average(losses, period, 1 / period)[period - 1:]
         
-        for i in range(period, len(data)):
-            if i == period:
-                rs = avg_gain / avg_loss if avg_loss != 0 else 100
-            else:
-                gain = gains[i-1]
-                loss = losses[i-1]
-                avg_gain = ((avg_gain * (period - 1)) + gain) / period
-                avg_loss = ((avg_loss * (period - 1)) + loss) / period
-                rs = avg_gain / avg_loss if avg_loss != 0 else 100
-            
-            rsi = 100 - (100 / (1 + rs))
-            result.append(rsi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.where(avg_loss != 0, avg_gain / avg_loss, 100.0)
+        rsi = 100 - (100 / (1 + rs))
         
-        return result
+        return np.concatenate((np.full(period, np.nan), rsi))
     
     @staticmethod
+    @cached_indicator('TechnicalAnalysis.atr')
     def atr(high, low, close, period=14):
         """Calculate Average True Range"""
         if len(high) < 2:
-            return [float('nan')] * len(high)
+            return np.full(len(high), np.nan)
         
-        tr_values = []
-        for i in range(len(high)):
-            if i == 0:
-                tr = high[i] - low[i]
-            else:
-                tr1 = high[i] - low[i]
-                tr2 = abs(high[i] - close[i-1])
-                tr3 = abs(low[i] - close[i-1])
-                tr = max(tr1, tr2, tr3)
-            tr_values.append(tr)
+        tr_values = _true_range(_to_float_array(high), _to_float_array(low), _to_float_array(close))
         
         # Calculate ATR using SMA of TR values
-        atr_values = []
-        for i in range(len(tr_values)):
-            if i < period - 1:
-                atr_values.append(float('nan'))
-            else:
-                atr = sum(tr_values[i-period+1:i+1]) / period
-                atr_values.append(atr)
-        
-        return atr_values
+        return _rolling_mean(tr_values, period)
     
     @staticmethod
+    @cached_indicator('TechnicalAnalysis.macd')
     def macd(data, fast_period=12, slow_period=26, signal_period=9):
         """Calculate MACD"""
         fast_ema = TechnicalAnalysis.ema(data, fast_period)
@@ -133,6 +140,7 @@ class TechnicalAnalysis:
         }
     
     @staticmethod
+    @cached_indicator('TechnicalAnalysis.bollinger_bands')
     def bollinger_bands(data, period=20, std_dev=2):
         """Calculate Bollinger Bands"""
         sma = TechnicalAnalysis.sma(data, period)
@@ -158,6 +166,7 @@ class TechnicalAnalysis:
         }
     
     @staticmethod
+    @cached_indicator('TechnicalAnalysis.stochastic')
     def stochastic(high, low, close, k_period=14, d_period=3):
         """Calculate Stochastic Oscillator"""
         k_values = []
@@ -184,6 +193,7 @@ class TechnicalAnalysis:
         }
     
     @staticmethod
+    @cached_indicator('TechnicalAnalysis.williams_r')
     def williams_r(high, low, close, period=14):
         """Calculate Williams %R"""
         result = []
@@ -227,6 +237,7 @@ class AdvancedTechnicalAnalysis:
         return TechnicalAnalysis.williams_r(high, low, close, period)
     
     @staticmethod
+    @cached_indicator('AdvancedTechnicalAnalysis.cci')
     def cci(high, low, close, period=20):
         """Calculate Commodity Channel Index"""
         typical_price = [(h + l + c) / 3 for h, l, c in zip(high, low, close)]
@@ -24,11 +24,14 @@ export interface PyodideInstance {
 }
 
 export interface MarketData {
-  open: number[];
-  high: number[];
-  low: number[];
-  close: number[];
-  volume: number[];
+  open: number[] | Float64Array;
+  high: number[] | Float64Array;
+  low: number[] | Float64Array;
+  close: number[] | Float64Array;
+  volume: number[] | Float64Array;
+  // Optional bar open times (epoch seconds/milliseconds or date strings, UTC); strategies
+  // then see a 'Time' column and MultiTimeframe resamples by clock time
+  time?: (number | string)[] | Float64Array;
 }
 
 export interface StrategyResult {
@@ -37,6 +40,7 @@ export interface StrategyResult {
   direction?: string[];
   trade_direction?: string[];
   error?: string;
+  perf?: StrategyPerf;
   // Optional technical indicators that strategies might return
   rsi?: number[];
   ema_fast?: number[];
@@ -48,3 +52,94 @@ export interface StrategyResult {
   avg_atr?: number[];
   [key: string]: any;
 }
+
+// Result transport: 'dict' returns Python lists, 'packed' returns typed buffers
+// (uint8 entry/exit, int8 direction codes 1/-1/0, float indicators) and
+// 'bitpacked' additionally packs entry/exit 8 bars per byte (MSB first)
+export type ResultFormat = 'dict' | 'packed' | 'bitpacked';
+
+export interface ResultTransportOptions {
+  resultFormat?: ResultFormat;
+  indicatorDtype?: 'float32' | 'float64';
+}
+
+export interface ExecutionOptions extends ResultTransportOptions {
+  // false drops the Python progress prints (they cost time on large runs)
+  verbose?: boolean;
+  // Attach the perf block (default true); profileMemory adds tracemalloc peak memory
+  profile?: boolean;
+  profileMemory?: boolean;
+}
+
+export interface StageTiming {
+  wall_seconds: number;
+  cpu_seconds: number;
+}
+
+export interface StrategyPerf {
+  bars: number;
+  wall_seconds: number;
+  cpu_seconds: number;
+  bars_per_second: number;
+  // convert, dataframe, strategy, signals, padding
+  stages: Record<string, StageTiming>;
+  // Inclusive timings per cached indicator
+  indicators: Record<string, { calls: number; cache_hits: number; seconds: number }>;
+  peak_memory_bytes: number | null;
+}
+
+export interface PackedStrategyResult {
+  format: 'packed';
+  length: number;
+  bitpacked: boolean;
+  entry: Uint8Array;
+  exit: Uint8Array;
+  direction: Int8Array;
+  indicators: Record<string, Float32Array | Float64Array>;
+  reverse_signals_applied?: boolean;
+  validation_passed?: boolean;
+  validation_message?: string;
+  auto_generated_direction?: boolean;
+  signal_stats?: Record<string, number>;
+  error?: string;
+  [key: string]: any;
+}
+
+// Batch evaluation of several strategies on one dataset (execute_strategy_batch)
+export type BatchMode = 'normal' | 'reversed';
+
+export interface BatchStrategyEntry {
+  name: string;
+  code: string;
+  // Keyword arguments for strategy_logic
+  params?: Record<string, any>;
+}
+
+export interface BatchComparisonRow {
+  strategy: string;
+  mode: BatchMode;
+  total_entries: number;
+  buy_signals: number;
+  sell_signals: number;
+  // Reversed result derived from the forward run (the strategy does not take reverse_signals)
+  derived: boolean;
+  seconds: number;
+  indicator_hits: number;
+  indicator_misses: number;
+  error: string | null;
+}
+
+export interface StrategyBatchResult {
+  results: Record<string, Partial<Record<BatchMode, StrategyResult>>>;
+  comparison: BatchComparisonRow[];
+  bars: number;
+  perf?: {
+    wall_seconds: number;
+    convert_seconds: number;
+    strategy_runs: number;
+    derived_results: number;
+    indicator_hits: number;
+    indicator_misses: number;
+  };
+  error?: string;
+}
@@ -1,5 +1,5 @@
 
-import type { StrategyResult, MarketData } from './python/types';
+import type { StrategyResult, MarketData, ExecutionOptions, BatchMode, BatchStrategyEntry, StrategyBatchResult } from './python/types';
 import { PyodideLoader } from './python/pyodideLoader';
 import type { PyodideInstance } from './python/types';
 import { ExecutionManager } from './python/executionManager';
@@ -14,7 +14,7 @@ export class PythonExecutor {
     return pyodide;
   }
 
-  static async executeStrategy(code: string, marketData: MarketData): Promise<StrategyResult> {
+  static async executeStrategy(code: string, marketData: MarketData, options: ExecutionOptions = {}): Promise<StrategyResult> {
     try {
       console.log('🐍 Starting Python strategy execution...');
       console.log('📊 Market data input:', {
@@ -52,7 +52,7 @@ export class PythonExecutor {
       // Execute strategy
       let pythonResult;
       try {
-        pythonResult = await ExecutionManager.executePythonStrategy(pyodide, marketData, code);
+        pythonResult = await ExecutionManager.executePythonStrategy(pyodide, marketData, code, options);
       } catch (executionError) {
         console.error('❌ Strategy execution failed:', executionError);
         return ResultProcessor.createFallbackResult(
@@ -92,6 +92,33 @@ export class PythonExecutor {
     }
   }
 
+  // Several strategies on one dataset: data converted once, shared indicators computed once,
+  // reversed results derived from the forward run where the strategy allows it
+  static async executeStrategyBatch(
+    strategies: BatchStrategyEntry[],
+    marketData: MarketData,
+    modes: BatchMode[] = ['normal', 'reversed'],
+    options: Pick<ExecutionOptions, 'verbose'> = {}
+  ): Promise<StrategyBatchResult> {
+    const validation = DataConverter.validateMarketData(marketData);
+    if (!validation.isValid) {
+      return { results: {}, comparison: [], bars: 0, error: validation.error };
+    }
+
+    try {
+      const pyodide = await this.initializePyodide();
+      return await ExecutionManager.executePythonStrategyBatch(pyodide, marketData, strategies, modes, options);
+    } catch (error) {
+      console.error('❌ Strategy batch execution failed:', error);
+      return {
+        results: {},
+        comparison: [],
+        bars: marketData.close?.length || 0,
+        error: `Strategy batch execution failed: ${error instanceof Error ? error.message : 'Unknown error'}`
+      };
+    }
+  }
+
   static async isAvailable(): Promise<boolean> {
     try {
       console.log('🔍 Checking Python environment availability...');
@@ -119,4 +146,4 @@ export class PythonExecutor {
 }
 
 // Re-export types for backward compatibility
-export type { StrategyResult, MarketData };
+export type { StrategyResult, MarketData, StrategyBatchResult };
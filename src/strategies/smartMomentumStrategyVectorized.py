@@ -0,0 +1,100 @@
+# Smart Momentum Strategy - Vectorized
+# Same signals as smartMomentumStrategyFixed.py, computed with NumPy masks instead of a per-bar loop.
+# Returns NumPy arrays (vectorized strategy contract): boolean entry/exit masks and
+# object arrays of "BUY"/"SELL"/None for direction. `np`, the TechnicalAnalysis
+# classes and MultiTimeframe are provided by the execution environment.
+
+def strategy_logic(data, reverse_signals=False, short_period=21, long_period=55, trend_period=200,
+                   rsi_period=14, atr_period=14, volatility_multiplier=1.2,
+                   rsi_long_band=(45, 75), rsi_short_band=(25, 55), trend_timeframe=None, base_timeframe=None):
+    """
+    Enhanced momentum strategy with AUTO-DETECTED directional signals (vectorized):
+    - Multiple timeframe trend filtering
+    - Volatility filtering
+    - AUTOMATIC BUY/SELL direction detection from conditions
+    - Reverse signal testing capability
+
+    The keyword parameters default to the values of smartMomentumStrategyFixed.py
+    and can be swept with strategy_optimizer.py.
+
+    trend_timeframe (e.g. 'H1', 'H4', 'D') replaces the base-timeframe trend EMA with
+    EMA(trend_period) of real higher-timeframe bars, taken from completed bars only.
+    base_timeframe is needed when the data carries no bar times.
+    """
+
+    close = data['Close'].to_numpy(dtype=float)
+    high = data['High'].to_numpy(dtype=float)
+    low = data['Low'].to_numpy(dtype=float)
+    n = len(close)
+
+    # Calculate all technical indicators (as read-only float arrays, no list conversion)
+    short_ema = TechnicalAnalysis.ema(close, short_period, as_array=True)
+    long_ema = TechnicalAnalysis.ema(close, long_period, as_array=True)
+    if trend_timeframe:
+        # Higher timeframe trend from resampled bars, aligned to base bars without look-ahead
+        daily_ema = MultiTimeframe(data, base_timeframe=base_timeframe).indicator(trend_timeframe, 'ema', trend_period)
+    else:
+        daily_ema = TechnicalAnalysis.ema(close, trend_period, as_array=True)  # Higher timeframe trend
+    rsi = TechnicalAnalysis.rsi(close, rsi_period, as_array=True)
+
+    # Volatility filter using ATR
+    atr = TechnicalAnalysis.atr(high, low, close, atr_period, as_array=True)
+    avg_atr = TechnicalAnalysis.sma(atr, 20, as_array=True)
+
+    def shifted(values, periods):
+        result = np.full(n, np.nan)
+        if periods < n:
+            result[periods:] = values[:n - periods]
+        return result
+
+    # Need enough data for all indicators
+    tradable = np.arange(n) >= max(short_period, long_period, trend_period)
+
+    # Higher timeframe trend filter
+    weekly_trend_up = close > daily_ema
+    weekly_trend_down = close < daily_ema
+
+    # Volatility filter - only trade during high volatility (NaN compares as False)
+    high_volatility = atr > avg_atr * volatility_multiplier
+
+    # Enhanced momentum conditions
+    short_ema_prev = shifted(short_ema, 1)
+    short_ema_prev5 = shifted(short_ema, 5)
+    trend_up = (short_ema > long_ema) & (short_ema_prev > short_ema_prev5)
+    trend_down = (short_ema < long_ema) & (short_ema_prev < short_ema_prev5)
+    momentum_strong_up = close > short_ema * 1.001
+    momentum_strong_down = close < short_ema * 0.999
+    rsi_good_long = (rsi_long_band[0] < rsi) & (rsi < rsi_long_band[1])
+    rsi_good_short = (rsi_short_band[0] < rsi) & (rsi < rsi_short_band[1])
+
+    base_long_entry = trend_up & momentum_strong_up & rsi_good_long & weekly_trend_up & high_volatility & tradable
+    base_short_entry = trend_down & momentum_strong_down & rsi_good_short & weekly_trend_down & high_volatility & tradable
+
+    # Apply reverse signals if enabled (for testing opposite direction)
+    if reverse_signals:
+        actual_long, actual_short = base_short_entry, base_long_entry
+    else:
+        actual_long, actual_short = base_long_entry, base_short_entry
+
+    entry = actual_long | actual_short
+    direction = np.full(n, None, dtype='O')
+    direction[actual_short] = "SELL"
+    direction[actual_long] = "BUY"
+
+    # Conservative exit conditions
+    exit = ((rsi > 80) | (rsi < 20) | ~high_volatility) & tradable
+
+    return {
+        'entry': entry,
+        'exit': exit,
+        'direction': direction,  # AUTO-DETECTED BUY/SELL directions
+        'trade_direction': direction.copy(),  # Additional compatibility field
+        'short_ema': short_ema,
+        'long_ema': long_ema,
+        'daily_ema': daily_ema,
+        'rsi': rsi,
+        'atr': atr,
+        'avg_atr': avg_atr,
+        'reverse_signals_applied': reverse_signals,
+        'note': 'Strategy with AUTO-DETECTED BUY/SELL directions for OANDA forward trading'
+    }
@@ -0,0 +1,120 @@
+# Williams Fractal + Triple EMA Scalper Strategy - Vectorized
+# Same signals as williamsFractalEMAScalper.py, computed with NumPy masks instead of per-bar loops.
+# Fractals come from shifted-window comparisons and the 5-bar fractal lookback is a rolling "any",
+# so the cost no longer grows with a nested window loop per bar.
+# Returns NumPy arrays (vectorized strategy contract); `np` and TechnicalAnalysis are provided
+# by the execution environment.
+
+def strategy_logic(data, reverse_signals=False, fast_period=20, mid_period=50, slow_period=100, rr_ratio=1.5):
+    # Keyword parameters default to the values of williamsFractalEMAScalper.py (sweepable with strategy_optimizer.py)
+    close = data['Close'].to_numpy(dtype=float)
+    high = data['High'].to_numpy(dtype=float)
+    low = data['Low'].to_numpy(dtype=float)
+    n = len(close)
+
+    # Calculate Triple EMAs exactly as specified (as read-only float arrays)
+    ema_20 = TechnicalAnalysis.ema(close, fast_period, as_array=True)  # Green
+    ema_50 = TechnicalAnalysis.ema(close, mid_period, as_array=True)  # Yellow
+    ema_100 = TechnicalAnalysis.ema(close, slow_period, as_array=True)  # Red
+
+    # Williams Fractals implementation (period = 2)
+    def detect_fractals(highs, lows, period=2):
+        # A bar is a fractal high when no other bar in the +/- period window has a high >= its high
+        # (comparisons with NaN are False, exactly like the loop version)
+        high_blocked = np.zeros(n, dtype=bool)
+        low_blocked = np.zeros(n, dtype=bool)
+        for offset in range(1, period + 1):
+            high_blocked[offset:] |= highs[:-offset] >= highs[offset:]
+            high_blocked[:-offset] |= highs[offset:] >= highs[:-offset]
+            low_blocked[offset:] |= lows[:-offset] <= lows[offset:]
+            low_blocked[:-offset] |= lows[offset:] <= lows[:-offset]
+
+        in_range = np.zeros(n, dtype=bool)
+        in_range[period:max(period, n - period)] = True
+        return in_range & ~high_blocked, in_range & ~low_blocked
+
+    def rolling_any(mask, window):
+        # any(mask[max(0, i-window+1):i+1]) for every i
+        counts = np.cumsum(mask, dtype=np.int64)
+        lagged = np.zeros(n, dtype=np.int64)
+        if window < n:
+            lagged[window:] = counts[:-window]
+        return (counts - lagged) > 0
+
+    fractal_highs, fractal_lows = detect_fractals(high, low, 2)
+
+    # Need enough data for EMA 100 + fractal lookback
+    tradable = np.arange(n) >= slow_period + 5
+
+    # LONG / SHORT EMA order (exactly as specified)
+    long_ema_order = (ema_20 > ema_50) & (ema_50 > ema_100)
+    short_ema_order = (ema_100 > ema_50) & (ema_50 > ema_20)
+
+    # Look back 5 bars for fractals
+    recent_fractal_low = rolling_any(fractal_lows, 6)
+    recent_fractal_high = rolling_any(fractal_highs, 6)
+
+    # LONG ENTRY LOGIC - DO NOT enter if price closes below EMA 100
+    long_branch = tradable & long_ema_order & (close > ema_100)
+    pullback_below_20 = close < ema_20
+    pullback_below_50 = close < ema_50
+    long_entry = long_branch & (pullback_below_20 | pullback_below_50) & recent_fractal_low
+
+    # SHORT ENTRY LOGIC - DO NOT enter if price closes above EMA 100
+    short_branch = tradable & ~long_branch & short_ema_order & (close < ema_100)
+    pullback_above_20 = close > ema_20
+    short_entry = short_branch & pullback_above_20 & recent_fractal_high
+
+    # Stop Loss / Take Profit (Risk-Reward Ratio 1:rr_ratio, default 1.5) for each side
+    long_stop_for_long = np.where(pullback_below_50, ema_100 - 0.0001, ema_50 - 0.0001)
+    long_stop_for_reversed = np.where(close < ema_50, ema_100 - 0.0001, ema_50 - 0.0001)
+    short_stop = ema_50 + 0.0001
+
+    # Apply signal reversal if requested (swap LONG and SHORT)
+    if reverse_signals:
+        is_long = short_entry
+        is_short = long_entry
+        long_stop = long_stop_for_reversed
+    else:
+        is_long = long_entry
+        is_short = short_entry
+        long_stop = long_stop_for_long
+
+    stop_loss_levels = np.zeros(n)
+    take_profit_levels = np.zeros(n)
+    stop_loss_levels[is_long] = long_stop[is_long]
+    stop_loss_levels[is_short] = short_stop[is_short]
+    risk_distance = np.abs(close - stop_loss_levels)
+    take_profit_levels[is_long] = close[is_long] + (rr_ratio * risk_distance[is_long])
+    take_profit_levels[is_short] = close[is_short] - (rr_ratio * risk_distance[is_short])
+
+    trade_type = np.full(n, 'NONE', dtype='O')
+    trade_type[is_long] = 'LONG'
+    trade_type[is_short] = 'SHORT'
+
+    # Final entry signal
+    entry = is_long | is_short
+
+    # Exit conditions - EMA order breakdown or price on the wrong side of EMA 100
+    prev_long = np.zeros(n, dtype=bool)
+    prev_short = np.zeros(n, dtype=bool)
+    prev_long[1:] = is_long[:-1]
+    prev_short[1:] = is_short[:-1]
+    exit = tradable & (
+        (prev_long & (~long_ema_order | (close < ema_100))) |
+        (prev_short & (~short_ema_order | (close > ema_100)))
+    )
+
+    return {
+        'entry': entry,
+        'exit': exit,
+        'ema_20': ema_20,
+        'ema_50': ema_50,
+        'ema_100': ema_100,
+        'fractal_highs': fractal_highs,  # Red arrows
+        'fractal_lows': fractal_lows,    # Green arrows
+        'trade_type': trade_type,
+        'stop_loss_levels': stop_loss_levels,
+        'take_profit_levels': take_profit_levels,
+        'reverse_signals_applied': reverse_signals
+    }
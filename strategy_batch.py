@@ -0,0 +1,223 @@
+"""
+Compare several strategies on one dataset in a single batch.
+
+N strategy sources are evaluated (normal and reversed by default) against the
+same OHLCV series and summarised in one comparison table:
+
+- the market data is converted once; with worker processes each maps it from
+  one shared memory block (SharedMarketData) instead of receiving pickled copies
+- the columns are read-only and fingerprinted once per process
+  (IndicatorCache.pinned_inputs), so an indicator call that several strategies
+  share is computed once per process and then served from the IndicatorCache
+- a strategy whose strategy_logic takes no reverse_signals parameter cannot
+  see the flag, so its reversed result is derived from the forward run instead
+  of running it again (executor.run_strategy_modes); strategies that take
+  reverse_signals may change their logic and are run in both modes
+
+Every result is scored with the NumPy trade simulator (simulation_score) by
+default.
+
+Strategies run in the calling process unless max_workers > 1: one IndicatorCache
+then serves all of them, which is where the sharing pays off. With max_workers > 1
+the strategies are spread over that many worker processes; each worker has its
+own cache, so an indicator is computed once per worker that needs it. That only
+wins when the strategies' own logic, not their common indicators, dominates.
+
+Example:
+    python strategy_batch.py --csv eurusd_m5.csv \\
+        --strategy src/strategies/smartMomentumStrategyVectorized.py \\
+        --strategy src/strategies/williamsFractalEMAScalperVectorized.py
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from embedded_python import load_executor_namespace
+from strategy_optimizer import SharedMarketData, market_data_columns
+from trade_simulator import simulation_score
+
+BATCH_MODES = ('normal', 'reversed')
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _read_only_columns(columns):
+    """Private read-only copies of the columns (so their fingerprints can be pinned)."""
+    frozen = {}
+    for name, values in columns.items():
+        values = np.array(values, dtype=np.float64)
+        values.flags.writeable = False
+        frozen[name] = values
+    return frozen
+
+
+def _init_worker(descriptor, scorer, cache_bytes):
+    executor = load_executor_namespace()
+    if cache_bytes is not None:
+        executor.configure_indicator_cache(max_bytes=cache_bytes)
+    if descriptor is None:
+        shm, data = None, None
+    else:
+        shm, df = SharedMarketData.attach(descriptor)
+        # Views of the shared block; every run builds its own DataFrame over them
+        data = {name: df[name].to_numpy() for name in df.columns}
+    _worker.update({
+        'executor': executor,
+        'shm': shm,
+        'data': data,
+        'columns': None if data is None else market_data_columns(data),
+        'scorer': scorer
+    })
+
+
+def _evaluate_strategy(entry, modes, keep_results):
+    """Rows (one per mode) for one strategy entry; with keep_results also {mode: processed}."""
+    executor = _worker['executor']
+    data = _worker['data']
+    columns = _worker['columns']
+    scorer = _worker['scorer']
+    # The executor narrates every run; keep the workers quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        with executor.INDICATOR_CACHE.pinned_inputs(columns.values()):
+            results, runs = executor.run_strategy_modes(entry['code'], data, modes, entry['params'])
+    rows = []
+    for mode in modes:
+        row = executor.comparison_row(entry['name'], mode, results[mode], runs[mode])
+        if not row['error']:
+            started = time.perf_counter()
+            row.update(scorer(columns, results[mode]))
+            row['score_seconds'] = time.perf_counter() - started
+        rows.append(row)
+    return rows, (results if keep_results else None)
+
+
+class StrategyBatch:
+    """
+    Evaluate several strategies ({name: code}, [code, ...] or [{'name', 'code', 'params'}, ...])
+    on one dataset and rank them by score_key.
+
+    max_workers=1 (the default) evaluates every strategy in the calling process with
+    one shared indicator cache; max_workers > 1 runs strategies in parallel worker
+    processes, each with its own cache (indicators shared across workers are
+    computed once per worker). keep_results=True also keeps the processed signals of
+    every strategy and mode in self.signals[name][mode].
+    """
+
+    def __init__(self, strategies, data, max_workers=1, modes=BATCH_MODES, scorer=simulation_score,
+                 score_key='total_return', cache_bytes=None, keep_results=False):
+        self.executor = load_executor_namespace()
+        self.entries = self.executor.batch_strategy_entries(strategies)
+        self.data = data
+        # More workers than strategies would only start idle processes
+        self.max_workers = max(1, min(max_workers or 1, len(self.entries)))
+        self.modes = tuple(modes)
+        self.scorer = scorer
+        self.score_key = score_key
+        self.cache_bytes = cache_bytes
+        self.keep_results = keep_results
+        self.results = []
+        self.signals = {}
+
+    def _collect(self, entry, outcome):
+        rows, results = outcome
+        if results is not None:
+            self.signals[entry['name']] = results
+        self.results.extend(rows)
+        return rows
+
+    def iter_results(self):
+        """Yield comparison rows as soon as each strategy is evaluated (all its modes at once)."""
+        self.results = []
+        self.signals = {}
+
+        if self.max_workers == 1:
+            _init_worker(None, self.scorer, self.cache_bytes)
+            _worker['data'] = _read_only_columns(market_data_columns(self.data))
+            _worker['columns'] = market_data_columns(_worker['data'])
+            for entry in self.entries:
+                yield from self._collect(entry, _evaluate_strategy(entry, self.modes, self.keep_results))
+            return
+
+        with SharedMarketData(self.data) as shared:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(shared.descriptor, self.scorer, self.cache_bytes)) as pool:
+                futures = {pool.submit(_evaluate_strategy, entry, self.modes, self.keep_results): entry
+                           for entry in self.entries}
+                for future in as_completed(futures):
+                    yield from self._collect(futures[future], future.result())
+
+    def comparison(self, top=None):
+        """Results so far as a DataFrame ranked by score_key (best first)."""
+        table = pd.DataFrame(self.results)
+        if table.empty or self.score_key not in table:
+            return table
+        table = table.sort_values(self.score_key, ascending=False, na_position='last', kind='stable').reset_index(drop=True)
+        table.insert(0, 'rank', np.arange(1, len(table) + 1))
+        return table.head(top) if top else table
+
+    def run(self, on_result=None):
+        """Evaluate every strategy; on_result(row, batch) is called as rows arrive. Returns the comparison."""
+        for row in self.iter_results():
+            if on_result is not None:
+                on_result(row, self)
+        return self.comparison()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare several backtest strategies on one dataset')
+    parser.add_argument('--strategy', action='append', required=True,
+                        help='Strategy source file defining strategy_logic (repeatable)')
+    parser.add_argument('--csv', help='CSV with open/high/low/close(/volume) columns')
+    parser.add_argument('--store', help='CandleStore root directory (with --instrument and --granularity)')
+    parser.add_argument('--instrument')
+    parser.add_argument('--granularity', default='M1')
+    parser.add_argument('--modes', default=','.join(BATCH_MODES), help='Comma separated: normal,reversed')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes (default 1: in-process, one indicator cache for all strategies)')
+    parser.add_argument('--score', default='total_return')
+    parser.add_argument('--output', help='Write the comparison table to this CSV')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    strategies = {}
+    for path in args.strategy:
+        with open(path) as f:
+            strategies[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    if args.csv:
+        data = pd.read_csv(args.csv)
+    elif args.store and args.instrument:
+        from candle_store import CandleStore
+        data = CandleStore(args.store).load(args.instrument, args.granularity)
+    else:
+        parser.error('Provide --csv or --store with --instrument')
+
+    modes = [mode for mode in args.modes.split(',') if mode]
+    batch = StrategyBatch(strategies, data, max_workers=args.workers, modes=modes, score_key=args.score)
+
+    started = time.perf_counter()
+
+    def report(row, b):
+        derived = ', derived' if row['derived'] else ''
+        logging.info(f"{row['strategy']} ({row['mode']}{derived}): {row.get(b.score_key, row.get('error'))} "
+                     f"in {row['seconds']:.2f}s")
+
+    comparison = batch.run(on_result=report)
+    logging.info(f"Batch finished: {len(strategies)} strategies x {len(modes)} modes "
+                 f"in {time.perf_counter() - started:.1f}s")
+    print(comparison.to_string(index=False))
+    if args.output:
+        comparison.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,384 @@
+"""
+Parameter sweeps for backtest strategies over a process pool.
+
+A strategy (the same source the browser backtester runs) is evaluated for
+every point of a parameter grid or random sample. Points are fanned out
+across a ProcessPoolExecutor; the OHLCV columns live in one shared memory
+block that every worker maps instead of receiving a pickled copy, and each
+worker compiles the strategy once. Indicators shared across grid points are
+computed once per worker and then served from the executor's IndicatorCache
+(points are dispatched in batches grouped by `group_by`, so points that share
+indicator parameters land on the same worker). Results stream back as they
+complete and are kept as a ranked table. By default every point is scored
+with the NumPy trade simulator (trade_simulator.simulation_score).
+
+Strategy parameters are passed to strategy_logic as keyword arguments, e.g.
+strategy_logic(data, reverse_signals=False, fast_period=20, rr_ratio=1.5).
+
+Example:
+    python strategy_optimizer.py --strategy src/strategies/williamsFractalEMAScalperVectorized.py \\
+        --csv eurusd_m5.csv --param fast_period=10,20,30 --param rr_ratio=1.0,1.5,2.0
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from embedded_python import load_executor_namespace
+from trade_simulator import simulation_score
+
+MARKET_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class ParameterGrid:
+    """Cartesian product of {name: [values]}; the last parameter varies fastest."""
+
+    def __init__(self, space):
+        self.space = {name: list(values) for name, values in space.items()}
+
+    def __len__(self):
+        total = 1
+        for values in self.space.values():
+            total *= len(values)
+        return total
+
+    def __iter__(self):
+        names = list(self.space)
+        for values in itertools.product(*(self.space[name] for name in names)):
+            yield dict(zip(names, values))
+
+
+class RandomSampler:
+    """
+    n_samples random points from {name: [choices] or (low, high)}.
+    (low, high) tuples of ints sample integers, otherwise floats, both inclusive.
+    """
+
+    def __init__(self, space, n_samples, seed=None):
+        self.space = space
+        self.n_samples = n_samples
+        self.seed = seed
+
+    def __len__(self):
+        return self.n_samples
+
+    def __iter__(self):
+        rng = random.Random(self.seed)
+        for _ in range(self.n_samples):
+            point = {}
+            for name, spec in self.space.items():
+                if isinstance(spec, tuple) and len(spec) == 2:
+                    low, high = spec
+                    point[name] = rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) else rng.uniform(low, high)
+                else:
+                    point[name] = rng.choice(list(spec))
+            yield point
+
+
+def market_data_columns(data):
+    """
+    OHLCV float64 columns from a DataFrame, a market-data dict ('open', ... or 'Open', ...)
+    or CandleSeries.read() output.
+    """
+    lookup = {str(key).lower(): key for key in data.keys()}
+    columns = {}
+    for name in MARKET_COLUMNS:
+        key = lookup.get(name.lower())
+        if key is None:
+            if name == 'Volume':
+                continue
+            raise ValueError(f"Market data is missing the '{name}' column")
+        columns[name] = np.asarray(data[key], dtype=np.float64)
+    return columns
+
+
+class SharedMarketData:
+    """OHLCV matrix in one shared memory block that worker processes attach to by name."""
+
+    def __init__(self, data):
+        columns = market_data_columns(data)
+        self.names = tuple(columns)
+        self.length = len(columns['Close'])
+        shape = (len(self.names), self.length)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=self._shm.buf)
+        for row, name in enumerate(self.names):
+            matrix[row] = columns[name]
+        self.descriptor = (self._shm.name, self.names, self.length)
+
+    @staticmethod
+    def attach(descriptor):
+        """Map the block and wrap it in a DataFrame without copying. Returns (shm, df)."""
+        name, names, length = descriptor
+        shm = shared_memory.SharedMemory(name=name)
+        matrix = np.ndarray((len(names), length), dtype=np.float64, buffer=shm.buf)
+        matrix.flags.writeable = False
+        return shm, pd.DataFrame({column: matrix[row] for row, column in enumerate(names)}, copy=False)
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def forward_return_score(columns, processed, horizon=10):
+    """
+    Quick scorer: return of every entry held for `horizon` bars in its direction.
+
+    Scorers take (columns, processed): OHLCV arrays keyed 'Open' ... 'Close' and the
+    processed signals. They must be module-level functions (or functools.partial of one)
+    so worker processes can unpickle them.
+    """
+    close = columns['Close']
+    entry = np.asarray(processed.get('entry', []), dtype=bool)
+    direction = processed.get('direction', [])
+    sign = np.array([1.0 if d == 'BUY' else -1.0 if d == 'SELL' else 0.0 for d in direction]) if len(direction) else np.zeros(len(entry))
+    idx = np.flatnonzero(entry[:len(close) - horizon] & (sign[:len(close) - horizon] != 0)) if len(close) > horizon else np.empty(0, dtype=int)
+    returns = sign[idx] * (close[idx + horizon] / close[idx] - 1.0) if len(idx) else np.empty(0)
+    return {
+        'trades': int(len(idx)),
+        'buy_signals': int((sign[idx] > 0).sum()),
+        'sell_signals': int((sign[idx] < 0).sum()),
+        'total_return': float(returns.sum()),
+        'mean_return': float(returns.mean()) if len(returns) else 0.0,
+        'hit_rate': float((returns > 0).mean()) if len(returns) else 0.0
+    }
+
+
+SIGNAL_KEYS = ('entry', 'exit', 'direction', 'entry_type', 'trade_direction', 'stop_loss_levels', 'take_profit_levels')
+
+
+def slice_signals(processed, start, end):
+    """Signal arrays of a processed result restricted to bars [start, end)."""
+    return {key: processed[key][start:end] for key in SIGNAL_KEYS if key in processed}
+
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _init_worker(descriptor, strategy_code, reverse_signals, scorer, cache_bytes, segments=None):
+    executor = load_executor_namespace()
+    if cache_bytes is not None:
+        executor.configure_indicator_cache(max_bytes=cache_bytes)
+    if descriptor is None:
+        shm, df = None, None
+    else:
+        shm, df = SharedMarketData.attach(descriptor)
+    _worker.update({
+        'executor': executor,
+        'shm': shm,
+        'df': df,
+        'columns': None if df is None else market_data_columns(df),
+        'code': strategy_code,
+        'reverse_signals': reverse_signals,
+        'scorer': scorer,
+        'segments': segments
+    })
+
+
+def _evaluate_point(params):
+    executor = _worker['executor']
+    df = _worker['df']
+    reverse_signals = _worker['reverse_signals']
+    started = time.perf_counter()
+    # The executor narrates every run; keep the workers quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        # The strategy registry compiles the source once per worker; later points reuse it
+        result = executor.run_registered_strategy(_worker['code'], df, reverse_signals, params)
+        if isinstance(result, dict) and not result.get('error'):
+            signals = {key: result[key] for key in SIGNAL_KEYS if key in result}
+            result = executor.process_strategy_signals(signals, reverse_signals)
+    columns = _worker['columns']
+    scorer = _worker['scorer']
+    segments = _worker['segments']
+    rows = []
+    if not isinstance(result, dict) or result.get('error'):
+        row = dict(params)
+        row['error'] = result.get('error') if isinstance(result, dict) else 'Invalid strategy result format'
+        rows.append(row)
+    elif segments is None:
+        row = dict(params)
+        row.update(scorer(columns, result))
+        rows.append(row)
+    else:
+        # One run over the whole series, scored per segment: overlapping segments cost no extra strategy runs
+        for start, end in segments:
+            row = dict(params, segment_start=start, segment_end=end)
+            window = {name: values[start:end] for name, values in columns.items()}
+            row.update(scorer(window, slice_signals(result, start, end)))
+            rows.append(row)
+    elapsed = time.perf_counter() - started
+    for row in rows:
+        row['seconds'] = elapsed
+    return rows
+
+
+def _evaluate_batch(batch):
+    return [row for params in batch for row in _evaluate_point(params)]
+
+
+class StrategyOptimizer:
+    """
+    Evaluate a strategy over a parameter sampler (ParameterGrid, RandomSampler or
+    any iterable of parameter dicts) on one dataset, using all cores by default.
+
+    max_workers=1 evaluates in the calling process (no pool, no shared memory).
+    With segments=[(start, end), ...] every point is run once over the whole series
+    and scored on each bar range, giving one row per point and segment.
+    """
+
+    def __init__(self, strategy_code, data, max_workers=None, reverse_signals=False, scorer=simulation_score,
+                 score_key='total_return', group_by=None, batch_size=4, cache_bytes=None, segments=None):
+        self.strategy_code = strategy_code
+        self.data = data
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.reverse_signals = reverse_signals
+        self.scorer = scorer
+        self.score_key = score_key
+        self.group_by = group_by
+        self.batch_size = batch_size
+        self.cache_bytes = cache_bytes
+        self.segments = segments
+        self.results = []
+
+    def _batches(self, points):
+        """Group points sharing the group_by values, then split each group into batches."""
+        if self.group_by:
+            groups = {}
+            for params in points:
+                groups.setdefault(tuple(repr(params.get(name)) for name in self.group_by), []).append(params)
+            ordered = list(groups.values())
+        else:
+            ordered = [points]
+        for group in ordered:
+            for start in range(0, len(group), self.batch_size):
+                yield group[start:start + self.batch_size]
+
+    def iter_results(self, sampler):
+        """Yield result rows (one per point, or per point and segment) as soon as they are evaluated."""
+        points = list(sampler)
+        self.results = []
+        init_args = (self.strategy_code, self.reverse_signals, self.scorer, self.cache_bytes, self.segments)
+
+        if self.max_workers == 1:
+            _init_worker(None, *init_args)
+            _worker['df'] = pd.DataFrame(market_data_columns(self.data))
+            _worker['columns'] = market_data_columns(_worker['df'])
+            for params in points:
+                for row in _evaluate_point(params):
+                    self.results.append(row)
+                    yield row
+            return
+
+        with SharedMarketData(self.data) as shared:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(shared.descriptor,) + init_args) as pool:
+                futures = [pool.submit(_evaluate_batch, batch) for batch in self._batches(points)]
+                for future in as_completed(futures):
+                    for row in future.result():
+                        self.results.append(row)
+                        yield row
+
+    def ranking(self, top=None):
+        """Results so far as a DataFrame ranked by score_key (best first)."""
+        table = pd.DataFrame(self.results)
+        if table.empty or self.score_key not in table:
+            return table
+        table = table.sort_values(self.score_key, ascending=False, na_position='last', kind='stable').reset_index(drop=True)
+        table.insert(0, 'rank', np.arange(1, len(table) + 1))
+        return table.head(top) if top else table
+
+    def run(self, sampler, on_result=None):
+        """Evaluate every point; on_result(row, optimizer) is called as rows arrive. Returns the ranking."""
+        for row in self.iter_results(sampler):
+            if on_result is not None:
+                on_result(row, self)
+        return self.ranking()
+
+
+def _parse_param(text):
+    """'name=1,2,3' -> ('name', [1, 2, 3]) with int/float values where possible."""
+    name, _, raw_values = text.partition('=')
+    values = []
+    for raw in raw_values.split(','):
+        for cast in (int, float):
+            try:
+                values.append(cast(raw))
+                break
+            except ValueError:
+                continue
+        else:
+            values.append(raw)
+    return name.strip(), values
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Grid/random parameter sweep for a backtest strategy')
+    parser.add_argument('--strategy', required=True, help='Strategy source file defining strategy_logic')
+    parser.add_argument('--csv', help='CSV with open/high/low/close(/volume) columns')
+    parser.add_argument('--store', help='CandleStore root directory (with --instrument and --granularity)')
+    parser.add_argument('--instrument')
+    parser.add_argument('--granularity', default='M1')
+    parser.add_argument('--param', action='append', default=[], help='name=v1,v2,... (repeatable)')
+    parser.add_argument('--random', type=int, help='Sample this many random points instead of the full grid')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--group-by', default='', help='Comma separated indicator parameters to batch together')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--reverse', action='store_true')
+    parser.add_argument('--score', default='total_return')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help='Write the full ranking to this CSV')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    with open(args.strategy) as f:
+        strategy_code = f.read()
+    if args.csv:
+        data = pd.read_csv(args.csv)
+    elif args.store and args.instrument:
+        from candle_store import CandleStore
+        data = CandleStore(args.store).load(args.instrument, args.granularity)
+    else:
+        parser.error('Provide --csv or --store with --instrument')
+
+    space = dict(_parse_param(p) for p in args.param)
+    sampler = RandomSampler(space, args.random, args.seed) if args.random else ParameterGrid(space)
+    group_by = [name for name in args.group_by.split(',') if name]
+    optimizer = StrategyOptimizer(strategy_code, data, max_workers=args.workers, reverse_signals=args.reverse,
+                                  score_key=args.score, group_by=group_by or None)
+
+    started = time.perf_counter()
+    total = len(sampler)
+
+    def report(row, opt):
+        best = opt.ranking(top=1)
+        best_score = best.iloc[0][opt.score_key] if opt.score_key in best else None
+        logging.info(f"[{len(opt.results)}/{total}] {row.get(opt.score_key, row.get('error'))} "
+                     f"(best {best_score}) in {row['seconds']:.2f}s")
+
+    ranking = optimizer.run(sampler, on_result=report)
+    logging.info(f"Sweep finished: {total} points in {time.perf_counter() - started:.1f}s")
+    print(ranking.head(args.top).to_string(index=False))
+    if args.output:
+        ranking.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
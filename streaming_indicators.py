@@ -0,0 +1,180 @@
+"""
+Incremental (streaming) indicators for the live runner.
+
+Each indicator is seeded once from history and then updated in O(1) per new
+closed candle. Values match TechnicalAnalysis on the Pyodide side: same NaN
+warm-up, SMA-seeded EMA, Wilder-smoothed RSI and SMA-of-true-range ATR.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+NAN = float('nan')
+
+
+class StreamingIndicator(ABC):
+    """Base class: update() consumes one closed bar and returns the latest value."""
+
+    def __init__(self, period):
+        if period < 1:
+            raise ValueError(f"period must be >= 1, got {period}")
+        self.period = period
+        self.value = NAN
+        self.count = 0
+
+    @property
+    def ready(self):
+        return not math.isnan(self.value)
+
+    @abstractmethod
+    def update(self, *bar):
+        """Consume one closed bar and return the latest value (NaN during warm-up)."""
+
+    def seed(self, history):
+        """Feed historical bars in order; each item is passed to update() as-is (or unpacked if a tuple)."""
+        for bar in history:
+            if isinstance(bar, tuple):
+                self.update(*bar)
+            else:
+                self.update(bar)
+        return self
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average with a running window sum."""
+
+    # Recompute the running sum from the window every N updates to cancel float drift
+    RESYNC_INTERVAL = 1000
+
+    def __init__(self, period):
+        super().__init__(period)
+        self._window = deque(maxlen=period)
+        self._sum = 0.0
+        self._nan_count = 0
+        self._since_resync = 0
+
+    def update(self, value):
+        value = float(value)
+        if len(self._window) == self.period:
+            oldest = self._window[0]
+            if math.isnan(oldest):
+                self._nan_count -= 1
+            else:
+                self._sum -= oldest
+        self._window.append(value)
+        if math.isnan(value):
+            self._nan_count += 1
+        else:
+            self._sum += value
+        self.count += 1
+
+        self._since_resync += 1
+        if self._since_resync >= self.RESYNC_INTERVAL:
+            self._sum = sum(v for v in self._window if not math.isnan(v))
+            self._since_resync = 0
+
+        if len(self._window) < self.period or self._nan_count:
+            self.value = NAN
+        else:
+            self.value = self._sum / self.period
+        return self.value
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average seeded with the SMA of the first `period` values."""
+
+    def __init__(self, period):
+        super().__init__(period)
+        self.multiplier = 2 / (period + 1)
+        self._seed_sum = 0.0
+
+    def update(self, value):
+        value = float(value)
+        self.count += 1
+        if self.count < self.period:
+            self._seed_sum += value
+        elif self.count == self.period:
+            self.value = (self._seed_sum + value) / self.period
+        else:
+            self.value = (value * self.multiplier) + (self.value * (1 - self.multiplier))
+        return self.value
+
+
+class RSI(StreamingIndicator):
+    """Relative Strength Index with Wilder smoothing."""
+
+    def __init__(self, period=14):
+        super().__init__(period)
+        self._prev_close = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._deltas = 0
+
+    def update(self, close):
+        close = float(close)
+        self.count += 1
+        if self._prev_close is None:
+            self._prev_close = close
+            return self.value
+
+        delta = close - self._prev_close
+        self._prev_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self._deltas += 1
+
+        if self._deltas < self.period:
+            self._avg_gain += gain
+            self._avg_loss += loss
+            return self.value
+        if self._deltas == self.period:
+            self._avg_gain = (self._avg_gain + gain) / self.period
+            self._avg_loss = (self._avg_loss + loss) / self.period
+        else:
+            self._avg_gain = ((self._avg_gain * (self.period - 1)) + gain) / self.period
+            self._avg_loss = ((self._avg_loss * (self.period - 1)) + loss) / self.period
+
+        rs = self._avg_gain / self._avg_loss if self._avg_loss != 0 else 100
+        self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+
+class ATR(StreamingIndicator):
+    """Average True Range (simple average of true range, like TechnicalAnalysis.atr)."""
+
+    def __init__(self, period=14):
+        super().__init__(period)
+        self._tr_average = SMA(period)
+        self._prev_close = None
+
+    def update(self, high, low, close):
+        high, low, close = float(high), float(low), float(close)
+        true_range = high - low
+        if self._prev_close is not None:
+            true_range = max(true_range, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.count += 1
+        self.value = self._tr_average.update(true_range)
+        return self.value
+
+
+class CrossoverDetector:
+    """Detects fast/slow line crossovers from consecutive (fast, slow) updates."""
+
+    def __init__(self):
+        self.previous = None
+        self.signal = None
+
+    def update(self, fast, slow):
+        """Returns 'BUY' on an upward cross, 'SELL' on a downward cross, else None."""
+        signal = None
+        if self.previous is not None:
+            prev_fast, prev_slow = self.previous
+            if prev_fast <= prev_slow and fast > slow:
+                signal = 'BUY'
+            elif prev_fast >= prev_slow and fast < slow:
+                signal = 'SELL'
+        self.previous = (fast, slow)
+        self.signal = signal
+        return signal
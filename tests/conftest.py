@@ -0,0 +1,65 @@
+"""
+Shared fixtures: the executor built from src/services/python, the reference
+(pre-vectorization) indicator sources kept in tests/reference and recorded
+OANDA data in tests/fixtures.
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from embedded_python import load_executor_namespace, load_python_sources  # noqa: E402
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REFERENCE_DIR = os.path.join(TESTS_DIR, 'reference')
+FIXTURES_DIR = os.path.join(TESTS_DIR, 'fixtures')
+
+
+@pytest.fixture(scope='session')
+def executor():
+    return load_executor_namespace()
+
+
+@pytest.fixture(scope='session')
+def reference_sources():
+    return load_python_sources(REFERENCE_DIR)
+
+
+def exec_source(source, name='<reference>'):
+    """Namespace of an embedded source executed on its own."""
+    namespace = {}
+    exec(compile(source, name, 'exec'), namespace)
+    return namespace
+
+
+def random_walk(n, seed=0, start=1.1, scale=0.001):
+    """Close prices plus high/low around them."""
+    rng = np.random.default_rng(seed)
+    close = start + np.cumsum(rng.normal(0, scale, n))
+    spread = np.abs(rng.normal(0, scale, n))
+    return {'high': close + spread, 'low': close - spread, 'close': close}
+
+
+def assert_same_values(actual, expected, rtol=1e-9, atol=1e-12):
+    """Element-wise equality with NaN == NaN (lists, arrays, dicts of them or scalars)."""
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected)
+        for key in expected:
+            assert_same_values(actual[key], expected[key], rtol, atol)
+        return
+    if isinstance(expected, (list, tuple, np.ndarray)):
+        assert len(actual) == len(expected)
+        np.testing.assert_allclose(np.asarray(actual, dtype=np.float64), np.asarray(expected, dtype=np.float64),
+                                   rtol=rtol, atol=atol, equal_nan=True)
+        return
+    if isinstance(expected, float) and math.isnan(expected):
+        assert math.isnan(actual)
+    else:
+        assert actual == pytest.approx(expected, rel=rtol, abs=atol)
@@ -0,0 +1,82 @@
+"""Next candle close under OANDA's dailyAlignment, and the scheduler's due granularities."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from candle_scheduler import CandleCloseScheduler, Cooldown, daily_alignment_offset, next_candle_close
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def test_next_close_is_strictly_after_now():
+    assert next_candle_close('M5', utc(2026, 7, 1, 10, 2, 30)) == utc(2026, 7, 1, 10, 5)
+    assert next_candle_close('M5', utc(2026, 7, 1, 10, 5)) == utc(2026, 7, 1, 10, 10)
+    assert next_candle_close('M1', utc(2026, 7, 1, 10, 5, 59) + 0.5) == utc(2026, 7, 1, 10, 6)
+
+
+@pytest.mark.parametrize('now,expected', [
+    # New York summer time (UTC-4): the trading day starts at 21:00 UTC
+    (utc(2026, 7, 1, 10, 0), utc(2026, 7, 1, 21, 0)),
+    (utc(2026, 7, 1, 21, 0), utc(2026, 7, 2, 21, 0)),
+    # Winter (UTC-5): 22:00 UTC
+    (utc(2026, 1, 15, 22, 30), utc(2026, 1, 16, 22, 0)),
+])
+def test_daily_candle_closes_at_new_york_five_pm(now, expected):
+    scheduler = CandleCloseScheduler(['D'])
+    assert scheduler.next_close(now) == (expected, {'D'})
+
+
+def test_h4_grid_follows_daily_alignment():
+    scheduler = CandleCloseScheduler(['H4'])
+    # Summer: 01, 05, 09, 13, 17, 21 UTC
+    assert scheduler.next_close(utc(2026, 7, 1, 9, 0))[0] == utc(2026, 7, 1, 13, 0)
+    # Winter: 02, 06, 10, 14, 18, 22 UTC
+    assert scheduler.next_close(utc(2026, 1, 15, 9, 0))[0] == utc(2026, 1, 15, 10, 0)
+    assert daily_alignment_offset('H4', utc(2026, 7, 1)) == 3600
+
+
+def test_minute_grids_are_unaffected_by_alignment():
+    now = utc(2026, 7, 1, 10, 2, 30)
+    aligned = CandleCloseScheduler(['M1', 'M5', 'H1'])
+    plain = CandleCloseScheduler(['M1', 'M5', 'H1'], daily_alignment=None)
+    assert aligned.next_close(now) == plain.next_close(now) == (utc(2026, 7, 1, 10, 3), {'M1'})
+
+
+def test_due_granularities_share_a_close():
+    scheduler = CandleCloseScheduler(['M1', 'M5', 'H4'])
+    close_time, due = scheduler.next_close(utc(2026, 7, 1, 12, 59, 10))
+    assert close_time == utc(2026, 7, 1, 13, 0)
+    assert due == {'M1', 'M5', 'H4'}
+
+
+def test_explicit_offsets_override_alignment():
+    scheduler = CandleCloseScheduler(['D'], offsets={'D': 0})
+    assert scheduler.next_close(utc(2026, 7, 1, 22, 0))[0] == utc(2026, 7, 2, 0, 0)
+
+
+def test_wait_sleeps_until_settle_delay_after_close():
+    now = [utc(2026, 7, 1, 10, 2, 30)]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    scheduler = CandleCloseScheduler(['M5'], settle_delay=1.5, clock=lambda: now[0], sleep=sleep)
+    assert scheduler.wait_for_next_close() == (utc(2026, 7, 1, 10, 5), {'M5'})
+    assert slept == [151.5]
+    assert scheduler.last_wake_lag == 0
+
+
+def test_cooldown_per_key():
+    now = [100.0]
+    cooldown = Cooldown(60, clock=lambda: now[0])
+    cooldown.mark(('EUR_USD', 'M1'))
+    now[0] += 30
+    assert cooldown.remaining(('EUR_USD', 'M1')) == 30
+    assert cooldown.ready(('EUR_USD', 'M5'))
+    now[0] += 30
+    assert cooldown.ready(('EUR_USD', 'M1'))
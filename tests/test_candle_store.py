@@ -0,0 +1,176 @@
+"""CandleStore on recorded OANDA candles: append, overlapping fetches, merges and reopening."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from candle_store import (COLUMNS, CandleStore, RecordedCandleClient, candles_to_columns, format_oanda_time, merge_ranges,
+                          parse_oanda_times, subtract_ranges)
+from conftest import FIXTURES_DIR
+
+CANDLES_FILE = os.path.join(FIXTURES_DIR, 'eur_usd_m1_candles.json')
+
+
+@pytest.fixture(scope='module')
+def candles():
+    with open(CANDLES_FILE) as f:
+        return json.load(f)['EUR_USD']
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(str(tmp_path))
+
+
+def _expected(candles):
+    return candles_to_columns(candles)
+
+
+def _assert_columns(actual, expected):
+    assert set(actual) == set(COLUMNS)
+    for name in COLUMNS:
+        np.testing.assert_array_equal(actual[name], expected[name])
+
+
+def test_append_stores_complete_candles_only(store, candles):
+    series = store.series('EUR_USD', 'M1')
+    assert series.append_candles(candles[:50]) == 50
+    # The recorded last candle is still forming and is skipped
+    assert series.append_candles(candles[50:]) == len(candles) - 51
+    _assert_columns(series.read(), _expected(candles))
+    assert series.last_time == parse_oanda_times([candles[-2]['time']])[0]
+
+
+def test_overlapping_fetches_are_deduplicated(store, candles):
+    series = store.series('EUR_USD', 'M1')
+    series.append_candles(candles[:80])
+    # Re-fetching from an earlier point returns bars already stored
+    assert series.append_candles(candles[60:120]) == 40
+    assert series.append_candles(candles[60:120]) == 0
+    # Duplicates inside one batch count once
+    assert series.append_candles(candles[110:130] + candles[115:130]) == 10
+    times = series.read()['time']
+    assert np.all(np.diff(times) > 0)
+    _assert_columns(series.read(), _expected(candles[:130]))
+
+
+def test_older_bars_are_merged_in_order(store, candles):
+    series = store.series('EUR_USD', 'M1')
+    series.append_candles(candles[100:150])
+    generation = series.generation
+    assert series.append_candles(candles[:120]) == 100
+    assert series.generation == generation + 1
+    _assert_columns(series.read(), _expected(candles[:150]))
+    # The previous generation's column files are gone
+    assert sorted(os.listdir(series.path)) == sorted(
+        [os.path.basename(series._column_path(name)) for name in COLUMNS] + ['meta.json'])
+
+
+def test_reopen_maps_the_stored_columns(tmp_path, candles):
+    CandleStore(str(tmp_path)).series('EUR_USD', 'M1').append_candles(candles[:120])
+    CandleStore(str(tmp_path)).series('EUR_USD', 'M1').append_candles(candles[:40])
+
+    reopened = CandleStore(str(tmp_path)).load('EUR_USD', 'M1')
+    assert all(isinstance(column, np.memmap) for column in reopened.values())
+    _assert_columns(reopened, _expected(candles[:120]))
+    window = CandleStore(str(tmp_path)).load('EUR_USD', 'M1', start=reopened['time'][10], end=reopened['time'][20])
+    _assert_columns(window, {name: values[10:20] for name, values in reopened.items()})
+
+
+def test_top_up_fetches_only_missing_ranges(store, candles):
+    client = RecordedCandleClient({'EUR_USD': candles})
+    times = parse_oanda_times([c['time'] for c in candles])
+    end = int(times[-1])
+
+    assert store.top_up(client, 'EUR_USD', 'M1', start=int(times[0]), end=end) == len(candles) - 1
+    requests = len(client.requests)
+    # Everything up to the forming bar is stored, and the recorded gap was answered
+    # (the API returned the bars after it), so nothing is requested again
+    assert store.top_up(client, 'EUR_USD', 'M1', start=int(times[0]), end=end) == 0
+    series = store.series('EUR_USD', 'M1')
+    assert series.gaps() == [(int(times[89]) + 60, int(times[90]))]
+    assert len(client.requests) == requests
+    _assert_columns(series.read(), _expected(candles))
+
+
+def test_empty_gap_is_not_requested_again(tmp_path, candles):
+    client = RecordedCandleClient({'EUR_USD': candles})
+    times = parse_oanda_times([c['time'] for c in candles])
+    gap = (int(times[89]) + 60, int(times[90]))
+    store = CandleStore(str(tmp_path))
+    series = store.series('EUR_USD', 'M1')
+    # Bars on both sides of the gap are already stored (e.g. from an earlier run)
+    series.append_candles(candles[:90])
+    series.append_candles(candles[90:])
+    start, end = int(times[0]), int(times[-1])
+    assert series.missing_ranges(start, end) == [gap]
+
+    # The client has no candles for the gap: the request returns the bars after it
+    assert store.top_up(client, 'EUR_USD', 'M1', start=start, end=end) == 0
+    assert [params['from'] for params in client.requests] == [format_oanda_time(gap[0])]
+    assert series.checked_ranges == [gap]
+    assert series.missing_ranges(start, end) == []
+
+    # Neither a second top_up nor a reopened store asks for it again
+    assert store.top_up(client, 'EUR_USD', 'M1', start=start, end=end) == 0
+    assert CandleStore(str(tmp_path)).top_up(client, 'EUR_USD', 'M1', start=start, end=end) == 0
+    assert len(client.requests) == 1
+
+
+def test_open_tail_is_requested_until_a_bar_arrives(store, candles):
+    times = parse_oanda_times([c['time'] for c in candles])
+    series = store.series('EUR_USD', 'M1')
+    series.append_candles(candles[:100])
+    # Nothing after the stored bars yet (market closed or no new candle)
+    client = RecordedCandleClient({'EUR_USD': candles[:100]})
+    end = int(times[120])
+    assert store.top_up(client, 'EUR_USD', 'M1', start=int(times[0]), end=end) == 0
+    assert store.top_up(client, 'EUR_USD', 'M1', start=int(times[0]), end=end) == 0
+    # The tail after the newest bar is asked for on every call; the recorded gap only once
+    tail = format_oanda_time(int(times[99]) + 60)
+    assert [params['from'] for params in client.requests].count(tail) == 2
+    assert len(client.requests) == 3
+    assert series.checked_ranges == [(int(times[89]) + 60, int(times[90]))]
+    # Once the bars exist they are fetched
+    assert store.top_up(RecordedCandleClient({'EUR_USD': candles}), 'EUR_USD', 'M1',
+                        start=int(times[0]), end=end) == 20
+
+
+def test_range_helpers():
+    assert merge_ranges([(5, 8), (0, 2), (2, 3), (7, 10), (12, 12)]) == [(0, 3), (5, 10)]
+    assert subtract_ranges([(0, 20)], [(2, 4), (6, 8), (18, 30)]) == [(0, 2), (4, 6), (8, 18)]
+    assert subtract_ranges([(0, 5), (10, 15)], [(0, 12)]) == [(12, 15)]
+    assert subtract_ranges([(3, 4)], []) == [(3, 4)]
+
+
+def test_interrupted_tail_append_is_dropped(tmp_path, candles):
+    series = CandleStore(str(tmp_path)).series('EUR_USD', 'M1')
+    series.append_candles(candles[:30])
+    # Bytes written by an append that never committed meta.json
+    with open(series._column_path('close'), 'ab') as f:
+        f.write(b'\0' * 24)
+    reopened = CandleStore(str(tmp_path)).series('EUR_USD', 'M1')
+    assert reopened.append_candles(candles[30:60]) == 30
+    _assert_columns(reopened.read(), _expected(candles[:60]))
+
+
+def test_crash_before_merge_commit_keeps_previous_columns(tmp_path, candles):
+    series = CandleStore(str(tmp_path)).series('EUR_USD', 'M1')
+    series.append_candles(candles[50:100])
+    # A merge that wrote some next-generation files, then died before meta.json
+    np.zeros(3, dtype=np.int64).tofile(series._column_path('time', series.generation + 1))
+    reopened = CandleStore(str(tmp_path)).series('EUR_USD', 'M1')
+    _assert_columns(reopened.read(), _expected(candles[50:100]))
+    assert reopened.append_candles(candles[:60]) == 50
+    _assert_columns(reopened.read(), _expected(candles[:100]))
+
+
+def test_short_column_file_is_rejected_on_open(tmp_path, candles):
+    series = CandleStore(str(tmp_path)).series('EUR_USD', 'M1')
+    series.append_candles(candles[:30])
+    with open(series._column_path('volume'), 'r+b') as f:
+        f.truncate(10 * COLUMNS['volume'].itemsize)
+    with pytest.raises(ValueError, match='meta.json commits 30'):
+        CandleStore(str(tmp_path)).series('EUR_USD', 'M1')
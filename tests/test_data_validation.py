@@ -0,0 +1,147 @@
+"""Market data ingestion: typed arrays, lists and NumPy columns convert alike, bar times parse, caller buffers stay untouched."""
+
+import array
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+class FakeTypedArray:
+    """Stands in for a JS Float64Array proxy: to_memoryview() / to_py() hand over a fresh buffer copy."""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def to_memoryview(self):
+        return memoryview(array.array('d', self.values))
+
+    to_py = to_memoryview
+
+
+def _convert(executor, market_data):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return executor.validate_and_convert_market_data(market_data)
+
+
+def _bar_times(executor, times, n):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return executor.extract_bar_times({'close': [1.0] * n, 'time': times}, n)
+
+
+def _market_lists(n=50, seed=12):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.001, n))
+    return {'open': close - 0.0002, 'high': close + 0.0005, 'low': close - 0.0005, 'close': close,
+            'volume': rng.integers(50, 500, n).astype(float)}
+
+
+@pytest.mark.parametrize('kind', ['typed', 'ndarray', 'series', 'memoryview', 'tuple'])
+def test_column_kinds_match_lists(executor, kind):
+    columns = _market_lists()
+    wrap = {
+        'typed': FakeTypedArray,
+        'ndarray': np.asarray,
+        'series': pd.Series,
+        'memoryview': lambda values: memoryview(np.asarray(values)),
+        'tuple': tuple
+    }[kind]
+    expected = _convert(executor, {name: values.tolist() for name, values in columns.items()})
+    actual = _convert(executor, {name: wrap(values.tolist() if kind in ('typed', 'tuple') else values)
+                                 for name, values in columns.items()})
+    assert list(actual) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    for name, values in expected.items():
+        assert actual[name].dtype == np.float64 and actual[name].ndim == 1
+        np.testing.assert_array_equal(actual[name], values)
+        np.testing.assert_array_equal(values, columns[name.lower()])
+
+
+def test_integer_and_float32_buffers_become_float64(executor):
+    converted = _convert(executor, {'close': np.arange(5, dtype=np.int32), 'open': np.arange(5, dtype=np.float32),
+                                    'high': np.arange(5), 'low': np.arange(5), 'volume': np.arange(5)})
+    for values in converted.values():
+        assert values.dtype == np.float64
+        np.testing.assert_array_equal(values, np.arange(5.0))
+
+
+def test_missing_values_become_nan(executor):
+    converted = _convert(executor, {
+        'Open': [1.0, None, 'x', float('nan'), '2.5'],
+        'high': np.array([1.0, np.nan, 3.0, 4.0, 5.0]),
+        'low': [1.0, 2.0],
+        'close': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'volume': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+    })
+    np.testing.assert_array_equal(converted['Open'], [1.0, np.nan, np.nan, np.nan, 2.5])
+    np.testing.assert_array_equal(converted['High'], [1.0, np.nan, 3.0, 4.0, 5.0])
+    # Short columns are padded with NaN, long ones cut to the close length
+    np.testing.assert_array_equal(converted['Low'], [1.0, 2.0, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(converted['Volume'], [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    missing = _convert(executor, {'close': [1.0, 2.0], 'volume': None})
+    np.testing.assert_array_equal(missing['Open'], [np.nan, np.nan])
+    np.testing.assert_array_equal(missing['Volume'], [np.nan, np.nan])
+    assert all(len(values) == 0 for values in _convert(executor, {'close': 'abc'}).values())
+
+
+def test_bar_times_in_seconds_and_milliseconds(executor):
+    seconds = 1_700_000_000 + 60 * np.arange(5)
+    np.testing.assert_array_equal(_bar_times(executor, seconds.tolist(), 5), seconds)
+    np.testing.assert_array_equal(_bar_times(executor, (seconds * 1000).tolist(), 5), seconds)
+    np.testing.assert_array_equal(_bar_times(executor, FakeTypedArray(seconds * 1000), 5), seconds)
+    np.testing.assert_array_equal(_bar_times(executor, seconds.astype(np.float64), 5), seconds)
+
+
+def test_bar_times_from_date_strings(executor):
+    times = _bar_times(executor, ['2024-03-01T10:00:00Z', '2024-03-01 10:01:00', '2024-03-01T12:02:00+02:00'], 3)
+    start = pd.Timestamp('2024-03-01T10:00:00Z').timestamp()
+    np.testing.assert_array_equal(times, [start, start + 60, start + 120])
+
+
+@pytest.mark.parametrize('times', [None, [], [1_700_000_000, 1_700_000_060], [3.0, 2.0, 1.0], [1.0, 1.0, 2.0],
+                                   [1.0, None, 3.0], ['2024-03-01', 'not a date', '2024-03-03']])
+def test_unusable_bar_times_are_ignored(executor, times):
+    assert _bar_times(executor, times, 3) is None
+
+
+MUTATING_STRATEGY = '''
+def strategy_logic(data, reverse_signals=False):
+    data.loc[0, 'Close'] = 0.0
+    data.iloc[:, 0] = -1.0
+    data['High'] *= 2.0
+    close = data['Close'].to_numpy()
+    return {'entry': (close > 0).tolist(), 'exit': [False] * len(close), 'direction': ['BUY'] * len(close)}
+'''
+
+
+@pytest.mark.parametrize('kind', ['ndarray', 'series', 'memoryview'])
+def test_strategies_cannot_write_to_caller_buffers(executor, kind):
+    columns = _market_lists()
+    originals = {name: values.copy() for name, values in columns.items()}
+    wrap = {'ndarray': lambda values: values, 'series': pd.Series, 'memoryview': memoryview}[kind]
+    market_data = {name: wrap(values) for name, values in columns.items()}
+    market_data.update(verbose=False, profile=False)
+
+    converted = _convert(executor, market_data)
+    for name, values in converted.items():
+        assert not np.shares_memory(values, columns[name.lower()])
+
+    result = executor.execute_strategy(market_data, MUTATING_STRATEGY)
+    assert not result.get('error')
+    assert result['entry'][0] is False and all(result['entry'][1:])
+    for name, values in columns.items():
+        np.testing.assert_array_equal(values, originals[name])
+        np.testing.assert_array_equal(np.asarray(market_data[name]), originals[name])
+
+
+def test_typed_array_buffers_are_used_in_place(executor):
+    typed = FakeTypedArray(_market_lists()['close'])
+    converted = _convert(executor, {'close': typed})
+    assert converted['Close'].flags.writeable
+    # No copy beyond the memoryview transfer: the column is backed by a buffer NumPy does not own
+    assert not converted['Close'].flags.owndata
+    np.testing.assert_array_equal(converted['Close'], typed.values)
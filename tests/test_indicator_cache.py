@@ -0,0 +1,145 @@
+"""IndicatorCache / cached_indicator: hit accounting, the byte budget, and results that match uncached calls."""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def cache(executor, monkeypatch):
+    """A fresh 1 MB cache in place of the shared INDICATOR_CACHE."""
+    fresh = executor.IndicatorCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(executor, 'INDICATOR_CACHE', fresh)
+    return fresh
+
+
+def _counting_indicator(executor, name='test.scaled'):
+    """A cached indicator that records how often it really runs."""
+    calls = []
+
+    def scaled(values, factor=2.0):
+        calls.append(factor)
+        return np.asarray(values, dtype=np.float64) * factor
+
+    return executor.cached_indicator(name)(scaled), calls
+
+
+def test_repeated_calls_hit(executor, cache):
+    scaled, calls = _counting_indicator(executor)
+    values = [1.0, 2.0, 3.0]
+
+    first = scaled(values)
+    first.append(99.0)  # callers get their own list; the cached array is unaffected
+    assert scaled(values) == [2.0, 4.0, 6.0]
+    assert scaled(np.array(values)) == [2.0, 4.0, 6.0]  # keyed by content, not by type
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    assert scaled(values, factor=3.0) == [3.0, 6.0, 9.0]
+    assert scaled(values, 3.0) == [3.0, 6.0, 9.0]  # positional and keyword params key apart
+    assert scaled([1.0, 2.0, 4.0]) == [2.0, 4.0, 8.0]
+    assert len(calls) == 4
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert cache.stats()['entries'] == 4
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(executor, cache):
+    scaled, calls = _counting_indicator(executor)
+    series = [np.full(100, float(i)) for i in range(4)]  # 800 bytes per result
+    cache.max_bytes = 3 * 800
+
+    for values in series[:3]:
+        scaled(values)
+    scaled(series[0])  # most recently used now
+    scaled(series[3])
+    assert cache.evictions == 1
+    assert cache.stats()['bytes'] == 3 * 800 and len(cache) == 3
+
+    calls.clear()
+    for values in (series[0], series[2], series[3]):
+        scaled(values)
+    assert calls == []
+    scaled(series[1])
+    assert len(calls) == 1
+
+    # Shrinking the budget evicts right away
+    executor.configure_indicator_cache(max_bytes=800)
+    assert len(cache) == 1 and cache.stats()['bytes'] == 800
+
+
+def test_results_larger_than_the_budget_are_not_stored(executor, cache):
+    scaled, calls = _counting_indicator(executor)
+    cache.max_bytes = 799
+    values = np.ones(100)
+
+    assert scaled(values) == scaled(values) == [2.0] * 100
+    assert len(calls) == 2
+    assert len(cache) == 0 and cache.stats()['bytes'] == 0
+    assert cache.evictions == 0
+
+
+def test_int_sentinels_come_back_as_ints(executor, cache):
+    flat = [1.1] * 20
+    rising = np.linspace(1.0, 1.2, 20).tolist()
+    high = flat[:10] + rising[10:]
+    low = flat[:10] + [v - 0.01 for v in rising[10:]]
+    close = flat[:10] + [v - 0.005 for v in rising[10:]]
+
+    williams = executor.TechnicalAnalysis.williams_r(high, low, close, 5)
+    stochastic = executor.TechnicalAnalysis.stochastic(high, low, close, 5, 3)
+    assert cache.misses == 3  # stochastic's %D goes through the cached sma
+    assert williams[4:10] == [-50] * 6 and stochastic['k'][4:10] == [50] * 6
+
+    williams_hit = executor.TechnicalAnalysis.williams_r(high, low, close, 5)
+    stochastic_hit = executor.TechnicalAnalysis.stochastic(high, low, close, 5, 3)
+    assert cache.hits == 2
+    for miss, hit in ((williams, williams_hit), (stochastic['k'], stochastic_hit['k']),
+                      (stochastic['d'], stochastic_hit['d'])):
+        assert [type(v) for v in hit] == [type(v) for v in miss]
+        np.testing.assert_array_equal(hit, miss)
+    assert all(type(v) is int for v in williams_hit[4:10])
+    assert all(type(v) is float for v in williams_hit[10:])
+
+
+def test_as_array_results_are_read_only(executor, cache):
+    scaled, calls = _counting_indicator(executor)
+    values = np.arange(10.0)
+
+    miss = scaled(values, as_array=True)
+    hit = scaled(values, as_array=True)
+    assert hit is miss
+    assert isinstance(hit, np.ndarray) and hit.dtype == np.float64
+    with pytest.raises(ValueError):
+        hit[0] = 1.0
+    assert scaled(values) == (values * 2.0).tolist()
+
+    bands = executor.TechnicalAnalysis.bollinger_bands(list(np.linspace(1.0, 2.0, 30)), 5, 2, as_array=True)
+    for band in bands.values():
+        assert not band.flags.writeable
+    assert len(calls) == 1
+
+
+def test_unkeyable_arguments_bypass_the_cache(executor, cache):
+    class Opaque:
+        pass
+
+    def first_value(values, marker):
+        calls.append(marker)
+        return np.asarray(values, dtype=np.float64)[:1]
+
+    calls = []
+    indicator = executor.cached_indicator('test.first_value')(first_value)
+    marker = Opaque()
+    assert cache.make_key('test.first_value', ([1.0, 2.0], marker), {}) is None
+
+    assert indicator([1.0, 2.0], marker) == indicator([1.0, 2.0], marker) == [1.0]
+    as_array = indicator([1.0, 2.0], marker=marker, as_array=True)
+    assert not as_array.flags.writeable
+    assert len(calls) == 3
+    assert len(cache) == 0 and (cache.hits, cache.misses) == (0, 0)
+
+
+def test_disabled_cache_always_computes(executor, cache):
+    scaled, calls = _counting_indicator(executor)
+    executor.configure_indicator_cache(enabled=False)
+    assert scaled([1.0]) == scaled([1.0]) == [2.0]
+    assert len(calls) == 2 and len(cache) == 0
@@ -0,0 +1,72 @@
+"""MultiTimeframe.indicator: higher-timeframe indicators aligned to base bars without look-ahead."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import assert_same_values, random_walk
+
+HOUR = 3600
+
+
+@pytest.fixture
+def mtf(executor):
+    n = 12 * 48  # two days of M5 bars
+    walk = random_walk(n, seed=4)
+    data = pd.DataFrame({'Open': np.r_[walk['close'][:1], walk['close'][:-1]], 'High': walk['high'],
+                         'Low': walk['low'], 'Close': walk['close'], 'Volume': np.ones(n),
+                         'Time': 1_700_006_400 + 300 * np.arange(n)})
+    return executor.MultiTimeframe(data)
+
+
+def _expected(mtf, timeframe, values):
+    return mtf.align(timeframe, np.asarray(values, dtype=np.float64))
+
+
+@pytest.mark.parametrize('name,args,inputs', [
+    ('ema', (10,), ('close',)),
+    ('atr', (14,), ('high', 'low', 'close')),
+    ('stochastic', (5, 3), ('high', 'low', 'close')),
+    ('williams_r', (14,), ('high', 'low', 'close')),
+    ('cci', (20,), ('high', 'low', 'close')),
+])
+def test_indicator_on_higher_timeframe(executor, mtf, name, args, inputs):
+    bars = mtf.bars('H1')
+    owner = executor.TechnicalAnalysis if hasattr(executor.TechnicalAnalysis, name) else executor.AdvancedTechnicalAnalysis
+    expected = getattr(owner, name)(*(bars[field].tolist() for field in inputs), *args)
+    actual = mtf.indicator('H1', name, *args, inputs=inputs)
+    if isinstance(expected, dict):
+        assert_same_values(actual, {key: _expected(mtf, 'H1', values) for key, values in expected.items()})
+    else:
+        assert_same_values(actual, _expected(mtf, 'H1', expected))
+    assert len(actual['k'] if isinstance(actual, dict) else actual) == len(mtf)
+
+
+def test_dict_indicator_aligned_per_key(executor, mtf):
+    bands = mtf.indicator('H1', 'bollinger_bands', 10, 2)
+    expected = executor.TechnicalAnalysis.bollinger_bands(mtf.bars('H1')['close'].tolist(), 10, 2)
+    assert set(bands) == set(expected)
+    for key, values in expected.items():
+        assert_same_values(bands[key], _expected(mtf, 'H1', values))
+
+
+def test_functions_without_as_array(executor, mtf, monkeypatch):
+    # Uncached helpers return lists and do not take as_array
+    def midpoint(high, low):
+        return [(h + l) / 2 for h, l in zip(high, low)]
+    monkeypatch.setattr(executor.AdvancedTechnicalAnalysis, 'midpoint', staticmethod(midpoint), raising=False)
+    bars = mtf.bars('H4')
+    actual = mtf.indicator('H4', 'midpoint', inputs=('high', 'low'))
+    assert_same_values(actual, _expected(mtf, 'H4', midpoint(bars['high'], bars['low'])))
+
+
+def test_only_completed_bars_are_visible(mtf):
+    ema = mtf.indicator('H1', 'ema', 3)
+    resampler = mtf.resampler('H1')
+    closes_hour = (mtf.times + 300) % HOUR == 0
+    # The last M5 bar of an hour completes it; earlier bars only see the hour before
+    assert np.array_equal(resampler.closed_through,
+                          np.where(closes_hour, resampler.base_index, resampler.base_index - 1))
+    assert np.isnan(ema[:11]).all()
+    # Aligned results are kept until update() appends bars
+    assert mtf.indicator('H1', 'ema', 3) is ema
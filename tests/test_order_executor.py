@@ -0,0 +1,147 @@
+"""OrderExecutor against mock_oanda: idempotent retries, backoff, rejects and async confirmation."""
+
+import time
+
+import pytest
+
+from mock_oanda import MockOandaServer
+from order_executor import (ORDER_ERROR, ORDER_FILLED, ORDER_REJECTED, ORDER_TIMEOUT, OrderExecutor,
+                            RateLimiter)
+
+
+class CountingLimiter:
+    """Token bucket stand-in that counts every request it lets through."""
+
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+        return 0.0
+
+
+@pytest.fixture
+def server():
+    with MockOandaServer() as server:
+        yield server
+
+
+def _executor(server, **kwargs):
+    kwargs.setdefault('retry_delay', 0.02)
+    kwargs.setdefault('confirm_interval', 0.02)
+    executor = OrderExecutor(server.api_client(), server.account_id, **kwargs)
+    executor.rate_limiter = CountingLimiter()
+    return executor
+
+
+def test_immediate_fill(server):
+    executor = _executor(server)
+    try:
+        result = executor.submit('EUR_USD', 100).result(10)
+        assert result.status == ORDER_FILLED
+        assert result.attempts == 1
+        assert result.trade_id is not None and result.price == '1.10000'
+        assert executor.metrics()['orders'][ORDER_FILLED] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_dropped_response_is_recovered_without_a_second_order(server):
+    executor = _executor(server)
+    try:
+        server.fail_next(1, 'drop')
+        result = executor.submit('EUR_USD', 100).result(10)
+        assert result.status == ORDER_FILLED
+        assert result.attempts == 1
+        assert len(server.orders) == 1
+        assert executor.metrics()['retries'] == 0
+        # The order was found by its client ID, not placed again
+        assert list(server.client_ids) == [result.client_order_id]
+    finally:
+        executor.shutdown()
+
+
+def test_service_unavailable_is_retried_with_backoff(server):
+    executor = _executor(server, retry_delay=0.05)
+    try:
+        server.fail_next(2, 'error')
+        started = time.monotonic()
+        result = executor.submit('EUR_USD', -100).result(10)
+        assert result.status == ORDER_FILLED
+        assert result.attempts == 3
+        assert len(server.orders) == 1
+        assert executor.metrics()['retries'] == 2
+        # Waits grow with the attempt number: 0.05s then 0.10s
+        assert time.monotonic() - started >= 0.15
+    finally:
+        executor.shutdown()
+
+
+def test_retries_are_bounded(server):
+    executor = _executor(server, max_retries=2)
+    try:
+        server.fail_next(5, 'error')
+        result = executor.submit('EUR_USD', 100).result(10)
+        assert result.status == ORDER_ERROR
+        assert result.attempts == 3
+        assert result.error.startswith('503')
+        assert server.orders == {}
+    finally:
+        executor.shutdown()
+
+
+def test_rejection_is_final(server):
+    executor = _executor(server)
+    try:
+        server.fail_next(1, 'reject')
+        result = executor.submit('EUR_USD', 100).result(10)
+        assert result.status == ORDER_REJECTED
+        assert result.attempts == 1
+        assert 'Insufficient margin' in result.error
+        assert executor.metrics()['retries'] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_poller_confirms_delayed_fills_through_the_rate_limiter():
+    with MockOandaServer(fill_delay=0.2) as server:
+        executor = _executor(server)
+        try:
+            done = []
+            futures = [executor.submit('GBP_USD', -5, callback=done.append) for _ in range(3)]
+            results = [future.result(10) for future in futures]
+            assert [r.status for r in results] == [ORDER_FILLED] * 3
+            assert all(r.fill_ms >= 200 for r in results)
+            assert len({r.trade_id for r in results}) == 3
+            assert len(done) == 3
+            assert executor.pending_count() == 0
+            # Every request, including the poller's lookups, took a token
+            assert executor.rate_limiter.acquired == server.requests
+            assert server.requests > 3
+        finally:
+            executor.shutdown()
+
+
+def test_unfilled_order_times_out():
+    with MockOandaServer(fill_delay=5) as server:
+        executor = _executor(server, confirm_timeout=0.2)
+        try:
+            result = executor.submit('EUR_USD', 1).result(10)
+            assert result.status == ORDER_TIMEOUT
+            assert executor.metrics()['orders'][ORDER_TIMEOUT] == 1
+        finally:
+            executor.shutdown(wait=False)
+
+
+def test_rate_limiter_spaces_requests_after_a_burst():
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(10, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(5):
+        limiter.acquire()
+    assert waits == pytest.approx([0.1, 0.1, 0.1])
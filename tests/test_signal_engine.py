@@ -0,0 +1,62 @@
+"""SignalEngine keys in-flight requests and metrics by (instrument, granularity)."""
+
+import threading
+
+from signal_engine import SignalEngine, strategy_key
+
+
+class Strategy:
+    def __init__(self, instrument, granularity):
+        self.instrument = instrument
+        self.granularity = granularity
+
+
+def test_same_instrument_on_two_granularities():
+    strategies = [Strategy('EUR_USD', 'M1'), Strategy('EUR_USD', 'M5')]
+    engine = SignalEngine(None, strategies, lambda client, s: (s.instrument, 100 if s.granularity == 'M1' else -100))
+    try:
+        signals = engine.run_cycle()
+        assert sorted((strategy_key(s), units) for s, units in signals) == [
+            (('EUR_USD', 'M1'), 100), (('EUR_USD', 'M5'), -100)]
+        assert set(engine.metrics) == {('EUR_USD', 'M1'), ('EUR_USD', 'M5')}
+        assert all(m.requests == 1 for m in engine.metrics.values())
+        assert set(engine.metrics_snapshot()['instruments']) == {'EUR_USD:M1', 'EUR_USD:M5'}
+    finally:
+        engine.shutdown()
+
+
+def test_slow_request_only_skips_its_own_granularity():
+    release = threading.Event()
+
+    def evaluate(client, strategy):
+        if strategy.granularity == 'M1':
+            release.wait(5)
+        return (None, None)
+
+    m1, m5 = Strategy('EUR_USD', 'M1'), Strategy('EUR_USD', 'M5')
+    engine = SignalEngine(None, [m1, m5], evaluate, cycle_timeout=0.05)
+    try:
+        engine.run_cycle()
+        engine.run_cycle()
+        assert engine.metrics[('EUR_USD', 'M1')].timeouts == 1
+        assert engine.metrics[('EUR_USD', 'M1')].skipped == 1
+        assert engine.metrics[('EUR_USD', 'M5')].skipped == 0
+        assert engine.metrics[('EUR_USD', 'M5')].requests == 2
+    finally:
+        release.set()
+        engine.shutdown()
+
+
+def test_errors_are_recorded_per_strategy():
+    def evaluate(client, strategy):
+        if strategy.granularity == 'M5':
+            raise RuntimeError('boom')
+        return (None, None)
+
+    engine = SignalEngine(None, [Strategy('EUR_USD', 'M1'), Strategy('EUR_USD', 'M5')], evaluate)
+    try:
+        assert engine.run_cycle() == []
+        assert engine.metrics[('EUR_USD', 'M5')].errors == 1
+        assert engine.metrics[('EUR_USD', 'M1')].errors == 0
+    finally:
+        engine.shutdown()
@@ -0,0 +1,101 @@
+"""Packed signal format: the same trades as process_strategy_signals (dict format)."""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ENTRY = np.array([True, False, True, True, False, True])
+EXIT = np.array([False, True, False, False, True, False])
+CODES = {'BUY': 1, 'SELL': -1}
+
+
+def _quiet(func, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def _assert_same_trades(executor, result, reverse=False):
+    """pack_strategy_signals gives the entries, exits and directions of process_strategy_signals."""
+    processed = _quiet(executor.process_strategy_signals, dict(result), reverse)
+    packed = _quiet(executor.pack_strategy_signals, dict(result), reverse, len(ENTRY))
+    if processed.get('error'):
+        assert packed['error'] == processed['error']
+        return packed
+    assert 'error' not in packed
+    codes = np.array([CODES.get(d, 0) for d in processed['direction']], dtype=np.int8)
+    np.testing.assert_array_equal(packed['entry'], processed['entry'])
+    np.testing.assert_array_equal(packed['exit'], processed['exit'])
+    np.testing.assert_array_equal(packed['direction'], codes)
+    assert packed['auto_generated_direction'] == processed['auto_generated_direction']
+    assert packed['signal_stats'] == processed['signal_stats']
+    return packed
+
+
+def _result(direction, key='direction', **extra):
+    return {'entry': ENTRY, 'exit': EXIT, key: direction, **extra}
+
+
+VALID = [
+    np.array([1, -1, 0, 2, -2, 1], dtype=np.int64),
+    np.array([1, -1, 0, 1, 0, -1], dtype=np.int8),
+    np.array([True, False, True, True, False, False]),
+    pd.Series([1, -1, 1, 0, 0, -1]),
+    np.array(['BUY', 'SELL', '', 'BUY', 'NONE', 'SELL']),
+    np.array(['BUY', None, 'SELL', 'None', None, 'BUY'], dtype=object),
+    ['BUY', 'SELL', None, 'BUY', 'None', 'SELL'],
+]
+
+# Directions the dict format replaces with auto-generated ones
+AUTO_GENERATED = [
+    np.array([1.0, -1.0, 0.0, 1.0, 0.0, -1.0]),
+    np.array([1.0, np.nan, -1.0, 1.0, 0.0, -1.0]),
+    [1, -1, 0, 1, 0, -1],
+    ['BUY', 'SELL', '', 'BUY', None, 'SELL'],
+    np.array(['BUY', 'SELL', 'HOLD', 'BUY', '', 'SELL']),
+    [None] * 6,
+    np.zeros(6, dtype=np.int8),
+    ['BUY', 'SELL'],
+    [],
+]
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+@pytest.mark.parametrize('direction', VALID)
+def test_valid_directions_match_dict_format(executor, direction, reverse):
+    packed = _assert_same_trades(executor, _result(direction), reverse)
+    assert packed['auto_generated_direction'] is False
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+@pytest.mark.parametrize('direction', AUTO_GENERATED)
+def test_auto_generated_directions_match_dict_format(executor, direction, reverse):
+    packed = _assert_same_trades(executor, _result(direction), reverse)
+    assert packed['auto_generated_direction'] is True
+
+
+@pytest.mark.parametrize('key', ['entry_type', 'trade_direction'])
+def test_entry_type_only_is_auto_generated_like_dict_format(executor, key):
+    rsi = np.array([30.0, 60.0, 70.0, 20.0, 50.0, 80.0])
+    packed = _assert_same_trades(executor, _result(np.array(['SELL'] * 6), key=key, rsi=rsi))
+    assert packed['auto_generated_direction'] is True
+    # The auto-generated direction follows the RSI, not the returned SELLs
+    np.testing.assert_array_equal(packed['direction'], [1, 0, -1, 1, 0, -1])
+
+
+@pytest.mark.parametrize('result', [
+    {'entry': ENTRY, 'direction': ['BUY'] * 6},
+    {'entry': np.zeros(6, dtype=bool), 'exit': EXIT, 'direction': ['BUY'] * 6},
+    {'entry': ENTRY, 'exit': EXIT[:4], 'direction': ['BUY'] * 6},
+    {'entry': [], 'exit': EXIT, 'direction': ['BUY'] * 6},
+])
+def test_errors_match_dict_format(executor, result):
+    assert 'error' in _assert_same_trades(executor, result)
+
+
+def test_other_integer_codes_are_no_trade(executor):
+    packed = _assert_same_trades(executor, _result(np.array([2, 1, -3, -1, 5, 1])))
+    np.testing.assert_array_equal(packed['direction'], [0, 1, 0, -1, 0, 1])
+    assert packed['signal_stats'] == {'total_entries': 4, 'buy_signals': 2, 'sell_signals': 1}
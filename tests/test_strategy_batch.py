@@ -0,0 +1,99 @@
+"""Batch evaluation: strategies share the converted columns but never each other's DataFrame."""
+
+import numpy as np
+import pytest
+
+from strategy_batch import StrategyBatch
+
+# Adds a column and replaces one of the data it was given (run again for reversed)
+ADDS_COLUMNS = '''
+def strategy_logic(data, reverse_signals=False):
+    if 'Signal' in data.columns:
+        raise ValueError("Saw the column of an earlier run")
+    data['Signal'] = data['Close'] > data['Open']
+    data['Close'] = data['Close'] * 0
+    return {'entry': data['Signal'].tolist(), 'exit': [False] * len(data), 'direction': ['BUY'] * len(data)}
+'''
+
+# Fails if it sees anything but the market data columns
+CHECKS_COLUMNS = '''
+def strategy_logic(data):
+    if 'Signal' in data.columns or not (data['Close'] > 0).all():
+        raise ValueError(f"Leaked columns: {list(data.columns)}")
+    return {'entry': (data['Close'] > data['Open']).tolist(), 'exit': [False] * len(data),
+            'direction': ['SELL'] * len(data)}
+'''
+
+
+def _market_data(n=200, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0004, n))
+    open_prices = np.r_[close[:1], close[:-1]]
+    return {
+        'open': open_prices.tolist(), 'close': close.tolist(),
+        'high': (np.maximum(open_prices, close) + 0.0002).tolist(),
+        'low': (np.minimum(open_prices, close) - 0.0002).tolist(),
+        'volume': rng.integers(50, 500, n).astype(float).tolist(),
+        'verbose': False
+    }
+
+
+STRATEGIES = {'adds_columns': ADDS_COLUMNS, 'checks_columns': CHECKS_COLUMNS, 'checks_again': CHECKS_COLUMNS}
+
+
+def test_execute_strategy_batch_gives_every_run_its_own_frame(executor):
+    batch = executor.execute_strategy_batch(_market_data(), STRATEGIES)
+    assert batch['bars'] == 200
+    errors = {(row['strategy'], row['mode']): row['error'] for row in batch['comparison']}
+    assert errors == {(name, mode): None for name in STRATEGIES for mode in ('normal', 'reversed')}
+    # adds_columns runs in both modes; the reversed run does not see its forward run's columns
+    assert batch['perf']['strategy_runs'] == 4
+
+
+def test_execute_strategy_batch_empty_data(executor):
+    data = {key: [] for key in ('open', 'high', 'low', 'close', 'volume')}
+    data['verbose'] = False
+    batch = executor.execute_strategy_batch(data, {'checks_columns': CHECKS_COLUMNS}, ('normal',))
+    assert batch['bars'] == 0
+    assert batch['comparison'][0]['error'] == 'No price data available'
+    assert batch['perf']['strategy_runs'] == 0
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_strategy_batch_frames_are_isolated(max_workers):
+    market_data = _market_data()
+    data = {key: market_data[key] for key in ('open', 'high', 'low', 'close', 'volume')}
+    batch = StrategyBatch(STRATEGIES, data, max_workers=max_workers, keep_results=True)
+    table = batch.run()
+    assert len(table) == 6
+    assert table['error'].isna().all()
+    assert batch.signals['checks_columns']['normal']['direction'] == batch.signals['checks_again']['normal']['direction']
+
+
+EMA_CROSS = '''
+def strategy_logic(data):
+    close = data['Close'].to_numpy()
+    fast = np.asarray(TechnicalAnalysis.ema(close, {fast}))
+    slow = np.asarray(TechnicalAnalysis.ema(close, 50))
+    return {{'entry': (fast > slow).tolist(), 'exit': [False] * len(close), 'direction': ['BUY'] * len(close)}}
+'''
+
+
+def test_strategy_batch_shares_one_cache_in_process_by_default():
+    market_data = _market_data()
+    data = {key: market_data[key] for key in ('open', 'high', 'low', 'close', 'volume')}
+    strategies = {f"ema_{fast}": EMA_CROSS.format(fast=fast) for fast in (5, 10, 20)}
+    batch = StrategyBatch(strategies, data, modes=('normal',))
+    assert batch.max_workers == 1
+    rows = {row['strategy']: row for row in batch.run().to_dict('records')}
+    assert rows['ema_5']['indicator_misses'] == 2
+    # The slow EMA is computed once and served from the cache to the later strategies
+    assert rows['ema_10']['indicator_hits'] == rows['ema_20']['indicator_hits'] == 1
+    assert rows['ema_10']['indicator_misses'] == rows['ema_20']['indicator_misses'] == 1
+
+
+def test_strategy_batch_caps_workers_at_the_strategy_count():
+    market_data = _market_data()
+    data = {key: market_data[key] for key in ('open', 'high', 'low', 'close', 'volume')}
+    assert StrategyBatch(STRATEGIES, data, max_workers=8).max_workers == len(STRATEGIES)
+    assert StrategyBatch(STRATEGIES, data, max_workers=None).max_workers == 1
@@ -0,0 +1,117 @@
+"""StrategyOptimizer: a process-pool sweep over SharedMarketData ranks like an in-process run."""
+
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import strategy_optimizer
+from conftest import ROOT
+from strategy_optimizer import (ParameterGrid, RandomSampler, SharedMarketData, StrategyOptimizer,
+                                forward_return_score, market_data_columns)
+
+STRATEGY_FILE = os.path.join(ROOT, 'src', 'strategies', 'williamsFractalEMAScalperVectorized.py')
+GRID = {'fast_period': [10, 20], 'mid_period': [40, 50], 'rr_ratio': [1.0, 2.0]}
+
+
+@pytest.fixture(scope='module')
+def strategy_code():
+    with open(STRATEGY_FILE) as f:
+        return f.read()
+
+
+@pytest.fixture(scope='module')
+def market_data():
+    rng = np.random.default_rng(8)
+    n = 1500
+    drift = np.repeat(rng.normal(0, 0.0003, n // 100 + 1), 100)[:n]
+    scale = np.repeat(rng.uniform(0.0001, 0.0009, n // 50 + 1), 50)[:n]
+    close = 1.1 + np.cumsum(drift + rng.normal(0, 1, n) * scale)
+    open_prices = np.r_[close[:1], close[:-1]]
+    return pd.DataFrame({'open': open_prices,
+                         'high': np.maximum(open_prices, close) + np.abs(rng.normal(0, 1, n)) * scale,
+                         'low': np.minimum(open_prices, close) - np.abs(rng.normal(0, 1, n)) * scale,
+                         'close': close, 'volume': rng.integers(50, 500, n).astype(float)})
+
+
+def _by_point(ranking):
+    """Ranking rows keyed by their parameters, without the timing column."""
+    table = ranking.drop(columns=['seconds', 'rank'])
+    return {tuple(row[name] for name in GRID): row for row in table.to_dict('records')}
+
+
+class RecordingSharedMarketData(SharedMarketData):
+    created = []
+
+    def __init__(self, data):
+        super().__init__(data)
+        RecordingSharedMarketData.created.append(self.descriptor[0])
+
+
+def test_process_pool_sweep_matches_in_process(strategy_code, market_data, monkeypatch):
+    monkeypatch.setattr(strategy_optimizer, 'SharedMarketData', RecordingSharedMarketData)
+    RecordingSharedMarketData.created = []
+
+    in_process = StrategyOptimizer(strategy_code, market_data, max_workers=1).run(ParameterGrid(GRID))
+    assert RecordingSharedMarketData.created == []
+    pooled = StrategyOptimizer(strategy_code, market_data, max_workers=2, group_by=['fast_period'],
+                               batch_size=2).run(ParameterGrid(GRID))
+
+    assert len(pooled) == len(in_process) == len(ParameterGrid(GRID))
+    assert 'error' not in pooled
+    expected, actual = _by_point(in_process), _by_point(pooled)
+    assert actual.keys() == expected.keys()
+    for point, row in expected.items():
+        assert actual[point] == pytest.approx(row, nan_ok=True), point
+    # Ranked best first by the score, the same order up to ties
+    assert pooled['total_return'].tolist() == in_process['total_return'].tolist()
+    assert in_process['total_trades'].sum() > 0
+
+    # The shared memory block is unlinked once the sweep is over
+    (name,) = RecordingSharedMarketData.created
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_shared_market_data_round_trip(market_data):
+    with SharedMarketData(market_data) as shared:
+        shm, df = SharedMarketData.attach(shared.descriptor)
+        try:
+            expected = market_data_columns(market_data)
+            assert list(df.columns) == list(expected)
+            for name, values in expected.items():
+                np.testing.assert_array_equal(df[name].to_numpy(), values)
+            assert not df['Close'].to_numpy().flags.writeable
+        finally:
+            del df
+            shm.close()
+        name = shared.descriptor[0]
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_samplers():
+    grid = ParameterGrid({'a': [1, 2], 'b': ['x', 'y', 'z']})
+    assert len(grid) == 6
+    assert list(grid)[:2] == [{'a': 1, 'b': 'x'}, {'a': 1, 'b': 'y'}]
+    sampler = RandomSampler({'n': (5, 10), 'f': (0.5, 1.5), 'c': ['u', 'v']}, 20, seed=3)
+    points = list(sampler)
+    assert points == list(RandomSampler({'n': (5, 10), 'f': (0.5, 1.5), 'c': ['u', 'v']}, 20, seed=3))
+    assert all(isinstance(p['n'], int) and 5 <= p['n'] <= 10 and 0.5 <= p['f'] <= 1.5 for p in points)
+
+
+def test_errors_are_reported_per_point(market_data):
+    failing = '''
+def strategy_logic(data, reverse_signals=False, period=1):
+    if period > 1:
+        return None.missing
+    return {'entry': (data['Close'] > data['Open']).tolist(), 'exit': [False] * len(data),
+            'direction': ['BUY'] * len(data)}
+'''
+    ranking = StrategyOptimizer(failing, market_data, max_workers=1, scorer=forward_return_score).run(
+        ParameterGrid({'period': [1, 2]}))
+    rows = {row['period']: row for row in ranking.to_dict('records')}
+    assert rows[1]['trades'] > 0
+    assert rows[2]["error"].startswith("Strategy execution failed")
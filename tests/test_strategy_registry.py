@@ -0,0 +1,126 @@
+"""Compiled strategies: sandbox reuse never carries module-level state between runs."""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _frame(n, start=1.1):
+    close = start + np.arange(n) * 0.001
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': np.ones(n)})
+
+
+def _compiled(executor, source):
+    return executor.CompiledStrategy(None, source)
+
+
+def _run(compiled, df, reverse=False):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return compiled.run(df, reverse)
+
+
+STATELESS = '''
+from typing import Dict
+import numpy as np
+
+PERIOD = 3
+LEVELS = (1, 2)
+
+def helper(values, scale=2.0):
+    return values * scale
+
+def strategy_logic(data, reverse_signals=False):
+    close = data['Close'].to_numpy()
+    return {'entry': close > 0, 'exit': close < 0, 'direction': ['BUY'] * len(close),
+            'scaled': helper(close)[-1], 'period': PERIOD}
+'''
+
+GLOBAL_COUNTER = '''
+runs = 0
+
+def strategy_logic(data):
+    global runs
+    runs += 1
+    return {'entry': [True] * len(data), 'exit': [False] * len(data), 'direction': ['BUY'] * len(data), 'runs': runs}
+'''
+
+MUTABLE_LIST = '''
+seen = []
+
+def strategy_logic(data):
+    seen.append(len(data))
+    return {'entry': [True] * len(data), 'exit': [False] * len(data), 'direction': ['BUY'] * len(data),
+            'seen': list(seen)}
+'''
+
+MUTABLE_DEFAULT = '''
+def strategy_logic(data, memo={}):
+    memo[len(memo)] = len(data)
+    return {'entry': [True] * len(data), 'exit': [False] * len(data), 'direction': ['BUY'] * len(data),
+            'memo': len(memo)}
+'''
+
+ARRAY_STATE = '''
+calls = np.zeros(1)
+
+def strategy_logic(data):
+    calls[0] += 1
+    return {'entry': [True] * len(data), 'exit': [False] * len(data), 'direction': ['BUY'] * len(data),
+            'calls': calls[0]}
+'''
+
+
+def test_stateless_source_is_loaded_once(executor):
+    compiled = _compiled(executor, STATELESS)
+    first = _run(compiled, _frame(10))
+    loaded = compiled.namespace
+    second = _run(compiled, _frame(20, start=2.0))
+    assert loaded is not None and compiled.namespace is loaded
+    assert first['scaled'] == pytest.approx(2 * 1.109)
+    assert second['scaled'] == pytest.approx(2 * 2.019)
+    assert len(second['entry']) == 20
+    # The loaded globals keep the first load's data; runs only see their own
+    assert loaded['data'] is not None and len(loaded['data']) == 10
+
+
+def test_global_rebinding_does_not_reach_the_next_run(executor):
+    compiled = _compiled(executor, GLOBAL_COUNTER)
+    assert [_run(compiled, _frame(5))['runs'] for _ in range(3)] == [1, 1, 1]
+    assert compiled.namespace is not None
+
+
+@pytest.mark.parametrize('source,key,value', [
+    (MUTABLE_LIST, 'seen', [5]),
+    (MUTABLE_DEFAULT, 'memo', 1),
+    (ARRAY_STATE, 'calls', 1.0),
+])
+def test_mutable_module_state_is_rebuilt_for_every_run(executor, source, key, value):
+    compiled = _compiled(executor, source)
+    results = [_run(compiled, _frame(5))[key] for _ in range(3)]
+    assert results == [value] * 3
+    assert compiled.namespace is None
+    assert compiled.runs == 3
+
+
+def test_module_level_data_reads_are_rebuilt_for_every_run(executor):
+    source = '''
+entry = [True] * len(data)
+exit = [False] * len(data)
+direction = ['SELL'] * len(data)
+'''
+    compiled = _compiled(executor, source)
+    assert len(_run(compiled, _frame(4))['entry']) == 4
+    assert len(_run(compiled, _frame(7))['entry']) == 7
+    assert compiled.namespace is None
+
+
+def test_reusable_namespace_rules(executor):
+    sandbox = executor.create_safe_execution_environment(None)
+    namespace = dict(sandbox)
+    exec(compile(STATELESS, '<strategy>', 'exec'), namespace)
+    assert executor.reusable_namespace(namespace, sandbox)
+    namespace['cache'] = {}
+    assert not executor.reusable_namespace(namespace, sandbox)
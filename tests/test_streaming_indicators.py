@@ -0,0 +1,116 @@
+"""Streaming indicators seeded from history match TechnicalAnalysis on the full series."""
+
+import numpy as np
+import pytest
+
+from conftest import assert_same_values, random_walk
+from streaming_indicators import ATR, EMA, RSI, SMA, CrossoverDetector, StreamingIndicator
+
+N = 400
+
+
+@pytest.fixture(scope='module')
+def bars():
+    data = random_walk(N, seed=21, scale=0.0005)
+    return {field: values.tolist() for field, values in data.items()}
+
+
+def _stream(indicator, history, live):
+    """Seed from history, then update bar by bar; every value from both phases in order."""
+    seeded = []
+    for bar in history:
+        seeded.append(indicator.update(*bar) if isinstance(bar, tuple) else indicator.update(bar))
+    return seeded + [indicator.update(*bar) if isinstance(bar, tuple) else indicator.update(bar) for bar in live]
+
+
+# Seed lengths inside the warm-up, right at it and well past it
+SEED_LENGTHS = [0, 5, 14, 50, 300]
+
+
+@pytest.mark.parametrize('seed_length', SEED_LENGTHS)
+@pytest.mark.parametrize('period', [1, 3, 14, 50])
+def test_sma_and_ema(executor, bars, seed_length, period):
+    close = bars['close']
+    for streaming, batch in ((SMA, executor.TechnicalAnalysis.sma), (EMA, executor.TechnicalAnalysis.ema)):
+        indicator = streaming(period)
+        values = _stream(indicator, close[:seed_length], close[seed_length:])
+        assert_same_values(values, batch(close, period))
+        assert indicator.count == N
+
+
+@pytest.mark.parametrize('seed_length', SEED_LENGTHS)
+@pytest.mark.parametrize('period', [2, 14, 30])
+def test_rsi(executor, bars, seed_length, period):
+    close = bars['close']
+    values = _stream(RSI(period), close[:seed_length], close[seed_length:])
+    assert_same_values(values, executor.TechnicalAnalysis.rsi(close, period))
+
+
+@pytest.mark.parametrize('seed_length', SEED_LENGTHS)
+@pytest.mark.parametrize('period', [1, 14, 30])
+def test_atr(executor, bars, seed_length, period):
+    rows = list(zip(bars['high'], bars['low'], bars['close']))
+    values = _stream(ATR(period), rows[:seed_length], rows[seed_length:])
+    assert_same_values(values, executor.TechnicalAnalysis.atr(bars['high'], bars['low'], bars['close'], period))
+
+
+def test_seed_helper_matches_updates(executor, bars):
+    close = bars['close']
+    indicator = RSI(14).seed(close[:100])
+    assert indicator.value == pytest.approx(executor.TechnicalAnalysis.rsi(close[:100], 14)[-1], rel=1e-9)
+    rows = list(zip(bars['high'], bars['low'], bars['close']))
+    atr = ATR(14).seed(rows[:100])
+    assert atr.value == pytest.approx(executor.TechnicalAnalysis.atr(bars['high'][:100], bars['low'][:100],
+                                                                     close[:100], 14)[-1], rel=1e-9)
+
+
+def test_flat_prices_rsi(executor):
+    close = [1.1] * 30 + [1.1 + 0.0001 * i for i in range(30)]
+    assert_same_values(_stream(RSI(14), close[:20], close[20:]), executor.TechnicalAnalysis.rsi(close, 14))
+
+
+def test_nan_in_the_window(executor, bars):
+    close = list(bars['close'])
+    close[120] = float('nan')
+    assert_same_values(_stream(SMA(20), close[:100], close[100:]), executor.TechnicalAnalysis.sma(close, 20))
+
+
+def test_sma_resync_keeps_the_window_sum(executor, monkeypatch):
+    monkeypatch.setattr(SMA, 'RESYNC_INTERVAL', 7)
+    close = random_walk(200, seed=5)['close'].tolist()
+    assert_same_values(_stream(SMA(10), close[:50], close[50:]), executor.TechnicalAnalysis.sma(close, 10))
+
+
+@pytest.mark.parametrize('seed_length', [0, 51, 300])
+def test_crossover_matches_batch_moving_averages(executor, bars, seed_length):
+    close = bars['close']
+    short_ma = executor.TechnicalAnalysis.sma(close, 20)
+    long_ma = executor.TechnicalAnalysis.sma(close, 50)
+    expected = [None]
+    for i in range(1, N):
+        # The rule the runner applied to the batch moving averages of the last two candles
+        if short_ma[i - 1] <= long_ma[i - 1] and short_ma[i] > long_ma[i]:
+            expected.append('BUY')
+        elif short_ma[i - 1] >= long_ma[i - 1] and short_ma[i] < long_ma[i]:
+            expected.append('SELL')
+        else:
+            expected.append(None)
+
+    short, long, detector = SMA(20), SMA(50), CrossoverDetector()
+    signals = [detector.update(short.update(c), long.update(c)) for c in close[:seed_length]]
+    signals += [detector.update(short.update(c), long.update(c)) for c in close[seed_length:]]
+    assert signals == expected
+    assert expected.count('BUY') > 0 and expected.count('SELL') > 0
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        StreamingIndicator(5)
+
+    class Incomplete(StreamingIndicator):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(5)
+    with pytest.raises(ValueError):
+        SMA(0)
@@ -0,0 +1,209 @@
+"""
+SupportResistanceDetection and PriceActionPatterns (array kernels) against the
+reference list-based implementation, and the structured arrays of as_array=True.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from conftest import exec_source
+
+LENGTHS = [0, 1, 2, 3, 5, 7, 12, 30, 200, 1500]
+KINDS = ['walk', 'nan', 'flat', 'ties']
+BAR_PATTERNS = ['pin_bar', 'engulfing_pattern', 'doji_patterns', 'morning_evening_star', 'inside_outside_bars']
+
+
+@pytest.fixture(scope='module')
+def reference(reference_sources):
+    return exec_source(reference_sources['ADVANCED_TECHNICAL_ANALYSIS_PYTHON_CODE'])
+
+
+@pytest.fixture(scope='module')
+def current():
+    from embedded_python import load_python_sources
+    return exec_source(load_python_sources()['ADVANCED_TECHNICAL_ANALYSIS_PYTHON_CODE'])
+
+
+def _same(actual, expected):
+    """Exact equality of nested results (NaN == NaN, int vs float kept apart)."""
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and list(actual) == list(expected) and all(
+            _same(actual[key], expected[key]) for key in expected)
+    if isinstance(expected, (list, tuple)):
+        return isinstance(actual, (list, tuple)) and len(actual) == len(expected) and all(
+            _same(a, e) for a, e in zip(actual, expected))
+    if isinstance(expected, float) and math.isnan(expected):
+        return isinstance(actual, float) and math.isnan(actual)
+    return actual == expected and type(actual) in (type(expected), int, float)
+
+
+def _bars(kind, n, seed):
+    """Open/high/low/close/volume lists; 'nan' lays NaN into every field, 'flat' adds zero-range bars."""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0004, n))
+    if kind == 'ties':
+        close = np.round(close, 3)
+    open_prices = np.r_[close[:1], close[:-1]]
+    if kind == 'flat':
+        open_prices[::7] = close[::7]
+    high = np.maximum(open_prices, close) + np.abs(rng.normal(0, 0.0002, n))
+    low = np.minimum(open_prices, close) - np.abs(rng.normal(0, 0.0002, n))
+    if kind == 'ties':
+        high, low = np.round(high, 3), np.round(low, 3)
+    if kind == 'flat':
+        high[::11] = low[::11] = open_prices[::11] = close[::11]
+    volume = rng.integers(50, 500, n).astype(float)
+    if kind == 'nan' and n:
+        for values in (open_prices, high, low, close, volume):
+            values[rng.integers(0, n, max(1, n // 50))] = np.nan
+    return [values.tolist() for values in (open_prices, high, low, close, volume)]
+
+
+def _call(owner, name, *args):
+    try:
+        return getattr(owner, name)(*args)
+    except Exception as e:
+        return e
+
+
+def _assert_matches(actual, expected, what):
+    if isinstance(expected, Exception):
+        assert type(actual) is type(expected), what
+    else:
+        assert _same(actual, expected), what
+
+
+def _cases():
+    for kind in KINDS:
+        for n in LENGTHS:
+            yield pytest.param(kind, n, id=f"{kind}-{n}")
+
+
+@pytest.mark.parametrize('kind,n', list(_cases()))
+def test_support_resistance_matches_reference(reference, current, kind, n):
+    old, new = reference['SupportResistanceDetection'], current['SupportResistanceDetection']
+    o, h, l, c, v = _bars(kind, n, seed=n)
+    calls = [('fractal_levels', (h, l, lookback)) for lookback in (0, 1, 3, 5)]
+    calls += [('recent_highs_lows', (h, l, period)) for period in (1, 5, 20)]
+    calls += [('supply_demand_zones', (h, l, c, v, 2))]
+    if kind != 'nan':
+        calls += [('volume_profile_levels', (c, v, bins)) for bins in (7, 20)]
+    for level in [1.1, 1.0995, 1.2, -1.0] + c[:5]:
+        calls.append(('support_resistance_strength', (h, l, c, level)))
+    for name, args in calls:
+        _assert_matches(_call(new, name, *args), _call(old, name, *args), (name, args[-1]))
+
+
+@pytest.mark.parametrize('kind,n', list(_cases()))
+def test_price_action_matches_reference(reference, current, kind, n):
+    old, new = reference['PriceActionPatterns'], current['PriceActionPatterns']
+    o, h, l, c, v = _bars(kind, n, seed=n)
+    for name in BAR_PATTERNS:
+        expected = _call(old, name, o, h, l, c)
+        if name == 'engulfing_pattern' and isinstance(expected, ZeroDivisionError):
+            continue  # covered by test_engulfing_zero_previous_body
+        _assert_matches(getattr(new, name)(o, h, l, c), expected, name)
+    for lookback in (2, 5, 20):
+        _assert_matches(new.chart_patterns_simple(h, l, c, lookback),
+                        old.chart_patterns_simple(h, l, c, lookback), ('chart_patterns_simple', lookback))
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_batch_strength_matches_reference_per_level(reference, current, kind):
+    o, h, l, c, v = _bars(kind, 300, seed=7)
+    levels = c[:50] + [1.1, -1.0, float('nan')]
+    expected = [reference['SupportResistanceDetection'].support_resistance_strength(h, l, c, level)
+                for level in levels]
+    actual = current['SupportResistanceDetection'].support_resistance_strength(h, l, c, np.array(levels))
+    assert actual.dtype == np.int64
+    assert actual.tolist() == expected
+
+
+def test_volume_profile_ignores_nan_closes(reference, current):
+    # The reference cannot bin a NaN close (it raises, or min/max turn NaN);
+    # the kernel drops those bars and matches the reference on the rest
+    o, h, l, c, v = _bars('walk', 200, seed=3)
+    for i in (0, 17, 80, 199):
+        c[i] = float('nan')
+    keep = [i for i, price in enumerate(c) if not math.isnan(price)]
+    assert len(keep) < len(c)
+    expected = reference['SupportResistanceDetection'].volume_profile_levels([c[i] for i in keep], [v[i] for i in keep])
+    assert _same(current['SupportResistanceDetection'].volume_profile_levels(c, v), expected)
+
+
+def test_engulfing_zero_previous_body(reference, current):
+    # A bullish candle engulfing a doji: the reference divides by the zero
+    # previous body, the kernel gives full strength
+    o = [1.1000, 1.1000, 1.0990]
+    h = [1.1005, 1.1005, 1.1015]
+    l = [1.0995, 1.0995, 1.0985]
+    c = [1.1000, 1.1000, 1.1010]
+    with pytest.raises(ZeroDivisionError):
+        reference['PriceActionPatterns'].engulfing_pattern(o, h, l, c)
+    patterns = current['PriceActionPatterns'].engulfing_pattern(o, h, l, c)
+    assert patterns == [{'type': 'none', 'strength': 0}, {'type': 'none', 'strength': 0},
+                        {'type': 'bullish_engulfing', 'strength': 100}]
+    # Bars where the previous body is non-zero still match the reference
+    o, h, l, c = o + [1.1012, 1.1020], h + [1.1022, 1.1025], l + [1.1008, 1.0995], c + [1.1015, 1.1000]
+    expected = reference['PriceActionPatterns'].engulfing_pattern(o[2:], h[2:], l[2:], c[2:])
+    assert current['PriceActionPatterns'].engulfing_pattern(o, h, l, c)[3:] == expected[1:]
+
+
+def _list_rows(rows, fields):
+    return [tuple(row[field] for field in fields) for row in rows]
+
+
+def test_support_resistance_as_array(current):
+    sr = current['SupportResistanceDetection']
+    o, h, l, c, v = _bars('walk', 500, seed=11)
+
+    for name, args in (('fractal_levels', (h, l, 5)), ('recent_highs_lows', (h, l, 20))):
+        arrays = getattr(sr, name)(*args, as_array=True)
+        lists = getattr(sr, name)(*args)
+        assert list(arrays) == list(lists)
+        for key, values in arrays.items():
+            assert isinstance(values, np.ndarray) and values.dtype == np.float64
+            assert _same(values.tolist(), lists[key])
+
+    zones = sr.supply_demand_zones(h, l, c, v, 2, as_array=True)
+    zone_lists = sr.supply_demand_zones(h, l, c, v, 2)
+    fields = sr.ZONE_DTYPE.names
+    assert fields == ('start_index', 'high', 'low', 'strength', 'type')
+    for key in ('supply_zones', 'demand_zones'):
+        assert zones[key].dtype == sr.ZONE_DTYPE
+        assert len(zones[key]) > 0
+        assert zones[key].tolist() == _list_rows(zone_lists[key], fields)
+
+    profile = sr.volume_profile_levels(c, v, 20, as_array=True)
+    profile_lists = sr.volume_profile_levels(c, v, 20)
+    assert profile['levels'].dtype == sr.LEVEL_DTYPE
+    assert profile['levels'].tolist() == profile_lists['levels']
+    assert profile['poc'] == profile_lists['poc'] == profile['levels']['price'][0]
+    # volume_by_price: the occupied bins by price
+    by_price = profile['volume_by_price']
+    assert np.all(np.diff(by_price['price']) > 0)
+    assert dict(by_price.tolist()) == profile_lists['volume_by_price']
+    flat = sr.volume_profile_levels([1.1] * 5, [1.0] * 5, as_array=True)
+    assert flat['levels'].dtype == sr.LEVEL_DTYPE and len(flat['levels']) == 0
+
+
+def test_price_action_as_array(current):
+    pap = current['PriceActionPatterns']
+    o, h, l, c, v = _bars('flat', 500, seed=5)
+    for name in BAR_PATTERNS:
+        patterns = getattr(pap, name)(o, h, l, c, as_array=True)
+        assert patterns.dtype == pap.PATTERN_DTYPE
+        assert patterns.tolist() == _list_rows(getattr(pap, name)(o, h, l, c), ('type', 'strength'))
+
+    o, h, l, c, v = _bars('ties', 500, seed=2)
+    charts = pap.chart_patterns_simple(h, l, c, 20, as_array=True)
+    chart_lists = pap.chart_patterns_simple(h, l, c, 20)
+    for key in ('double_tops', 'double_bottoms'):
+        assert charts[key].dtype == pap.CHART_PATTERN_DTYPE
+        assert len(charts[key]) > 0
+        assert charts[key].tolist() == [
+            (pair['indices'][0], pair['indices'][1], pair['levels'][0], pair['levels'][1], pair['current_index'])
+            for pair in chart_lists[key]
+        ]
@@ -0,0 +1,101 @@
+"""
+TechnicalAnalysis (NumPy/pandas, cached) against the reference list-based
+implementation, on random walks, NaN-laced data and short series.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from conftest import assert_same_values, exec_source, random_walk
+
+LENGTHS = [0, 1, 2, 3, 9, 14, 15, 27, 40, 300]
+
+# name -> (input fields, parameter sets)
+INDICATORS = {
+    'ema': (('close',), [(5,), (14,), (50,)]),
+    'sma': (('close',), [(1,), (5,), (20,)]),
+    'rsi': (('close',), [(), (2,), (14,)]),
+    'atr': (('high', 'low', 'close'), [(), (5,)]),
+    'macd': (('close',), [(), (3, 6, 4)]),
+    'bollinger_bands': (('close',), [(), (5, 1.5)]),
+    'stochastic': (('high', 'low', 'close'), [(), (5, 2)]),
+    'williams_r': (('high', 'low', 'close'), [(), (5,)]),
+}
+
+
+@pytest.fixture(scope='module')
+def reference(reference_sources):
+    return exec_source(reference_sources['TECHNICAL_ANALYSIS_PYTHON_CODE'])['TechnicalAnalysis']
+
+
+@pytest.fixture
+def current(executor):
+    executor.INDICATOR_CACHE.clear()
+    yield executor.TechnicalAnalysis
+    executor.INDICATOR_CACHE.clear()
+
+
+def _series(kind, n, seed):
+    data = random_walk(n, seed=seed)
+    if kind == 'nan' and n:
+        rng = np.random.default_rng(seed + 1)
+        for values in data.values():
+            values[rng.random(n) < 0.05] = np.nan
+    elif kind == 'flat' and n:
+        # Flat stretches hit the high == low sentinels of stochastic / williams_r
+        for values in data.values():
+            values[n // 3:2 * n // 3] = 1.1
+    return {field: values.tolist() for field, values in data.items()}
+
+
+def _calls():
+    for name, (fields, param_sets) in INDICATORS.items():
+        for params in param_sets:
+            for kind in ('walk', 'nan', 'flat'):
+                for n in LENGTHS:
+                    yield pytest.param(name, fields, params, kind, n, id=f"{name}{params}-{kind}-{n}")
+
+
+@pytest.mark.parametrize('name,fields,params,kind,n', list(_calls()))
+def test_matches_reference(reference, current, name, fields, params, kind, n):
+    series = _series(kind, n, seed=n)
+    args = tuple(series[field] for field in fields) + params
+    expected = getattr(reference, name)(*args)
+    miss = getattr(current, name)(*args)
+    hit = getattr(current, name)(*args)
+    assert_same_values(miss, expected)
+    assert_same_values(hit, expected)
+
+
+def _item_types(result):
+    if isinstance(result, dict):
+        return {key: _item_types(values) for key, values in result.items()}
+    return [type(v) for v in result]
+
+
+@pytest.mark.parametrize('name', ['stochastic', 'williams_r'])
+def test_cache_hit_keeps_sentinel_types(current, name):
+    series = _series('flat', 60, seed=3)
+    args = (series['high'], series['low'], series['close'], 5)
+    miss = getattr(current, name)(*args)
+    hit = getattr(current, name)(*args)
+    assert _item_types(hit) == _item_types(miss)
+    values = miss['k'] if isinstance(miss, dict) else miss
+    assert any(type(v) is int for v in values)
+
+
+def test_cache_hit_returns_fresh_lists(current):
+    close = _series('walk', 50, seed=4)['close']
+    first = current.ema(close, 10)
+    first[-1] = 0.0
+    assert current.ema(close, 10)[-1] != 0.0
+    assert not math.isnan(current.ema(close, 10)[-1])
+
+
+def test_as_array_is_read_only_float64(current):
+    close = np.asarray(_series('walk', 50, seed=5)['close'])
+    values = current.sma(close, 10, as_array=True)
+    assert values.dtype == np.float64 and not values.flags.writeable
+    assert current.sma(close, 10, as_array=True) is values
@@ -0,0 +1,144 @@
+"""BarAggregator / BarFeed on a recorded pricing stream: OHLCV, close boundaries and replay."""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import FIXTURES_DIR
+from tick_stream import BarAggregator, BarFeed, ReplaySource, Tick, bar_seconds, parse_stream_time
+
+TICKS_FILE = os.path.join(FIXTURES_DIR, 'eur_gbp_ticks.jsonl')
+SUBSCRIPTIONS = [('EUR_USD', 'S5'), ('EUR_USD', 'S10'), ('GBP_USD', 'S5')]
+START = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc).timestamp()
+
+# (instrument, granularity, start offset, open, high, low, close, volume, partial) in stream order
+EXPECTED_BARS = [
+    ('EUR_USD', 'S5', 0, 1.1000, 1.1004, 1.0998, 1.1002, 4, True),     # closed by the 12:00:05 tick
+    ('GBP_USD', 'S5', 0, 1.2700, 1.2700, 1.2700, 1.2700, 1, True),
+    ('EUR_USD', 'S5', 5, 1.1006, 1.1010, 1.1006, 1.1010, 2, False),    # closed by the 10.2s heartbeat
+    ('EUR_USD', 'S10', 0, 1.1000, 1.1010, 1.0998, 1.1010, 6, True),
+    ('GBP_USD', 'S5', 5, 1.2690, 1.2690, 1.2690, 1.2690, 1, False),
+    ('EUR_USD', 'S5', 10, 1.1008, 1.1008, 1.1008, 1.1008, 1, False),   # the 12:00:15 bar is still open
+]
+
+
+def _messages():
+    with open(TICKS_FILE) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _bar_row(bar):
+    candle = bar.candle
+    return (bar.instrument, bar.granularity, bar.start - START, candle['mid']['o'], candle['mid']['h'],
+            candle['mid']['l'], candle['mid']['c'], candle['volume'], bar.partial)
+
+
+def _assert_bars(bars, expected=EXPECTED_BARS):
+    assert len(bars) == len(expected)
+    for bar, row in zip(bars, expected):
+        actual = _bar_row(bar)
+        assert actual[:3] == row[:3]
+        assert actual[3:7] == pytest.approx(row[3:7], abs=1e-9)
+        assert actual[7:] == row[7:]
+        assert bar.close_time == bar.start + bar_seconds(bar.granularity)
+        assert bar.candle['complete'] is True
+        assert bar.candle['time'] == datetime.fromtimestamp(bar.start, timezone.utc).strftime(
+            '%Y-%m-%dT%H:%M:%S.000000000Z')
+
+
+def test_replay_builds_bars_at_the_period_boundaries():
+    feed = BarFeed(ReplaySource.from_file(TICKS_FILE), BarAggregator(SUBSCRIPTIONS))
+    _assert_bars(list(feed))
+    metrics = feed.metrics()
+    assert metrics['bars'] == len(EXPECTED_BARS)
+    assert metrics['ticks'] == 11
+    # The resent 12:00:05 tick and the 12:00:04 tick after it
+    assert metrics['duplicate_ticks'] == 2
+    # The 12:00:09.9 tick arrived after the heartbeat closed both EUR_USD bars ending at 12:00:10
+    assert metrics['late_ticks'] == 2
+
+
+def test_tick_on_the_boundary_opens_the_next_bar():
+    aggregator = BarAggregator([('EUR_USD', 'S5')])
+    assert aggregator.on_tick(Tick('EUR_USD', START + 4.999, 1.0, 1.0)) == []
+    closed = aggregator.on_tick(Tick('EUR_USD', START + 5.0, 2.0, 2.0))
+    assert [(bar.start - START, bar.candle['mid']['c']) for bar in closed] == [(0, 1.0)]
+    assert aggregator.next_close() == START + 10
+
+
+def test_clock_closes_a_bar_without_a_tick():
+    aggregator = BarAggregator([('EUR_USD', 'S5')])
+    aggregator.on_tick(Tick('EUR_USD', START + 1, 1.0, 1.2))
+    assert aggregator.on_clock(START + 4.99) == []
+    closed = aggregator.on_clock(START + 5)
+    assert [(bar.start - START, bar.candle['mid']['o']) for bar in closed] == [(0, pytest.approx(1.1))]
+    assert aggregator.next_close() is None
+
+
+def test_bid_and_ask_bars():
+    message = _messages()[0]
+    tick = Tick.from_message(message)
+    for price, expected in (('bid', 1.0999), ('ask', 1.1001)):
+        aggregator = BarAggregator([('EUR_USD', 'S5')], price=price)
+        aggregator.on_tick(tick)
+        (bar,) = aggregator.on_clock(START + 5)
+        assert bar.candle[price]['c'] == pytest.approx(expected)
+
+
+def test_backpressure_keeps_every_bar_in_order():
+    feed = BarFeed(ReplaySource(_messages()), BarAggregator(SUBSCRIPTIONS), max_pending_bars=1)
+    bars = []
+    for bar in feed:
+        bars.append(bar)
+        time.sleep(0.02)
+    _assert_bars(bars)
+    assert feed.metrics()['backpressure_waits'] > 0
+
+
+def test_recorded_stream_replays_identically(tmp_path):
+    recording = str(tmp_path / 'stream.jsonl')
+    live = list(BarFeed(ReplaySource(_messages()), BarAggregator(SUBSCRIPTIONS), record_to=recording))
+    replayed = list(BarFeed(ReplaySource.from_file(recording), BarAggregator(SUBSCRIPTIONS)))
+    assert [bar.candle for bar in replayed] == [bar.candle for bar in live]
+    _assert_bars(replayed)
+
+
+def test_paced_replay_sleeps_by_timestamp():
+    slept = []
+    messages = _messages()[:3]
+    list(ReplaySource(messages, speed=2.0, sleep=slept.append))
+    assert slept == pytest.approx([0.25, 0.5])
+
+
+class ReconnectingSource:
+    """Replay that reports a reconnect before the message at `reconnect_at`."""
+
+    def __init__(self, messages, reconnect_at):
+        self.messages = messages
+        self.reconnect_at = reconnect_at
+        self.reconnects = 0
+
+    def __iter__(self):
+        for index, message in enumerate(self.messages):
+            if index == self.reconnect_at:
+                self.reconnects += 1
+            yield message
+
+
+def test_reconnect_marks_the_bars_in_progress_partial():
+    messages = _messages()
+    # Reconnect right before the 12:00:07.3 EUR_USD tick
+    source = ReconnectingSource(messages, reconnect_at=9)
+    bars = list(BarFeed(source, BarAggregator(SUBSCRIPTIONS)))
+    partial = {(bar.instrument, bar.granularity, bar.start - START): bar.partial for bar in bars}
+    assert partial[('EUR_USD', 'S5', 5)] is True
+    assert partial[('GBP_USD', 'S5', 5)] is True
+    assert partial[('EUR_USD', 'S5', 10)] is False
+
+
+def test_stream_time_parsing():
+    assert parse_stream_time('2026-03-10T12:00:05.250000000Z') == pytest.approx(START + 5.25)
+    assert parse_stream_time('2026-03-10T12:00:05Z') == START + 5
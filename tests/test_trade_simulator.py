@@ -0,0 +1,149 @@
+"""Trade simulator fills on small hand-checked OHLC series."""
+
+import numpy as np
+import pytest
+
+from trade_simulator import (EXIT_END_OF_DATA, EXIT_SIGNAL, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, direction_signs,
+                             simulate_strategy_result, simulate_trades)
+
+UNITS = 10000
+
+
+def _simulate(bars, entry, direction, exit=None, **settings):
+    """bars: (open, high, low, close) rows; 10 pip stop / 20 pip target and 10k units unless overridden."""
+    open_, high, low, close = (list(column) for column in zip(*bars))
+    settings = {'stop_loss_pips': 10, 'take_profit_pips': 20, 'units': UNITS, **settings}
+    return simulate_trades(open_, high, low, close, entry, direction=direction, exit=exit, **settings)
+
+
+def _only_trade(simulation):
+    assert len(simulation.trades) == 1
+    return simulation.trades.iloc[0]
+
+
+ENTRY_BAR = (1.1000, 1.1002, 1.0998, 1.1000)
+QUIET_BAR = (1.1000, 1.1004, 1.0996, 1.1002)
+
+
+@pytest.mark.parametrize('direction,bar,reason,exit_price', [
+    # BUY: stop 1.0990, target 1.1020
+    ('BUY', (1.1000, 1.1005, 1.0985, 1.0995), EXIT_STOP_LOSS, 1.0990),
+    ('BUY', (1.1000, 1.1025, 1.0995, 1.1015), EXIT_TAKE_PROFIT, 1.1020),
+    ('BUY', (1.1000, 1.1025, 1.0985, 1.1000), EXIT_STOP_LOSS, 1.0990),    # both inside the bar: stop first
+    ('BUY', (1.0980, 1.0990, 1.0970, 1.0975), EXIT_STOP_LOSS, 1.0980),    # gaps through the stop: open
+    ('BUY', (1.1030, 1.1040, 1.1025, 1.1035), EXIT_TAKE_PROFIT, 1.1030),  # gaps through the target: open
+    # SELL: stop 1.1010, target 1.0980
+    ('SELL', (1.1000, 1.1015, 1.0995, 1.1005), EXIT_STOP_LOSS, 1.1010),
+    ('SELL', (1.1000, 1.1005, 1.0975, 1.0985), EXIT_TAKE_PROFIT, 1.0980),
+    ('SELL', (1.1000, 1.1015, 1.0975, 1.1000), EXIT_STOP_LOSS, 1.1010),
+])
+def test_stop_loss_and_take_profit_fills(direction, bar, reason, exit_price):
+    trade = _only_trade(_simulate([ENTRY_BAR, QUIET_BAR, bar, QUIET_BAR], [True, False, False, False],
+                                  [direction, None, None, None]))
+    sign = 1 if direction == 'BUY' else -1
+    assert (trade['type'], trade['entry_index'], trade['exit_index'], trade['exit_reason']) == (direction, 0, 2, reason)
+    assert trade['entry'] == pytest.approx(1.1000)
+    assert trade['stop_loss'] == pytest.approx(1.1000 - sign * 0.0010)
+    assert trade['take_profit'] == pytest.approx(1.1000 + sign * 0.0020)
+    assert trade['exit'] == pytest.approx(exit_price)
+    assert trade['pnl'] == pytest.approx((exit_price - 1.1000) * sign * UNITS)
+
+
+def test_exit_signal_fills_at_the_close():
+    bars = [ENTRY_BAR, QUIET_BAR, (1.1002, 1.1008, 1.1000, 1.1006), QUIET_BAR]
+    trade = _only_trade(_simulate(bars, [True, False, False, False], ['BUY', None, None, None],
+                                  exit=[False, False, True, False]))
+    assert (trade['exit_index'], trade['exit_reason'], trade['bars_held']) == (2, EXIT_SIGNAL, 2)
+    assert trade['exit'] == pytest.approx(1.1006)
+    assert trade['pnl'] == pytest.approx(6.0)
+
+
+def test_open_position_is_marked_out_at_the_end():
+    trade = _only_trade(_simulate([ENTRY_BAR, QUIET_BAR, QUIET_BAR], [True, False, False], ['SELL', None, None]))
+    assert (trade['exit_index'], trade['exit_reason']) == (2, EXIT_END_OF_DATA)
+    assert trade['pnl'] == pytest.approx(-2.0)
+
+
+def test_spread_and_commission():
+    bars = [ENTRY_BAR, QUIET_BAR, (1.1002, 1.1008, 1.1000, 1.1006), QUIET_BAR]
+    exit = [False, False, True, False]
+    buy = _only_trade(_simulate(bars, [True, False, False, False], ['BUY'] * 4, exit=exit,
+                                spread_pips=1, commission=2.0))
+    # Pays the spread both ways: in at 1.1000 + 0.0001, out at 1.1006 - 0.0001
+    assert buy['entry'] == pytest.approx(1.1001)
+    assert buy['exit'] == pytest.approx(1.1005)
+    assert buy['pnl'] == pytest.approx(0.0004 * UNITS - 2.0)
+    # Stop and target are measured from the filled entry
+    assert buy['stop_loss'] == pytest.approx(1.0991)
+    assert buy['take_profit'] == pytest.approx(1.1021)
+
+    sell = _only_trade(_simulate(bars, [True, False, False, False], ['SELL'] * 4, exit=exit,
+                                 spread_pips=1, commission=2.0))
+    assert sell['entry'] == pytest.approx(1.0999)
+    assert sell['exit'] == pytest.approx(1.1007)
+    assert sell['pnl'] == pytest.approx(-0.0008 * UNITS - 2.0)
+
+
+def test_stop_fill_pays_slippage():
+    bars = [ENTRY_BAR, (1.1000, 1.1005, 1.0985, 1.0995)]
+    trade = _only_trade(_simulate(bars, [True, False], ['BUY', None], slippage_pips=0.5))
+    assert trade['exit'] == pytest.approx(1.09895)
+
+
+def test_per_bar_levels_take_precedence():
+    bars = [ENTRY_BAR, (1.1000, 1.1006, 1.0996, 1.1004)]
+    trade = _only_trade(_simulate(bars, [True, False], ['BUY', None],
+                                  stop_loss_levels=[1.0995, 0], take_profit_levels=[1.1005, 0]))
+    assert (trade['stop_loss'], trade['take_profit']) == pytest.approx((1.0995, 1.1005))
+    assert (trade['exit_reason'], trade['exit']) == (EXIT_TAKE_PROFIT, pytest.approx(1.1005))
+    # A level on the wrong side of the entry falls back to the pip distance
+    wrong_side = _only_trade(_simulate(bars, [True, False], ['BUY', None], stop_loss_levels=[1.1005, 0]))
+    assert wrong_side['stop_loss'] == pytest.approx(1.0990)
+
+
+def test_one_position_at_a_time():
+    bars = [ENTRY_BAR, QUIET_BAR, QUIET_BAR, (1.1000, 1.1025, 1.0995, 1.1015), QUIET_BAR, QUIET_BAR]
+    simulation = _simulate(bars, [True, True, True, False, True, False], ['BUY'] * 6)
+    assert simulation.trades['entry_index'].tolist() == [0, 4]
+    assert simulation.trades['exit_index'].tolist() == [3, 5]
+
+
+@pytest.mark.parametrize('direction', [
+    np.array([np.nan, 0.0, -1.0, np.nan]),
+    np.array([0, 0, -1, 0]),
+    [None, 'None', 'SELL', None],
+])
+def test_nan_and_zero_directions_do_not_trade(direction):
+    bars = [ENTRY_BAR, ENTRY_BAR, ENTRY_BAR, QUIET_BAR]
+    simulation = _simulate(bars, [True, True, True, True], direction)
+    trade = _only_trade(simulation)
+    assert (trade['type'], trade['entry_index']) == ('SELL', 2)
+    assert not np.isnan(simulation.equity).any()
+    stats = simulation.stats()
+    assert stats['final_balance'] == pytest.approx(10000 - 2.0)
+    assert not any(isinstance(value, float) and np.isnan(value) for value in stats.values())
+
+
+def test_direction_signs():
+    np.testing.assert_array_equal(direction_signs(np.array([2.5, -0.1, np.nan, 0.0]), 4), [1, -1, 0, 0])
+    np.testing.assert_array_equal(direction_signs(None, 3), [1, 1, 1])
+    np.testing.assert_array_equal(direction_signs(['BUY', 'SELL', None], 3), [1, -1, 0])
+
+
+def test_equity_and_stats():
+    bars = [ENTRY_BAR, (1.1000, 1.1025, 1.0995, 1.1015), ENTRY_BAR, (1.1000, 1.1005, 1.0985, 1.0995)]
+    simulation = _simulate(bars, [True, False, True, False], ['BUY', None, 'BUY', None])
+    np.testing.assert_allclose(simulation.equity, [10000, 10020, 10020, 10010])
+    stats = simulation.stats()
+    assert (stats['total_trades'], stats['winning_trades'], stats['losing_trades']) == (2, 1, 1)
+    assert stats['total_return'] == pytest.approx(0.1)
+    assert stats['profit_factor'] == pytest.approx(2.0)
+    assert stats['max_drawdown'] == pytest.approx(10 / 10020 * 100)
+
+
+def test_simulate_strategy_result_reads_the_dict_format():
+    columns = {name: np.array(values) for name, values in zip(('Open', 'High', 'Low', 'Close'),
+                                                               zip(ENTRY_BAR, (1.1000, 1.1025, 1.0995, 1.1015)))}
+    result = {'entry': [True, False], 'exit': [False, False], 'direction': ['SELL', None]}
+    trade = _only_trade(simulate_strategy_result(columns, result, stop_loss_pips=10, units=UNITS))
+    assert (trade['type'], trade['exit_reason']) == ('SELL', EXIT_STOP_LOSS)
@@ -0,0 +1,120 @@
+"""
+Bundled vectorized strategies against the loop strategies they replace: the same
+entry/exit/direction signals and SL/TP levels, in normal and reversed mode.
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import FIXTURES_DIR, ROOT, assert_same_values
+
+STRATEGIES_DIR = os.path.join(ROOT, 'src', 'strategies')
+PAIRS = [
+    ('smartMomentumStrategyFixed', 'smartMomentumStrategyVectorized'),
+    ('williamsFractalEMAScalper', 'williamsFractalEMAScalperVectorized'),
+]
+SIGNAL_KEYS = ['entry', 'exit', 'direction', 'trade_direction', 'trade_type']
+LEVEL_KEYS = ['stop_loss_levels', 'take_profit_levels']
+INDICATOR_KEYS = ['short_ema', 'long_ema', 'daily_ema', 'rsi', 'atr', 'avg_atr', 'ema_20', 'ema_50', 'ema_100',
+                  'fractal_highs', 'fractal_lows']
+
+
+def _source(name):
+    with open(os.path.join(STRATEGIES_DIR, f'{name}.py')) as f:
+        return f.read()
+
+
+def _walk_frame(n, seed, nan=False):
+    """Trending and ranging stretches with changing volatility, so both strategies trade."""
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 0.0003, n // 100 + 1), 100)[:n]
+    scale = np.repeat(rng.uniform(0.0001, 0.0009, n // 50 + 1), 50)[:n]
+    close = 1.1 + np.cumsum(drift + rng.normal(0, 1, n) * scale)
+    open_prices = np.r_[close[:1], close[:-1]]
+    high = np.maximum(open_prices, close) + np.abs(rng.normal(0, 1, n)) * scale
+    low = np.minimum(open_prices, close) - np.abs(rng.normal(0, 1, n)) * scale
+    if nan:
+        for values in (high, low):
+            values[rng.integers(0, n, n // 200)] = np.nan
+    return pd.DataFrame({'Open': open_prices, 'High': high, 'Low': low, 'Close': close,
+                         'Volume': rng.integers(50, 500, n).astype(float)})
+
+
+def _recorded_frame():
+    with open(os.path.join(FIXTURES_DIR, 'eur_usd_m1_candles.json')) as f:
+        candles = json.load(f)['EUR_USD']
+    return pd.DataFrame({column: [float(candle['mid'][key]) for candle in candles]
+                         for column, key in (('Open', 'o'), ('High', 'h'), ('Low', 'l'), ('Close', 'c'))})
+
+
+DATASETS = {
+    'walk-0': lambda: _walk_frame(3000, 0),
+    'walk-1': lambda: _walk_frame(3000, 1),
+    'walk-2': lambda: _walk_frame(3000, 2),
+    'walk-nan-highs-lows': lambda: _walk_frame(3000, 3, nan=True),
+    'short': lambda: _walk_frame(150, 4),
+    'recorded-m1': _recorded_frame,
+}
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return {name: build() for name, build in DATASETS.items()}
+
+
+def _run(executor, name, df, reverse):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return executor.CompiledStrategy(None, _source(name)).run(df, reverse)
+
+
+def _as_list(values):
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+def _same_items(actual, expected):
+    return len(actual) == len(expected) and all(
+        (isinstance(a, float) and isinstance(e, float) and math.isnan(a) and math.isnan(e)) or a == e
+        for a, e in zip(actual, expected))
+
+
+@pytest.mark.parametrize('reverse', [False, True], ids=['normal', 'reversed'])
+@pytest.mark.parametrize('dataset', list(DATASETS))
+@pytest.mark.parametrize('loop_name,vectorized_name', PAIRS, ids=[pair[1] for pair in PAIRS])
+def test_vectorized_matches_loop(executor, frames, loop_name, vectorized_name, dataset, reverse):
+    df = frames[dataset]
+    expected = _run(executor, loop_name, df, reverse)
+    actual = _run(executor, vectorized_name, df, reverse)
+
+    for key in SIGNAL_KEYS + LEVEL_KEYS:
+        if key in expected:
+            # Bit-identical: exact equality, not a tolerance
+            assert _same_items(_as_list(actual[key]), _as_list(expected[key])), key
+    for key in INDICATOR_KEYS:
+        if key in expected:
+            assert_same_values(_as_list(actual[key]), _as_list(expected[key]), rtol=0, atol=0)
+    assert actual['reverse_signals_applied'] == reverse
+
+    # And the same trades once processed (directions of the fractal scalper are auto-generated)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processed_loop = executor.process_strategy_signals(expected, reverse)
+        processed_vectorized = executor.process_strategy_signals(actual, reverse)
+    for key in ('entry', 'exit', 'direction', 'error'):
+        assert processed_vectorized.get(key) == processed_loop.get(key), key
+
+
+@pytest.mark.parametrize('loop_name,vectorized_name', PAIRS, ids=[pair[1] for pair in PAIRS])
+def test_parity_data_exercises_both_directions(executor, frames, loop_name, vectorized_name):
+    # Guard against parity holding only because nothing trades
+    expected = _run(executor, loop_name, frames['walk-0'], False)
+    directions = expected.get('direction', expected.get('trade_type'))
+    entries = [d for d, e in zip(directions, expected['entry']) if e]
+    assert sum(d in ('BUY', 'LONG') for d in entries) >= 10
+    assert sum(d in ('SELL', 'SHORT') for d in entries) >= 10
+    assert sum(expected['exit']) > 0
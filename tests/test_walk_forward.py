@@ -0,0 +1,110 @@
+"""Walk-forward: per-segment scores of the one full-series run match runs on the segment alone, without look-ahead."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_optimizer import ParameterGrid, StrategyOptimizer
+from walk_forward import run_walk_forward, walk_forward_windows
+
+# Every bar's signal depends on that bar only, so a run over a slice has no warm-up to differ by
+BAR_BODY_STRATEGY = '''
+def strategy_logic(data, reverse_signals=False, threshold=0.0, fade=False):
+    body = (data['Close'] - data['Open']).tolist()
+    up = 'SELL' if fade else 'BUY'
+    down = 'BUY' if fade else 'SELL'
+    return {'entry': [abs(b) > threshold for b in body], 'exit': [False] * len(body),
+            'direction': [up if b > 0 else down for b in body]}
+'''
+GRID = {'threshold': [0.0, 0.0003, 0.0006], 'fade': [False, True]}
+TRAIN_BARS, TEST_BARS = 300, 100
+
+
+def _market_data(n, seed):
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 0.0003, n // 100 + 1), 100)[:n]
+    scale = np.repeat(rng.uniform(0.0001, 0.0009, n // 50 + 1), 50)[:n]
+    close = 1.1 + np.cumsum(drift + rng.normal(0, 1, n) * scale)
+    open_prices = np.r_[close[:1], close[:-1]]
+    return pd.DataFrame({'open': open_prices,
+                         'high': np.maximum(open_prices, close) + np.abs(rng.normal(0, 1, n)) * scale,
+                         'low': np.minimum(open_prices, close) - np.abs(rng.normal(0, 1, n)) * scale,
+                         'close': close, 'volume': rng.integers(50, 500, n).astype(float)})
+
+
+@pytest.fixture(scope='module')
+def market_data():
+    return _market_data(1000, seed=9)
+
+
+@pytest.fixture(scope='module')
+def walk_forward(market_data):
+    return run_walk_forward(BAR_BODY_STRATEGY, market_data, TRAIN_BARS, TEST_BARS, sampler=ParameterGrid(GRID),
+                            max_workers=1)
+
+
+def _segment_stats(data, start, end, params):
+    """Stats of a standalone run over data[start:end] only."""
+    segment = data.iloc[start:end].reset_index(drop=True)
+    ranking = StrategyOptimizer(BAR_BODY_STRATEGY, segment, max_workers=1).run([params])
+    return ranking.drop(columns=['seconds', 'rank']).to_dict('records')[0]
+
+
+def test_windows():
+    windows = walk_forward_windows(1000, 300, 100, warmup_bars=50)
+    assert [(w.train_start, w.train_end, w.test_start, w.test_end) for w in windows] == [
+        (50, 350, 350, 450), (150, 450, 450, 550), (250, 550, 550, 650), (350, 650, 650, 750),
+        (450, 750, 750, 850), (550, 850, 850, 950)]
+    anchored = walk_forward_windows(1000, 300, 200, step_bars=100, anchored=True)
+    assert [(w.train_start, w.train_end, w.test_end) for w in anchored] == [
+        (0, 300, 500), (0, 400, 600), (0, 500, 700), (0, 600, 800), (0, 700, 900), (0, 800, 1000)]
+    assert walk_forward_windows(399, 300, 100) == []
+
+
+def test_test_scores_match_runs_on_the_segment_alone(market_data, walk_forward):
+    table = walk_forward.windows
+    assert len(table) == len(walk_forward_windows(len(market_data), TRAIN_BARS, TEST_BARS))
+    assert walk_forward.summary['strategy_runs'] == len(ParameterGrid(GRID))
+    assert table['test_total_trades'].sum() > 0
+    for window in table.to_dict('records'):
+        params = {name: window[name] for name in GRID}
+        expected = _segment_stats(market_data, window['test_start'], window['test_end'], params)
+        actual = {key[len('test_'):]: value for key, value in window.items() if key.startswith('test_')
+                  and key not in ('test_start', 'test_end')}
+        assert actual.keys() == expected.keys() - set(GRID)
+        assert actual == pytest.approx({key: expected[key] for key in actual}, nan_ok=True), window['index']
+
+        train = _segment_stats(market_data, window['train_start'], window['train_end'], params)
+        assert window['train_total_return'] == pytest.approx(train['total_return'])
+
+
+def test_selection_is_the_best_in_sample_point(market_data, walk_forward):
+    for window in walk_forward.windows.to_dict('records'):
+        scores = [_segment_stats(market_data, window['train_start'], window['train_end'], params)['total_return']
+                  for params in ParameterGrid(GRID)]
+        assert window['train_total_return'] == pytest.approx(max(scores))
+
+
+def test_selection_never_sees_out_of_sample_bars(market_data, walk_forward):
+    # Replace every bar from the first window's test range on with an unrelated series
+    windows = walk_forward_windows(len(market_data), TRAIN_BARS, TEST_BARS)
+    cut = windows[0].test_start
+    altered = market_data.copy()
+    replacement = _market_data(len(market_data), seed=10)
+    altered.iloc[cut:] = replacement.iloc[cut:].to_numpy() - replacement['close'].iloc[cut] + market_data['close'].iloc[cut - 1]
+
+    rerun = run_walk_forward(BAR_BODY_STRATEGY, altered, TRAIN_BARS, TEST_BARS, sampler=ParameterGrid(GRID),
+                             max_workers=1)
+    first, first_rerun = walk_forward.windows.iloc[0], rerun.windows.iloc[0]
+    # The first window's in-sample choice only depends on bars before its test range
+    for name in list(GRID) + ['train_total_return']:
+        assert first_rerun[name] == first[name]
+    # while its out-of-sample result, and the later windows, do see the new bars
+    assert not rerun.windows['test_total_return'].equals(walk_forward.windows['test_total_return'])
+
+    # Per segment, rows for ranges ending at or before the cut are unchanged for every point
+    keep = ['segment_start', 'segment_end'] + list(GRID)
+    before = walk_forward.results[walk_forward.results['segment_end'] <= cut].drop(columns='seconds')
+    after = rerun.results[rerun.results['segment_end'] <= cut].drop(columns='seconds')
+    pd.testing.assert_frame_equal(before.sort_values(keep).reset_index(drop=True),
+                                  after.sort_values(keep).reset_index(drop=True))
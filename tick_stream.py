@@ -0,0 +1,481 @@
+"""
+Tick streaming and local bar aggregation for the live runner.
+
+Instead of polling InstrumentsCandles after every candle close, the runner
+can read the OANDA pricing stream and build OHLC bars itself. A bar is closed
+by the first tick (or heartbeat) past its end, or by the local clock a short
+grace period after its end, so the signal sees it within milliseconds of the
+close instead of after a REST round trip.
+
+- PricingStreamSource yields raw stream messages (PRICE and HEARTBEAT) and
+  reconnects with exponential backoff when the stream breaks or goes quiet.
+- ReplaySource plays recorded messages back (optionally paced) and stands
+  in for the live stream in tests and offline runs.
+- BarAggregator turns ticks into closed bars for any granularity, including
+  sub-minute ones that OANDA does not offer (e.g. 'S1').
+- BarFeed runs the source on a reader thread and hands closed bars to the
+  consumer through a bounded queue. A slow consumer blocks the reader, which
+  stops reading the socket (TCP backpressure) instead of buffering without
+  limit or dropping bars.
+
+Closed bars carry an OANDA-shaped candle dict, so MovingAverageCrossover
+.on_candles() and CandleSeries.append_candles() take them unchanged.
+"""
+
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from oandapyV20 import API
+from oandapyV20.endpoints.pricing import PricingStream
+
+from candle_scheduler import GRANULARITY_SECONDS
+from candle_store import format_oanda_time
+
+MESSAGE_PRICE = 'PRICE'
+MESSAGE_HEARTBEAT = 'HEARTBEAT'
+
+# OANDA sends a heartbeat every 5 seconds; no data for this long means the stream is dead
+DEFAULT_HEARTBEAT_TIMEOUT = 20.0
+
+_CUSTOM_GRANULARITY = re.compile(r'^([SMH])(\d+)$')
+_UNIT_SECONDS = {'S': 1, 'M': 60, 'H': 3600}
+
+
+def bar_seconds(granularity):
+    """Bar length in seconds: any OANDA granularity, or a custom one such as 'S1', 'S3' or 'M3'."""
+    if granularity in GRANULARITY_SECONDS:
+        return GRANULARITY_SECONDS[granularity]
+    match = _CUSTOM_GRANULARITY.match(str(granularity))
+    if match is None or int(match.group(2)) < 1:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    return int(match.group(2)) * _UNIT_SECONDS[match.group(1)]
+
+
+def parse_stream_time(value, _cache={}):
+    """RFC3339 stream timestamp (nanosecond precision) -> float epoch seconds."""
+    whole, _, fraction = value.rstrip('Z').partition('.')
+    seconds = _cache.get(whole)
+    if seconds is None:
+        # Ticks arrive many per second; remember only the latest whole second
+        _cache.clear()
+        seconds = _cache[whole] = datetime.fromisoformat(whole).replace(tzinfo=timezone.utc).timestamp()
+    return seconds + (float('0.' + fraction) if fraction else 0.0)
+
+
+class Tick:
+    """One price update from the stream."""
+
+    __slots__ = ('instrument', 'time', 'bid', 'ask')
+
+    def __init__(self, instrument, time, bid, ask):
+        self.instrument = instrument
+        self.time = time
+        self.bid = bid
+        self.ask = ask
+
+    @property
+    def mid(self):
+        return (self.bid + self.ask) / 2
+
+    @classmethod
+    def from_message(cls, message):
+        """Tick from a PRICE stream message, or None if it carries no quotes."""
+        bids, asks = message.get('bids'), message.get('asks')
+        if not bids or not asks:
+            return None
+        return cls(message['instrument'], parse_stream_time(message['time']),
+                   float(bids[0]['price']), float(asks[0]['price']))
+
+    def __repr__(self):
+        return f"Tick({self.instrument}, {self.time:.3f}, {self.bid}, {self.ask})"
+
+
+class ClosedBar:
+    """A completed bar: candle is OANDA-shaped ({'time', 'complete', 'volume', 'mid': {o, h, l, c}})."""
+
+    __slots__ = ('instrument', 'granularity', 'start', 'close_time', 'candle', 'partial', 'closed_at')
+
+    def __init__(self, instrument, granularity, start, close_time, candle, partial, closed_at):
+        self.instrument = instrument
+        self.granularity = granularity
+        self.start = start
+        self.close_time = close_time
+        self.candle = candle
+        # Built from an incomplete tick history (first bar after connecting, or a reconnect gap):
+        # the close is current, open/high/low/volume may not be
+        self.partial = partial
+        self.closed_at = closed_at
+
+    def __repr__(self):
+        return f"ClosedBar({self.instrument}, {self.granularity}, {self.candle['time']}, partial={self.partial})"
+
+
+class BarBuilder:
+    """OHLC bar under construction for one instrument and granularity."""
+
+    def __init__(self, instrument, granularity, offset=0, price='mid'):
+        if price not in ('mid', 'bid', 'ask'):
+            raise ValueError(f"Unsupported price component: {price}")
+        self.instrument = instrument
+        self.granularity = granularity
+        self.period = bar_seconds(granularity)
+        self.offset = offset
+        self.price = price
+        self.start = None
+        self.end = None
+        # End of the last closed bar; ticks before it arrived too late
+        self.closed_until = None
+        self.late_ticks = 0
+        self._ohlc = None
+        self._volume = 0
+        # The first bar starts mid-period, so it is incomplete by definition
+        self._partial = True
+
+    def mark_gap(self):
+        """Ticks may have been missed (stream reconnect): the current and next bar are incomplete."""
+        self._partial = True
+
+    def update(self, tick, now=None):
+        """Add a tick; returns the bar it closed, if any."""
+        if self.closed_until is not None and tick.time < self.closed_until:
+            self.late_ticks += 1
+            return None
+        closed = None
+        if self.end is not None and tick.time >= self.end:
+            closed = self._close(now)
+        price = getattr(tick, self.price)
+        if self._ohlc is None:
+            self.start = (tick.time - self.offset) // self.period * self.period + self.offset
+            self.end = self.start + self.period
+            self._ohlc = [price, price, price, price]
+            self._volume = 1
+        else:
+            ohlc = self._ohlc
+            if price > ohlc[1]:
+                ohlc[1] = price
+            elif price < ohlc[2]:
+                ohlc[2] = price
+            ohlc[3] = price
+            self._volume += 1
+        return closed
+
+    def close_due(self, as_of, now=None):
+        """Close the current bar if `as_of` (stream or local time) is past its end."""
+        if self.end is not None and as_of >= self.end:
+            return self._close(now)
+        return None
+
+    def _close(self, now=None):
+        o, h, l, c = self._ohlc
+        candle = {'time': format_oanda_time(self.start), 'complete': True, 'volume': self._volume,
+                  self.price: {'o': o, 'h': h, 'l': l, 'c': c}}
+        bar = ClosedBar(self.instrument, self.granularity, self.start, self.end, candle, self._partial,
+                        time.time() if now is None else now)
+        self.closed_until = self.end
+        self.start = self.end = self._ohlc = None
+        self._volume = 0
+        self._partial = False
+        return bar
+
+
+class BarAggregator:
+    """
+    Routes ticks to one BarBuilder per (instrument, granularity).
+    Duplicate and out-of-order ticks (OANDA resends the latest price on connect) are dropped.
+    """
+
+    def __init__(self, subscriptions, offsets=None, price='mid'):
+        offsets = offsets or {}
+        self._builders = {}
+        for instrument, granularity in subscriptions:
+            builder = BarBuilder(instrument, granularity, offsets.get(granularity, 0), price)
+            self._builders.setdefault(instrument, []).append(builder)
+        self.ticks = 0
+        self.duplicate_ticks = 0
+        self._last_tick_time = {}
+        self._lock = threading.Lock()
+
+    @property
+    def instruments(self):
+        return list(self._builders)
+
+    def on_tick(self, tick):
+        """Returns the list of bars this tick closed."""
+        builders = self._builders.get(tick.instrument)
+        if builders is None:
+            return []
+        with self._lock:
+            last = self._last_tick_time.get(tick.instrument)
+            if last is not None and tick.time <= last:
+                self.duplicate_ticks += 1
+                return []
+            self._last_tick_time[tick.instrument] = tick.time
+            self.ticks += 1
+            now = time.time()
+            return [bar for bar in (b.update(tick, now) for b in builders) if bar is not None]
+
+    def on_clock(self, as_of):
+        """Close every bar that ended at or before `as_of` (heartbeat time or local clock)."""
+        with self._lock:
+            now = time.time()
+            return [bar for builders in self._builders.values() for bar in
+                    (b.close_due(as_of, now) for b in builders) if bar is not None]
+
+    def next_close(self):
+        """Earliest end of a bar in progress, or None."""
+        with self._lock:
+            ends = [b.end for builders in self._builders.values() for b in builders if b.end is not None]
+        return min(ends) if ends else None
+
+    def mark_gap(self):
+        with self._lock:
+            for builders in self._builders.values():
+                for builder in builders:
+                    builder.mark_gap()
+
+    def late_ticks(self):
+        return sum(b.late_ticks for builders in self._builders.values() for b in builders)
+
+
+def streaming_api_client(access_token, environment='practice', heartbeat_timeout=DEFAULT_HEARTBEAT_TIMEOUT):
+    """
+    API client for the pricing stream, separate from the REST session. The read
+    timeout turns a stream that stopped sending heartbeats into an error, so
+    PricingStreamSource reconnects instead of hanging.
+    """
+    return API(access_token=access_token, environment=environment,
+               request_params={'timeout': (10, heartbeat_timeout)})
+
+
+class PricingStreamSource:
+    """
+    Live OANDA pricing stream as an iterator of raw messages, reconnecting on errors.
+
+    Use an API client with a read timeout (streaming_api_client), otherwise a
+    silently dead connection blocks forever. `reconnects` counts reconnections
+    so consumers can tell that ticks may have been missed.
+    """
+
+    def __init__(self, api_client, account_id, instruments, reconnect_delay=1.0, max_reconnect_delay=30.0):
+        self.api_client = api_client
+        self.account_id = account_id
+        self.instruments = list(instruments)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = False
+        self.messages = 0
+        self.heartbeats = 0
+        self.reconnects = 0
+        self.last_error = None
+        self.last_message_at = None
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop after the current message (at most one heartbeat interval later)."""
+        self._stopped.set()
+
+    def __iter__(self):
+        delay = self.reconnect_delay
+        first_connect = True
+        while not self._stopped.is_set():
+            if not first_connect:
+                self.reconnects += 1
+            first_connect = False
+            try:
+                endpoint = PricingStream(accountID=self.account_id,
+                                         params={'instruments': ','.join(self.instruments)})
+                for message in self.api_client.request(endpoint):
+                    if not self.connected:
+                        self.connected = True
+                        delay = self.reconnect_delay
+                        logging.info(f"Pricing stream connected: {', '.join(self.instruments)}")
+                    self.messages += 1
+                    self.last_message_at = time.monotonic()
+                    if message.get('type') == MESSAGE_HEARTBEAT:
+                        self.heartbeats += 1
+                    yield message
+                    if self._stopped.is_set():
+                        return
+                self.last_error = 'stream closed by server'
+            except Exception as e:
+                self.last_error = str(e)
+            self.connected = False
+            if self._stopped.is_set():
+                return
+            logging.warning(f"Pricing stream disconnected ({self.last_error}), reconnecting in {delay:.1f}s")
+            self._stopped.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+
+class ReplaySource:
+    """
+    Recorded stream messages played back as a stand-in for PricingStreamSource.
+    With `speed` set, messages are paced by their timestamps (1.0 = real time).
+    """
+
+    def __init__(self, messages, speed=None, sleep=time.sleep):
+        self.messages = messages
+        self.speed = speed
+        self.sleep = sleep
+        self.reconnects = 0
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Replay a JSON-lines recording (one stream message per line, see record_messages)."""
+        def read():
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        return cls(read(), **kwargs)
+
+    def stop(self):
+        self._stopped.set()
+
+    def __iter__(self):
+        previous = None
+        for message in self.messages:
+            if self._stopped.is_set():
+                return
+            if self.speed and 'time' in message:
+                stamp = parse_stream_time(message['time'])
+                if previous is not None and stamp > previous:
+                    self.sleep((stamp - previous) / self.speed)
+                previous = stamp
+            yield message
+
+
+def record_messages(messages, path):
+    """Pass stream messages through while appending them to a JSON-lines file for ReplaySource."""
+    with open(path, 'a') as f:
+        for message in messages:
+            f.write(json.dumps(message, separators=(',', ':')) + '\n')
+            yield message
+
+
+_END_OF_STREAM = object()
+
+
+class BarFeed:
+    """
+    Reads a message source on a background thread and yields closed bars in order.
+
+    The queue between reader and consumer holds at most `max_pending_bars`;
+    when it is full the reader waits (and stops reading the stream) until the
+    consumer catches up, which is recorded in backpressure_waits/seconds.
+    With `clock` set (live streams), bars are also closed `close_grace`
+    seconds after their end by the local clock, without waiting for the next
+    tick or heartbeat. Leave it None for replays, whose timestamps are not "now".
+    `record_to` appends every message read to a JSON-lines file for ReplaySource.
+    """
+
+    def __init__(self, source, aggregator, max_pending_bars=1000, clock=None, close_grace=0.25, record_to=None):
+        self.source = source
+        self.record_to = record_to
+        self.aggregator = aggregator
+        self.clock = clock
+        self.close_grace = close_grace
+        self.backpressure_waits = 0
+        self.backpressure_seconds = 0.0
+        self.bars = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_pending_bars)
+        self._stopped = threading.Event()
+        self._reader = None
+
+    def start(self):
+        self._reader = threading.Thread(target=self._read, name='tick-reader', daemon=True)
+        self._reader.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        stop = getattr(self.source, 'stop', None)
+        if stop is not None:
+            stop()
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        self.backpressure_waits += 1
+        waited = time.perf_counter()
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+        self.backpressure_seconds += time.perf_counter() - waited
+
+    def _read(self):
+        reconnects = getattr(self.source, 'reconnects', 0)
+        messages = record_messages(self.source, self.record_to) if self.record_to else self.source
+        try:
+            for message in messages:
+                if self._stopped.is_set():
+                    break
+                current = getattr(self.source, 'reconnects', 0)
+                if current != reconnects:
+                    reconnects = current
+                    self.aggregator.mark_gap()
+                kind = message.get('type')
+                if kind == MESSAGE_PRICE:
+                    tick = Tick.from_message(message)
+                    bars = self.aggregator.on_tick(tick) if tick is not None else []
+                elif kind == MESSAGE_HEARTBEAT and 'time' in message:
+                    bars = self.aggregator.on_clock(parse_stream_time(message['time']))
+                else:
+                    continue
+                for bar in bars:
+                    self._put(bar)
+        except Exception as e:
+            self.error = e
+            logging.error(f"Tick reader stopped: {e}")
+        finally:
+            self._put(_END_OF_STREAM)
+
+    def __iter__(self):
+        """Closed bars as they complete; ends when the source is exhausted or the feed is stopped."""
+        if self._reader is None:
+            self.start()
+        while not self._stopped.is_set():
+            timeout = None
+            if self.clock is not None:
+                next_close = self.aggregator.next_close()
+                timeout = 1.0 if next_close is None else max(0.0, next_close + self.close_grace - self.clock())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # Nothing queued, so no earlier bar can be waiting behind the ones closed here
+                for bar in self.aggregator.on_clock(self.clock() - self.close_grace):
+                    self.bars += 1
+                    yield bar
+                continue
+            if item is _END_OF_STREAM:
+                return
+            self.bars += 1
+            yield item
+
+    def metrics(self):
+        source = self.source
+        return {
+            'bars': self.bars,
+            'ticks': self.aggregator.ticks,
+            'duplicate_ticks': self.aggregator.duplicate_ticks,
+            'late_ticks': self.aggregator.late_ticks(),
+            'pending_bars': self._queue.qsize(),
+            'backpressure_waits': self.backpressure_waits,
+            'backpressure_seconds': self.backpressure_seconds,
+            'reconnects': getattr(source, 'reconnects', 0),
+            'heartbeats': getattr(source, 'heartbeats', None),
+            'last_error': getattr(source, 'last_error', None)
+        }
@@ -0,0 +1,249 @@
+"""
+NumPy trade simulator for strategy signals.
+
+Turns the arrays returned by strategy_logic (entry / exit / direction, plus
+optional per-bar stop_loss_levels / take_profit_levels such as the fractal
+scalper's) and OHLC columns into a trade log and an equity curve, so whole
+backtests can run server-side or in batch.
+
+Fill model, following the supabase run-backtest function:
+- one position at a time; entries fill at the signal bar's close plus the
+  spread against the trade (BUY pays close + spread, SELL gets close - spread)
+- from the next bar on, stop loss / take profit are checked intrabar against
+  high/low; a bar that opens beyond a level fills at the open, and when both
+  levels fall inside one bar the stop loss is assumed to trigger first
+- SL/TP fills pay slippage; exit signals fill at the close minus the spread
+- commission is charged once per round trip
+- per-bar levels (> 0) take precedence over the stop_loss_pips / take_profit_pips
+  distances; levels on the wrong side of the entry for the trade's direction
+  (e.g. a short's stop on an auto-generated BUY) are ignored
+
+Instead of stepping through every bar, the simulator jumps from entry to the
+next exit with vectorized searches over geometrically growing bar windows,
+so the Python-level work scales with the number of trades, not bars.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+PIP_SIZE = 0.0001
+
+# Exit reasons in the trade log
+EXIT_STOP_LOSS = 'Stop loss'
+EXIT_TAKE_PROFIT = 'Take profit'
+EXIT_SIGNAL = 'Strategy exit signal'
+EXIT_END_OF_DATA = 'End of data'
+
+
+def direction_signs(direction, length):
+    """'BUY'/'SELL'/None (or 1/-1/0 codes) -> float array of +1/-1/0; no direction means BUY.
+
+    NaN codes are no trade, like None in the dict format.
+    """
+    if direction is None or len(direction) == 0:
+        return np.ones(length)
+    values = np.asarray(direction)
+    if values.dtype.kind in 'iubf':
+        return np.nan_to_num(np.sign(values.astype(np.float64)), nan=0.0)
+    return np.where(values == 'BUY', 1.0, np.where(values == 'SELL', -1.0, 0.0))
+
+
+def _levels(values, length):
+    if values is None or len(values) == 0:
+        return None
+    levels = np.asarray(values, dtype=np.float64)
+    return np.where(levels > 0, levels, np.nan)[:length]
+
+
+class TradeSimulation:
+    """Trade log (DataFrame), realized equity curve (one balance per bar) and summary stats."""
+
+    def __init__(self, trades, equity, initial_balance):
+        self.trades = trades
+        self.equity = equity
+        self.initial_balance = initial_balance
+
+    def stats(self):
+        pnl = self.trades['pnl'].to_numpy() if len(self.trades) else np.empty(0)
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        final_balance = float(self.equity[-1]) if len(self.equity) else self.initial_balance
+        peaks = np.maximum.accumulate(np.concatenate(([self.initial_balance], self.equity)))
+        drawdowns = (peaks[1:] - self.equity) / peaks[1:] * 100 if len(self.equity) else np.zeros(1)
+        return {
+            'total_trades': int(len(pnl)),
+            'winning_trades': int(len(wins)),
+            'losing_trades': int(len(losses)),
+            'win_rate': float(len(wins) / len(pnl) * 100) if len(pnl) else 0.0,
+            'final_balance': final_balance,
+            'total_return': (final_balance - self.initial_balance) / self.initial_balance * 100,
+            'profit_factor': float(wins.sum() / -losses.sum()) if len(losses) else (float('inf') if len(wins) else 0.0),
+            'max_drawdown': float(drawdowns.max()),
+            'avg_win': float(wins.mean()) if len(wins) else 0.0,
+            'avg_loss': float(-losses.mean()) if len(losses) else 0.0
+        }
+
+
+def simulate_trades(open_, high, low, close, entry, direction=None, exit=None,
+                    stop_loss_levels=None, take_profit_levels=None, stop_loss_pips=None, take_profit_pips=None,
+                    spread_pips=0.0, slippage_pips=0.0, commission=0.0, initial_balance=10000.0,
+                    risk_per_trade=1.0, max_position_size=100000.0, units=None, pip_size=PIP_SIZE):
+    """
+    Simulate the signals on OHLC columns and return a TradeSimulation.
+
+    Position size is `units` when given, otherwise initial_balance * risk_per_trade% divided by
+    the trade's stop distance, capped at max_position_size (max_position_size when there is no stop).
+    """
+    open_ = np.asarray(open_, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    entry_mask = np.asarray(entry, dtype=bool)[:n]
+    exit_mask = np.zeros(n, dtype=bool) if exit is None or len(exit) == 0 else np.asarray(exit, dtype=bool)[:n]
+    signs = direction_signs(direction, n)[:n]
+    sl_levels = _levels(stop_loss_levels, n)
+    tp_levels = _levels(take_profit_levels, n)
+
+    spread = spread_pips * pip_size
+    slippage = slippage_pips * pip_size
+    sl_distance = stop_loss_pips * pip_size if stop_loss_pips else np.nan
+    tp_distance = take_profit_pips * pip_size if take_profit_pips else np.nan
+    risk_amount = initial_balance * risk_per_trade / 100
+
+    candidates = np.flatnonzero(entry_mask & (signs != 0) & ~np.isnan(close))
+    log = {name: [] for name in ('entry_index', 'exit_index', 'type', 'entry', 'exit', 'stop_loss',
+                                 'take_profit', 'units', 'pnl', 'exit_reason')}
+    next_bar = 0
+    while True:
+        k = np.searchsorted(candidates, next_bar)
+        if k >= len(candidates):
+            break
+        i = int(candidates[k])
+        sign = signs[i]
+        entry_price = close[i] + sign * spread
+        stop = entry_price - sign * sl_distance
+        if sl_levels is not None and (entry_price - sl_levels[i]) * sign > 0:
+            stop = sl_levels[i]
+        target = entry_price + sign * tp_distance
+        if tp_levels is not None and (tp_levels[i] - entry_price) * sign > 0:
+            target = tp_levels[i]
+
+        if units is not None:
+            size = units
+        elif not np.isnan(stop) and abs(entry_price - stop) > 0:
+            size = min(risk_amount / abs(entry_price - stop), max_position_size)
+        else:
+            size = max_position_size
+
+        j, exit_price, reason = _find_exit(i, sign, stop, target, open_, high, low, close, exit_mask, spread, slippage)
+        log['entry_index'].append(i)
+        log['exit_index'].append(j)
+        log['type'].append('BUY' if sign > 0 else 'SELL')
+        log['entry'].append(entry_price)
+        log['exit'].append(exit_price)
+        log['stop_loss'].append(stop)
+        log['take_profit'].append(target)
+        log['units'].append(size)
+        log['pnl'].append((exit_price - entry_price) * sign * size - commission)
+        log['exit_reason'].append(reason)
+        next_bar = j + 1
+
+    trades = pd.DataFrame(log)
+    trades.insert(0, 'id', np.arange(1, len(trades) + 1))
+    trades['bars_held'] = trades['exit_index'] - trades['entry_index']
+
+    realized = np.zeros(n)
+    if len(trades):
+        np.add.at(realized, trades['exit_index'].to_numpy(), trades['pnl'].to_numpy())
+    equity = initial_balance + np.cumsum(realized)
+    return TradeSimulation(trades, equity, initial_balance)
+
+
+def _find_exit(i, sign, stop, target, open_, high, low, close, exit_mask, spread, slippage):
+    """First bar after i that closes the position: (bar, fill price, reason)."""
+    n = len(close)
+    start = i + 1
+    window = 64
+    while start < n:
+        stop_bar = min(n, start + window)
+        if sign > 0:
+            hit = exit_mask[start:stop_bar] | (low[start:stop_bar] <= stop) | (high[start:stop_bar] >= target)
+        else:
+            hit = exit_mask[start:stop_bar] | (high[start:stop_bar] >= stop) | (low[start:stop_bar] <= target)
+        hits = np.flatnonzero(hit)
+        if len(hits):
+            j = start + int(hits[0])
+            return (j,) + _resolve_bar(j, sign, stop, target, open_, high, low, close, spread, slippage)
+        start = stop_bar
+        window *= 4
+    # Still open at the end of the data: mark out at the last close
+    return n - 1, close[n - 1] - sign * spread, EXIT_END_OF_DATA
+
+
+def _resolve_bar(j, sign, stop, target, open_, high, low, close, spread, slippage):
+    """Fill price and reason on the exit bar (SL before TP before the close-based exit signal)."""
+    if sign > 0:
+        if open_[j] <= stop:
+            return open_[j] - slippage, EXIT_STOP_LOSS
+        if open_[j] >= target:
+            return open_[j] - slippage, EXIT_TAKE_PROFIT
+        if low[j] <= stop:
+            return stop - slippage, EXIT_STOP_LOSS
+        if high[j] >= target:
+            return target - slippage, EXIT_TAKE_PROFIT
+    else:
+        if open_[j] >= stop:
+            return open_[j] + slippage, EXIT_STOP_LOSS
+        if open_[j] <= target:
+            return open_[j] + slippage, EXIT_TAKE_PROFIT
+        if high[j] >= stop:
+            return stop + slippage, EXIT_STOP_LOSS
+        if low[j] <= target:
+            return target + slippage, EXIT_TAKE_PROFIT
+    return close[j] - sign * spread, EXIT_SIGNAL
+
+
+def simulate_strategy_result(columns, result, **settings):
+    """simulate_trades for a strategy result dict and {'Open': ..., 'High': ..., 'Low': ..., 'Close': ...} columns."""
+    direction = result.get('direction', result.get('entry_type', result.get('trade_direction')))
+    return simulate_trades(columns['Open'], columns['High'], columns['Low'], columns['Close'], result.get('entry', []),
+                           direction=direction, exit=result.get('exit'),
+                           stop_loss_levels=result.get('stop_loss_levels'),
+                           take_profit_levels=result.get('take_profit_levels'), **settings)
+
+
+def simulation_score(columns, processed, **settings):
+    """Optimizer scorer: simulation stats of a processed strategy result (settings go to simulate_trades)."""
+    return simulate_strategy_result(columns, processed, **settings).stats()
+
+
+def benchmark(n_bars=2_000_000, signal_rate=0.02, seed=7):
+    """Time a simulation over n_bars synthetic bars; returns (seconds, stats)."""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0004, n_bars))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.0002, n_bars))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.0002, n_bars))
+    entry = rng.random(n_bars) < signal_rate
+    direction = np.where(rng.random(n_bars) < 0.5, 1, -1)
+    exit_mask = rng.random(n_bars) < signal_rate / 2
+
+    started = time.perf_counter()
+    simulation = simulate_trades(open_, high, low, close, entry, direction, exit_mask, stop_loss_pips=20,
+                                 take_profit_pips=30, spread_pips=1.0, slippage_pips=0.2, commission=0.5, units=1000)
+    return time.perf_counter() - started, simulation.stats()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the NumPy trade simulator on synthetic bars')
+    parser.add_argument('--bars', type=int, default=2_000_000)
+    parser.add_argument('--signal-rate', type=float, default=0.02)
+    args = parser.parse_args()
+    seconds, stats = benchmark(args.bars, args.signal_rate)
+    print(f"{args.bars:,} bars, {stats['total_trades']:,} trades in {seconds:.2f}s "
+          f"({args.bars / seconds / 1e6:.1f}M bars/s)")
+    print(stats)
@@ -0,0 +1,127 @@
+"""
+Walk-forward and rolling-window backtests.
+
+The series is split into in-sample (train) / out-of-sample (test) windows.
+Instead of re-running the strategy on every sliced DataFrame, each parameter
+point is run once over the whole series and its signals are scored per
+window: indicator warm-up state simply carries over from one window into the
+next (as it would live), and overlapping windows cost no extra strategy runs.
+Parameter points are evaluated in parallel through StrategyOptimizer; for
+each window the best in-sample point is picked and its out-of-sample metrics
+are reported and aggregated.
+
+This requires causal strategies (signals at bar i may only use bars <= i),
+otherwise a window's signals would see bars after the window.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from strategy_optimizer import StrategyOptimizer, market_data_columns
+from trade_simulator import simulation_score
+
+
+class WalkForwardWindow(NamedTuple):
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def walk_forward_windows(n_bars, train_bars, test_bars, step_bars=None, anchored=False, warmup_bars=0):
+    """
+    Consecutive windows over [warmup_bars, n_bars): train [train_start, train_end) followed by
+    test [train_end, train_end + test_bars). Windows advance by step_bars (default test_bars);
+    anchored windows keep train_start at warmup_bars and grow the training range.
+    """
+    step = step_bars or test_bars
+    windows = []
+    while True:
+        offset = len(windows) * step
+        train_start = warmup_bars if anchored else warmup_bars + offset
+        train_end = warmup_bars + offset + train_bars
+        test_end = train_end + test_bars
+        if test_end > n_bars:
+            break
+        windows.append(WalkForwardWindow(len(windows), train_start, train_end, train_end, test_end))
+    return windows
+
+
+class WalkForwardResult:
+    """Per-window table, aggregate summary and the raw per-segment result rows."""
+
+    def __init__(self, windows, summary, results):
+        self.windows = windows
+        self.summary = summary
+        self.results = results
+
+    def __repr__(self):
+        return f"WalkForwardResult({self.summary})"
+
+
+def run_walk_forward(strategy_code, data, train_bars, test_bars, sampler=None, step_bars=None, anchored=False,
+                     warmup_bars=0, score_key='total_return', scorer=simulation_score, **optimizer_kwargs):
+    """
+    Walk-forward analysis of strategy_code on data.
+
+    sampler: ParameterGrid / RandomSampler / iterable of parameter dicts optimized on each
+    train window; None runs the strategy's defaults (a plain rolling-window backtest).
+    Extra keyword arguments (max_workers, reverse_signals, group_by, ...) go to StrategyOptimizer.
+    """
+    n_bars = len(market_data_columns(data)['Close'])
+    windows = walk_forward_windows(n_bars, train_bars, test_bars, step_bars, anchored, warmup_bars)
+    if not windows:
+        raise ValueError(f"{n_bars} bars are not enough for one {train_bars}/{test_bars} window after {warmup_bars} warm-up bars")
+
+    points = list(sampler) if sampler is not None else [{}]
+    param_names = list(dict.fromkeys(name for params in points for name in params))
+    segments = sorted({(w.train_start, w.train_end) for w in windows} | {(w.test_start, w.test_end) for w in windows})
+
+    optimizer = StrategyOptimizer(strategy_code, data, scorer=scorer, score_key=score_key, segments=segments,
+                                  **optimizer_kwargs)
+    results = pd.DataFrame(list(optimizer.iter_results(points)))
+    if 'error' in results:
+        failed = results[results['error'].notna()]
+        results = results[results['error'].isna()]
+        if results.empty:
+            raise RuntimeError(f"Every parameter point failed, e.g. {failed['error'].iloc[0]}")
+
+    by_segment = {key: rows for key, rows in results.groupby(['segment_start', 'segment_end'], sort=False)}
+    window_rows = []
+    for window in windows:
+        train = by_segment[(window.train_start, window.train_end)]
+        # Single-row frames keep each column's dtype (a Series row would upcast ints to float)
+        best = train.sort_values(score_key, ascending=False, kind='stable').head(1).to_dict('records')[0]
+        best_params = {name: best[name] for name in param_names}
+
+        test = by_segment[(window.test_start, window.test_end)]
+        match = np.ones(len(test), dtype=bool)
+        for name, value in best_params.items():
+            match &= (test[name] == value).to_numpy()
+        test_row = test[match].head(1).to_dict('records')[0]
+
+        row = window._asdict()
+        row.update(best_params)
+        row['train_' + score_key] = best[score_key]
+        for column, value in test_row.items():
+            if column not in param_names and column not in ('segment_start', 'segment_end', 'seconds', 'error'):
+                row['test_' + column] = value
+        window_rows.append(row)
+
+    table = pd.DataFrame(window_rows)
+    train_per_bar = table['train_' + score_key] / (table['train_end'] - table['train_start'])
+    test_per_bar = table['test_' + score_key] / (table['test_end'] - table['test_start'])
+    summary = {
+        'windows': len(table),
+        'parameter_points': len(points),
+        'strategy_runs': len(points),
+        'total_test_' + score_key: float(table['test_' + score_key].sum()),
+        'mean_test_' + score_key: float(table['test_' + score_key].mean()),
+        'positive_test_windows': int((table['test_' + score_key] > 0).sum()),
+        # Out-of-sample score per bar relative to in-sample (walk-forward efficiency)
+        'efficiency': float(test_per_bar.mean() / train_per_bar.mean()) if train_per_bar.mean() else None
+    }
+    return WalkForwardResult(table, summary, results)